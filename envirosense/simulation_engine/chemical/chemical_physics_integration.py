@@ -25,6 +25,7 @@ from envirosense.core.physics.coordinates import Vector3D
 from envirosense.core.physics.space import SpatialGrid
 from envirosense.core.physics.geometry import Room, Material, Wall
 from envirosense.core.physics.airflow import AirflowModel, VentilationSource
+from envirosense.core.physics.snapshots import SnapshotWriter, SnapshotReader
 
 from envirosense.core.chemical.chemical_properties import (
     ChemicalCategory,
@@ -255,86 +256,28 @@ def integrate_chemical_physics():
     # Prepare to store data for visualization
     chemicals_to_track = ["formaldehyde", "nitrogen_dioxide", "benzene", "ethanol", "carbon_monoxide"]
     snapshot_times = [0, 900, 1800, 3600, 7140]  # Times to save snapshots (in seconds)
-    snapshots = {chem: {t: np.zeros((width, length, height)) for t in snapshot_times} for chem in chemicals_to_track}
+    
+    # Record snapshots to a chunked on-disk store rather than holding them in memory
+    output_dir = create_output_directory()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    snapshot_path = os.path.join(output_dir, f"chemical_physics_snapshots_{timestamp}")
+    snapshot_writer = SnapshotWriter.for_grid(snapshot_path, grid, chemicals_to_track,
+                                              chunk_steps=len(snapshot_times))
+    snapshot_writer.append(grid, time=0)
     
     # Trigger time for cooking event
     cooking_trigger_time = 1800  # 30 minutes into simulation
     
-    # Helper function to get environment at a position
-    def get_environment_at_position(position):
-        """Get environmental conditions at a position."""
-        # Convert from meters to grid coordinates
-        x = int(position.x / grid_cell_size)
-        y = int(position.y / grid_cell_size)
-        z = int(position.z / grid_cell_size)
-        
-        # Ensure coordinates are within grid bounds
-        x = max(0, min(x, width - 1))
-        y = max(0, min(y, length - 1))
-        z = max(0, min(z, height - 1))
-        
-        return {
-            "temperature": grid.get_parameter_at((x, y, z), "temperature"),
-            "relative_humidity": grid.get_parameter_at((x, y, z), "relative_humidity")
-        }
+    # Convert emission rates (g/s) into ppm added per time step
+    cell_volume = grid_cell_size ** 3
     
-    # Helper function to apply chemical emission to the grid
-    def apply_emission_to_grid(source, emission_rate):
-        """Apply chemical emission to grid cells within the source's radius."""
-        if emission_rate <= 0:
-            return
-            
-        # Get source position in grid coordinates
-        source_x = int(source.position.x / grid_cell_size)
-        source_y = int(source.position.y / grid_cell_size)
-        source_z = int(source.position.z / grid_cell_size)
-        
-        # Get radius in grid cells
-        radius_cells = int(source.properties.get("radius", 0.5) / grid_cell_size)
-        
-        # Calculate volume of a grid cell in m³
-        cell_volume = grid_cell_size ** 3
-        
-        # Convert emission rate from g/s to concentration increase per cell
+    def emission_to_ppm(source):
+        """Factor converting a source's emission rate into ppm per kernel weight."""
+        # Formula: ppm = (mg/m³) * (24.45 / molecular_weight) at 25°C and 1 atm
         # This is a simplification - in reality would need to account for 
         # molecular weight, temperature, pressure, etc.
-        
-        # Approximate conversion using typical molecular weights
-        # Formula: ppm = (mg/m³) * (24.45 / molecular_weight) at 25°C and 1 atm
         molecular_weight = CHEMICAL_PROPERTIES[source.chemical_id].get("molecular_weight", 100.0)
-        
-        # Calculate mg/m³ from g/s spread over affected cells
-        affected_cells = (2 * radius_cells + 1) ** 3  # Approximate cube of influence
-        emission_mg_per_m3 = (emission_rate * 1000) / (affected_cells * cell_volume)
-        
-        # Convert to ppm
-        emission_ppm = emission_mg_per_m3 * (24.45 / molecular_weight)
-        
-        # Apply to grid with distance-based falloff
-        for dx in range(-radius_cells, radius_cells + 1):
-            for dy in range(-radius_cells, radius_cells + 1):
-                for dz in range(-radius_cells, radius_cells + 1):
-                    x = source_x + dx
-                    y = source_y + dy
-                    z = source_z + dz
-                    
-                    # Skip if outside grid
-                    if not (0 <= x < width and 0 <= y < length and 0 <= z < height):
-                        continue
-                    
-                    # Calculate distance-based falloff (inverse square law)
-                    distance = math.sqrt(dx**2 + dy**2 + dz**2) * grid_cell_size
-                    if distance < 0.01:  # Avoid division by zero
-                        distance = 0.01
-                        
-                    # Apply inverse square falloff with minimum threshold
-                    falloff = min(1.0, (source.properties.get("radius", 0.5) / distance) ** 2)
-                    
-                    # Get current concentration and add emission
-                    current = grid.get_parameter_at((x, y, z), source.chemical_id)
-                    new_value = current + emission_ppm * falloff * (time_step / 60.0)  # Scale by time step 
-                    
-                    grid.set_parameter_at((x, y, z), source.chemical_id, new_value)
+        return (1000 / cell_volume) * (24.45 / molecular_weight) * (time_step / 60.0)
     
     # Run simulation
     print(f"Running integrated simulation for {simulation_duration/3600:.1f} hours...")
@@ -351,10 +294,8 @@ def integrate_chemical_physics():
             source_manager.trigger_source("cooking_activity")
         
         # Apply emissions from all sources
-        emission_rates = source_manager.apply_emissions(
-            time_step=time_step,
-            environment_function=get_environment_at_position,
-            apply_function=apply_emission_to_grid
+        emission_rates = source_manager.apply_emissions_to_grid(
+            grid, time_step, conversion=emission_to_ppm
         )
         
         # Apply airflow effects
@@ -377,18 +318,13 @@ def integrate_chemical_physics():
         # Save snapshots at specific times
         if current_time in snapshot_times:
             print(f"  Saving snapshot at {current_time/60:.1f} minutes")
-            for chemical_id in chemicals_to_track:
-                for x in range(width):
-                    for y in range(length):
-                        for z in range(height):
-                            snapshots[chemical_id][current_time][x, y, z] = grid.get_parameter_at((x, y, z), chemical_id)
+            snapshot_writer.append(grid, time=current_time)
     
-    print("Simulation complete")
+    snapshot_writer.close()
+    snapshots = SnapshotReader(snapshot_path)
+    print(f"Simulation complete, snapshots saved to {snapshot_path}")
     
     # Create visualizations
-    output_dir = create_output_directory()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
     # Visualization for each chemical at different time points
     for chemical_id in chemicals_to_track:
         chemical_name = CHEMICAL_PROPERTIES[chemical_id]["name"]
@@ -397,9 +333,14 @@ def integrate_chemical_physics():
         plt.figure(figsize=(15, 10))
         subplot_count = 1
         
-        for t in snapshot_times:
+        for step, t in enumerate(snapshots.times):
             if t == 0:
                 continue  # Skip initial state which is all zeros
+            
+            # Determine max value for consistent color scaling
+            max_val = np.max(snapshots.get_snapshot(chemical_id, step))
+            if max_val == 0:
+                max_val = 0.001  # Avoid divide by zero
                 
             # Create horizontal slices at different heights
             for height_fraction in [0.2, 0.5, 0.8]:
@@ -410,12 +351,7 @@ def integrate_chemical_physics():
                 subplot_count += 1
                 
                 # Extract horizontal slice
-                slice_data = snapshots[chemical_id][t][:, :, z_idx].transpose()
-                
-                # Determine max value for consistent color scaling
-                max_val = np.max(snapshots[chemical_id][t])
-                if max_val == 0:
-                    max_val = 0.001  # Avoid divide by zero
+                slice_data = snapshots.read(chemical_id, step, (slice(None), slice(None), z_idx)).transpose()
                 
                 # Create heatmap
                 im = plt.imshow(slice_data, 
@@ -449,7 +385,8 @@ def integrate_chemical_physics():
         z_idx = int(height * 0.5)
         
         # Extract horizontal slice
-        slice_data = snapshots[chemical_id][snapshot_times[-1]][:, :, z_idx].transpose()
+        slice_data = snapshots.read(chemical_id, snapshots.num_steps - 1,
+                                    (slice(None), slice(None), z_idx)).transpose()
         
         # Create heatmap
         im = plt.imshow(slice_data, 
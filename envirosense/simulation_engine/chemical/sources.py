@@ -14,9 +14,10 @@ import numpy as np
 from datetime import datetime, timedelta
 from enum import Enum, auto
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple, Optional, Union, Any
+from typing import Callable, Dict, List, Tuple, Optional, Union, Any
 
 from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.spatial_index import PointIndex
 from envirosense.core.chemical.chemical_properties import (
     ChemicalCategory, 
     CHEMICAL_PROPERTIES,
@@ -92,6 +93,9 @@ class ChemicalSource(ABC):
         # Get chemical properties
         self.chemical_properties = CHEMICAL_PROPERTIES.get(chemical_id, {})
         
+        # Rasterized emission kernel, keyed on position, radius and grid geometry
+        self._emission_kernel = None
+        
     @abstractmethod
     def emit(self, time_step: float, environment: Optional[Dict[str, Any]] = None) -> float:
         """
@@ -191,6 +195,43 @@ class ChemicalSource(ABC):
         
         return humidity_factor
     
+    def get_emission_kernel(self, grid) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the grid cells this source emits into and the share of each.
+        
+        The emission is spread over the cube of cells within ``radius`` of
+        the source cell, with inverse-square falloff from the source (capped
+        at 1) divided by the number of cells in the cube. The kernel is
+        rasterized once and reused until the source moves, its radius
+        changes or it is applied to a grid of another geometry.
+        
+        Args:
+            grid: SpatialGrid the emission is applied to
+        
+        Returns:
+            Tuple of (flat cell indices, weights); cells outside the grid are dropped
+        """
+        radius = self.properties.get("radius", 0.1)
+        key = (self.position.to_tuple(), radius, grid.cell_size, tuple(grid.dimensions))
+        
+        if self._emission_kernel is None or self._emission_kernel[0] != key:
+            center = grid.grid_coordinates(key[0])
+            reach = int(radius / grid.cell_size)
+            offsets = np.arange(-reach, reach + 1)
+            dx, dy, dz = (axis.ravel() for axis in np.meshgrid(offsets, offsets, offsets, indexing="ij"))
+            
+            cells = np.stack([dx + center[0], dy + center[1], dz + center[2]])
+            inside = np.all((cells >= 0) & (cells < np.array(grid.dimensions)[:, None]), axis=0)
+            
+            # Inverse-square falloff, avoiding division by zero at the source
+            distance = np.maximum(np.sqrt(dx ** 2 + dy ** 2 + dz ** 2) * grid.cell_size, 0.01)
+            weights = np.minimum(1.0, (radius / distance) ** 2) / len(dx)
+            
+            indices = np.ravel_multi_index(tuple(cells[:, inside]), grid.dimensions)
+            self._emission_kernel = (key, indices, weights[inside])
+            
+        return self._emission_kernel[1], self._emission_kernel[2]
+    
     def deactivate(self) -> None:
         """Deactivate the source temporarily."""
         self.status = SourceStatus.INACTIVE
@@ -224,6 +265,115 @@ class ChemicalSource(ABC):
         return None
 
 
+def _temperature_factors(sources: List[ChemicalSource], temperatures: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``ChemicalSource.get_temperature_factor`` for several sources.
+    
+    Args:
+        sources: Sources to evaluate
+        temperatures: Temperature at each source in Celsius
+    
+    Returns:
+        Array of temperature scaling factors
+    """
+    factors = np.ones(len(sources))
+    
+    # Sources of the same chemical share a scaling curve
+    groups: Dict[str, List[int]] = {}
+    for index, source in enumerate(sources):
+        if source.properties.get("temperature_sensitive", True):
+            groups.setdefault(source.chemical_id, []).append(index)
+    
+    for indices in groups.values():
+        indices = np.array(indices)
+        temperature = temperatures[indices]
+        temp_scaling = sources[indices[0]].chemical_properties.get("temperature_scaling", {})
+        scaling_type = temp_scaling.get("type", "linear")
+        
+        if scaling_type == "linear":
+            slope = temp_scaling.get("slope", 0.02)
+            ref_temp = temp_scaling.get("reference_temp", 25.0)
+            factors[indices] = 1.0 + slope * (temperature - ref_temp)
+            
+        elif scaling_type == "arrhenius":
+            activation_energy = temp_scaling.get("activation_energy", 50.0)
+            ref_temp = temp_scaling.get("reference_temp", 298.15)
+            R = 8.314 / 1000
+            factors[indices] = np.exp((activation_energy / R) * (1 / ref_temp - 1 / (temperature + 273.15)))
+            
+        elif scaling_type == "complex":
+            # Interpolation clamps to the endpoints outside the curve
+            ref_curve = sorted(temp_scaling.get("reference_curve", [(0, 0.5), (25, 1.0), (50, 2.0)]),
+                               key=lambda x: x[0])
+            curve_temps, curve_factors = zip(*ref_curve)
+            factors[indices] = np.interp(temperature, curve_temps, curve_factors)
+            
+        else:
+            factors[indices] = 1.0 + temp_scaling.get("factor", 0.01) * (temperature - 25.0)
+            
+    return factors
+
+
+def _humidity_factors(sources: List[ChemicalSource], humidities: np.ndarray) -> np.ndarray:
+    """
+    Vectorized ``ChemicalSource.get_humidity_factor`` for several sources.
+    
+    Args:
+        sources: Sources to evaluate
+        humidities: Relative humidity at each source (0-100%)
+    
+    Returns:
+        Array of humidity scaling factors
+    """
+    sensitive = np.array([source.properties.get("humidity_sensitive", True) for source in sources], dtype=bool)
+    humidity_effect = np.array([source.chemical_properties.get("humidity_effect", 0.2) for source in sources])
+    return np.where(sensitive, 0.8 + (0.7 * humidity_effect * humidities / 100.0), 1.0)
+
+
+def _record_emissions(sources: List[ChemicalSource], emission_rates: np.ndarray,
+                      emitting: np.ndarray, time_step: float, now: datetime) -> None:
+    """
+    Update the emission totals of sources after a batched emission.
+    
+    Args:
+        sources: Sources that were evaluated
+        emission_rates: Emission rate of each source
+        emitting: Mask of the sources that emitted this step
+        time_step: Time step in seconds
+        now: Time recorded as the last emission time
+    """
+    for source, emission_rate, emitted in zip(sources, emission_rates, emitting):
+        if not emitted:
+            continue
+        source.total_emitted += float(emission_rate) * time_step
+        source.last_emission_time = now
+        
+        # Check if source is depleted (if it has a finite capacity)
+        total_capacity = source.properties.get("total_capacity")
+        if total_capacity is not None and source.total_emitted >= total_capacity:
+            source.set_depleted()
+
+
+def _batch_emitter(source_type: type):
+    """
+    Get the batched emitter matching a source type's ``emit``.
+    
+    A subclass that overrides ``emit`` without also overriding
+    ``emit_batch`` must not inherit its parent's batched emitter.
+    
+    Args:
+        source_type: ChemicalSource subclass
+    
+    Returns:
+        The type's ``emit_batch`` classmethod, or None if ``emit`` has to be
+        called per source
+    """
+    for klass in source_type.__mro__:
+        if "emit" in vars(klass):
+            return getattr(source_type, "emit_batch") if "emit_batch" in vars(klass) else None
+    return None
+
+
 class ConstantSource(ChemicalSource):
     """
     A chemical source that emits at a constant rate.
@@ -268,6 +418,27 @@ class ConstantSource(ChemicalSource):
             self.set_depleted()
             
         return emission_rate
+    
+    @classmethod
+    def emit_batch(cls, sources: List["ConstantSource"], time_step: float,
+                   temperatures: np.ndarray, humidities: np.ndarray) -> np.ndarray:
+        """
+        Calculate emissions of several constant sources with array math.
+        
+        Args:
+            sources: Active sources of this type
+            time_step: Time step in seconds
+            temperatures: Temperature at each source in Celsius
+            humidities: Relative humidity at each source (0-100%)
+        
+        Returns:
+            Array of emission rates, in the order of ``sources``
+        """
+        strength = np.array([source.current_strength for source in sources])
+        emission_rates = strength * _temperature_factors(sources, temperatures) * _humidity_factors(sources, humidities)
+        
+        _record_emissions(sources, emission_rates, np.ones(len(sources), dtype=bool), time_step, datetime.now())
+        return emission_rates
 
 
 class PulsedSource(ChemicalSource):
@@ -353,6 +524,36 @@ class PulsedSource(ChemicalSource):
         else:
             # During inactive part of the pulse
             return 0.0
+    
+    @classmethod
+    def emit_batch(cls, sources: List["PulsedSource"], time_step: float,
+                   temperatures: np.ndarray, humidities: np.ndarray) -> np.ndarray:
+        """
+        Calculate emissions of several pulsed sources with array math.
+        
+        Args:
+            sources: Active sources of this type
+            time_step: Time step in seconds
+            temperatures: Temperature at each source in Celsius
+            humidities: Relative humidity at each source (0-100%)
+        
+        Returns:
+            Array of emission rates, in the order of ``sources``
+        """
+        period = np.array([source.pulse_period for source in sources])
+        active_time = np.array([source.active_time for source in sources])
+        elapsed = (np.array([source.elapsed_time for source in sources]) + time_step) % period
+        for source, elapsed_time in zip(sources, elapsed):
+            source.elapsed_time = float(elapsed_time)
+        
+        # Only sources in the active part of their cycle emit
+        on = elapsed <= active_time
+        strength = np.array([source.current_strength for source in sources])
+        emission_rates = np.where(
+            on, strength * _temperature_factors(sources, temperatures) * _humidity_factors(sources, humidities), 0.0)
+        
+        _record_emissions(sources, emission_rates, on, time_step, datetime.now())
+        return emission_rates
 
 
 class DecayingSource(ChemicalSource):
@@ -440,6 +641,42 @@ class DecayingSource(ChemicalSource):
             self.set_depleted()
             
         return emission_rate
+    
+    @classmethod
+    def emit_batch(cls, sources: List["DecayingSource"], time_step: float,
+                   temperatures: np.ndarray, humidities: np.ndarray) -> np.ndarray:
+        """
+        Calculate emissions of several decaying sources with array math.
+        
+        Args:
+            sources: Active sources of this type
+            time_step: Time step in seconds
+            temperatures: Temperature at each source in Celsius
+            humidities: Relative humidity at each source (0-100%)
+        
+        Returns:
+            Array of emission rates, in the order of ``sources``
+        """
+        time_elapsed = np.array([source.time_elapsed for source in sources]) + time_step
+        initial = np.array([source.initial_strength for source in sources])
+        decay_constant = np.array([source.decay_constant for source in sources])
+        threshold = np.array([source.properties.get("depletion_threshold", 0.01) for source in sources])
+        
+        # S(t) = S₀ * e^(-λt)
+        decayed_strength = initial * np.exp(-decay_constant * time_elapsed)
+        depleted = decayed_strength < initial * threshold
+        for source, elapsed, strength, exhausted in zip(sources, time_elapsed, decayed_strength, depleted):
+            source.time_elapsed = float(elapsed)
+            source.current_strength = float(strength)
+            if exhausted:
+                source.set_depleted()
+        
+        emission_rates = np.where(
+            depleted, 0.0,
+            decayed_strength * _temperature_factors(sources, temperatures) * _humidity_factors(sources, humidities))
+        
+        _record_emissions(sources, emission_rates, ~depleted, time_step, datetime.now())
+        return emission_rates
 
 
 class DiurnalSource(ChemicalSource):
@@ -546,6 +783,41 @@ class DiurnalSource(ChemicalSource):
             self.set_depleted()
             
         return emission_rate
+    
+    @classmethod
+    def emit_batch(cls, sources: List["DiurnalSource"], time_step: float,
+                   temperatures: np.ndarray, humidities: np.ndarray) -> np.ndarray:
+        """
+        Calculate emissions of several diurnal sources with array math.
+        
+        Args:
+            sources: Active sources of this type
+            time_step: Time step in seconds
+            temperatures: Temperature at each source in Celsius
+            humidities: Relative humidity at each source (0-100%)
+        
+        Returns:
+            Array of emission rates, in the order of ``sources``
+        """
+        now = datetime.now()
+        current_hour = now.hour + now.minute / 60.0
+        
+        period = np.array([source.period for source in sources])
+        phase_shift = np.array([source.phase_shift for source in sources])
+        min_factor = np.array([source.min_factor for source in sources])
+        initial = np.array([source.initial_strength for source in sources])
+        
+        # Sinusoidal factor in [min_factor, 1.0]
+        sine_value = np.sin(2 * np.pi / period * current_hour + phase_shift)
+        diurnal_factor = (1.0 - min_factor) * (sine_value + 1) / 2 + min_factor
+        
+        emission_rates = (initial * diurnal_factor * _temperature_factors(sources, temperatures) *
+                          _humidity_factors(sources, humidities))
+        for source, emission_rate in zip(sources, emission_rates):
+            source.current_strength = float(emission_rate)
+        
+        _record_emissions(sources, emission_rates, np.ones(len(sources), dtype=bool), time_step, now)
+        return emission_rates
 
 
 class EventTriggeredSource(ChemicalSource):
@@ -695,6 +967,9 @@ class ChemicalSourceManager:
         """Initialize the chemical source manager."""
         self.sources = {}  # Dictionary mapping source_id to source object
         
+        # KD-tree over source positions, as (sources, index); rebuilt on change
+        self._source_index = None
+        
     def add_source(self, source: ChemicalSource) -> None:
         """
         Add a chemical source to the environment.
@@ -709,6 +984,7 @@ class ChemicalSourceManager:
             raise ValueError(f"Source with ID {source.source_id} already exists")
             
         self.sources[source.source_id] = source
+        self._source_index = None
         
     def remove_source(self, source_id: str) -> bool:
         """
@@ -722,9 +998,18 @@ class ChemicalSourceManager:
         """
         if source_id in self.sources:
             del self.sources[source_id]
+            self._source_index = None
             return True
         return False
         
+    def invalidate_spatial_index(self) -> None:
+        """
+        Discard the source position index so it is rebuilt on the next query.
+        
+        Call this after moving sources already in the manager.
+        """
+        self._source_index = None
+        
     def get_source(self, source_id: str) -> Optional[ChemicalSource]:
         """
         Get a chemical source by ID.
@@ -783,10 +1068,65 @@ class ChemicalSourceManager:
         if isinstance(position, tuple):
             position = Vector3D(*position)
             
-        return [
-            source for source in self.sources.values()
-            if position.distance_to(source.position) <= radius
-        ]
+        if self._source_index is None or len(self._source_index[0]) != len(self.sources):
+            sources = list(self.sources.values())
+            self._source_index = (sources, PointIndex([source.position.to_tuple() for source in sources]))
+            
+        sources, index = self._source_index
+        return [sources[i] for i in index.query_radius(position.to_tuple(), radius)]
+        
+    def compute_emissions(
+        self,
+        time_step: float,
+        sources: List[ChemicalSource],
+        temperatures: Union[float, np.ndarray] = 25.0,
+        humidities: Union[float, np.ndarray] = 50.0,
+        environments: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> np.ndarray:
+        """
+        Calculate emission rates for several sources in one batch.
+        
+        Sources are grouped by type, and each group with a batched emitter
+        (``emit_batch``) is evaluated with array math; other sources fall
+        back to calling ``emit`` one by one. Inactive sources emit nothing.
+        
+        Args:
+            time_step: Time step in seconds
+            sources: Sources to evaluate
+            temperatures: Temperature at each source in Celsius (or one for all)
+            humidities: Relative humidity at each source (or one for all)
+            environments: Optional full environment conditions of each
+                source, passed to sources without a batched emitter
+                
+        Returns:
+            Array of emission rates, in the order of ``sources``
+        """
+        temperatures = np.broadcast_to(np.asarray(temperatures, dtype=float), (len(sources),))
+        humidities = np.broadcast_to(np.asarray(humidities, dtype=float), (len(sources),))
+        emission_rates = np.zeros(len(sources))
+        
+        groups: Dict[type, List[int]] = {}
+        for index, source in enumerate(sources):
+            if source.is_active():
+                groups.setdefault(type(source), []).append(index)
+        
+        for source_type, indices in groups.items():
+            emitter = _batch_emitter(source_type)
+            if emitter is not None:
+                indices = np.array(indices)
+                emission_rates[indices] = emitter(
+                    [sources[i] for i in indices], time_step, temperatures[indices], humidities[indices])
+                continue
+                
+            for i in indices:
+                if environments is not None and environments[i] is not None:
+                    environment = environments[i]
+                else:
+                    environment = {"temperature": float(temperatures[i]),
+                                   "relative_humidity": float(humidities[i])}
+                emission_rates[i] = sources[i].emit(time_step, environment)
+                
+        return emission_rates
         
     def apply_emissions(
         self,
@@ -797,6 +1137,10 @@ class ChemicalSourceManager:
         """
         Calculate and apply emissions from all sources to the environment.
         
+        Emission rates are calculated in one batch (see ``compute_emissions``);
+        use ``apply_emissions_to_grid`` to also apply them to a SpatialGrid
+        without per-source callbacks.
+        
         Args:
             time_step: Time step in seconds
             environment_function: Function that takes a position and returns
@@ -807,22 +1151,89 @@ class ChemicalSourceManager:
         Returns:
             Dictionary mapping source_id to emission rate
         """
-        emission_rates = {}
+        emission_rates = dict.fromkeys(self.sources, 0.0)
+        active = self.get_active_sources()
+        if not active:
+            return emission_rates
         
-        for source_id, source in self.sources.items():
-            if not source.is_active():
-                emission_rates[source_id] = 0.0
-                continue
+        # Get environment conditions at source positions
+        environments = [environment_function(source.position) or {} for source in active]
+        temperatures = np.array([env.get("temperature", 25.0) for env in environments], dtype=float)
+        humidities = np.array([env.get("relative_humidity", 50.0) for env in environments], dtype=float)
+        
+        rates = self.compute_emissions(time_step, active, temperatures, humidities, environments)
+        
+        for source, emission_rate in zip(active, rates):
+            emission_rates[source.source_id] = float(emission_rate)
+            
+            # Apply emission to environment
+            apply_function(source, float(emission_rate))
+            
+        return emission_rates
+        
+    def apply_emissions_to_grid(
+        self,
+        grid,
+        time_step: float,
+        conversion: Optional[Callable[[ChemicalSource], float]] = None
+    ) -> Dict[str, float]:
+        """
+        Calculate emissions from all sources and add them to a SpatialGrid.
+        
+        Temperature and relative humidity are read from the grid cell of each
+        source (25 °C and 50% where the grid does not hold them). Emission
+        rates are calculated in one batch, spread over each source's
+        rasterized emission kernel (see ``ChemicalSource.get_emission_kernel``)
+        and scatter-added into the grid in a single pass. Each source's
+        chemical is stored in the grid parameter named by its chemical ID.
+        
+        Args:
+            grid: SpatialGrid to emit into
+            time_step: Time step in seconds
+            conversion: Optional function giving, for a source, the factor
+                converting its emission rate into the value added to a cell
+                of kernel weight 1. Defaults to ``time_step`` divided by the
+                cell volume (mass per cubic meter).
                 
-            # Get environment conditions at source position
-            env_conditions = environment_function(source.position)
+        Returns:
+            Dictionary mapping source_id to emission rate
+        """
+        emission_rates = dict.fromkeys(self.sources, 0.0)
+        active = self.get_active_sources()
+        if not active:
+            return emission_rates
+        
+        # Sample the environment at the source cells, clamped to the grid
+        cells = np.array([grid.grid_coordinates(source.position.to_tuple()) for source in active])
+        cells = np.clip(cells, 0, np.array(grid.dimensions) - 1)
+        if grid.is_array_backed:
+            temperatures = grid.get_parameter_array("temperature", 25.0)[tuple(cells.T)]
+            humidities = grid.get_parameter_array("relative_humidity", 50.0)[tuple(cells.T)]
+        else:
+            positions = [tuple(int(i) for i in cell) for cell in cells]
+            temperatures = np.array([grid.get_parameter_at(p, "temperature", 25.0) for p in positions])
+            humidities = np.array([grid.get_parameter_at(p, "relative_humidity", 50.0) for p in positions])
+        
+        rates = self.compute_emissions(time_step, active, temperatures, humidities)
+        
+        # Gather every emitting source's kernel into one scatter
+        chemical_ids: Dict[str, int] = {}
+        parameter_indices, cell_indices, values = [], [], []
+        for source, emission_rate in zip(active, rates):
+            emission_rates[source.source_id] = float(emission_rate)
+            if emission_rate <= 0:
+                continue
             
-            # Calculate emission rate
-            emission_rate = source.emit(time_step, env_conditions)
-            emission_rates[source_id] = emission_rate
+            indices, weights = source.get_emission_kernel(grid)
+            parameter = chemical_ids.setdefault(source.chemical_id, len(chemical_ids))
+            parameter_indices.append(np.full(len(indices), parameter))
+            cell_indices.append(indices)
+            factor = time_step / grid.cell_size ** 3 if conversion is None else conversion(source)
+            values.append(weights * (emission_rate * factor))
             
-            # Apply emission to environment
-            apply_function(source, emission_rate)
+        if chemical_ids:
+            grid.scatter_add_parameters(list(chemical_ids), np.concatenate(parameter_indices),
+                                        np.concatenate(cell_indices), np.concatenate(values))
             
         return emission_rates
         
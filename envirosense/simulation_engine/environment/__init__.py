@@ -2,7 +2,9 @@
 # It will contain classes related to managing and representing the 3D simulated environment.
 
 from .state import Environment3DState # Example, if state.py is created
+from .grid_state import GridEnvironment3DState
 
 __all__ = [
-    "Environment3DState"
+    "Environment3DState",
+    "GridEnvironment3DState"
 ]
\ No newline at end of file
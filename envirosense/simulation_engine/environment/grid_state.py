@@ -0,0 +1,340 @@
+"""
+Defines GridEnvironment3DState, an Environment3DState whose scalar queries are
+answered from the parameter arrays of a physics SpatialGrid.
+
+Point queries are trilinearly interpolated between grid nodes. Box-shaped
+sampling volumes are averaged through a summed-area (integral volume) table
+built once per parameter per time step, so every volume average costs eight
+table lookups regardless of its size.
+"""
+
+import math
+from typing import Dict, Any, Tuple, Optional, List, TYPE_CHECKING
+
+import numpy as np
+
+from envirosense.simulation_engine.physics.space import trilinear_sample
+from envirosense.simulation_engine.physics.thermal_imaging import KELVIN_OFFSET, render_grid_view, render_profile_view
+from .state import Environment3DState
+
+if TYPE_CHECKING:
+    from envirosense.simulation_engine.physics.space import SpatialGrid
+    from envirosense.simulation_engine.physics.thermal import ThermalProfile
+
+# Edge length of the cube with the same volume as a unit-radius sphere
+SPHERE_TO_CUBE_EDGE = (4.0 * math.pi / 3.0) ** (1.0 / 3.0)
+
+
+def summed_volume_table(values: np.ndarray) -> np.ndarray:
+    """
+    Build the summed-area table of a 3D array.
+
+    Args:
+        values: Array of shape (nx, ny, nz)
+
+    Returns:
+        Array of shape (nx + 1, ny + 1, nz + 1) where entry [i, j, k] is the
+        sum of values[:i, :j, :k]
+    """
+    table = np.zeros(tuple(n + 1 for n in values.shape))
+    table[1:, 1:, 1:] = values.cumsum(axis=0).cumsum(axis=1).cumsum(axis=2)
+    return table
+
+
+def box_sums(table: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    """
+    Sum boxes of cells using a summed-area table.
+
+    Args:
+        table: Summed-area table from summed_volume_table
+        lower: Integer array of shape (N, 3) with the first cell of each box
+        upper: Integer array of shape (N, 3) with the cell past the end of each box
+
+    Returns:
+        Array of N box sums
+    """
+    x0, y0, z0 = lower.T
+    x1, y1, z1 = upper.T
+    return (table[x1, y1, z1]
+            - table[x0, y1, z1] - table[x1, y0, z1] - table[x1, y1, z0]
+            + table[x0, y0, z1] + table[x0, y1, z0] + table[x1, y0, z0]
+            - table[x0, y0, z0])
+
+
+class GridEnvironment3DState(Environment3DState):
+    """
+    Environment state backed by the parameter arrays of a SpatialGrid.
+
+    Grid node (i, j, k) sits at origin + (i, j, k) * cell_size and represents
+    the cell of that size centred on it. Temperatures are in degrees Celsius.
+    Queries for quantities the grid does not hold fall back to the
+    Environment3DState placeholders.
+
+    Thermal camera views are rendered from the grid temperature field and,
+    if given, the analytic sources of a ThermalProfile (the hotter one wins).
+
+    The state caches parameter arrays and their summed-area tables for the
+    current time step. Call advance() after the grid has been stepped.
+    """
+
+    def __init__(self,
+                 grid: 'SpatialGrid',
+                 timestamp: float,
+                 simulation_time_seconds: float,
+                 origin: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                 parameter_names: Optional[Dict[str, str]] = None,
+                 thermal_profile: Optional['ThermalProfile'] = None,
+                 thermal_absorption_per_m: float = 0.0):
+        """
+        Initializes the grid-backed environment state.
+
+        Args:
+            grid: Spatial grid holding the physical fields.
+            timestamp: Absolute timestamp of this state (e.g., Unix timestamp).
+            simulation_time_seconds: Simulation time elapsed in seconds since simulation start.
+            origin: Physical (x, y, z) position of grid node (0, 0, 0) in meters.
+            parameter_names: Optional mapping from query names (e.g., "temperature",
+                             a chemical_id or a pm_size) to grid parameter names.
+                             Unmapped query names are used as grid parameter names directly.
+            thermal_profile: Optional analytic thermal sources included in thermal camera views.
+            thermal_absorption_per_m: Infrared absorption of the air for thermal camera views;
+                                      0 renders only the grid's bounding surfaces.
+        """
+        super().__init__(timestamp, simulation_time_seconds)
+        self.grid = grid
+        self.origin = np.asarray(origin, dtype=float)
+        self.parameter_names = parameter_names if parameter_names is not None else {}
+        self.thermal_profile = thermal_profile
+        self.thermal_absorption_per_m = thermal_absorption_per_m
+
+        self._grid_parameters: Optional[set] = None
+        self._values: Dict[str, np.ndarray] = {}
+        self._tables: Dict[str, np.ndarray] = {}
+
+    def advance(self, timestamp: float, simulation_time_seconds: float) -> None:
+        """
+        Moves the state to a new time step, discarding the cached arrays and tables.
+
+        Args:
+            timestamp: Absolute timestamp of the new step.
+            simulation_time_seconds: Simulation time of the new step.
+        """
+        self.timestamp = timestamp
+        self.simulation_time_seconds = simulation_time_seconds
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discards cached parameter arrays and summed-area tables."""
+        self._grid_parameters = None
+        self._values.clear()
+        self._tables.clear()
+
+    def has_parameter(self, name: str) -> bool:
+        """
+        Whether the grid holds the parameter a query name maps to.
+
+        Args:
+            name: Query name (e.g., "temperature" or a chemical_id)
+
+        Returns:
+            True if the grid stores the mapped parameter
+        """
+        if self._grid_parameters is None:
+            self._grid_parameters = set(self.grid.get_parameter_names())
+        return self.parameter_names.get(name, name) in self._grid_parameters
+
+    def _parameter_values(self, name: str) -> np.ndarray:
+        """Get the cached array of the grid parameter a query name maps to."""
+        values = self._values.get(name)
+        if values is None:
+            values = self.grid.get_parameter_array(self.parameter_names.get(name, name))
+            self._values[name] = values
+        return values
+
+    def _parameter_table(self, name: str) -> np.ndarray:
+        """Get the cached summed-area table of the grid parameter a query name maps to."""
+        table = self._tables.get(name)
+        if table is None:
+            table = summed_volume_table(self._parameter_values(name))
+            self._tables[name] = table
+        return table
+
+    @staticmethod
+    def _half_extents(sampling_volume: Optional[Dict[str, Any]]) -> Tuple[float, float, float]:
+        """
+        Half edge lengths of the box a sampling volume averages over.
+
+        Cubes use 'size_m' (or 'size') as the edge length, either a scalar or an
+        (x, y, z) triple. Spheres use 'radius_m' (or 'radius') and are averaged
+        over the cube of equal volume. Anything else samples a single point.
+        """
+        if not sampling_volume:
+            return (0.0, 0.0, 0.0)
+        shape = sampling_volume.get("shape", "point")
+        if shape in ("cube", "box"):
+            size = sampling_volume.get("size_m", sampling_volume.get("size", 0.0))
+            if isinstance(size, (list, tuple)):
+                return tuple(0.5 * float(s) for s in size)
+            return (0.5 * float(size),) * 3
+        if shape == "sphere":
+            radius = float(sampling_volume.get("radius_m", sampling_volume.get("radius", 0.0)))
+            return (0.5 * radius * SPHERE_TO_CUBE_EDGE,) * 3
+        return (0.0, 0.0, 0.0)
+
+    def sample_parameter(self,
+                         name: str,
+                         positions: List[Tuple[float, float, float]],
+                         sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None
+                         ) -> np.ndarray:
+        """
+        Samples a grid parameter at many positions in one vectorized pass.
+
+        Positions whose sampling volume covers at least one grid node get the
+        average over the covered nodes; the rest are trilinearly interpolated.
+
+        Args:
+            name: Query name of the parameter (mapped through parameter_names).
+            positions: Physical (x, y, z) positions in meters.
+            sampling_volumes: Optional sampling volume per position.
+
+        Returns:
+            Array with one value per position.
+        """
+        if sampling_volumes is None:
+            sampling_volumes = [None] * len(positions)
+        if len(sampling_volumes) != len(positions):
+            raise ValueError("sampling_volumes must have the same length as positions.")
+        if not positions:
+            return np.empty(0)
+
+        dims = np.asarray(self.grid.dimensions)
+        coords = (np.asarray(positions, dtype=float).reshape(-1, 3) - self.origin) / self.grid.cell_size
+        half = np.array([self._half_extents(volume) for volume in sampling_volumes]) / self.grid.cell_size
+
+        # Nodes whose centres lie inside each box, clipped to the grid
+        lower = np.clip(np.ceil(coords - half - 1e-9), 0, dims).astype(int)
+        upper = np.clip(np.floor(coords + half + 1e-9) + 1, 0, dims).astype(int)
+        counts = np.prod(np.maximum(upper - lower, 0), axis=1)
+        use_box = (half > 0).any(axis=1) & (counts > 0)
+
+        result = trilinear_sample(self._parameter_values(name), coords.T)
+        if use_box.any():
+            sums = box_sums(self._parameter_table(name), lower[use_box], upper[use_box])
+            result[use_box] = sums / counts[use_box]
+        return result
+
+    # --- Query Methods for Sensors ---
+
+    def get_chemical_concentration(self,
+                                   chemical_id: str,
+                                   position: Tuple[float, float, float],
+                                   sampling_volume: Optional[Dict[str, Any]] = None
+                                   ) -> float:
+        """Gets the concentration of a chemical, averaged over the sampling volume."""
+        if not self.has_parameter(chemical_id):
+            return super().get_chemical_concentration(chemical_id, position, sampling_volume)
+        return float(self.sample_parameter(chemical_id, [position], [sampling_volume])[0])
+
+    def get_chemical_concentrations(self,
+                                    chemical_ids: List[str],
+                                    positions: List[Tuple[float, float, float]],
+                                    sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None
+                                    ) -> List[Dict[str, float]]:
+        """Gets several chemicals at many positions, one vectorized pass per chemical."""
+        placeholder = super().get_chemical_concentration
+        columns = {}
+        for chemical_id in chemical_ids:
+            if self.has_parameter(chemical_id):
+                columns[chemical_id] = self.sample_parameter(chemical_id, positions, sampling_volumes).tolist()
+            else:
+                columns[chemical_id] = [placeholder(chemical_id, position) for position in positions]
+        return [{chemical_id: columns[chemical_id][i] for chemical_id in chemical_ids}
+                for i in range(len(positions))]
+
+    def get_temperature_celsius(self,
+                                position: Tuple[float, float, float],
+                                sampling_volume: Optional[Dict[str, Any]] = None
+                                ) -> float:
+        """Gets the temperature in Celsius, averaged over the sampling volume."""
+        if not self.has_parameter("temperature"):
+            return super().get_temperature_celsius(position, sampling_volume)
+        return float(self.sample_parameter("temperature", [position], [sampling_volume])[0])
+
+    def get_temperatures_celsius(self,
+                                 positions: List[Tuple[float, float, float]],
+                                 sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None
+                                 ) -> List[float]:
+        """Gets the temperature in Celsius at many positions in one vectorized pass."""
+        if not self.has_parameter("temperature"):
+            return super().get_temperatures_celsius(positions, sampling_volumes)
+        return self.sample_parameter("temperature", positions, sampling_volumes).tolist()
+
+    def get_thermal_field_view(self,
+                               camera_position: Tuple[float, float, float],
+                               camera_orientation: Dict[str, float],
+                               fov_degrees: Tuple[float, float],
+                               resolution: Tuple[int, int]
+                               ) -> np.ndarray:
+        """
+        Renders the thermal image seen by a pinhole camera as a (height, width) array
+        in degrees Celsius. See physics.thermal_imaging for the camera conventions.
+        Thermal profile sources are drawn over the grid only where they are hotter
+        than it. Pixels that see neither the grid nor a source show the profile's
+        ambient, or the Environment3DState placeholder view without a profile.
+        """
+        has_grid = self.has_parameter("temperature")
+        if not has_grid and self.thermal_profile is None:
+            return np.asarray(super().get_thermal_field_view(camera_position, camera_orientation,
+                                                             fov_degrees, resolution), dtype=float)
+
+        image = None
+        if has_grid:
+            image = render_grid_view(self._parameter_values("temperature"), self.grid.cell_size,
+                                     camera_position, camera_orientation, fov_degrees, resolution,
+                                     origin=tuple(self.origin),
+                                     absorption_per_m=self.thermal_absorption_per_m)
+        if self.thermal_profile is not None:
+            sources = render_profile_view(self.thermal_profile, camera_position, camera_orientation,
+                                          fov_degrees, resolution)
+            image = sources if image is None else np.fmax(image, sources)
+
+        unseen = np.isnan(image)
+        if unseen.any():
+            if self.thermal_profile is not None:
+                background = self.thermal_profile.ambient_temperature - KELVIN_OFFSET
+            else:
+                background = np.asarray(super().get_thermal_field_view(camera_position, camera_orientation,
+                                                                       fov_degrees, resolution), dtype=float)
+            image = np.where(unseen, background, image)
+        return image
+
+    def get_particulate_matter_concentration(self,
+                                             pm_size: str,
+                                             position: Tuple[float, float, float],
+                                             sampling_volume: Optional[Dict[str, Any]] = None
+                                             ) -> float:
+        """Gets the concentration of a particulate matter size, averaged over the sampling volume."""
+        if not self.has_parameter(pm_size):
+            return super().get_particulate_matter_concentration(pm_size, position, sampling_volume)
+        return float(self.sample_parameter(pm_size, [position], [sampling_volume])[0])
+
+    def get_relative_humidity_percent(self,
+                                      position: Tuple[float, float, float],
+                                      sampling_volume: Optional[Dict[str, Any]] = None
+                                      ) -> float:
+        """Gets the relative humidity in percent, averaged over the sampling volume."""
+        if not self.has_parameter("relative_humidity"):
+            return super().get_relative_humidity_percent(position, sampling_volume)
+        return float(self.sample_parameter("relative_humidity", [position], [sampling_volume])[0])
+
+    def get_barometric_pressure_hpa(self,
+                                    position: Tuple[float, float, float]
+                                    ) -> float:
+        """Gets the barometric pressure in hPa at a point."""
+        if not self.has_parameter("barometric_pressure"):
+            return super().get_barometric_pressure_hpa(position)
+        return float(self.sample_parameter("barometric_pressure", [position])[0])
+
+    def __repr__(self) -> str:
+        return (f"<GridEnvironment3DState(timestamp={self.timestamp}, sim_time={self.simulation_time_seconds}s, "
+                f"grid_dimensions={tuple(self.grid.dimensions)})>")
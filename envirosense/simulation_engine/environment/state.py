@@ -66,6 +66,36 @@ class Environment3DState:
         # print(f"Querying chemical {chemical_id} at {position} (volume: {sampling_volume}) -> returning 0.0 (placeholder)")
         return 0.0 # Placeholder
 
+    def get_chemical_concentrations(self,
+                                    chemical_ids: List[str],
+                                    positions: List[Tuple[float, float, float]],
+                                    sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None
+                                    ) -> List[Dict[str, float]]:
+        """
+        Gets the concentrations of several chemicals at several positions in one call.
+        Sensors of the same type use this to share a single environment query per step.
+
+        The default implementation loops over get_chemical_concentration, so states that
+        only override the single-point query (e.g., mocks) still answer batched queries.
+
+        Args:
+            chemical_ids: Chemicals to query at every position.
+            positions: (x, y, z) positions to query.
+            sampling_volumes: Optional sampling volume per position (same length as positions).
+
+        Returns:
+            One dict per position, mapping chemical_id to its concentration.
+        """
+        if sampling_volumes is None:
+            sampling_volumes = [None] * len(positions)
+        if len(sampling_volumes) != len(positions):
+            raise ValueError("sampling_volumes must have the same length as positions.")
+        return [
+            {chemical_id: self.get_chemical_concentration(chemical_id, position, sampling_volume)
+             for chemical_id in chemical_ids}
+            for position, sampling_volume in zip(positions, sampling_volumes)
+        ]
+
     def get_temperature_celsius(self,
                                 position: Tuple[float, float, float],
                                 sampling_volume: Optional[Dict[str, Any]] = None
@@ -77,6 +107,28 @@ class Environment3DState:
         # print(f"Querying temperature at {position} -> returning 25.0 C (placeholder)")
         return 25.0 # Placeholder
 
+    def get_temperatures_celsius(self,
+                                 positions: List[Tuple[float, float, float]],
+                                 sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None
+                                 ) -> List[float]:
+        """
+        Gets the temperature in Celsius at several positions in one call.
+        The default implementation loops over get_temperature_celsius.
+
+        Args:
+            positions: (x, y, z) positions to query.
+            sampling_volumes: Optional sampling volume per position (same length as positions).
+
+        Returns:
+            One temperature per position.
+        """
+        if sampling_volumes is None:
+            sampling_volumes = [None] * len(positions)
+        if len(sampling_volumes) != len(positions):
+            raise ValueError("sampling_volumes must have the same length as positions.")
+        return [self.get_temperature_celsius(position, sampling_volume)
+                for position, sampling_volume in zip(positions, sampling_volumes)]
+
     def get_thermal_field_view(self,
                                camera_position: Tuple[float, float, float],
                                camera_orientation: Dict[str, float], # e.g., {'yaw', 'pitch', 'roll'}
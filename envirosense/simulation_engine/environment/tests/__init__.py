@@ -0,0 +1 @@
+# This file makes the 'tests' directory under 'environment' a Python package.
\ No newline at end of file
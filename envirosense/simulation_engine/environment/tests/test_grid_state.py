@@ -0,0 +1,131 @@
+import unittest
+
+import numpy as np
+
+from envirosense.simulation_engine.environment.grid_state import GridEnvironment3DState
+from envirosense.simulation_engine.environment.state import Environment3DState
+from envirosense.simulation_engine.physics.space import SpatialGrid
+from envirosense.simulation_engine.physics.thermal_imaging import render_grid_view
+
+
+class BoxThermalProfile:
+    """ThermalProfile stand-in: hot boxes over a 20 C ambient, combined as 'maximum temperature wins'."""
+
+    def __init__(self, ambient_temperature: float = 293.15):
+        self.ambient_temperature = ambient_temperature
+        self.boxes = []  # (center, half_size, temperature_k)
+
+    def calculate_temperature_at_points(self, points):
+        temperatures = np.full(len(points), self.ambient_temperature)
+        for center, half_size, temperature_k in self.boxes:
+            inside = np.all(np.abs(points - np.asarray(center)) <= half_size, axis=1)
+            temperatures[inside] = np.maximum(temperatures[inside], temperature_k)
+        return temperatures
+
+
+class TestGridEnvironment3DState(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = SpatialGrid((8, 6, 5), cell_size=0.5, storage=SpatialGrid.STORAGE_ARRAY)
+        rng = np.random.default_rng(0)
+        self.co = rng.uniform(0.0, 20.0, self.grid.dimensions)
+        self.grid.set_parameter_array("CO", self.co)
+        x, y, z = np.meshgrid(*(np.arange(n) * 0.5 for n in self.grid.dimensions), indexing="ij")
+        self.grid.set_parameter_array("temperature", 20.0 + 2.0 * x - y + 0.5 * z)
+        self.state = GridEnvironment3DState(self.grid, timestamp=0.0, simulation_time_seconds=0.0,
+                                            origin=(1.0, 0.0, 0.0))
+
+    def test_point_query_interpolates_trilinearly(self):
+        """A linear field is reproduced exactly between grid nodes."""
+        position = (1.0 + 1.3, 0.7, 1.1)
+        expected = 20.0 + 2.0 * 1.3 - 0.7 + 0.5 * 1.1
+        self.assertAlmostEqual(self.state.get_temperature_celsius(position), expected, places=9)
+
+    def test_box_average_matches_direct_mean(self):
+        """Cube sampling volumes average every grid node inside the cube."""
+        volume = {"shape": "cube", "size_m": 1.6}
+        position = (1.0 + 1.4, 1.1, 0.9)
+        # Nodes within +/-0.8 m of the centre: x 0.6..2.2 -> 2..4, y 0.3..1.9 -> 1..3, z 0.1..1.7 -> 1..3
+        expected = self.co[2:5, 1:4, 1:4].mean()
+        self.assertAlmostEqual(self.state.get_chemical_concentration("CO", position, volume), expected, places=9)
+
+    def test_batched_query_matches_single_queries(self):
+        positions = [(1.5, 0.5, 0.5), (3.0, 2.0, 1.0), (4.2, 1.3, 1.9)]
+        volumes = [None, {"shape": "cube", "size_m": 1.0}, {"shape": "sphere", "radius_m": 0.6}]
+        batch = self.state.get_chemical_concentrations(["CO", "NO2"], positions, volumes)
+        for result, position, volume in zip(batch, positions, volumes):
+            self.assertAlmostEqual(result["CO"], self.state.get_chemical_concentration("CO", position, volume))
+            self.assertEqual(result["NO2"], 0.0)
+
+    def test_missing_parameter_falls_back_to_placeholder(self):
+        self.assertEqual(self.state.get_relative_humidity_percent((1.0, 1.0, 1.0)),
+                         Environment3DState(0.0, 0.0).get_relative_humidity_percent((1.0, 1.0, 1.0)))
+
+    def test_advance_refreshes_cached_tables(self):
+        volume = {"shape": "cube", "size_m": 1.0}
+        self.state.get_chemical_concentration("CO", (2.0, 1.0, 1.0), volume)
+        self.grid.set_parameter_array("CO", self.co + 5.0)
+        self.state.advance(timestamp=1.0, simulation_time_seconds=1.0)
+        self.assertAlmostEqual(self.state.get_chemical_concentration("CO", (2.0, 1.0, 1.0), volume),
+                               self.co[1:4, 1:4, 1:4].mean() + 5.0, places=9)
+
+    def test_thermal_view_sees_far_wall(self):
+        """Without absorption each pixel shows the temperature where its ray leaves the grid."""
+        values = np.full(self.grid.dimensions, 20.0)
+        values[-1, :, :] = 60.0  # Far wall along +x
+        self.grid.set_parameter_array("temperature", values)
+        self.state.advance(timestamp=1.0, simulation_time_seconds=1.0)
+        image = self.state.get_thermal_field_view(camera_position=(1.1, 1.25, 1.0),
+                                                  camera_orientation={"yaw": 0.0, "pitch": 0.0, "roll": 0.0},
+                                                  fov_degrees=(20.0, 20.0), resolution=(4, 3))
+        self.assertIsInstance(image, np.ndarray)
+        self.assertEqual(image.shape, (3, 4))
+        np.testing.assert_allclose(image, 60.0)
+
+    def test_thermal_view_absorption_mixes_in_air(self):
+        values = np.full(self.grid.dimensions, 20.0)
+        values[-1, :, :] = 60.0
+        self.grid.set_parameter_array("temperature", values)
+        state = GridEnvironment3DState(self.grid, timestamp=0.0, simulation_time_seconds=0.0,
+                                       origin=(1.0, 0.0, 0.0), thermal_absorption_per_m=1.0)
+        image = state.get_thermal_field_view((1.1, 1.25, 1.0), {"yaw": 0.0}, (20.0, 20.0), (4, 3))
+        self.assertTrue(np.all(image > 20.0) and np.all(image < 60.0))
+
+    def test_thermal_view_from_outside_grid(self):
+        """From outside the grid rays see the face they enter through; rays that miss it see the background."""
+        grid = SpatialGrid((10, 10, 10), cell_size=1.0, storage=SpatialGrid.STORAGE_ARRAY)
+        values = np.full(grid.dimensions, 20.0)
+        values[0, :, :] = 50.0  # Near face at x = 0
+        grid.set_parameter_array("temperature", values)
+        camera = ((-5.0, 4.5, 4.5), {"yaw": 0.0}, (120.0, 120.0), (6, 6))
+
+        for absorption_per_m in (0.0, 1.0):
+            rendered = render_grid_view(values, 1.0, *camera, absorption_per_m=absorption_per_m)
+            np.testing.assert_allclose(rendered[2:4, 2:4], 50.0)
+            self.assertTrue(np.isnan(rendered[0, :]).all() and np.isnan(rendered[:, -1]).all())
+
+        image = GridEnvironment3DState(grid, 0.0, 0.0).get_thermal_field_view(*camera)
+        np.testing.assert_allclose(image[2:4, 2:4], 50.0)
+        np.testing.assert_allclose(image[np.isnan(rendered)], 25.0)  # Environment3DState placeholder
+
+    def test_thermal_profile_does_not_paint_ambient_over_cold_grid(self):
+        """Profile sources only show where they are hotter than the grid behind them."""
+        x, y, z = np.meshgrid(*(np.arange(n) * 0.5 for n in self.grid.dimensions), indexing="ij")
+        self.grid.set_parameter_array("temperature", 5.0 + 2.0 * x)  # 5-12 C, colder than the 20 C ambient
+        camera = ((1.1, 1.25, 1.0), {"yaw": 0.0}, (60.0, 40.0), (8, 6))
+        grid_only = GridEnvironment3DState(self.grid, 0.0, 0.0, origin=(1.0, 0.0, 0.0)).get_thermal_field_view(*camera)
+
+        profile = BoxThermalProfile()
+        state = GridEnvironment3DState(self.grid, 0.0, 0.0, origin=(1.0, 0.0, 0.0), thermal_profile=profile)
+        np.testing.assert_allclose(state.get_thermal_field_view(*camera), grid_only)
+
+        profile.boxes.append(((2.5, 1.25, 1.0), 0.3, 313.15))
+        image = state.get_thermal_field_view(*camera)
+        hot = image > grid_only
+        self.assertTrue(hot[2:4, 3:5].all())  # Pixels looking straight at the rack
+        np.testing.assert_allclose(image[~hot], grid_only[~hot])
+        self.assertLess(hot.sum(), image.size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,6 +16,9 @@ import datetime # For timestamps in Avro records
 import fastavro # For Avro serialization
 import numbers # For type checking
 import math # For math operations like sqrt, isclose
+import pickle # For shipping guardian/orchestrator templates to worker processes
+import random # For seeding per-scenario runs
+from concurrent.futures import ProcessPoolExecutor
 
 # Assuming VirtualGridGuardian will be imported
 # from envirosense.simulation_engine.sensors import VirtualGridGuardian
@@ -35,6 +38,114 @@ MLS_SCHEMA_NAME = "com.envirosense.schema.ml.MLDataSample"
 SD_SCHEMA_NAME = "com.envirosense.schema.scenario.ScenarioDefinition"
 SRP_SCHEMA_NAME = "com.envirosense.schema.scenario.ScenarioRunPackage"
 
+# Pickled grid guardian and environment orchestrator a pool worker copies for every scenario
+_worker_templates: Dict[str, bytes] = {}
+
+
+def scenario_seed(base_seed: int, scenario_index: int) -> int:
+    """
+    Derives the seed for the scenario at a given position in a generation run.
+    The seed depends only on the base seed and the position, never on which
+    worker runs the scenario.
+    """
+    return int(np.random.SeedSequence([base_seed, scenario_index]).generate_state(1)[0])
+
+
+def _seed_global_generators(seed: int) -> None:
+    """Seeds the global generators used by sensors and scenarios (random and np.random)."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _collect_scenario_samples(scenario_instance: BaseScenario,
+                              grid_guardian: Any,
+                              environment_orchestrator: Any,
+                              time_step_seconds: float,
+                              max_samples: int,
+                              label_extractor: Optional[Callable[[Dict[str, Any]], str]] = None,
+                              target_label_value: Optional[str] = None,
+                              target_count: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Runs one scenario and returns its raw samples in time order.
+
+    Args:
+        scenario_instance: Scenario to run; setup_environment is called first.
+        grid_guardian: VirtualGridGuardian producing the readings and labels.
+        environment_orchestrator: Orchestrator evolving the 3D environment.
+        time_step_seconds: Simulation time step.
+        max_samples: Maximum number of samples to generate.
+        label_extractor: Optional function adding 'extracted_class_label' to each sample.
+        target_label_value: With label_extractor, stop once target_count samples carry this label.
+        target_count: Number of target-label samples after which to stop.
+
+    Returns:
+        List of raw_sample dicts (see MLDataGenerator).
+    """
+    scenario_instance.setup_environment(environment_orchestrator)
+    samples: List[Dict[str, Any]] = []
+    target_found = 0
+    while len(samples) < max_samples and \
+          (target_count is None or target_found < target_count) and \
+          not scenario_instance.is_completed(environment_orchestrator.get_current_state()):
+        scenario_instance.update(time_step_seconds, environment_orchestrator)
+        environment_orchestrator.update(time_step_seconds)
+        current_env_state = environment_orchestrator.get_current_state()
+
+        # Upstream Contract: (Same as in MLDataGenerator.generate_training_dataset)
+        sensor_readings, full_labels = grid_guardian.generate_training_sample(
+            current_env_state,
+            scenario_labels=scenario_instance.get_ground_truth_labels(current_env_state)
+        )
+        sample_data = {
+            "timestamp_scenario_seconds": scenario_instance.current_time_seconds,
+            "scenario_id": scenario_instance.scenario_id,
+            "sensor_readings": sensor_readings,
+            "labels": full_labels
+        }
+        if label_extractor is not None:
+            sample_data["extracted_class_label"] = label_extractor(full_labels)
+            if sample_data["extracted_class_label"] == target_label_value:
+                target_found += 1
+        samples.append(sample_data)
+    return samples
+
+
+def _init_scenario_worker(grid_guardian_bytes: bytes, environment_orchestrator_bytes: bytes) -> None:
+    """
+    Pool initializer storing the pickled guardian and orchestrator templates.
+
+    Args:
+        grid_guardian_bytes: Pickled VirtualGridGuardian
+        environment_orchestrator_bytes: Pickled environment orchestrator
+    """
+    global _worker_templates
+    _worker_templates = {"grid_guardian": grid_guardian_bytes,
+                         "environment_orchestrator": environment_orchestrator_bytes}
+
+
+def _run_scenario_task(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Runs one scenario in a pool worker, on fresh copies of the guardian and
+    orchestrator templates and with the task's seed.
+
+    Args:
+        task: Dict with 'scenario_definition' (ScenarioDefinition dict), 'seed',
+              'time_step_seconds' and 'max_samples', plus the optional
+              label_extractor/target_label_value/target_count of _collect_scenario_samples
+
+    Returns:
+        The scenario's raw samples.
+    """
+    scenario_instance = BaseScenario.from_scenario_definition_dict(task["scenario_definition"])
+    grid_guardian = pickle.loads(_worker_templates["grid_guardian"])
+    environment_orchestrator = pickle.loads(_worker_templates["environment_orchestrator"])
+    _seed_global_generators(task["seed"])
+    return _collect_scenario_samples(scenario_instance, grid_guardian, environment_orchestrator,
+                                     task["time_step_seconds"], task["max_samples"],
+                                     label_extractor=task.get("label_extractor"),
+                                     target_label_value=task.get("target_label_value"),
+                                     target_count=task.get("target_count"))
+
 
 class MLDataGenerator:
     """
@@ -167,10 +278,25 @@ class MLDataGenerator:
                                   output_format: str = "list_of_dicts", # "dataframe_csv", "dataframe_parquet", "hdf5", "avro"
                                   dataset_name: Optional[str] = None,
                                   imperfection_settings: Optional[Dict[str, Any]] = None,
-                                  time_step_seconds: Optional[float] = None
+                                  time_step_seconds: Optional[float] = None,
+                                  num_workers: Optional[int] = None,
+                                  seed: Optional[int] = None
                                  ) -> Any: # Return type depends on output_format (e.g., path, list, DataFrame)
         """
         Generates a training dataset by running specified scenarios.
+
+        By default the scenarios run one after another in this process, sharing
+        self.grid_guardian and self.environment_orchestrator. With num_workers set,
+        each scenario is shipped as its ScenarioDefinition dict to a worker process
+        and run on its own copy of the guardian and orchestrator as they are at call
+        time (both must be picklable), and the outputs are merged in scenario order.
+        Sensor state therefore does not carry over from one scenario to the next.
+
+        Args:
+            num_workers: Number of worker processes for parallel generation; None runs sequentially.
+            seed: Base seed. Scenario i is run with scenario_seed(seed, i), so parallel runs
+                  produce the same samples for any num_workers. Parallel runs draw a
+                  random base seed (and print it) when None.
         """
         current_time_step = time_step_seconds if time_step_seconds is not None else self.default_time_step_seconds
         all_generated_samples: List[Dict[str, Any]] = [] 
@@ -183,46 +309,37 @@ class MLDataGenerator:
             raise ValueError("samples_per_scenario must be an int or a list matching the length of scenarios.")
 
         print(f"Starting dataset generation for {len(scenarios)} scenarios...")
-
-        for i, scenario_instance in enumerate(scenarios):
-            target_samples = num_samples_list[i]
-            print(f"  Running scenario: {scenario_instance.scenario_id} ({scenario_instance.name}) for {target_samples} samples...")
-            
-            scenario_instance.setup_environment(self.environment_orchestrator)
-            
-            # TODO: Apply imperfection_settings to self.grid_guardian sensors
-
-            generated_count = 0
-            # Assuming get_current_state() exists on environment_orchestrator
-            while generated_count < target_samples and not scenario_instance.is_completed(self.environment_orchestrator.get_current_state()): 
-                scenario_instance.update(current_time_step, self.environment_orchestrator)
-                self.environment_orchestrator.update(current_time_step) 
-                current_env_state = self.environment_orchestrator.get_current_state()
+        # TODO: Apply imperfection_settings to self.grid_guardian sensors
+
+        if num_workers is not None:
+            base_seed = self._resolve_base_seed(seed)
+            tasks = [{
+                "scenario_definition": scenario_instance.to_scenario_definition_dict(),
+                "seed": scenario_seed(base_seed, i),
+                "time_step_seconds": current_time_step,
+                "max_samples": num_samples_list[i]
+            } for i, scenario_instance in enumerate(scenarios)]
+            for scenario_instance, scenario_samples in zip(scenarios, self._run_scenario_tasks(tasks, num_workers)):
+                print(f"  Finished scenario: {scenario_instance.scenario_id}. Generated {len(scenario_samples)} samples.")
+                all_generated_samples.extend(scenario_samples)
+        else:
+            for i, scenario_instance in enumerate(scenarios):
+                target_samples = num_samples_list[i]
+                print(f"  Running scenario: {scenario_instance.scenario_id} ({scenario_instance.name}) for {target_samples} samples...")
+                if seed is not None:
+                    _seed_global_generators(scenario_seed(seed, i))
 
                 # Upstream Contract:
                 # - sensor_readings: Dict[str, Dict[str, Any]] from VirtualGridGuardian,
                 #   where each inner dict MUST conform to its specific Avro sensor schema.
-                # - scenario_and_sensor_labels: Dict[str, Any] from VirtualGridGuardian,
+                # - labels: Dict[str, Any] from VirtualGridGuardian,
                 #   which incorporates BaseScenario.get_ground_truth_labels() and MUST
                 #   contain keys mappable to GroundTruthLabels.avsc fields.
-                sensor_readings, scenario_and_sensor_labels = self.grid_guardian.generate_training_sample(
-                    current_env_state,
-                    scenario_labels=scenario_instance.get_ground_truth_labels(current_env_state)
-                )
-                
-                # This is the raw internal format
-                all_generated_samples.append({
-                    "timestamp_scenario_seconds": scenario_instance.current_time_seconds,
-                    "scenario_id": scenario_instance.scenario_id,
-                    "sensor_readings": sensor_readings, # This is a dict from VirtualGridGuardian
-                    "labels": scenario_and_sensor_labels # This is also a dict
-                })
-                generated_count += 1
-
-                if generated_count % 100 == 0: 
-                    print(f"    Generated {generated_count}/{target_samples} samples for {scenario_instance.scenario_id}...")
-            
-            print(f"  Finished scenario: {scenario_instance.scenario_id}. Generated {generated_count} samples.")
+                scenario_samples = _collect_scenario_samples(scenario_instance, self.grid_guardian,
+                                                             self.environment_orchestrator,
+                                                             current_time_step, target_samples)
+                all_generated_samples.extend(scenario_samples)
+                print(f"  Finished scenario: {scenario_instance.scenario_id}. Generated {len(scenario_samples)} samples.")
 
         print(f"Total samples generated: {len(all_generated_samples)}")
         
@@ -232,6 +349,34 @@ class MLDataGenerator:
 
         return self._export_data(all_generated_samples, output_format, dataset_name)
 
+    def _resolve_base_seed(self, seed: Optional[int]) -> int:
+        """Returns the base seed of a parallel run, drawing (and printing) a fresh one if None."""
+        if seed is not None:
+            return seed
+        base_seed = int(np.random.SeedSequence().entropy)
+        print(f"Using base seed {base_seed} for parallel scenario runs.")
+        return base_seed
+
+    def _run_scenario_tasks(self, tasks: List[Dict[str, Any]], num_workers: int) -> List[List[Dict[str, Any]]]:
+        """
+        Runs scenario tasks (see _run_scenario_task) in a process pool.
+
+        Args:
+            tasks: One task per scenario.
+            num_workers: Maximum number of worker processes.
+
+        Returns:
+            Each task's raw samples, in task order.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1.")
+        if not tasks:
+            return []
+        initargs = (pickle.dumps(self.grid_guardian), pickle.dumps(self.environment_orchestrator))
+        with ProcessPoolExecutor(max_workers=min(num_workers, len(tasks)),
+                                 initializer=_init_scenario_worker, initargs=initargs) as executor:
+            return list(executor.map(_run_scenario_task, tasks))
+
     def _validate_generated_data(self, data: List[Dict[str, Any]]) -> List[str]:
         """
         Performs comprehensive validation on the list of generated `raw_sample` dictionaries.
@@ -935,10 +1080,18 @@ class MLDataGenerator:
                                   dataset_name: Optional[str] = None,
                                   imperfection_settings: Optional[Dict[str, Any]] = None,
                                   time_step_seconds: Optional[float] = None,
-                                  max_samples_per_scenario_run: int = 10000
+                                  max_samples_per_scenario_run: int = 10000,
+                                  num_workers: Optional[int] = None,
+                                  seed: Optional[int] = None
                                  ) -> Any:
         """
         Generates a dataset attempting to balance classes based on specified labels.
+
+        With num_workers set, every scenario run happens in a worker process, as in
+        generate_training_dataset; label_extractor must then be picklable (e.g., a
+        module-level function). Each run stops once it has produced enough samples of
+        its target class to fill that class on its own, and the runs are then merged
+        in config order, applying the class quotas as the sequential loop does.
         """
         current_time_step = time_step_seconds if time_step_seconds is not None else self.default_time_step_seconds
         
@@ -956,7 +1109,24 @@ class MLDataGenerator:
 
         print(f"Starting balanced dataset generation. Targets: {samples_needed_by_class}")
 
-        for config_idx, config_item in enumerate(scenarios_and_configs):
+        sequential_configs = scenarios_and_configs
+        if num_workers is not None:
+            base_seed = self._resolve_base_seed(seed)
+            tasks = [{
+                "scenario_definition": config_item["scenario"].to_scenario_definition_dict(),
+                "seed": scenario_seed(base_seed, config_idx),
+                "time_step_seconds": current_time_step,
+                "max_samples": max_samples_per_scenario_run,
+                "label_extractor": label_extractor,
+                "target_label_value": config_item["target_label_value"],
+                "target_count": samples_needed_by_class[config_item["target_label_value"]]
+            } for config_idx, config_item in enumerate(scenarios_and_configs)]
+            runs = self._run_scenario_tasks(tasks, num_workers)
+            for config_item, run_samples in zip(scenarios_and_configs, runs):
+                self._merge_balanced_run(config_item, run_samples, collected_samples_by_class, samples_needed_by_class)
+            sequential_configs = []
+
+        for config_idx, config_item in enumerate(sequential_configs):
             scenario_instance = config_item["scenario"]
             target_label_key = config_item["target_label_key"]
             target_label_value = config_item["target_label_value"] 
@@ -966,6 +1136,8 @@ class MLDataGenerator:
                 continue
 
             print(f"  Running scenario for balancing: {scenario_instance.scenario_id} (targets {target_label_key}=='{target_label_value}')")
+            if seed is not None:
+                _seed_global_generators(scenario_seed(seed, config_idx))
             scenario_instance.setup_environment(self.environment_orchestrator)
             # TODO: Apply imperfection_settings
 
@@ -1032,6 +1204,34 @@ class MLDataGenerator:
 
         return self._export_data(all_balanced_samples, output_format, dataset_name)
 
+    def _merge_balanced_run(self,
+                            config_item: Dict[str, Any],
+                            run_samples: List[Dict[str, Any]],
+                            collected_samples_by_class: Dict[str, List[Dict[str, Any]]],
+                            samples_needed_by_class: Dict[str, int]) -> None:
+        """
+        Adds the samples of one parallel balancing run to collected_samples_by_class,
+        keeping the samples the sequential loop would have kept from the same stream.
+        """
+        target_label_value = config_item["target_label_value"]
+        scenario_id = config_item["scenario"].scenario_id
+        if len(collected_samples_by_class.get(target_label_value, [])) >= samples_needed_by_class.get(target_label_value, 0):
+            print(f"  Already have enough samples for '{target_label_value}'. Skipping scenario {scenario_id}.")
+            return
+
+        used = 0
+        for sample_data in run_samples:
+            if len(collected_samples_by_class.get(target_label_value, [])) >= samples_needed_by_class.get(target_label_value, 0):
+                break
+            used += 1
+            extracted_class_label = sample_data["extracted_class_label"]
+            if extracted_class_label in samples_needed_by_class and \
+               len(collected_samples_by_class.get(extracted_class_label, [])) < samples_needed_by_class[extracted_class_label]:
+                collected_samples_by_class.setdefault(extracted_class_label, []).append(sample_data)
+
+        current_counts_str = {k: len(v) for k,v in collected_samples_by_class.items()}
+        print(f"  Finished scenario run for {scenario_id}. Used {used} of {len(run_samples)} samples. Class counts: {current_counts_str}")
+
     def generate_edge_cases(self,
                             base_scenarios: List[BaseScenario],
                             modification_strategies: List[Callable[[BaseScenario], BaseScenario]], # Functions that modify a scenario
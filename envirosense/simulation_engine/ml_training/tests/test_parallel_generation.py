@@ -0,0 +1,119 @@
+import unittest
+import tempfile
+
+from envirosense.simulation_engine.ml_training.data_generator import MLDataGenerator, MLS_SCHEMA_NAME, scenario_seed
+from envirosense.simulation_engine.scenarios.base import BaseScenario
+from envirosense.simulation_engine.sensors.config import SensorConfiguration, IndividualSensorConfig
+from envirosense.simulation_engine.sensors.grid_guardian import VirtualGridGuardian
+from envirosense.simulation_engine.environment.mock_utils import create_mock_environment_state
+
+# Scenarios, orchestrators and label extractors must live at module level so
+# worker processes can unpickle / re-import them.
+
+class LeakScenario(BaseScenario):
+    """Raises the CO level by leak_rate_ppb every second; labels samples 'LEAK' once above 20 ppb."""
+
+    def __init__(self, *args, leak_rate_ppb: float = 1.0, duration_seconds: float = 30.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.leak_rate_ppb = leak_rate_ppb
+        self.duration_seconds = duration_seconds
+
+    def _get_specific_params(self):
+        return {"leak_rate_ppb": self.leak_rate_ppb, "duration_seconds": self.duration_seconds}
+
+    def setup_environment(self, environment_3d_orchestrator):
+        environment_3d_orchestrator.reset()
+
+    def get_ground_truth_labels(self, environment_3d_state):
+        co = environment_3d_state.get_chemical_concentration("CO", (0, 0, 0), None)
+        return {"event_type": "LEAK" if co > 20.0 else "NORMAL"}
+
+    def update(self, time_step_seconds, environment_3d_orchestrator):
+        self.current_time_seconds += time_step_seconds
+        environment_3d_orchestrator.co_ppb += self.leak_rate_ppb * time_step_seconds
+
+    def is_completed(self, environment_3d_state):
+        return self.current_time_seconds >= self.duration_seconds
+
+
+class SimpleOrchestrator:
+    """Uniform environment whose CO level is driven by the scenario."""
+
+    def __init__(self):
+        self.co_ppb = 0.0
+        self.simulation_time_seconds = 0.0
+
+    def reset(self):
+        self.co_ppb = 0.0
+        self.simulation_time_seconds = 0.0
+
+    def update(self, time_step_seconds):
+        self.simulation_time_seconds += time_step_seconds
+
+    def get_current_state(self):
+        return create_mock_environment_state(timestamp=0.0,
+                                             simulation_time_seconds=self.simulation_time_seconds,
+                                             chemical_concentrations={"CO": self.co_ppb})
+
+
+def event_type_label(labels):
+    return labels["event_type"]
+
+
+class TestParallelGeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        config = SensorConfiguration(guardian_id="GG-Parallel", sensors=[
+            IndividualSensorConfig(sensor_type="voc_array", sensor_id="voc_1",
+                                   specific_params={"channels": ["CO"]})
+        ])
+        self.generator = MLDataGenerator(
+            grid_guardian=VirtualGridGuardian(guardian_id="GG-Parallel", config=config),
+            environment_orchestrator=SimpleOrchestrator(),
+            default_output_dir=self.output_dir.name,
+            _parsed_schemas_for_testing={MLS_SCHEMA_NAME: {"type": "record", "name": "MLDataSample", "fields": []}}
+        )
+        self.scenarios = [LeakScenario(f"leak_{i}", f"Leak {i}", "CO leak", leak_rate_ppb=1.0 + i, duration_seconds=12.0)
+                          for i in range(3)]
+
+    def tearDown(self):
+        self.output_dir.cleanup()
+
+    def _readings(self, samples):
+        return [(s["scenario_id"], s["timestamp_scenario_seconds"], s["sensor_readings"]) for s in samples]
+
+    def test_scenario_seed_is_deterministic(self):
+        self.assertEqual(scenario_seed(7, 3), scenario_seed(7, 3))
+        self.assertNotEqual(scenario_seed(7, 3), scenario_seed(7, 4))
+        self.assertNotEqual(scenario_seed(7, 3), scenario_seed(8, 3))
+
+    def test_parallel_output_independent_of_worker_count(self):
+        one_worker = self.generator.generate_training_dataset(self.scenarios, [5, 8, 20], num_workers=1, seed=42)
+        two_workers = self.generator.generate_training_dataset(self.scenarios, [5, 8, 20], num_workers=2, seed=42)
+
+        self.assertEqual([s["scenario_id"] for s in one_worker], ["leak_0"] * 5 + ["leak_1"] * 8 + ["leak_2"] * 12)
+        self.assertEqual(self._readings(one_worker), self._readings(two_workers))
+        self.assertEqual([s["labels"] for s in one_worker], [s["labels"] for s in two_workers])
+
+    def test_balanced_parallel_output_independent_of_worker_count(self):
+        for scenario in self.scenarios:
+            scenario.duration_seconds = 40.0
+        configs = [{"scenario": scenario, "target_label_key": "event_type", "target_label_value": target, "samples_needed": needed}
+                   for scenario, target, needed in zip(self.scenarios, ["NORMAL", "LEAK", "LEAK"], [10, 8, 7])]
+
+        one_worker = self.generator.generate_balanced_dataset(configs, event_type_label, num_workers=1, seed=3)
+        two_workers = self.generator.generate_balanced_dataset(configs, event_type_label, num_workers=2, seed=3)
+
+        self.assertEqual(self._readings(one_worker), self._readings(two_workers))
+        self.assertEqual([s["extracted_class_label"] for s in one_worker], ["NORMAL"] * 10 + ["LEAK"] * 15)
+        # leak_0 fills NORMAL on its own; the LEAK quota is met from leak_1 before leak_2 is needed
+        self.assertEqual({s["scenario_id"] for s in one_worker}, {"leak_0", "leak_1"})
+
+    def test_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            self.generator.generate_training_dataset(self.scenarios, 5, num_workers=0, seed=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,10 +20,11 @@ from scipy import signal
 import matplotlib.pyplot as plt
 from matplotlib import cm
 import time
-from typing import Tuple, List, Dict, Optional, Union, Any
+from typing import Tuple, List, Dict, Optional, Union, Any, Iterator
 from abc import ABC, abstractmethod
 
-from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.coordinates import Vector3D, as_points
+from envirosense.core.physics.spectral_synthesis import SYNTHESIS_AUTO, synthesize_tones, add_periodic_events
 
 # Constants
 SPEED_OF_SOUND = 343.0  # Speed of sound in air at 20°C (m/s)
@@ -39,6 +40,7 @@ class AcousticSource(ABC):
         enabled (bool): Whether the source is currently active
         sound_power (float): Sound power in watts
         sample_rate (int): Sample rate for audio generation in Hz
+        synthesis_method (str): How line spectra are synthesized ('direct', 'ifft' or 'auto')
     """
     
     def __init__(self, name: str,
@@ -59,6 +61,7 @@ class AcousticSource(ABC):
         self.enabled = True
         self.sound_power = max(0.0, sound_power)
         self.sample_rate = sample_rate
+        self.synthesis_method = SYNTHESIS_AUTO
     
     @abstractmethod
     def generate_spectrum(self, freq_range: Tuple[float, float, int]) -> Tuple[np.ndarray, np.ndarray]:
@@ -86,6 +89,96 @@ class AcousticSource(ABC):
         """
         pass
     
+    def stream_time_signal(self, block_size: int,
+                           num_blocks: Optional[int] = None,
+                           start_time: float = 0.0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate the time-domain signal as a stream of fixed-size blocks.
+        
+        Consecutive blocks continue one signal: tone phases, modulations,
+        filter state and pulse tails carry across block boundaries, and only
+        the current block is held in memory. Unlike generate_time_signal,
+        blocks are not normalized, since the peak of an unbounded stream is
+        not known in advance. Disabled sources stream silence.
+        
+        Args:
+            block_size: Samples per block
+            num_blocks: Number of blocks to yield, or None for an endless stream
+            start_time: Time of the first sample in seconds
+            
+        Yields:
+            Tuples of (time_points, amplitude_values) arrays of ``block_size`` samples
+        """
+        if block_size < 1:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        
+        sample_spacing = 1.0 / self.sample_rate
+        state = self._start_signal()
+        
+        first_sample = int(round(start_time * self.sample_rate))
+        block = 0
+        while num_blocks is None or block < num_blocks:
+            time_points = (first_sample + np.arange(block_size)) * sample_spacing
+            if self.enabled:
+                signal_values = self._render_signal(time_points, sample_spacing, state)
+            else:
+                signal_values = np.zeros(block_size)
+            yield time_points, signal_values
+            first_sample += block_size
+            block += 1
+    
+    def _start_signal(self) -> Dict[str, Any]:
+        """
+        Create the state of a new signal, such as its line spectrum and filter state.
+        
+        Sources that support streaming override this together with
+        _render_signal.
+        
+        Returns:
+            Dictionary of signal state passed to _render_signal
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support signal streaming")
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the unnormalized signal at a block of uniformly spaced time points.
+        
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
+            
+        Returns:
+            Array of signal values
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support signal streaming")
+    
+    def _generate_signal(self, duration: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Render a whole signal as a single block, normalized to a peak of 1.
+        
+        Args:
+            duration: Signal duration in seconds
+            
+        Returns:
+            Tuple of (time_points, amplitude_values)
+        """
+        # Create time array
+        time_points = np.linspace(0, duration, int(duration * self.sample_rate))
+        if not self.enabled:
+            # Return silence
+            return time_points, np.zeros_like(time_points)
+        
+        sample_spacing = duration / max(len(time_points) - 1, 1)
+        signal_values = self._render_signal(time_points, sample_spacing, self._start_signal())
+        
+        # Normalize
+        if len(signal_values) and np.max(np.abs(signal_values)) > 0:
+            signal_values /= np.max(np.abs(signal_values))
+        
+        return time_points, signal_values
+    
     def calculate_spl_at(self, position: Tuple[float, float, float]) -> float:
         """
         Calculate sound pressure level (SPL) at a specified position.
@@ -96,16 +189,27 @@ class AcousticSource(ABC):
         Returns:
             Sound pressure level in dB
         """
+        return float(self.calculate_spl_at_points(as_points(position))[0])
+    
+    def calculate_spl_at_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate sound pressure level (SPL) at a batch of positions.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Array of shape (N,) with sound pressure levels in dB
+        """
+        points = as_points(points)
         if not self.enabled or self.sound_power <= 0:
-            return 0.0
+            return np.zeros(len(points))
         
         # Calculate distance from source to position
-        pos = Vector3D(*position)
-        distance = (pos - self.position).magnitude()
+        distance = np.linalg.norm(points - np.array(self.position.to_tuple()), axis=1)
         
         # Avoid division by zero
-        if distance < 0.1:
-            distance = 0.1
+        distance = np.maximum(distance, 0.1)
             
         # Calculate sound pressure level using the inverse square law
         # SPL = SWL - 20*log10(r) - 11
@@ -118,7 +222,7 @@ class AcousticSource(ABC):
         # Calculate SPL at the given position
         spl = swl - 20 * np.log10(distance) - 11
         
-        return max(0, spl)  # Ensure non-negative SPL
+        return np.maximum(0, spl)  # Ensure non-negative SPL
     
     @property
     @abstractmethod
@@ -367,20 +471,37 @@ class TransformerSound(AcousticSource):
         Returns:
             Tuple of (time_points, amplitude_values)
         """
-        if not self.enabled:
-            # Return silence
-            time_points = np.linspace(0, duration, int(duration * self.sample_rate))
-            return time_points, np.zeros_like(time_points)
+        return self._generate_signal(duration)
+    
+    def _start_signal(self) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: the harmonic frequencies and amplitudes.
         
-        # Create time array
-        time_points = np.linspace(0, duration, int(duration * self.sample_rate))
-        signal_values = np.zeros_like(time_points)
+        Returns:
+            Dictionary of signal state
+        """
+        harmonics = np.array(list(self._harmonic_profile.items()), dtype=float).reshape(-1, 2)
+        return {
+            'frequencies': harmonics[:, 0] * self.fundamental_freq,
+            'amplitudes': harmonics[:, 1]
+        }
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the unnormalized transformer sound at a block of time points.
         
-        # Add harmonics
-        for harmonic, amplitude in self._harmonic_profile.items():
-            harmonic_freq = harmonic * self.fundamental_freq
-            # Add sine wave for each harmonic
-            signal_values += amplitude * np.sin(2 * np.pi * harmonic_freq * time_points)
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal
+            
+        Returns:
+            Array of signal values
+        """
+        # Add a sine wave for each harmonic
+        signal_values = synthesize_tones(time_points, state['frequencies'], state['amplitudes'],
+                                         method=self.synthesis_method)
         
         # Add some noise based on condition
         noise_level = 0.01
@@ -407,11 +528,7 @@ class TransformerSound(AcousticSource):
         # Scale by load factor
         signal_values *= (0.4 + 0.6 * self.load_factor)
         
-        # Normalize
-        if np.max(np.abs(signal_values)) > 0:
-            signal_values /= np.max(np.abs(signal_values))
-        
-        return time_points, signal_values
+        return signal_values
 
 
 class SwitchSound(AcousticSource):
@@ -615,39 +732,61 @@ class SwitchSound(AcousticSource):
         Returns:
             Tuple of (time_points, amplitude_values)
         """
-        if not self.enabled:
-            # Return silence
-            time_points = np.linspace(0, duration, int(duration * self.sample_rate))
-            return time_points, np.zeros_like(time_points)
+        return self._generate_signal(duration)
+    
+    def _start_signal(self) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: the time of the pending transition impact.
         
-        # Create time array
-        time_points = np.linspace(0, duration, int(duration * self.sample_rate))
+        Returns:
+            Dictionary of signal state
+        """
+        return {'impact_time': None}
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the unnormalized switch sound at a block of time points.
+        
+        A transition impact sounds 20 ms after the first block rendered in
+        the transitioning state and rings on into the following blocks.
+        
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
+            
+        Returns:
+            Array of signal values
+        """
         signal_values = np.zeros_like(time_points)
         
-        if self.switch_state == self.STATE_TRANSITIONING:
+        if self.switch_state != self.STATE_TRANSITIONING:
+            state['impact_time'] = None
+        
+        if self.switch_state == self.STATE_TRANSITIONING and len(time_points):
             # Create a brief impact sound followed by decay
             
-            # Determine the position of the impact in the signal
-            impact_time = 0.02  # Impact at 20ms
-            impact_pos = int(impact_time * self.sample_rate)
-            
-            # Ensure impact_pos is within the signal duration
-            if impact_pos >= len(time_points):
-                impact_pos = 0
+            # Determine the time of the impact, 20ms into the transition
+            if state['impact_time'] is None:
+                impact_delay = 0.02
+                state['impact_time'] = time_points[0] + round(impact_delay / sample_spacing) * sample_spacing
             
-            # Create exponential decay envelope
+            # Create exponential decay envelope, until the slowest decay has faded
             decay_const = 15.0  # Decay constant
-            t_env = np.arange(len(time_points) - impact_pos) / self.sample_rate
+            t_env = time_points - state['impact_time']
+            ringing = (t_env > -1e-6 * sample_spacing) & (t_env < 20.0 / 8.0)
+            t_env = np.maximum(t_env[ringing], 0.0)
             envelope = np.exp(-decay_const * t_env)
             
             # Generate white noise for the impact
-            noise = np.random.normal(0, 1, len(time_points) - impact_pos)
+            noise = np.random.normal(0, 1, len(t_env))
             
             # Apply envelope to noise
             impact_signal = noise * envelope
             
-            # Add to signal at impact position
-            signal_values[impact_pos:] += impact_signal
+            # Add to signal from the impact on
+            signal_values[ringing] += impact_signal
             
             # Add resonances based on switch type
             if self.switch_type == "circuit_breaker":
@@ -662,24 +801,21 @@ class SwitchSound(AcousticSource):
                 # Different decay rates for different frequencies
                 decay = 8.0 + freq / 500.0  # Higher frequencies decay faster
                 damped_sin = amp * np.exp(-decay * t_env) * np.sin(2 * np.pi * freq * t_env)
-                signal_values[impact_pos:] += damped_sin
+                signal_values[ringing] += damped_sin
                 
         elif self.switch_state == self.STATE_CLOSED:
             # Add very quiet 60Hz hum and harmonics
             power_freq = 60  # Hz
-            for n in range(1, 6):  # Fundamental and 5 harmonics
-                amplitude = 0.05 / n  # Decreasing amplitude with harmonic number
-                signal_values += amplitude * np.sin(2 * np.pi * power_freq * n * time_points)
+            harmonics = np.arange(1, 6)  # Fundamental and 5 harmonics
+            amplitudes = 0.05 / harmonics  # Decreasing amplitude with harmonic number
+            signal_values += synthesize_tones(time_points, power_freq * harmonics, amplitudes,
+                                              method=self.synthesis_method)
             
             # Add very low level noise
             noise = np.random.normal(0, 0.01, len(time_points))
             signal_values += noise
-            
-        # Normalize
-        if np.max(np.abs(signal_values)) > 0:
-            signal_values /= np.max(np.abs(signal_values))
         
-        return time_points, signal_values
+        return signal_values
 
 
 class DischargeSound(AcousticSource):
@@ -889,13 +1025,54 @@ class DischargeSound(AcousticSource):
         Returns:
             Tuple of (time_points, amplitude_values)
         """
-        if not self.enabled:
-            # Return silence
-            time_points = np.linspace(0, duration, int(duration * self.sample_rate))
-            return time_points, np.zeros_like(time_points)
+        return self._generate_signal(duration)
+    
+    def _start_signal(self) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: noise filter states and pulse tails.
         
-        # Create time array
-        time_points = np.linspace(0, duration, int(duration * self.sample_rate))
+        Returns:
+            Dictionary of signal state
+        """
+        return {'filters': {}, 'overflow': np.zeros(0)}
+    
+    def _filter_noise(self, noise: np.ndarray, order: int, band: Tuple[float, float],
+                      state: Dict[str, Any]) -> np.ndarray:
+        """
+        Band-pass filter noise, carrying the filter state over from the previous block.
+        
+        Args:
+            noise: Noise samples
+            order: Butterworth filter order
+            band: Pass band (low, high) in Hz
+            state: Signal state from _start_signal, updated in place
+            
+        Returns:
+            Filtered noise
+        """
+        key = (order, band)
+        if key not in state['filters']:
+            sos = signal.butter(order, list(band), 'bandpass', fs=self.sample_rate, output='sos')
+            state['filters'][key] = (sos, np.zeros((sos.shape[0], 2)))
+        
+        sos, zi = state['filters'][key]
+        filtered_noise, zi = signal.sosfilt(sos, noise, zi=zi)
+        state['filters'][key] = (sos, zi)
+        return filtered_noise
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the unnormalized discharge sound at a block of time points.
+        
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
+            
+        Returns:
+            Array of signal values
+        """
         signal_values = np.zeros_like(time_points)
         
         if self.discharge_type == self.TYPE_CORONA:
@@ -905,8 +1082,7 @@ class DischargeSound(AcousticSource):
             base_noise = np.random.normal(0, 1, len(time_points))
             
             # Apply bandpass filtering to shape spectrum
-            sos = signal.butter(6, [800, 5000], 'bandpass', fs=self.sample_rate, output='sos')
-            filtered_noise = signal.sosfilt(sos, base_noise)
+            filtered_noise = self._filter_noise(base_noise, 6, (800, 5000), state)
             
             # Add amplitude modulation
             mod_freq = 120  # Hz
@@ -921,21 +1097,23 @@ class DischargeSound(AcousticSource):
             base_noise = np.random.normal(0, 1.5, len(time_points))
             
             # Apply filter to shape spectrum
-            sos = signal.butter(4, [200, 8000], 'bandpass', fs=self.sample_rate, output='sos')
-            filtered_noise = signal.sosfilt(sos, base_noise)
-            
-            # Add crackle events
-            num_crackles = int(duration * 20)  # 20 crackles per second average
-            for _ in range(num_crackles):
-                # Random position
-                pos = np.random.randint(0, len(time_points))
-                
-                # Generate pulse
-                pulse_width = int(0.005 * self.sample_rate)  # 5ms pulse
-                if pos + pulse_width < len(time_points):
-                    pulse = np.random.normal(0, 3, pulse_width) * \
-                            np.exp(-np.arange(pulse_width) / (0.001 * self.sample_rate))
-                    signal_values[pos:pos+pulse_width] += pulse
+            filtered_noise = self._filter_noise(base_noise, 4, (200, 8000), state)
+            
+            # Add crackle events, 20 crackles per second on average; pulses
+            # that run past the block spill over into the next one
+            pulse_width = int(0.005 * self.sample_rate)  # 5ms pulse
+            crackles = np.zeros(len(time_points) + pulse_width)
+            crackles[:len(state['overflow'])] += state['overflow']
+            
+            num_crackles = np.random.poisson(20 * len(time_points) * sample_spacing)
+            for pos in np.random.randint(0, max(len(time_points), 1), num_crackles):
+                # Generate pulse at a random position
+                pulse = np.random.normal(0, 3, pulse_width) * \
+                        np.exp(-np.arange(pulse_width) / (0.001 * self.sample_rate))
+                crackles[pos:pos+pulse_width] += pulse
+            
+            signal_values += crackles[:len(time_points)]
+            state['overflow'] = crackles[len(time_points):]
             
             # Add base filtered noise
             signal_values += filtered_noise * 0.3
@@ -946,19 +1124,10 @@ class DischargeSound(AcousticSource):
             # Generate base noise
             base_noise = np.random.normal(0, 0.2, len(time_points))
             
-            # Add periodic pulses (120 Hz rate for 60 Hz power)
+            # Add periodic exponentially decaying 1ms pulses (120 Hz rate for 60 Hz power)
             pulse_rate = 120  # Hz
-            pulse_interval = self.sample_rate / pulse_rate
-            
-            for i in range(int(duration * pulse_rate)):
-                pos = int(i * pulse_interval)
-                if pos < len(time_points):
-                    # Generate pulse
-                    pulse_width = int(0.001 * self.sample_rate)  # 1ms pulse
-                    if pos + pulse_width < len(time_points):
-                        # Exponential decay pulse
-                        pulse = 2.0 * np.exp(-np.arange(pulse_width) / (0.0002 * self.sample_rate))
-                        signal_values[pos:pos+pulse_width] += pulse
+            add_periodic_events(signal_values, time_points, sample_spacing, 1.0 / pulse_rate, 0.001,
+                                lambda rel_time: 2.0 * np.exp(-rel_time / 0.0002))
             
             # Add some randomization to pulse amplitudes
             signal_values *= (1.0 + 0.3 * np.random.normal(0, 1, len(time_points)))
@@ -971,17 +1140,12 @@ class DischargeSound(AcousticSource):
             base_noise = np.random.normal(0, 1, len(time_points))
             
             # Apply filter for electrical noise character
-            sos = signal.butter(3, [300, 3000], 'bandpass', fs=self.sample_rate, output='sos')
-            signal_values = signal.sosfilt(sos, base_noise)
+            signal_values = self._filter_noise(base_noise, 3, (300, 3000), state)
         
         # Apply intensity scaling
         signal_values *= self.intensity
         
-        # Normalize
-        if np.max(np.abs(signal_values)) > 0:
-            signal_values /= np.max(np.abs(signal_values))
-        
-        return time_points, signal_values
+        return signal_values
 
 
 class AcousticProfile:
@@ -1074,6 +1238,30 @@ class AcousticProfile:
         
         return combined_spl
     
+    def calculate_combined_spl_at_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate combined sound pressure level at a batch of positions.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Array of shape (N,) with combined sound pressure levels in dB
+        """
+        points = as_points(points)
+        
+        # If no sources, return ambient noise
+        if not self.sources:
+            return np.full(len(points), self.ambient_noise, dtype=float)
+        
+        # Add ambient noise and every source in the linear power domain
+        total_linear = np.full(len(points), 10 ** (self.ambient_noise / 10), dtype=float)
+        for source in self.sources:
+            total_linear += 10 ** (source.calculate_spl_at_points(points) / 10)
+        
+        # Convert back to dB
+        return 10 * np.log10(total_linear)
+    
     def generate_combined_spectrum(self, 
                                 position: Tuple[float, float, float],
                                 freq_range: Tuple[float, float, int]) -> Tuple[np.ndarray, np.ndarray]:
@@ -1249,11 +1437,9 @@ class AcousticVisualizer:
         y = np.linspace(y_range[0], y_range[1], y_range[2])
         X, Y = np.meshgrid(x, y)
         
-        # Calculate SPL at each point
-        Z = np.zeros_like(X)
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                Z[i, j] = profile.calculate_combined_spl((X[i, j], Y[i, j], z_level))
+        # Calculate SPL at every point in one batch
+        points = np.column_stack((X.ravel(), Y.ravel(), np.full(X.size, z_level)))
+        Z = profile.calculate_combined_spl_at_points(points).reshape(X.shape)
         
         # Create plot
         fig, ax = plt.subplots(figsize=(10, 8))
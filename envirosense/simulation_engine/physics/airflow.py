@@ -7,9 +7,11 @@ propagate through a space.
 """
 
 import numpy as np
+import scipy.sparse as sp
 from typing import Dict, List, Tuple, Optional, Union, Any
 import logging
-from .space import SpatialGrid, GridCell
+from .space import (SpatialGrid, GridCell, trilinear_stencil, trilinear_matrix, diffusion_step,
+                    full_box, expand_box, relative_box, box_indices)
 from .geometry import Room, GeometryObject
 from .coordinates import Vector3D
 
@@ -109,6 +111,20 @@ class VentilationSource:
         if self.source_type == self.TYPE_BIDIRECTIONAL:
             self.current_direction *= -1.0
     
+    def geometry_key(self) -> Tuple[Any, ...]:
+        """
+        Get a key describing the shape of this source's velocity field.
+        
+        The field scales linearly with ``max_velocity``, so two states with
+        the same key differ only by a constant factor. Changing the position,
+        direction, radius or flow direction changes the key.
+        
+        Returns:
+            Hashable tuple of the properties that shape the field
+        """
+        return (self.position.to_tuple(), self.direction.to_tuple(),
+                self.radius, self.current_direction)
+    
     def get_velocity_at(self, point: Tuple[float, float, float]) -> Vector3D:
         """
         Calculate the air velocity vector at a given point due to this source.
@@ -162,6 +178,57 @@ class VentilationSource:
         velocity = self.direction * velocity_magnitude * angle_factor * self.current_direction
         
         return velocity
+    
+    def get_velocity_at_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate the air velocity at many points at once.
+        
+        Vectorized equivalent of ``get_velocity_at``.
+        
+        Args:
+            points: Array of shape (N, 3) with positions in meters
+            
+        Returns:
+            Array of shape (N, 3) with velocities in meters per second
+        """
+        return self.get_velocity_profile_at_points(points) * self.max_velocity
+    
+    def get_velocity_profile_at_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate the velocity per unit of maximum velocity at many points.
+        
+        The profile depends only on ``geometry_key()``; multiplying it by
+        ``max_velocity`` gives the actual velocity, so it can be cached
+        across flow rate changes.
+        
+        Args:
+            points: Array of shape (N, 3) with positions in meters
+            
+        Returns:
+            Array of shape (N, 3) with velocities per unit maximum velocity
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        direction = np.array(self.direction.to_tuple())
+        offset = points - np.array(self.position.to_tuple())
+        distance = np.sqrt(np.einsum('ij,ij->i', offset, offset))
+        safe_distance = np.where(distance > 0.0, distance, 1.0)
+        
+        # Cosine of angle between flow direction and direction to point;
+        # for outlets or reverse flow, we care about flow toward the source
+        cos_angle = (offset @ direction) / safe_distance
+        if self.current_direction < 0:
+            cos_angle = -cos_angle
+        angle_factor = np.maximum(0.0, cos_angle)
+        
+        # Linear falloff within radius, inverse square beyond it
+        magnitude = np.where(distance < self.radius,
+                             1.0 - distance / self.radius,
+                             (self.radius / safe_distance) ** 2)
+        
+        scale = magnitude * angle_factor * self.current_direction
+        scale[distance > self.radius * 10.0] = 0.0
+        scale[distance < 0.001] = self.current_direction
+        return scale[:, np.newaxis] * direction
 
 
 class AirflowModel:
@@ -184,8 +251,17 @@ class AirflowModel:
         self.room = room
         self.sources = {}  # Dictionary mapping names to VentilationSource instances
         
-        # Velocity field - will be initialized on demand
-        self.velocity_field = None
+        # Velocity field of shape (3, width, length, height), assembled on
+        # demand from per-source profiles. Each profile covers the bounding
+        # box of the source's reach and is cached as
+        # name -> (geometry key, box, profile); the assembled field is cached
+        # under a key of every source's geometry and maximum velocity.
+        self._source_profiles = {}
+        self._velocity_key = None
+        self._velocity_array = None
+        
+        # Cached back-trace operator as (velocity array, time_step, sparse matrix, reach)
+        self._advection_cache = None
         
         # Air exchange rate (in air changes per hour)
         self.air_exchange_rate = 1.0
@@ -202,8 +278,7 @@ class AirflowModel:
             source: The ventilation source to add
         """
         self.sources[source.name] = source
-        # Invalidate velocity field so it will be recalculated
-        self.velocity_field = None
+        # The velocity field picks up the new source on next use
     
     def remove_source(self, name: str) -> None:
         """
@@ -214,8 +289,7 @@ class AirflowModel:
         """
         if name in self.sources:
             del self.sources[name]
-            # Invalidate velocity field
-            self.velocity_field = None
+            # The velocity field drops the source on next use
     
     def get_sources(self) -> List[VentilationSource]:
         """
@@ -235,35 +309,103 @@ class AirflowModel:
         """
         self.air_exchange_rate = max(0.0, rate)
     
-    def calculate_velocity_field(self) -> Dict[Tuple[int, int, int], Vector3D]:
+    @property
+    def velocity_field(self) -> np.ndarray:
+        """Current velocity field, shape (3, width, length, height), in m/s."""
+        return self.get_velocity_array()
+    
+    def invalidate_velocity_field(self) -> None:
+        """
+        Discard all cached source profiles so the field is fully recalculated.
+        
+        Source state changes are detected automatically; this is only needed
+        after changing the grid itself.
+        """
+        self._source_profiles = {}
+        self._velocity_key = None
+        self._velocity_array = None
+        self._advection_cache = None
+    
+    def calculate_velocity_field(self) -> np.ndarray:
         """
-        Calculate the velocity vector at each grid cell based on all sources.
+        Recalculate the velocity vector at each grid cell from all sources.
         
         Returns:
-            Dictionary mapping grid positions to velocity vectors
+            Array of shape (3, width, length, height) with velocities in m/s
         """
-        # Initialize empty velocity field
-        velocity_field = {}
+        self.invalidate_velocity_field()
+        return self.get_velocity_array()
+    
+    def get_velocity_array(self) -> np.ndarray:
+        """
+        Get the velocity field as an array of shape (3, width, length, height).
         
-        # For each grid cell
-        for position, cell in self.grid.iterate_cells():
-            # Get physical coordinates of cell center
-            physical_pos = self.grid.physical_coordinates(position)
-            
-            # Initialize zero velocity
-            velocity = Vector3D(0, 0, 0)
-            
-            # Add contribution from each source
-            for source in self.sources.values():
-                src_velocity = source.get_velocity_at(physical_pos)
-                velocity = velocity + src_velocity
-            
-            # Store in velocity field
-            velocity_field[position] = velocity
+        Only sources whose position, direction, radius or flow direction
+        changed since the last call have their profile recalculated; flow
+        rate changes (e.g. HVAC fan speed) only rescale cached profiles.
         
-        # Cache the calculated field
-        self.velocity_field = velocity_field
-        return velocity_field
+        Returns:
+            Array of velocity components in meters per second
+        """
+        velocity_key = tuple(
+            (name, source.geometry_key(), source.max_velocity)
+            for name, source in self.sources.items()
+        )
+        if self._velocity_array is not None and velocity_key == self._velocity_key:
+            return self._velocity_array
+        
+        # Forget removed sources
+        for name in list(self._source_profiles):
+            if name not in self.sources:
+                del self._source_profiles[name]
+        
+        velocity = np.zeros((3,) + tuple(self.grid.dimensions))
+        for name, source in self.sources.items():
+            geometry_key = source.geometry_key()
+            cached = self._source_profiles.get(name)
+            if cached is None or cached[0] != geometry_key:
+                cached = (geometry_key,) + self._calculate_source_profile(source)
+                self._source_profiles[name] = cached
+            
+            _, box, profile = cached
+            if profile is not None:
+                velocity[(slice(None),) + box] += profile * source.max_velocity
+        
+        self._velocity_key = velocity_key
+        self._velocity_array = velocity
+        return velocity
+    
+    def _calculate_source_profile(self, source: VentilationSource) -> Tuple[Tuple[slice, ...],
+                                                                            Optional[np.ndarray]]:
+        """
+        Evaluate a source's unit velocity profile over the cells it can reach.
+        
+        Args:
+            source: The ventilation source
+            
+        Returns:
+            Tuple of (box slices, profile of shape (3, *box shape)); the
+            profile is None when the source reaches no cells
+        """
+        reach = source.radius * 10.0
+        cell_size = self.grid.cell_size
+        box = []
+        for center, size in zip(source.position.to_tuple(), self.grid.dimensions):
+            lower = max(0, int(np.floor((center - reach) / cell_size)))
+            upper = min(size, int(np.ceil((center + reach) / cell_size)) + 1)
+            box.append(slice(lower, max(lower, upper)))
+        box = tuple(box)
+        
+        shape = tuple(b.stop - b.start for b in box)
+        if 0 in shape:
+            return box, None
+        
+        # Physical coordinates of the cells in the box
+        axes = [np.arange(b.start, b.stop) * cell_size for b in box]
+        points = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1).reshape(-1, 3)
+        
+        profile = source.get_velocity_profile_at_points(points)
+        return box, np.moveaxis(profile.reshape(shape + (3,)), -1, 0)
     
     def get_velocity_at(self, position: Tuple[int, int, int]) -> Vector3D:
         """
@@ -275,18 +417,23 @@ class AirflowModel:
         Returns:
             Vector3D representing velocity in meters per second
         """
-        # Calculate velocity field if needed
-        if self.velocity_field is None:
-            self.calculate_velocity_field()
+        # Return zero velocity for positions outside the grid
+        if not self.grid.is_position_valid(position):
+            return Vector3D(0, 0, 0)
         
-        # Return velocity at the specified position, or zero if not found
-        return self.velocity_field.get(position, Vector3D(0, 0, 0))
+        x, y, z = position
+        return Vector3D(*(float(v) for v in self.get_velocity_array()[:, x, y, z]))
     
     def advect_parameter(self, parameter: str, time_step: Optional[float] = None) -> None:
         """
         Advect a parameter through the grid based on the velocity field.
         
-        This moves parameter values through the grid based on airflow.
+        This moves parameter values through the grid based on airflow, using
+        semi-Lagrangian advection: each cell takes the trilinearly
+        interpolated value at the point its air was traced back from. All
+        cells are updated at once from the cached velocity field. Parameters
+        with active-region tracking only update the cells the active region
+        can reach in one step.
         
         Args:
             parameter: The name of the parameter to advect
@@ -295,60 +442,73 @@ class AirflowModel:
         if time_step is None:
             time_step = self.time_step
         
-        # Calculate velocity field if needed
-        if self.velocity_field is None:
-            self.calculate_velocity_field()
-        
-        # Create a copy of current parameter values
-        new_values = {}
+        operator, reach = self._get_advection_operator(time_step)
         
-        # For each cell
-        for position, cell in self.grid.iterate_cells():
-            x, y, z = position
+        if self.grid.has_active_region(parameter):
+            region = self.grid.get_active_region(parameter)
+            if region is None:
+                return
+            target = expand_box(region, reach, self.grid.dimensions)
             
-            # Get current parameter value
-            current_value = cell.get_parameter(parameter, 0.0)
-            
-            # Get velocity at this cell
-            velocity = self.get_velocity_at(position)
-            
-            if velocity.magnitude() < 0.001:
-                # No significant airflow, value stays the same
-                new_values[position] = current_value
-                continue
-            
-            # Calculate where the air at this cell came from
-            # using semi-Lagrangian advection (backward tracing)
-            src_x = x - velocity.x * time_step / self.grid.cell_size
-            src_y = y - velocity.y * time_step / self.grid.cell_size
-            src_z = z - velocity.z * time_step / self.grid.cell_size
-            
-            # Convert to integer indices with clamping to grid bounds
-            width, length, height = self.grid.dimensions
-            src_x_idx = max(0, min(width - 1, int(src_x)))
-            src_y_idx = max(0, min(length - 1, int(src_y)))
-            src_z_idx = max(0, min(height - 1, int(src_z)))
+            values = self.grid.get_parameter_array(parameter, 0.0)
+            rows = operator[box_indices(target, self.grid.dimensions)]
+            values[target] = (rows @ values.ravel()).reshape(values[target].shape)
+            self.grid.refresh_active_region(parameter, target)
+            return
+        
+        values = self.grid.get_parameter_array(parameter, 0.0)
+        new_values = (operator @ values.ravel()).reshape(values.shape)
+        
+        self.grid.set_parameter_array(parameter, new_values)
+    
+    def _get_advection_operator(self, time_step: float) -> Tuple[sp.csr_matrix, Tuple[int, int, int]]:
+        """
+        Get the semi-Lagrangian back-trace operator for a time step.
+        
+        Every cell is traced backwards along its velocity to the point the
+        air came from. The trilinear interpolation weights for those points
+        form a sparse matrix that maps flattened grid values to advected
+        values; it is built once and reused until the velocity field or the
+        time step changes. Cells without significant airflow map to
+        themselves, so they keep their value exactly.
+        
+        Args:
+            time_step: Time step for advection in seconds
             
-            # Get parameter value at source position
-            src_position = (src_x_idx, src_y_idx, src_z_idx)
-            src_cell = self.grid.get_cell(src_position)
-            if src_cell:
-                src_value = src_cell.get_parameter(parameter, 0.0)
-                new_values[position] = src_value
-            else:
-                new_values[position] = current_value
-        
-        # Update grid with new values
-        for position, value in new_values.items():
-            cell = self.grid.get_cell(position)
-            if cell:
-                cell.set_parameter(parameter, value)
+        Returns:
+            Tuple of (sparse matrix of shape (cells, cells), reach), where
+            reach is the furthest a cell samples from along each axis
+        """
+        velocity = self.get_velocity_array()
+        
+        cache = self._advection_cache
+        if cache is not None and cache[0] is velocity and cache[1] == time_step:
+            return cache[2], cache[3]
+        
+        # No significant airflow, value stays the same
+        still = np.sqrt(np.einsum('i...,i...->...', velocity, velocity)) < 0.001
+        
+        # Calculate where the air at each cell came from
+        displacement = velocity * (time_step / self.grid.cell_size)
+        displacement[:, still] = 0.0
+        coordinates = np.indices(self.grid.dimensions, dtype=float) - displacement
+        
+        stencil = trilinear_stencil(coordinates, self.grid.dimensions)
+        operator = trilinear_matrix(stencil, self.grid.dimensions)
+        
+        # Cells sample from their back-traced point and the next cell along
+        reach = tuple(int(np.ceil(np.abs(d).max())) + 1 for d in displacement)
+        
+        self._advection_cache = (velocity, time_step, operator, reach)
+        return operator, reach
     
     def apply_airflow_step(self, parameters: List[str], time_step: Optional[float] = None) -> None:
         """
         Apply a single time step of airflow to the specified parameters.
         
-        This performs both advection due to airflow and diffusion.
+        This performs advection due to airflow, diffusion and air exchange.
+        All parameters are stacked into one (P, width, length, height) array
+        so each stage is a single vectorized pass over the whole stack.
         
         Args:
             parameters: List of parameter names to update
@@ -357,47 +517,134 @@ class AirflowModel:
         if time_step is None:
             time_step = self.time_step
         
-        # First advect parameters due to airflow
-        for param in parameters:
-            self.advect_parameter(param, time_step)
+        if not parameters:
+            return
         
-        # Then apply diffusion
-        for param in parameters:
-            self.grid.diffuse_parameter(param, self.diffusion_coefficient * time_step)
+        if all(self.grid.has_active_region(param) for param in parameters):
+            if self._apply_airflow_step_active(parameters, time_step):
+                return
+        
+        stack = self.grid.get_parameter_stack(parameters, 0.0)
+        
+        # First advect parameters due to airflow; one sparse product
+        # interpolates every parameter
+        operator, _ = self._get_advection_operator(time_step)
+        flat = stack.reshape(len(parameters), -1)
+        advected = np.ascontiguousarray((operator @ flat.T).T).reshape(stack.shape)
+        
+        # Then apply diffusion, reusing the original stack as output
+        stack = self.grid.diffuse_array(advected, self.diffusion_coefficient * time_step, out=stack)
         
         # Apply air exchange with outside
-        self._apply_air_exchange(parameters, time_step)
+        self._exchange_with_outside(stack, time_step)
+        
+        self.grid.set_parameter_stack(parameters, stack)
+    
+    def _apply_airflow_step_active(self, parameters: List[str], time_step: float) -> bool:
+        """
+        Apply an airflow step to tracked parameters within their active regions.
+        
+        The stack covers the union of the active regions grown by the
+        advection and diffusion reach, plus a one-cell halo for the
+        diffusion stencil; only the cells that can change are written back.
+        
+        Args:
+            parameters: List of parameter names, all with active-region tracking
+            time_step: Time step in seconds
+            
+        Returns:
+            True if the step was applied, False if the regions cover the
+            whole grid and the full-grid step should be used instead
+        """
+        regions = [self.grid.get_active_region(param) for param in parameters]
+        regions = [region for region in regions if region is not None]
+        if not regions:
+            return True
+        
+        dimensions = self.grid.dimensions
+        union = tuple(
+            slice(min(region[axis].start for region in regions),
+                  max(region[axis].stop for region in regions))
+            for axis in range(len(dimensions))
+        )
+        
+        # Advection and then diffusion can each move values outwards
+        operator, reach = self._get_advection_operator(time_step)
+        target = expand_box(union, tuple(r + 1 for r in reach), dimensions)
+        halo = expand_box(target, 1, dimensions)
+        if halo == full_box(dimensions):
+            return False
+        
+        rows = operator[box_indices(halo, dimensions)]
+        fields = [self.grid.get_parameter_array(param, 0.0) for param in parameters]
+        stack = np.empty((len(parameters),) + fields[0][halo].shape)
+        for index, values in enumerate(fields):
+            stack[index] = (rows @ values.ravel()).reshape(stack.shape[1:])
+        
+        stack = diffusion_step(stack, self.diffusion_coefficient * time_step,
+                               self.grid.inverse_neighbor_counts[halo])
+        self._exchange_with_outside(stack, time_step)
+        
+        inner = relative_box(target, halo)
+        for index, (param, values) in enumerate(zip(parameters, fields)):
+            values[target] = stack[(index,) + inner]
+            self.grid.refresh_active_region(param, target)
+        return True
     
     def _apply_air_exchange(self, parameters: List[str], time_step: float) -> None:
         """
         Apply air exchange with the outside environment.
         
-        This models the effect of fresh air entering the space.
+        This models the effect of fresh air entering the space. Parameters
+        with active-region tracking are only updated within their region.
         
         Args:
             parameters: List of parameter names to update
             time_step: Time step in seconds
         """
+        untracked = []
+        for param in parameters:
+            if not self.grid.has_active_region(param):
+                untracked.append(param)
+                continue
+            
+            region = self.grid.get_active_region(param)
+            if region is not None:
+                self._exchange_with_outside(self.grid.get_parameter_array(param, 0.0)[region], time_step)
+                self.grid.refresh_active_region(param, region)
+        
+        parameters = untracked
+        if not parameters:
+            return
+        
+        stack = self.grid.get_parameter_stack(parameters, 0.0)
+        self._exchange_with_outside(stack, time_step)
+        self.grid.set_parameter_stack(parameters, stack)
+    
+    def _exchange_with_outside(self, values: np.ndarray, time_step: float) -> np.ndarray:
+        """
+        Mix parameter values with outside air in place.
+        
+        Args:
+            values: Parameter values (a single grid or a stack of grids)
+            time_step: Time step in seconds
+            
+        Returns:
+            The updated ``values``
+        """
         # Convert air changes per hour to a rate per second
         exchange_rate = self.air_exchange_rate / 3600.0
         
         # Calculate the fraction of air exchanged in this time step
         exchange_fraction = 1.0 - np.exp(-exchange_rate * time_step)
         
-        # For each parameter
-        for param in parameters:
-            # Get assumed outside concentration (usually zero)
-            outside_concentration = 0.0
-            
-            # For each cell
-            for position, cell in self.grid.iterate_cells():
-                current_value = cell.get_parameter(param, 0.0)
-                
-                # Mix with outside air
-                new_value = current_value * (1.0 - exchange_fraction) + outside_concentration * exchange_fraction
-                
-                # Update cell parameter
-                cell.set_parameter(param, new_value)
+        # Get assumed outside concentration (usually zero)
+        outside_concentration = 0.0
+        
+        # Mix with outside air
+        values *= 1.0 - exchange_fraction
+        values += outside_concentration * exchange_fraction
+        return values
     
     def simulate(self, parameters: List[str], 
                 duration: float, 
@@ -443,9 +690,7 @@ class AirflowVisualizer:
         Returns:
             Tuple of (X, Y, U, V) for 2D plotting
         """
-        # Ensure velocity field is calculated
-        if airflow_model.velocity_field is None:
-            airflow_model.calculate_velocity_field()
+        velocity = airflow_model.get_velocity_array()
         
         grid = airflow_model.grid
         width, length, height = grid.dimensions
@@ -456,18 +701,10 @@ class AirflowVisualizer:
             y_points = np.arange(0, length, spacing)
             X, Y = np.meshgrid(x_points, y_points)
             
-            # Initialize velocity components
-            U = np.zeros_like(X, dtype=float)
-            V = np.zeros_like(Y, dtype=float)
-            
-            # Fill velocity components
-            for i, x in enumerate(x_points):
-                for j, y in enumerate(y_points):
-                    z = min(offset, height - 1)
-                    pos = (x, y, z)
-                    velocity = airflow_model.get_velocity_at(pos)
-                    U[j, i] = velocity.x
-                    V[j, i] = velocity.y
+            # Velocity components in the plane, indexed [j, i]
+            z = min(offset, height - 1)
+            U = velocity[0, ::spacing, ::spacing, z].T.copy()
+            V = velocity[1, ::spacing, ::spacing, z].T.copy()
             
             return X, Y, U, V
         
@@ -477,18 +714,10 @@ class AirflowVisualizer:
             z_points = np.arange(0, height, spacing)
             X, Z = np.meshgrid(x_points, z_points)
             
-            # Initialize velocity components
-            U = np.zeros_like(X, dtype=float)
-            V = np.zeros_like(Z, dtype=float)
-            
-            # Fill velocity components
-            for i, x in enumerate(x_points):
-                for j, z in enumerate(z_points):
-                    y = min(offset, length - 1)
-                    pos = (x, y, z)
-                    velocity = airflow_model.get_velocity_at(pos)
-                    U[j, i] = velocity.x
-                    V[j, i] = velocity.z
+            # Velocity components in the plane, indexed [j, i]
+            y = min(offset, length - 1)
+            U = velocity[0, ::spacing, y, ::spacing].T.copy()
+            V = velocity[2, ::spacing, y, ::spacing].T.copy()
             
             return X, Z, U, V
         
@@ -498,18 +727,10 @@ class AirflowVisualizer:
             z_points = np.arange(0, height, spacing)
             Y, Z = np.meshgrid(y_points, z_points)
             
-            # Initialize velocity components
-            U = np.zeros_like(Y, dtype=float)
-            V = np.zeros_like(Z, dtype=float)
-            
-            # Fill velocity components
-            for i, y in enumerate(y_points):
-                for j, z in enumerate(z_points):
-                    x = min(offset, width - 1)
-                    pos = (x, y, z)
-                    velocity = airflow_model.get_velocity_at(pos)
-                    U[j, i] = velocity.y
-                    V[j, i] = velocity.z
+            # Velocity components in the plane, indexed [j, i]
+            x = min(offset, width - 1)
+            U = velocity[1, x, ::spacing, ::spacing].T.copy()
+            V = velocity[2, x, ::spacing, ::spacing].T.copy()
             
             return Y, Z, U, V
         
@@ -9,8 +9,9 @@ of environmental parameters.
 import numpy as np
 from typing import Dict, List, Tuple, Optional, Union, Any
 import logging
-from .space import SpatialGrid, GridCell
-from .geometry import GeometryObject, Material, Wall
+from .space import SpatialGrid, GridCell, axis_slices, expand_box, relative_box
+from .geometry import GeometryObject, GeometryVoxels, Material, Room, Wall, box_contains
+from .spatial_index import BoxIndex, bounding_boxes
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +79,20 @@ class Barrier(GeometryObject):
             
         return True
     
+    def contains_points(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Check which of many points are contained within this barrier.
+        
+        Args:
+            x: X coordinates in meters
+            y: Y coordinates in meters (broadcastable against ``x`` and ``z``)
+            z: Z coordinates in meters
+            
+        Returns:
+            Boolean array of the broadcast shape, True for points inside the barrier
+        """
+        return box_contains(self.get_bounding_box(), x, y, z)
+    
     def surface_normal_at(self, point: Tuple[float, float, float]) -> Tuple[float, float, float]:
         """
         Get the surface normal vector at a given point on the barrier.
@@ -189,6 +204,19 @@ class BarrierHandler:
         
         # Cache barrier information at grid cell interfaces for efficiency
         self.barrier_cache = {}  # (pos1, pos2) -> List[Barrier]
+        
+        # Compiled face representation: the cell faces each barrier covers,
+        # as one box of face indices per axis, and per-parameter face
+        # permeability arrays built from them
+        self.barrier_face_boxes = {}  # id(barrier) -> (corners, [box or None per axis])
+        self.face_permeability_cache = {}  # parameter -> (key, [array per axis])
+        
+        # Bounding-box index over the barriers, built on first lookup
+        self.barrier_index = None
+        
+        # Voxelization of the barriers (and optionally a room's objects),
+        # as ((room, room revision), voxels)
+        self.voxel_cache = None
     
     def add_barrier(self, barrier: Barrier) -> None:
         """
@@ -199,7 +227,7 @@ class BarrierHandler:
         """
         self.barriers.append(barrier)
         # Invalidate cache since barriers have changed
-        self.barrier_cache = {}
+        self._invalidate_caches()
     
     def remove_barrier(self, barrier_name: str) -> None:
         """
@@ -210,7 +238,38 @@ class BarrierHandler:
         """
         self.barriers = [b for b in self.barriers if b.name != barrier_name]
         # Invalidate cache since barriers have changed
+        self._invalidate_caches()
+    
+    def _invalidate_caches(self) -> None:
+        """
+        Discard cached barrier lookups after the set of barriers changes.
+        """
         self.barrier_cache = {}
+        self.barrier_face_boxes = {}
+        self.face_permeability_cache = {}
+        self.barrier_index = None
+        self.voxel_cache = None
+    
+    def voxelize(self, room: Optional[Room] = None) -> GeometryVoxels:
+        """
+        Rasterize the barriers onto the grid.
+        
+        The result is cached until barriers are added or removed, or the
+        room's objects change.
+        
+        Args:
+            room: Optional room whose objects are rasterized too, before the
+                barriers (so barriers determine the material ID where they overlap)
+                
+        Returns:
+            GeometryVoxels with material IDs, solid mask and permeabilities
+        """
+        key = (room, None if room is None else room.revision)
+        cached = self.voxel_cache
+        if cached is None or cached[0] != key or not cached[1].matches(self.grid):
+            objects = ([] if room is None else room.get_all_objects()) + self.barriers
+            self.voxel_cache = (key, GeometryVoxels(self.grid, objects))
+        return self.voxel_cache[1]
     
     def _get_barriers_between(self, pos1: Tuple[int, int, int], 
                              pos2: Tuple[int, int, int]) -> List[Barrier]:
@@ -237,7 +296,10 @@ class BarrierHandler:
         midpoint = tuple((p1 + p2) / 2 for p1, p2 in zip(phys_pos1, phys_pos2))
         
         # Check which barriers contain this midpoint
-        barriers_between = [b for b in self.barriers if b.contains_point(midpoint)]
+        if self.barrier_index is None or len(self.barrier_index) != len(self.barriers):
+            self.barrier_index = BoxIndex(bounding_boxes(self.barriers))
+        candidates = (self.barriers[i] for i in self.barrier_index.query_point(midpoint))
+        barriers_between = [b for b in candidates if b.contains_point(midpoint)]
         
         # Cache the result
         self.barrier_cache[cache_key] = barriers_between
@@ -274,47 +336,180 @@ class BarrierHandler:
         
         return modified_rate
     
-    def diffuse_parameter_with_barriers(self, parameter: str, diffusion_rate: float) -> None:
+    def _get_barrier_face_boxes(self, barrier: Barrier) -> List[Optional[Tuple[slice, ...]]]:
+        """
+        Rasterize a barrier onto the faces between adjacent grid cells.
+        
+        A face lies inside the barrier when the midpoint between its two
+        cells does, which is the same test ``_get_barriers_between`` uses.
+        Because barriers are axis-aligned boxes, the covered faces normal to
+        each axis form a box of face indices.
+        
+        Args:
+            barrier: The barrier to rasterize
+            
+        Returns:
+            Per axis, the slices selecting covered faces in a face array of
+            that axis, or None if the barrier covers no faces on that axis
+        """
+        corners = (barrier.start_point, barrier.end_point)
+        cached = self.barrier_face_boxes.get(id(barrier))
+        if cached is not None and cached[0] == corners:
+            return cached[1]
+        
+        min_point, max_point = barrier.get_bounding_box()
+        
+        # Cell coordinates and midpoints between neighbors along each axis,
+        # computed the same way as physical_coordinates
+        centers, midpoints = [], []
+        for size in self.grid.dimensions:
+            coords = np.arange(size) * self.grid.cell_size
+            centers.append(coords)
+            midpoints.append((coords[:-1] + coords[1:]) / 2)
+        
+        def covered(coords: np.ndarray, axis: int) -> Optional[slice]:
+            inside = np.nonzero((min_point[axis] <= coords) & (coords <= max_point[axis]))[0]
+            if inside.size == 0:
+                return None
+            return slice(inside[0], inside[-1] + 1)
+        
+        boxes = []
+        for axis in range(3):
+            box = tuple(
+                covered(midpoints[a] if a == axis else centers[a], a) for a in range(3)
+            )
+            boxes.append(None if any(b is None for b in box) else box)
+        
+        self.barrier_face_boxes[id(barrier)] = (corners, boxes)
+        return boxes
+    
+    def get_face_permeability(self, parameter: str) -> List[np.ndarray]:
+        """
+        Get the permeability of every face between adjacent cells for a parameter.
+        
+        The array for axis ``a`` has the grid's shape with one fewer entry
+        along ``a``; entry ``i`` along that axis is the face between cells
+        ``i`` and ``i + 1``, holding the product of the permeabilities of the
+        barriers covering it (1 where there are none). Arrays are rebuilt
+        only when barriers or their permeabilities change.
+        
+        Args:
+            parameter: The parameter being diffused
+            
+        Returns:
+            List of three face permeability arrays, one per axis
+        """
+        key = tuple(
+            (id(barrier), barrier.start_point, barrier.end_point,
+             barrier.get_permeability(parameter))
+            for barrier in self.barriers
+        )
+        cached = self.face_permeability_cache.get(parameter)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        dims = self.grid.dimensions
+        faces = [
+            np.ones(tuple(n - 1 if a == axis else n for a, n in enumerate(dims)))
+            for axis in range(3)
+        ]
+        for barrier in self.barriers:
+            perm = barrier.get_permeability(parameter)
+            for axis, box in enumerate(self._get_barrier_face_boxes(barrier)):
+                if box is not None:
+                    faces[axis][box] *= perm
+        
+        self.face_permeability_cache[parameter] = (key, faces)
+        return faces
+    
+    def diffuse_parameter_with_barriers(self, parameter: str, diffusion_rate: float,
+                                        scheme: str = SpatialGrid.DIFFUSION_EXPLICIT) -> None:
         """
         Diffuse a parameter across the grid accounting for barriers.
         
+        Uses the same neighbor-averaged stencil as
+        ``SpatialGrid.diffuse_parameter``, with the exchange across each
+        face weighted by the precomputed face permeability.
+        
         Args:
             parameter: Name of the parameter to diffuse
-            diffusion_rate: Base rate of diffusion (0 to 1)
+            diffusion_rate: Base rate of diffusion (0 to 1 for the explicit scheme)
+            scheme: 'explicit', or an implicit scheme ('crank_nicolson' or
+                'backward_euler') that is stable for rates above 1
         """
-        # Create a copy of the current parameter values
-        new_values = {}
+        if scheme != SpatialGrid.DIFFUSION_EXPLICIT:
+            faces = self.get_face_permeability(parameter) if self.barriers else None
+            self.grid.diffuse_parameter_implicit(parameter, diffusion_rate, scheme, faces)
+            return
+        
+        if not self.barriers:
+            self.grid.diffuse_parameter(parameter, diffusion_rate)
+            return
+        
+        values = self.grid.get_parameter_array(parameter, 0.0)
+        if values.size <= 1:
+            return
+        faces = self.get_face_permeability(parameter)
+        
+        if self.grid.has_active_region(parameter):
+            self._diffuse_active_region(parameter, diffusion_rate, values, faces)
+            return
+        
+        # Accumulate the permeability-weighted exchange across every face
+        exchange = self.grid.acquire_buffer()
+        exchange.fill(0.0)
+        for axis, face_perm in enumerate(faces):
+            lower, upper = axis_slices(3, axis)
+            flux = (values[upper] - values[lower]) * face_perm
+            exchange[lower] += flux
+            exchange[upper] -= flux
+        
+        # Apply diffusion equation
+        exchange *= self.grid.inverse_neighbor_counts
+        exchange *= diffusion_rate
+        exchange += values
+        
+        self.grid.set_parameter_array(parameter, exchange)
+        self.grid.release_buffer(values)
+    
+    def _diffuse_active_region(self, parameter: str, diffusion_rate: float,
+                               values: np.ndarray, faces: Tuple[np.ndarray, ...]) -> None:
+        """
+        Diffuse a tracked parameter across barriers within its active region.
         
-        # Calculate diffusion for each cell
-        for position, cell in self.grid.iterate_cells():
-            current_value = cell.get_parameter(parameter, 0.0)
-            total_diffusion = 0.0
-            neighbor_count = 0
-            
-            # Get diffusion from all neighbors
-            for direction, neighbor in cell.get_all_neighbors().items():
-                neighbor_pos = neighbor.position
-                neighbor_value = neighbor.get_parameter(parameter, 0.0)
-                
-                # Modify diffusion rate based on barriers
-                local_diffusion_rate = self.modify_diffusion_rate(
-                    parameter, position, neighbor_pos, diffusion_rate)
-                
-                # Calculate diffusion contribution
-                diffusion = (neighbor_value - current_value) * local_diffusion_rate
-                total_diffusion += diffusion
-                neighbor_count += 1
-                
-            if neighbor_count > 0:
-                # Apply diffusion equation
-                new_value = current_value + total_diffusion / neighbor_count
-                new_values[position] = new_value
-        
-        # Update all cells with new values
-        for position, value in new_values.items():
-            cell = self.grid.get_cell(position)
-            if cell:
-                cell.set_parameter(parameter, value)
+        The stencil runs on the active box grown by two cells and the cells
+        within one step of the active region are written back in place.
+        
+        Args:
+            parameter: Name of the parameter to diffuse
+            diffusion_rate: Base rate of diffusion (0 to 1)
+            values: Live parameter array
+            faces: Per-axis face permeability arrays
+        """
+        region = self.grid.get_active_region(parameter)
+        if region is None:
+            return
+        
+        target = expand_box(region, 1, self.grid.dimensions)
+        halo = expand_box(region, 2, self.grid.dimensions)
+        local = values[halo]
+        
+        exchange = np.zeros(local.shape)
+        for axis, face_perm in enumerate(faces):
+            # Faces between the cells of the halo along this axis
+            face_box = list(halo)
+            face_box[axis] = slice(halo[axis].start, halo[axis].stop - 1)
+            lower, upper = axis_slices(3, axis)
+            flux = (local[upper] - local[lower]) * face_perm[tuple(face_box)]
+            exchange[lower] += flux
+            exchange[upper] -= flux
+        
+        exchange *= self.grid.inverse_neighbor_counts[halo]
+        exchange *= diffusion_rate
+        exchange += local
+        
+        values[target] = exchange[relative_box(target, halo)]
+        self.grid.refresh_active_region(parameter, target)
 
 
 class PartitionedRoom:
@@ -362,6 +557,24 @@ class PartitionedRoom:
         barrier_handler.add_barrier(barrier)
         return barrier
     
+    @staticmethod
+    def voxelize(grid: SpatialGrid, barrier_handler: BarrierHandler,
+                 room: Optional[Room] = None) -> GeometryVoxels:
+        """
+        Rasterize a partitioned room onto its grid.
+        
+        Args:
+            grid: The spatial grid of the room
+            barrier_handler: The barrier handler holding the partitions
+            room: Optional room whose walls, windows and doors are included
+            
+        Returns:
+            GeometryVoxels with material IDs, solid mask and permeabilities
+        """
+        if barrier_handler.grid is not grid:
+            raise ValueError("The barrier handler manages a different grid")
+        return barrier_handler.voxelize(room)
+    
     @staticmethod
     def create_room_divider(grid: SpatialGrid, barrier_handler: BarrierHandler,
                            room_origin: Tuple[float, float, float],
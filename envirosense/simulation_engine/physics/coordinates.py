@@ -18,6 +18,8 @@ class Vector3D:
     modeling system, with methods for common vector operations.
     """
     
+    __slots__ = ('x', 'y', 'z')
+    
     def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
         """
         Initialize a 3D vector.
@@ -89,6 +91,18 @@ class Vector3D:
         """
         return Vector3D(self.x * scalar, self.y * scalar, self.z * scalar)
     
+    def __rmul__(self, scalar: float) -> 'Vector3D':
+        """
+        Multiply the vector by a scalar on the left.
+        
+        Args:
+            scalar: The scalar value to multiply by
+            
+        Returns:
+            A new Vector3D representing the scaled vector
+        """
+        return self.__mul__(scalar)
+    
     def __truediv__(self, scalar: float) -> 'Vector3D':
         """
         Divide the vector by a scalar.
@@ -192,6 +206,296 @@ class Vector3D:
         return f"Vector3D(x={self.x}, y={self.y}, z={self.z})"
 
 
+def as_points(points: Union[np.ndarray, 'Vector3DArray', List[Tuple[float, float, float]]]) -> np.ndarray:
+    """
+    Convert a batch of positions to a float array of shape (N, 3).
+
+    Args:
+        points: Array-like of (x, y, z) coordinates or a Vector3DArray
+
+    Returns:
+        Array of shape (N, 3)
+    """
+    points = np.asarray(points, dtype=float)
+    return points.reshape(-1, 3)
+
+
+def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+    """
+    Normalize each row of an (N, 3) array, matching Vector3D.normalize.
+
+    Args:
+        vectors: Array of shape (N, 3)
+
+    Returns:
+        Array of unit vectors; zero-length rows stay zero
+    """
+    magnitudes = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, magnitudes, out=np.zeros_like(vectors), where=magnitudes > 0)
+
+
+class Vector3DArray:
+    """
+    Represents a batch of 3D vectors stored as an (N, 3) array.
+    
+    This is the struct-of-arrays counterpart of Vector3D: every operation
+    works on the whole batch at once instead of allocating one object per
+    vector. Operands may be another Vector3DArray of the same length, a
+    single Vector3D (broadcast to every row) or an array of shape (N, 3).
+    """
+    
+    __slots__ = ('data',)
+    
+    # Let NumPy scalars and arrays defer to __rmul__ instead of broadcasting
+    __array_ufunc__ = None
+    
+    def __init__(self, data: Union[np.ndarray, List[Tuple[float, float, float]]]):
+        """
+        Initialize a vector batch.
+        
+        Args:
+            data: Array-like of shape (N, 3) with the x, y, z components
+        """
+        self.data = as_points(data)
+    
+    @classmethod
+    def from_vectors(cls, vectors: List[Vector3D]) -> 'Vector3DArray':
+        """
+        Create a Vector3DArray from a list of Vector3D objects.
+        
+        Args:
+            vectors: Vectors to pack
+            
+        Returns:
+            A new Vector3DArray instance
+        """
+        return cls(np.array([vector.to_tuple() for vector in vectors], dtype=float).reshape(-1, 3))
+    
+    @classmethod
+    def zeros(cls, count: int) -> 'Vector3DArray':
+        """
+        Create a batch of zero vectors.
+        
+        Args:
+            count: Number of vectors
+            
+        Returns:
+            A new Vector3DArray instance
+        """
+        return cls(np.zeros((count, 3)))
+    
+    @property
+    def x(self) -> np.ndarray:
+        """X components of every vector."""
+        return self.data[:, 0]
+    
+    @property
+    def y(self) -> np.ndarray:
+        """Y components of every vector."""
+        return self.data[:, 1]
+    
+    @property
+    def z(self) -> np.ndarray:
+        """Z components of every vector."""
+        return self.data[:, 2]
+    
+    def to_vectors(self) -> List[Vector3D]:
+        """
+        Unpack the batch into Vector3D objects.
+        
+        Returns:
+            List of Vector3D instances
+        """
+        return [Vector3D(*row) for row in self.data]
+    
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Expose the (N, 3) backing array to NumPy."""
+        return self.data if dtype is None else self.data.astype(dtype)
+    
+    def __len__(self) -> int:
+        """Return the number of vectors in the batch."""
+        return len(self.data)
+    
+    def __getitem__(self, index) -> Union[Vector3D, 'Vector3DArray']:
+        """
+        Get a single vector or a sub-batch.
+        
+        Args:
+            index: Integer index, slice, index array or boolean mask
+            
+        Returns:
+            A Vector3D for integer indices, otherwise a Vector3DArray
+        """
+        if isinstance(index, (int, np.integer)):
+            return Vector3D(*self.data[index])
+        return Vector3DArray(self.data[index])
+    
+    def __iter__(self):
+        """Iterate over the batch as Vector3D objects."""
+        for row in self.data:
+            yield Vector3D(*row)
+    
+    @staticmethod
+    def _operand(other: Union['Vector3DArray', Vector3D, np.ndarray]) -> np.ndarray:
+        """
+        Convert a vector operand to an array that broadcasts against (N, 3).
+        
+        Args:
+            other: Vector3DArray, Vector3D or array of shape (N, 3) or (3,)
+            
+        Returns:
+            Array operand
+        """
+        if isinstance(other, Vector3DArray):
+            return other.data
+        if isinstance(other, Vector3D):
+            return np.array(other.to_tuple())
+        return np.asarray(other, dtype=float)
+    
+    @staticmethod
+    def _scalar(scalar: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Convert a scalar or per-vector (N,) array so it broadcasts against (N, 3).
+        
+        Args:
+            scalar: Scalar value or array of shape (N,)
+            
+        Returns:
+            Scalar operand
+        """
+        scalar = np.asarray(scalar, dtype=float)
+        return scalar[:, None] if scalar.ndim == 1 else scalar
+    
+    def __add__(self, other: Union['Vector3DArray', Vector3D, np.ndarray]) -> 'Vector3DArray':
+        """
+        Add vectors elementwise.
+        
+        Args:
+            other: The vectors to add
+            
+        Returns:
+            A new Vector3DArray representing the sums
+        """
+        return Vector3DArray(self.data + self._operand(other))
+    
+    def __sub__(self, other: Union['Vector3DArray', Vector3D, np.ndarray]) -> 'Vector3DArray':
+        """
+        Subtract vectors elementwise.
+        
+        Args:
+            other: The vectors to subtract
+            
+        Returns:
+            A new Vector3DArray representing the differences
+        """
+        return Vector3DArray(self.data - self._operand(other))
+    
+    def __mul__(self, scalar: Union[float, np.ndarray]) -> 'Vector3DArray':
+        """
+        Scale the vectors by a scalar or by one scalar per vector.
+        
+        Args:
+            scalar: Scalar value or array of shape (N,)
+            
+        Returns:
+            A new Vector3DArray representing the scaled vectors
+        """
+        return Vector3DArray(self.data * self._scalar(scalar))
+    
+    __rmul__ = __mul__
+    
+    def __truediv__(self, scalar: Union[float, np.ndarray]) -> 'Vector3DArray':
+        """
+        Divide the vectors by a scalar or by one scalar per vector.
+        
+        Args:
+            scalar: Scalar value or array of shape (N,)
+            
+        Returns:
+            A new Vector3DArray representing the scaled vectors
+        """
+        scalar = self._scalar(scalar)
+        if np.any(scalar == 0):
+            raise ValueError("Cannot divide vector by zero")
+        return Vector3DArray(self.data / scalar)
+    
+    def dot(self, other: Union['Vector3DArray', Vector3D, np.ndarray]) -> np.ndarray:
+        """
+        Calculate the dot product of each vector with another vector.
+        
+        Args:
+            other: The vectors to calculate dot products with
+            
+        Returns:
+            Array of shape (N,) with the dot products
+        """
+        return np.einsum('ij,ij->i', self.data, np.broadcast_to(self._operand(other), self.data.shape))
+    
+    def cross(self, other: Union['Vector3DArray', Vector3D, np.ndarray]) -> 'Vector3DArray':
+        """
+        Calculate the cross product of each vector with another vector.
+        
+        Args:
+            other: The vectors to calculate cross products with
+            
+        Returns:
+            A new Vector3DArray representing the cross products
+        """
+        return Vector3DArray(np.cross(self.data, self._operand(other)))
+    
+    def magnitude(self) -> np.ndarray:
+        """
+        Calculate the magnitude (length) of each vector.
+        
+        Returns:
+            Array of shape (N,) with the magnitudes
+        """
+        return np.linalg.norm(self.data, axis=1)
+    
+    def normalize(self) -> 'Vector3DArray':
+        """
+        Return normalized (unit) vectors in the same directions.
+        
+        Returns:
+            A new Vector3DArray of unit vectors; zero vectors stay zero
+        """
+        return Vector3DArray(normalize_vectors(self.data))
+    
+    def distance_to(self, other: Union['Vector3DArray', Vector3D, np.ndarray]) -> np.ndarray:
+        """
+        Calculate the distance from each vector to another vector.
+        
+        Args:
+            other: The vectors to calculate distances to
+            
+        Returns:
+            Array of shape (N,) with the distances
+        """
+        return np.linalg.norm(self.data - self._operand(other), axis=1)
+    
+    def angle_to(self, other: Union['Vector3DArray', Vector3D, np.ndarray]) -> np.ndarray:
+        """
+        Calculate the angle from each vector to another vector in radians.
+        
+        Args:
+            other: The vectors to calculate angles to
+            
+        Returns:
+            Array of shape (N,) with the angles; 0 where either vector is zero
+        """
+        other = np.broadcast_to(self._operand(other), self.data.shape)
+        magnitudes = self.magnitude() * np.linalg.norm(other, axis=1)
+        dot_product = np.einsum('ij,ij->i', self.data, other)
+        cos_angle = np.divide(dot_product, magnitudes, out=np.ones_like(dot_product),
+                              where=magnitudes > 0)
+        # Handle floating point errors that could result in cos_angle outside [-1, 1]
+        return np.arccos(np.clip(cos_angle, -1.0, 1.0))
+    
+    def __repr__(self) -> str:
+        """Formal string representation of the vector batch."""
+        return f"Vector3DArray(n={len(self.data)})"
+
+
 class CoordinateSystem:
     """
     Defines a coordinate system with transformations between different systems.
@@ -330,6 +634,87 @@ class CoordinateSystem:
         # Convert from local Cartesian to the desired local system
         return self._from_cartesian(local_cartesian)
     
+    def local_to_global_points(self, local_coords: Union[np.ndarray, Vector3DArray]) -> np.ndarray:
+        """
+        Convert a batch of local coordinates to global coordinates.
+        
+        Args:
+            local_coords: Array of shape (N, 3) with coordinates in the local system
+            
+        Returns:
+            Array of shape (N, 3) with coordinates in the global Cartesian system
+        """
+        # First convert to local Cartesian if needed
+        local_cartesian = self._to_cartesian_points(as_points(local_coords))
+        
+        # Apply rotation, then translation
+        return local_cartesian @ self.rotation_matrix.T + np.array(self.origin.to_tuple())
+    
+    def global_to_local_points(self, global_coords: Union[np.ndarray, Vector3DArray]) -> np.ndarray:
+        """
+        Convert a batch of global coordinates to local coordinates.
+        
+        Args:
+            global_coords: Array of shape (N, 3) in the global Cartesian system
+            
+        Returns:
+            Array of shape (N, 3) with coordinates in the local system
+        """
+        # Translate to the local origin and apply the inverse rotation
+        translated = as_points(global_coords) - np.array(self.origin.to_tuple())
+        local_cartesian = translated @ self.inverse_rotation_matrix.T
+        
+        # Convert from local Cartesian to the desired local system
+        return self._from_cartesian_points(local_cartesian)
+    
+    def _to_cartesian_points(self, coords: np.ndarray) -> np.ndarray:
+        """
+        Convert a batch of coordinates from the current system to Cartesian.
+        
+        Args:
+            coords: Array of shape (N, 3) in the current system
+            
+        Returns:
+            Array of shape (N, 3) in Cartesian coordinates
+        """
+        if self.system_type == self.CYLINDRICAL:
+            # Cylindrical (r, θ, z) -> Cartesian (x, y, z)
+            r, theta, z = coords.T
+            return np.column_stack((r * np.cos(theta), r * np.sin(theta), z))
+        
+        if self.system_type == self.SPHERICAL:
+            # Spherical (r, θ, φ) -> Cartesian (x, y, z)
+            r, theta, phi = coords.T
+            return np.column_stack((r * np.sin(phi) * np.cos(theta),
+                                    r * np.sin(phi) * np.sin(theta),
+                                    r * np.cos(phi)))
+        
+        return coords
+    
+    def _from_cartesian_points(self, coords: np.ndarray) -> np.ndarray:
+        """
+        Convert a batch of Cartesian coordinates to the current system.
+        
+        Args:
+            coords: Array of shape (N, 3) in Cartesian coordinates
+            
+        Returns:
+            Array of shape (N, 3) in the current system
+        """
+        x, y, z = coords.T
+        if self.system_type == self.CYLINDRICAL:
+            # Cartesian (x, y, z) -> Cylindrical (r, θ, z)
+            return np.column_stack((np.hypot(x, y), np.arctan2(y, x), z))
+        
+        if self.system_type == self.SPHERICAL:
+            # Cartesian (x, y, z) -> Spherical (r, θ, φ)
+            r = np.sqrt(x**2 + y**2 + z**2)
+            cos_phi = np.divide(z, r, out=np.ones_like(r), where=r > 0)
+            phi = np.where(r > 0, np.arccos(np.clip(cos_phi, -1.0, 1.0)), 0.0)
+            return np.column_stack((r, np.arctan2(y, x), phi))
+        
+        return coords
+    
     def _to_cartesian(self, coords: Tuple[float, float, float]) -> Tuple[float, float, float]:
         """
         Convert coordinates from current system to Cartesian.
@@ -664,3 +1049,62 @@ class Transform:
             return transformed_vector
         
         return (transformed[0], transformed[1], transformed[2])
+    
+    def transform_points(self, points: Union[np.ndarray, Vector3DArray]) -> np.ndarray:
+        """
+        Transform a batch of points from local space to world space.
+        
+        Args:
+            points: Array of shape (N, 3) with points in local space
+            
+        Returns:
+            Array of shape (N, 3) with transformed points in world space
+        """
+        # Apply local transformation (homogeneous w = 1)
+        points = as_points(points)
+        transformed = points @ self.matrix[:3, :3].T + self.matrix[:3, 3]
+        
+        # Apply parent transformations if any
+        if self.parent:
+            return self.parent.transform_points(transformed)
+        
+        return transformed
+    
+    def inverse_transform_points(self, points: Union[np.ndarray, Vector3DArray]) -> np.ndarray:
+        """
+        Transform a batch of points from world space to local space.
+        
+        Args:
+            points: Array of shape (N, 3) with points in world space
+            
+        Returns:
+            Array of shape (N, 3) with transformed points in local space
+        """
+        # If there's a parent, apply its inverse transformation first
+        points = as_points(points)
+        if self.parent:
+            points = self.parent.inverse_transform_points(points)
+        
+        # Apply inverse transformation (homogeneous w = 1)
+        return points @ self.inverse_matrix[:3, :3].T + self.inverse_matrix[:3, 3]
+    
+    def transform_vectors(self, vectors: Union[np.ndarray, Vector3DArray]) -> np.ndarray:
+        """
+        Transform a batch of vectors from local space to world space.
+        
+        This method applies rotation but not translation to the vectors.
+        
+        Args:
+            vectors: Array of shape (N, 3) with vectors in local space
+            
+        Returns:
+            Array of shape (N, 3) with transformed vectors in world space
+        """
+        # Apply local rotation
+        transformed = as_points(vectors) @ self.rotation_matrix[:3, :3].T
+        
+        # Apply parent transformations for rotation only
+        if self.parent:
+            return self.parent.transform_vectors(transformed)
+        
+        return transformed
@@ -21,7 +21,7 @@ from mpl_toolkits.mplot3d import Axes3D
 from abc import ABC, abstractmethod
 from typing import Tuple, List, Dict, Optional, Union
 
-from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.coordinates import Vector3D, as_points, normalize_vectors
 
 # Constants
 MU_0 = 4 * np.pi * 1e-7  # Permeability of free space (H/m)
@@ -62,6 +62,41 @@ class EMFSource(ABC):
         """
         pass
     
+    def calculate_field_at_points(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the electric and magnetic fields at a batch of positions.
+        
+        Subclasses override this with a vectorized implementation; the default
+        falls back to calling calculate_field_at for each point.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Tuple of (electric_field, magnetic_field) arrays of shape (N, 3)
+        """
+        points = as_points(points)
+        e_field = np.zeros_like(points)
+        b_field = np.zeros_like(points)
+        for i, point in enumerate(points):
+            e_vec, b_vec = self.calculate_field_at(tuple(point))
+            e_field[i] = e_vec.to_tuple()
+            b_field[i] = b_vec.to_tuple()
+        return e_field, b_field
+    
+    def _field_at_single_point(self, position: Tuple[float, float, float]) -> Tuple[Vector3D, Vector3D]:
+        """
+        Evaluate calculate_field_at_points for one position.
+        
+        Args:
+            position: 3D coordinates (x, y, z) to calculate the field at
+            
+        Returns:
+            Tuple of Vector3D representing (electric_field, magnetic_field)
+        """
+        e_field, b_field = self.calculate_field_at_points(as_points(position))
+        return Vector3D(*e_field[0]), Vector3D(*b_field[0])
+    
     @property
     @abstractmethod
     def source_type(self) -> str:
@@ -142,41 +177,47 @@ class PowerLine(EMFSource):
         Returns:
             Tuple of Vector3D representing (electric_field, magnetic_field) in V/m and T
         """
+        return self._field_at_single_point(position)
+    
+    def calculate_field_at_points(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the electric and magnetic fields at a batch of positions.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Tuple of (electric_field, magnetic_field) arrays of shape (N, 3)
+        """
+        points = as_points(points)
         if not self.enabled:
-            return Vector3D(0, 0, 0), Vector3D(0, 0, 0)
+            return np.zeros_like(points), np.zeros_like(points)
         
-        pos = Vector3D(*position)
+        start = np.array(self.start_point.to_tuple())
+        end = np.array(self.end_point.to_tuple())
+        direction = np.array(self._direction.to_tuple())
         
         # Calculate magnetic field using the Biot-Savart law
         # For a finite straight wire, we integrate along the wire
         # B = (μ₀*I/4π) * (sinθ₂ - sinθ₁)/r
         
         # Vector from position to start and end points
-        r1 = pos - self.start_point
-        r2 = pos - self.end_point
-        
-        # Distance from the line to the position
-        p = self._closest_point_on_line(pos)
-        r = (pos - p).magnitude()
-        
-        if r < 0.01:  # Avoid division by zero or numerical issues
-            r = 0.01
+        r1 = points - start
+        r2 = points - end
+        along1 = r1 @ direction
+        along2 = r2 @ direction
         
-        # Calculate angles
-        cos_theta1 = r1.dot(self._direction) / r1.magnitude()
-        cos_theta2 = r2.dot(self._direction) / r2.magnitude()
+        # Distance from the line to the position (clamped to the segment)
+        closest = start + np.clip(along1, 0, self._length)[:, None] * direction
+        displacement = points - closest
+        distance = np.linalg.norm(displacement, axis=1)
         
-        # Clamp to valid range [-1, 1] to avoid numerical issues
-        cos_theta1 = max(-1.0, min(1.0, cos_theta1))
-        cos_theta2 = max(-1.0, min(1.0, cos_theta2))
+        # Avoid division by zero or numerical issues
+        r = np.maximum(distance, 0.01)
         
-        sin_theta1 = np.sqrt(1 - cos_theta1**2)
-        sin_theta2 = np.sqrt(1 - cos_theta2**2)
-        
-        if r1.dot(self._direction) < 0:
-            sin_theta1 *= -1
-        if r2.dot(self._direction) < 0:
-            sin_theta2 *= -1
+        # Calculate angles, clamped to [-1, 1] to avoid numerical issues
+        sin_theta1 = self._signed_sine(along1, np.linalg.norm(r1, axis=1))
+        sin_theta2 = self._signed_sine(along2, np.linalg.norm(r2, axis=1))
         
         # Calculate magnetic field magnitude
         # Using simplified Biot-Savart for finite wire segment
@@ -184,31 +225,38 @@ class PowerLine(EMFSource):
         
         # Direction of B is perpendicular to both the wire and the displacement vector
         # from wire to the position
-        displacement = pos - p
-        if displacement.magnitude() < 0.01:
-            B_dir = Vector3D(0, 0, 0)
-        else:
-            B_dir = self._direction.cross(displacement.normalize())
-        
-        # Magnetic field vector
-        B_vec = B_dir.normalize() * B_mag if B_dir.magnitude() > 0 else Vector3D(0, 0, 0)
+        B_dir = normalize_vectors(np.cross(direction, displacement))
+        B_dir[distance < 0.01] = 0.0
+        B_vec = B_dir * B_mag[:, None]
         
         # Calculate electric field - simplified model based on distance and voltage
-        # Using approximate formula for power line electric field
-        if r < 0.01:  # Avoid division by zero
-            r = 0.01
-            
         # Electric field strength decreases with distance from the line
         # This is a simplified model - actual field calculation would use Coulomb's law
         # with charge distribution
         E_mag = self.voltage / (2 * np.pi * 8.85e-12 * r * np.log(10))
         
         # Direction of E points radially from the line
-        E_dir = displacement
-        E_vec = E_dir.normalize() * E_mag if E_dir.magnitude() > 0 else Vector3D(0, 0, 0)
+        E_vec = normalize_vectors(displacement) * E_mag[:, None]
         
         return E_vec, B_vec
     
+    @staticmethod
+    def _signed_sine(along: np.ndarray, distance: np.ndarray) -> np.ndarray:
+        """
+        Compute the signed sine of the angle between the wire and an endpoint vector.
+        
+        Args:
+            along: Projection of the endpoint vector onto the wire direction
+            distance: Length of the endpoint vector
+            
+        Returns:
+            Sine values, negative where the projection is negative
+        """
+        cos_theta = np.divide(along, distance, out=np.zeros_like(along), where=distance > 0)
+        cos_theta = np.clip(cos_theta, -1.0, 1.0)
+        sin_theta = np.sqrt(1 - cos_theta**2)
+        return np.where(along < 0, -sin_theta, sin_theta)
+    
     def _closest_point_on_line(self, point: Vector3D) -> Vector3D:
         """
         Find the closest point on the line to the given point.
@@ -304,17 +352,28 @@ class Transformer(EMFSource):
         Returns:
             Tuple of Vector3D representing (electric_field, magnetic_field) in V/m and T
         """
-        if not self.enabled:
-            return Vector3D(0, 0, 0), Vector3D(0, 0, 0)
+        return self._field_at_single_point(position)
+    
+    def calculate_field_at_points(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the electric and magnetic fields at a batch of positions
+        using the dipole approximation.
         
-        pos = Vector3D(*position)
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Tuple of (electric_field, magnetic_field) arrays of shape (N, 3)
+        """
+        points = as_points(points)
+        if not self.enabled:
+            return np.zeros_like(points), np.zeros_like(points)
         
         # Vector from transformer to position
-        r_vec = pos - self.position
-        r = r_vec.magnitude()
-        
-        if r < 0.1:  # Minimum distance to avoid singularity
-            r = 0.1
+        r_vec = points - np.array(self.position.to_tuple())
+        distance = np.linalg.norm(r_vec, axis=1)
+        r = np.maximum(distance, 0.1)  # Minimum distance to avoid singularity
+        r_norm = normalize_vectors(r_vec)
         
         # Magnetic field - using approximate model for transformer
         # Transformers can be approximated as magnetic dipoles
@@ -325,22 +384,19 @@ class Transformer(EMFSource):
         moment_factor = 1e-7 * self.power_rating / 1000  # Scale based on power rating
         
         # Assume dipole is aligned with z-axis
-        dipole_orientation = Vector3D(0, 0, 1)
+        dipole_orientation = np.array([0.0, 0.0, 1.0])
         
         # Magnetic field from dipole
-        r_norm = r_vec.normalize()
-        B_mag = moment_factor * (3 * r_norm.dot(dipole_orientation) * r_norm - dipole_orientation) / (r**3)
+        B_vec = moment_factor * (3 * r_norm[:, 2:3] * r_norm - dipole_orientation) / (r**3)[:, None]
         
         # Electric field - very simplified model
         # In reality, transformer electric field is complex and shielded
-        E_mag = Vector3D(0, 0, 0)
-        if r > 0.1:
-            # Simple inverse square approximation for electric field
-            # Field strength related to voltage
-            field_strength = 0.5 * self.primary_voltage / (r**2)
-            E_mag = r_vec.normalize() * field_strength
-        
-        return E_mag, B_mag
+        # Simple inverse square approximation for electric field
+        # Field strength related to voltage
+        field_strength = np.where(distance > 0.1, 0.5 * self.primary_voltage / r**2, 0.0)
+        E_vec = r_norm * field_strength[:, None]
+        
+        return E_vec, B_vec
 
 
 class Switch(EMFSource):
@@ -428,17 +484,25 @@ class Switch(EMFSource):
         Returns:
             Tuple of Vector3D representing (electric_field, magnetic_field) in V/m and T
         """
-        if not self.enabled:
-            return Vector3D(0, 0, 0), Vector3D(0, 0, 0)
+        return self._field_at_single_point(position)
+    
+    def calculate_field_at_points(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the electric and magnetic fields at a batch of positions.
         
-        pos = Vector3D(*position)
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Tuple of (electric_field, magnetic_field) arrays of shape (N, 3)
+        """
+        points = as_points(points)
+        if not self.enabled:
+            return np.zeros_like(points), np.zeros_like(points)
         
         # Vector from switch to position
-        r_vec = pos - self.position
-        r = r_vec.magnitude()
-        
-        if r < 0.05:  # Minimum distance to avoid singularity
-            r = 0.05
+        r_vec = points - np.array(self.position.to_tuple())
+        r = np.maximum(np.linalg.norm(r_vec, axis=1), 0.05)  # Avoid singularity
         
         # Calculate magnetic field
         # For a closed switch, approximate as a current-carrying conductor
@@ -449,19 +513,18 @@ class Switch(EMFSource):
         B_mag = MU_0 * self.current / (2 * np.pi * r)
         
         # Direction perpendicular to radial vector and assumed current direction (z-axis)
-        B_dir = r_vec.cross(Vector3D(0, 0, 1))
+        B_dir = np.cross(r_vec, np.array([0.0, 0.0, 1.0]))
         
-        if B_dir.magnitude() < 0.001:
-            # If parallel to z-axis, pick arbitrary perpendicular
-            B_dir = Vector3D(1, 0, 0)
-            
-        B_vec = B_dir.normalize() * B_mag if B_dir.magnitude() > 0 else Vector3D(0, 0, 0)
+        # If parallel to z-axis, pick arbitrary perpendicular
+        B_dir[np.linalg.norm(B_dir, axis=1) < 0.001] = (1.0, 0.0, 0.0)
+        
+        B_vec = normalize_vectors(B_dir) * B_mag[:, None]
         
         # For arcing state, add high-frequency components (simplified)
         if self.state == self.STATE_ARCING:
             # Add random fluctuations to simulate arc instability
             arc_factor = 1.0 + 0.5 * np.sin(r * 10) + 0.3 * np.cos(r * 15)
-            B_vec = B_vec * arc_factor
+            B_vec = B_vec * arc_factor[:, None]
         
         # Electric field calculation
         # Open switch has stronger electric field due to voltage difference
@@ -478,7 +541,7 @@ class Switch(EMFSource):
             # Minimal electric field when closed
             E_factor = 0.1
             
-        E_vec = r_vec.normalize() * E_base * E_factor
+        E_vec = normalize_vectors(r_vec) * (E_base * E_factor)[:, None]
         
         return E_vec, B_vec
 
@@ -561,6 +624,29 @@ class EMFField:
                 
         return total_e, total_b
     
+    def calculate_field_at_points(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the combined electric and magnetic fields at a batch of positions.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Tuple of (electric_field, magnetic_field) arrays of shape (N, 3)
+        """
+        points = as_points(points)
+        total_e = np.zeros_like(points)
+        total_b = np.zeros_like(points)
+        
+        # Sum contributions from all sources
+        for source in self.sources.values():
+            if source.enabled:
+                e_field, b_field = source.calculate_field_at_points(points)
+                total_e += e_field
+                total_b += b_field
+                
+        return total_e, total_b
+    
     def calculate_field_grid(self, 
                           x_range: Tuple[float, float, int],
                           y_range: Tuple[float, float, int],
@@ -584,16 +670,11 @@ class EMFField:
         y = np.linspace(y_range[0], y_range[1], y_range[2])
         X, Y = np.meshgrid(x, y)
         
-        # Initialize field magnitude arrays
-        E_mag = np.zeros_like(X)
-        B_mag = np.zeros_like(X)
-        
-        # Calculate field at each point
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                e_field, b_field = self.calculate_field_at((X[i, j], Y[i, j], z))
-                E_mag[i, j] = e_field.magnitude()
-                B_mag[i, j] = b_field.magnitude()
+        # Calculate field at every point in one batch
+        points = np.column_stack((X.ravel(), Y.ravel(), np.full(X.size, z)))
+        e_field, b_field = self.calculate_field_at_points(points)
+        E_mag = np.linalg.norm(e_field, axis=1).reshape(X.shape)
+        B_mag = np.linalg.norm(b_field, axis=1).reshape(X.shape)
                 
         return X, Y, E_mag, B_mag
     
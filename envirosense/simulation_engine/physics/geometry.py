@@ -10,6 +10,8 @@ from typing import Dict, List, Tuple, Optional, Union, Any
 from dataclasses import dataclass
 import logging
 import json
+from .space import SpatialGrid
+from .spatial_index import BoxIndex, bounding_boxes
 
 logger = logging.getLogger(__name__)
 
@@ -102,6 +104,24 @@ class Material:
         )
 
 
+def box_contains(box: Tuple[Tuple[float, float, float], Tuple[float, float, float]],
+                 x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """
+    Check which points lie inside an axis-aligned box (boundaries included).
+    
+    Args:
+        box: Tuple of (min_point, max_point)
+        x: X coordinates in meters
+        y: Y coordinates in meters (broadcastable against ``x`` and ``z``)
+        z: Z coordinates in meters
+        
+    Returns:
+        Boolean array of the broadcast shape
+    """
+    (x1, y1, z1), (x2, y2, z2) = box
+    return ((x1 <= x) & (x <= x2)) & ((y1 <= y) & (y <= y2)) & ((z1 <= z) & (z <= z2))
+
+
 class GeometryObject:
     """
     Base class for all geometric objects in the environment.
@@ -134,6 +154,24 @@ class GeometryObject:
         # Abstract method, should be implemented by subclasses
         raise NotImplementedError("Subclasses must implement contains_point")
     
+    def contains_points(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Check which of many points are contained within this object.
+        
+        The base implementation calls ``contains_point`` for every point;
+        subclasses override it with array math.
+        
+        Args:
+            x: X coordinates in meters
+            y: Y coordinates in meters (broadcastable against ``x`` and ``z``)
+            z: Z coordinates in meters
+            
+        Returns:
+            Boolean array of the broadcast shape, True for points inside the object
+        """
+        contains = np.vectorize(lambda px, py, pz: self.contains_point((px, py, pz)), otypes=[bool])
+        return contains(x, y, z)
+    
     def surface_normal_at(self, point: Tuple[float, float, float]) -> Tuple[float, float, float]:
         """
         Get the surface normal vector at a given point on the object.
@@ -231,6 +269,20 @@ class Wall(GeometryObject):
             
         return True
     
+    def contains_points(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Check which of many points are contained within this wall.
+        
+        Args:
+            x: X coordinates in meters
+            y: Y coordinates in meters (broadcastable against ``x`` and ``z``)
+            z: Z coordinates in meters
+            
+        Returns:
+            Boolean array of the broadcast shape, True for points inside the wall
+        """
+        return box_contains(self.get_bounding_box(), x, y, z)
+    
     def surface_normal_at(self, point: Tuple[float, float, float]) -> Tuple[float, float, float]:
         """
         Get the surface normal vector at a given point on the wall.
@@ -384,6 +436,25 @@ class Door(GeometryObject):
             
         return True
     
+    def contains_points(self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+        """
+        Check which of many points are contained within this door.
+        
+        An open door contains no points.
+        
+        Args:
+            x: X coordinates in meters
+            y: Y coordinates in meters (broadcastable against ``x`` and ``z``)
+            z: Z coordinates in meters
+            
+        Returns:
+            Boolean array of the broadcast shape, True for points inside the door
+        """
+        inside = box_contains(self.get_bounding_box(), x, y, z)
+        if self.is_open:
+            return np.zeros(np.shape(inside), dtype=bool)
+        return inside
+    
     def surface_normal_at(self, point: Tuple[float, float, float]) -> Tuple[float, float, float]:
         """
         Get the surface normal vector at a given point on the door.
@@ -446,6 +517,161 @@ class Door(GeometryObject):
         return super().affects_parameter(parameter, point, value)
 
 
+class GeometryVoxels:
+    """
+    Rasterization of geometry objects onto the cells of a SpatialGrid.
+    
+    A cell belongs to an object when its grid point (``physical_coordinates``
+    of the cell) is contained in the object. The rasterization provides an
+    integer material-ID array, a solid/air mask and, per parameter, the
+    combined factor the objects apply to that parameter in each cell (the
+    array form of ``Room.get_parameter_effects``), so physics kernels can
+    use masks instead of querying the geometry cell by cell.
+    
+    Each object's footprint is computed once, when the voxelization is
+    built. Object state (a door opening, a barrier permeability change) is
+    only picked up by building a new voxelization.
+    """
+    
+    def __init__(self, grid: SpatialGrid, objects: List[GeometryObject]):
+        """
+        Rasterize objects onto a grid.
+        
+        Args:
+            grid: Grid whose cells are classified
+            objects: Objects to rasterize; where objects overlap, later ones
+                determine the material ID
+        """
+        self.dimensions = tuple(grid.dimensions)
+        self.cell_size = grid.cell_size
+        self.objects = list(objects)
+        
+        # Material 0 is air; the others are numbered in order of first use
+        self.materials: List[Optional[Material]] = [None]
+        material_index = {}
+        
+        self.material_ids = np.zeros(self.dimensions, dtype=np.int32)
+        
+        # Per object: the box of cells its bounding box covers and, within
+        # it, the mask of the cells the object contains (None if it is empty)
+        self._footprints: List[Optional[Tuple[Tuple[slice, ...], np.ndarray]]] = []
+        self._permeability_cache: Dict[str, np.ndarray] = {}
+        
+        self._coordinates = [np.arange(size) * self.cell_size for size in self.dimensions]
+        for obj in self.objects:
+            footprint = self._rasterize(obj, self._coordinates)
+            self._footprints.append(footprint)
+            if footprint is None:
+                continue
+            
+            if obj.material.name not in material_index:
+                material_index[obj.material.name] = len(self.materials)
+                self.materials.append(obj.material)
+            box, mask = footprint
+            self.material_ids[box][mask] = material_index[obj.material.name]
+        
+        self.solid_mask = self.material_ids > 0
+    
+    @staticmethod
+    def _rasterize(obj: GeometryObject,
+                   coordinates: List[np.ndarray]) -> Optional[Tuple[Tuple[slice, ...], np.ndarray]]:
+        """
+        Find the grid cells an object contains.
+        
+        Args:
+            obj: Object to rasterize
+            coordinates: Physical coordinate of each cell along each axis
+            
+        Returns:
+            Tuple of (box of cells, containment mask within the box), or None
+            if the object contains no cell
+        """
+        try:
+            min_point, max_point = obj.get_bounding_box()
+        except NotImplementedError:
+            min_point, max_point = (-np.inf,) * 3, (np.inf,) * 3
+        
+        box = []
+        for axis, coords in enumerate(coordinates):
+            inside = np.nonzero((min_point[axis] <= coords) & (coords <= max_point[axis]))[0]
+            if inside.size == 0:
+                return None
+            box.append(slice(int(inside[0]), int(inside[-1]) + 1))
+        box = tuple(box)
+        
+        x, y, z = np.ix_(*(coords[b] for coords, b in zip(coordinates, box)))
+        mask = np.broadcast_to(obj.contains_points(x, y, z), tuple(b.stop - b.start for b in box))
+        if not mask.any():
+            return None
+        return box, mask
+    
+    def matches(self, grid: SpatialGrid) -> bool:
+        """
+        Check whether this voxelization was built for a grid's geometry.
+        
+        Args:
+            grid: Grid to compare against
+            
+        Returns:
+            True if the grid has the same dimensions and cell size
+        """
+        return self.dimensions == tuple(grid.dimensions) and self.cell_size == grid.cell_size
+    
+    @property
+    def air_mask(self) -> np.ndarray:
+        """Boolean array of the cells not contained in any object."""
+        return ~self.solid_mask
+    
+    def get_object_mask(self, name: str) -> np.ndarray:
+        """
+        Get the cells contained in an object.
+        
+        Args:
+            name: Object name
+            
+        Returns:
+            Boolean array of shape ``dimensions``
+        """
+        mask = np.zeros(self.dimensions, dtype=bool)
+        for obj, footprint in zip(self.objects, self._footprints):
+            if obj.name == name and footprint is not None:
+                box, inside = footprint
+                mask[box] |= inside
+        return mask
+    
+    def get_permeability(self, parameter: str) -> np.ndarray:
+        """
+        Get the factor the objects apply to a parameter in each cell.
+        
+        Each object's effect is sampled once, at the middle of the cells it
+        contains, as ``affects_parameter(parameter, point, 1.0)``; a cell's
+        factor is the product over the objects containing it (1 in air).
+        This matches ``Room.get_parameter_effects`` for the built-in
+        objects, whose effects are uniform and proportional to the value.
+        
+        Args:
+            parameter: Parameter name
+            
+        Returns:
+            Array of shape ``dimensions`` (cached; do not modify)
+        """
+        if parameter in self._permeability_cache:
+            return self._permeability_cache[parameter]
+        
+        permeability = np.ones(self.dimensions)
+        for obj, footprint in zip(self.objects, self._footprints):
+            if footprint is None:
+                continue
+            box, mask = footprint
+            point = tuple(float(coords[b].mean()) for coords, b in zip(self._coordinates, box))
+            factor = obj.affects_parameter(parameter, point, 1.0)
+            if factor != 1.0:
+                permeability[box][mask] *= factor
+        
+        self._permeability_cache[parameter] = permeability
+        return permeability
+
+
 class Room:
     """
     Represents a room with walls, doors, windows, and other objects.
@@ -469,6 +695,14 @@ class Room:
         self.position = position
         self.objects = {}  # Dictionary mapping object names to GeometryObject instances
         
+        # Bounding-box index over the objects, as (objects, index), and the
+        # voxelization onto the last grid used; both rebuilt on change
+        self._object_index = None
+        self._voxels = None
+        
+        # Incremented whenever the objects change, so dependent caches can tell
+        self.revision = 0
+        
     def add_object(self, obj: GeometryObject) -> None:
         """
         Add a geometric object to the room.
@@ -477,6 +711,51 @@ class Room:
             obj: The GeometryObject to add
         """
         self.objects[obj.name] = obj
+        self.invalidate_spatial_index()
+        
+    def remove_object(self, name: str) -> bool:
+        """
+        Remove a geometric object from the room.
+        
+        Args:
+            name: Object identifier
+            
+        Returns:
+            True if the object was removed, False if not found
+        """
+        if name not in self.objects:
+            return False
+        del self.objects[name]
+        self.invalidate_spatial_index()
+        return True
+        
+    def invalidate_spatial_index(self) -> None:
+        """
+        Discard the object index and voxelization so they are rebuilt on next use.
+        
+        Call this after moving, resizing or opening/closing objects already
+        in the room.
+        """
+        self._object_index = None
+        self._voxels = None
+        self.revision += 1
+        
+    def voxelize(self, grid: SpatialGrid) -> GeometryVoxels:
+        """
+        Rasterize the room's objects onto a grid.
+        
+        The result is cached and reused until objects are added or removed
+        (or ``invalidate_spatial_index`` is called).
+        
+        Args:
+            grid: Grid to rasterize onto
+            
+        Returns:
+            GeometryVoxels with material IDs, solid mask and permeabilities
+        """
+        if self._voxels is None or not self._voxels.matches(grid):
+            self._voxels = GeometryVoxels(grid, list(self.objects.values()))
+        return self._voxels
         
     def get_object(self, name: str) -> Optional[GeometryObject]:
         """
@@ -500,7 +779,14 @@ class Room:
         Returns:
             List of GeometryObject instances containing the point
         """
-        return [obj for obj in self.objects.values() if obj.contains_point(point)]
+        if self._object_index is None or len(self._object_index[0]) != len(self.objects):
+            objects = list(self.objects.values())
+            self._object_index = (objects, BoxIndex(bounding_boxes(objects)))
+        
+        # The index narrows the search to objects whose bounding box holds the point
+        objects, index = self._object_index
+        candidates = (objects[i] for i in index.query_point(point))
+        return [obj for obj in candidates if obj.contains_point(point)]
     
     def get_all_objects(self) -> List[GeometryObject]:
         """
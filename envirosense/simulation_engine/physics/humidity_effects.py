@@ -10,7 +10,7 @@ import numpy as np
 import math
 from typing import Dict, List, Tuple, Optional, Union, Any
 import logging
-from .space import SpatialGrid, GridCell
+from .space import SpatialGrid, GridCell, accumulate_point_falloff
 
 logger = logging.getLogger(__name__)
 
@@ -123,10 +123,13 @@ class HumidityEffects:
             "fabric": [70.0, 0.1]
         }
     
-    def calculate_absolute_humidity(self, temperature: float, relative_humidity: float) -> float:
+    def calculate_absolute_humidity(self, temperature: Union[float, np.ndarray],
+                                    relative_humidity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate absolute humidity from temperature and relative humidity.
         
+        Accepts scalars or NumPy arrays (broadcast elementwise).
+        
         Args:
             temperature: Temperature in Celsius
             relative_humidity: Relative humidity percentage (0-100)
@@ -145,10 +148,13 @@ class HumidityEffects:
         
         return abs_humidity
     
-    def calculate_relative_humidity(self, temperature: float, absolute_humidity: float) -> float:
+    def calculate_relative_humidity(self, temperature: Union[float, np.ndarray],
+                                    absolute_humidity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate relative humidity from temperature and absolute humidity.
         
+        Accepts scalars or NumPy arrays (broadcast elementwise).
+        
         Args:
             temperature: Temperature in Celsius
             absolute_humidity: Absolute humidity in g/m³
@@ -165,12 +171,15 @@ class HumidityEffects:
         # Relative humidity
         rh = (vp / svp) * 100.0
         
-        return min(100.0, max(0.0, rh))
+        return np.clip(rh, 0.0, 100.0)
     
-    def calculate_dew_point(self, temperature: float, relative_humidity: float) -> float:
+    def calculate_dew_point(self, temperature: Union[float, np.ndarray],
+                            relative_humidity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate dew point from temperature and relative humidity.
         
+        Accepts scalars or NumPy arrays (broadcast elementwise).
+        
         Args:
             temperature: Temperature in Celsius
             relative_humidity: Relative humidity percentage (0-100)
@@ -183,18 +192,21 @@ class HumidityEffects:
         b = 237.7
         
         # Intermediate term
-        gamma = ((a * temperature) / (b + temperature)) + math.log(relative_humidity / 100.0)
+        gamma = ((a * temperature) / (b + temperature)) + np.log(relative_humidity / 100.0)
         
         # Dew point formula
         dew_point = (b * gamma) / (a - gamma)
         
         return dew_point
     
-    def calculate_hygroscopic_growth(self, particle_type: str, initial_size: float,
-                                   relative_humidity: float) -> float:
+    def calculate_hygroscopic_growth(self, particle_type: str,
+                                     initial_size: Union[float, np.ndarray],
+                                     relative_humidity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate hygroscopic particle growth due to humidity.
         
+        Accepts scalars or NumPy arrays for size and humidity.
+        
         Args:
             particle_type: Type of particle (from HYGROSCOPIC_GROWTH)
             initial_size: Initial particle diameter in micrometers
@@ -207,45 +219,44 @@ class HumidityEffects:
         if particle_type not in self.HYGROSCOPIC_GROWTH:
             logger.warning(f"Unknown particle type: {particle_type}. Using pm2.5_urban.")
             particle_type = "pm2.5_urban"
-            
-        growth_data = self.HYGROSCOPIC_GROWTH[particle_type]
         
-        # Find growth factor by interpolating between known RH points
-        rh_points = sorted(growth_data.keys())
-        
-        # Clamp RH to valid range
-        rh = min(max(rh_points), max(0.0, relative_humidity))
-        
-        # Find bracketing points
-        if rh <= min(rh_points):
-            growth_factor = growth_data[min(rh_points)]
-        elif rh >= max(rh_points):
-            growth_factor = growth_data[max(rh_points)]
-        else:
-            # Find two closest RH points
-            lower_rh = max(point for point in rh_points if point <= rh)
-            upper_rh = min(point for point in rh_points if point >= rh)
-            
-            # Interpolate
-            if upper_rh == lower_rh:
-                growth_factor = growth_data[lower_rh]
-            else:
-                lower_gf = growth_data[lower_rh]
-                upper_gf = growth_data[upper_rh]
-                t = (rh - lower_rh) / (upper_rh - lower_rh)
-                growth_factor = lower_gf + t * (upper_gf - lower_gf)
+        # Find growth factor by interpolating between known RH points,
+        # holding the end values outside the tabulated range
+        growth_factor = self._interpolate_rh_table(
+            self.HYGROSCOPIC_GROWTH[particle_type], relative_humidity)
         
         # Apply growth factor to initial size
         new_size = initial_size * growth_factor
         
         return new_size
     
+    @staticmethod
+    def _interpolate_rh_table(table: Dict[float, float],
+                              relative_humidity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        Linearly interpolate a {RH: factor} table.
+        
+        Args:
+            table: Mapping of relative humidity points to factors
+            relative_humidity: Relative humidity percentage (0-100)
+            
+        Returns:
+            Interpolated factor, clamped to the end values of the table
+        """
+        rh_points = sorted(table.keys())
+        factors = [table[point] for point in rh_points]
+        rh = np.clip(relative_humidity, 0.0, 100.0)
+        return np.interp(rh, rh_points, factors)
+    
     def calculate_humidity_dependent_settling(self, particle_type: str, particle_size: float,
-                                            density: float, relative_humidity: float,
-                                            temperature: float = 25.0) -> float:
+                                            density: float,
+                                            relative_humidity: Union[float, np.ndarray],
+                                            temperature: Union[float, np.ndarray] = 25.0) -> Union[float, np.ndarray]:
         """
         Calculate settling velocity of particles accounting for humidity effects.
         
+        Accepts scalars or NumPy arrays for humidity and temperature.
+        
         Args:
             particle_type: Type of particle (from HYGROSCOPIC_GROWTH)
             particle_size: Particle diameter in micrometers
@@ -287,10 +298,13 @@ class HumidityEffects:
         
         return settling_velocity
     
-    def calculate_reaction_adjustment(self, reaction_type: str, relative_humidity: float) -> float:
+    def calculate_reaction_adjustment(self, reaction_type: str,
+                                      relative_humidity: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate adjustment factor for chemical reactions based on humidity.
         
+        Accepts a scalar or NumPy array of humidities.
+        
         Args:
             reaction_type: Type of reaction (from REACTION_RH_ADJUSTMENTS)
             relative_humidity: Relative humidity percentage (0-100)
@@ -302,35 +316,10 @@ class HumidityEffects:
         if reaction_type not in self.REACTION_RH_ADJUSTMENTS:
             logger.warning(f"Unknown reaction type: {reaction_type}. Using voc_degradation.")
             reaction_type = "voc_degradation"
-            
-        adjustment_data = self.REACTION_RH_ADJUSTMENTS[reaction_type]
         
         # Find adjustment by interpolating between known RH points
-        rh_points = sorted(adjustment_data.keys())
-        
-        # Clamp RH to valid range
-        rh = min(100.0, max(0.0, relative_humidity))
-        
-        # Find bracketing points
-        if rh <= min(rh_points):
-            adjustment = adjustment_data[min(rh_points)]
-        elif rh >= max(rh_points):
-            adjustment = adjustment_data[max(rh_points)]
-        else:
-            # Find two closest RH points
-            lower_rh = max(point for point in rh_points if point <= rh)
-            upper_rh = min(point for point in rh_points if point >= rh)
-            
-            # Interpolate
-            if upper_rh == lower_rh:
-                adjustment = adjustment_data[lower_rh]
-            else:
-                lower_adj = adjustment_data[lower_rh]
-                upper_adj = adjustment_data[upper_rh]
-                t = (rh - lower_rh) / (upper_rh - lower_rh)
-                adjustment = lower_adj + t * (upper_adj - lower_adj)
-        
-        return adjustment
+        return self._interpolate_rh_table(
+            self.REACTION_RH_ADJUSTMENTS[reaction_type], relative_humidity)
     
     def calculate_material_moisture(self, material: str, ambient_rh: float, 
                                    exposure_time: float) -> float:
@@ -423,113 +412,116 @@ class HumidityEffects:
         if chemical_params is None:
             chemical_params = ["formaldehyde", "voc_total", "ozone", "no2"]
             
-        # Process each cell
-        for position, cell in grid.iterate_cells():
-            # Get cell humidity and temperature
-            rh = cell.get_parameter("relative_humidity", 50.0)  # Default to 50%
-            temperature = cell.get_parameter("temperature", 25.0)  # Default to 25°C
+        # Get humidity and temperature for every cell
+        rh = grid.get_parameter_array("relative_humidity", 50.0)  # Default to 50%
+        temperature = grid.get_parameter_array("temperature", 25.0)  # Default to 25°C
+        
+        # Skip cells at standard conditions
+        active = ~((np.abs(rh - 50.0) < 1.0) & (np.abs(temperature - 25.0) < 0.1))
+        if not active.any():
+            return
+        
+        present = set(grid.get_parameter_names())
+        has_settling = None
+        
+        # 1. Process particulate parameters
+        for param in particulate_params:
+            if param not in present:
+                continue
+            current_value = grid.get_parameter_array(param, 0.0)
             
-            # Skip if at standard conditions
-            if abs(rh - 50.0) < 1.0 and abs(temperature - 25.0) < 0.1:
+            # Skip cells with no particulates present
+            cells = active & (current_value > 0.0)
+            if not cells.any():
                 continue
-                
-            # 1. Process particulate parameters
-            for param in particulate_params:
-                current_value = cell.get_parameter(param, 0.0)
-                
-                # Skip if no particulates present
-                if current_value <= 0.0:
-                    continue
-                    
-                # Determine particle type (map parameter to types in HYGROSCOPIC_GROWTH)
-                if param == "pm2.5":
-                    particle_type = "pm2.5_urban"
-                elif param == "pm10":
-                    particle_type = "pm10_urban"
-                else:
-                    particle_type = param
-                    
-                # Particles can grow due to humidity
-                # This affects concentration (µg/m³) because we're counting the water
-                if rh > 50.0:  # Only apply growth above standard RH
-                    growth_factor = self.calculate_hygroscopic_growth(
-                        particle_type, 1.0, rh) / self.calculate_hygroscopic_growth(
-                            particle_type, 1.0, 50.0)
-                            
-                    # Apply growth to concentration
-                    adjusted_value = current_value * growth_factor
-                    cell.set_parameter(param, adjusted_value)
-                
-                # Humidity affects settling rate, which alters vertical distribution
-                # This is a complex effect better handled in a separate method for
-                # vertical transport, but we use a simplified approach here
-                if "settling_velocity" in cell.get_parameter_names():
-                    base_settling = cell.get_parameter(f"{param}_settling_velocity", 0.0)
-                    if base_settling > 0:
-                        # Assume standard particle density
-                        density = 1000.0  # kg/m³, a simplification
-                        
-                        # Assume standard particle size
-                        if param == "pm2.5":
-                            size = 2.5
-                        elif param == "pm10":
-                            size = 10.0
-                        elif param == "dust":
-                            size = 15.0
-                        elif param == "pollen":
-                            size = 30.0
-                        else:
-                            size = 5.0  # Default
-                            
-                        # Calculate humidity-adjusted settling velocity
-                        adjusted_settling = self.calculate_humidity_dependent_settling(
-                            particle_type, size, density, rh, temperature)
-                            
-                        # Update settling velocity
-                        cell.set_parameter(f"{param}_settling_velocity", adjusted_settling)
-            
-            # 2. Process chemical parameters
-            for param in chemical_params:
-                current_value = cell.get_parameter(param, 0.0)
-                
-                # Skip if no chemical present
-                if current_value <= 0.0:
-                    continue
-                    
-                # Determine reaction type
-                if param == "formaldehyde":
-                    reaction_type = "formaldehyde_emission"
-                elif param == "ozone":
-                    reaction_type = "ozone_formation"
-                elif param == "no2":
-                    reaction_type = "no2_formation"
-                else:
-                    reaction_type = "voc_degradation"
-                    
-                # Apply humidity adjustment to reaction rates
-                base_rate = 0.0001 * time_step  # Base reaction rate per second
-                rh_factor = self.calculate_reaction_adjustment(reaction_type, rh)
-                
-                # Calculate change in concentration
-                if reaction_type.endswith("_emission"):
-                    # For emission processes, higher rate means more chemical produced
-                    if cell.get_parameter(f"{param}_source", 0.0) > 0:
-                        base_emission = cell.get_parameter(f"{param}_emission_rate", 0.0)
-                        adjusted_emission = base_emission * rh_factor
-                        cell.set_parameter(f"{param}_emission_rate", adjusted_emission)
-                else:
-                    # For degradation processes, higher rate means more chemical consumed
-                    degradation = current_value * base_rate * rh_factor
-                    new_value = max(0.0, current_value - degradation)
-                    cell.set_parameter(param, new_value)
-            
-            # 3. Calculate and update absolute humidity
-            abs_humidity = self.calculate_absolute_humidity(temperature, rh)
-            cell.set_parameter("absolute_humidity", abs_humidity)
-            
-            # 4. Calculate and update dew point
-            dew_point = self.calculate_dew_point(temperature, rh)
-            cell.set_parameter("dew_point", dew_point)
+            
+            # Determine particle type (map parameter to types in HYGROSCOPIC_GROWTH)
+            if param == "pm2.5":
+                particle_type = "pm2.5_urban"
+            elif param == "pm10":
+                particle_type = "pm10_urban"
+            else:
+                particle_type = param
+            
+            # Particles can grow due to humidity
+            # This affects concentration (µg/m³) because we're counting the water
+            growing = cells & (rh > 50.0)  # Only apply growth above standard RH
+            if growing.any():
+                growth_factor = self.calculate_hygroscopic_growth(
+                    particle_type, 1.0, rh[growing]) / self.calculate_hygroscopic_growth(
+                        particle_type, 1.0, 50.0)
+                adjusted_value = np.zeros(grid.dimensions)
+                adjusted_value[growing] = current_value[growing] * growth_factor
+                grid.set_parameter_where(param, adjusted_value, growing)
+            
+            # Humidity affects settling rate, which alters vertical distribution
+            # This is a complex effect better handled in a separate method for
+            # vertical transport, but we use a simplified approach here
+            if "settling_velocity" not in present:
+                continue
+            if has_settling is None:
+                has_settling = ~np.isnan(grid.get_parameter_array("settling_velocity", np.nan))
+            base_settling = grid.get_parameter_array(f"{param}_settling_velocity", 0.0)
+            settling = cells & has_settling & (base_settling > 0)
+            if not settling.any():
+                continue
+            
+            # Assume standard particle density
+            density = 1000.0  # kg/m³, a simplification
+            
+            # Assume standard particle size
+            size = {"pm2.5": 2.5, "pm10": 10.0, "dust": 15.0, "pollen": 30.0}.get(param, 5.0)
+            
+            # Calculate humidity-adjusted settling velocity
+            adjusted_settling = np.zeros(grid.dimensions)
+            adjusted_settling[settling] = self.calculate_humidity_dependent_settling(
+                particle_type, size, density, rh[settling], temperature[settling])
+            grid.set_parameter_where(f"{param}_settling_velocity", adjusted_settling, settling)
+        
+        # 2. Process chemical parameters
+        for param in chemical_params:
+            if param not in present:
+                continue
+            current_value = grid.get_parameter_array(param, 0.0)
+            
+            # Skip cells with no chemical present
+            cells = active & (current_value > 0.0)
+            if not cells.any():
+                continue
+            
+            # Determine reaction type
+            if param == "formaldehyde":
+                reaction_type = "formaldehyde_emission"
+            elif param == "ozone":
+                reaction_type = "ozone_formation"
+            elif param == "no2":
+                reaction_type = "no2_formation"
+            else:
+                reaction_type = "voc_degradation"
+            
+            # Apply humidity adjustment to reaction rates
+            base_rate = 0.0001 * time_step  # Base reaction rate per second
+            rh_factor = self.calculate_reaction_adjustment(reaction_type, rh)
+            
+            # Calculate change in concentration
+            if reaction_type.endswith("_emission"):
+                # For emission processes, higher rate means more chemical produced
+                sources = cells & (grid.get_parameter_array(f"{param}_source", 0.0) > 0)
+                base_emission = grid.get_parameter_array(f"{param}_emission_rate", 0.0)
+                grid.set_parameter_where(f"{param}_emission_rate", base_emission * rh_factor, sources)
+            else:
+                # For degradation processes, higher rate means more chemical consumed
+                degradation = current_value * base_rate * rh_factor
+                new_value = np.maximum(0.0, current_value - degradation)
+                grid.set_parameter_where(param, new_value, cells)
+        
+        # 3. Calculate and update absolute humidity
+        abs_humidity = self.calculate_absolute_humidity(temperature, rh)
+        grid.set_parameter_where("absolute_humidity", abs_humidity, active)
+        
+        # 4. Calculate and update dew point
+        dew_point = self.calculate_dew_point(temperature, rh)
+        grid.set_parameter_where("dew_point", dew_point, active)
     
     def apply_material_moisture_effects(self, grid: SpatialGrid, 
                                       materials_map: Dict[Tuple[int, int, int], str],
@@ -714,21 +706,22 @@ class HumidityManager:
         """
         Initialize humidity across the grid with ambient humidity.
         """
-        for position, cell in self.grid.iterate_cells():
-            # Only set if not already set
-            if not cell.has_parameter("relative_humidity"):
-                cell.set_parameter("relative_humidity", self.ambient_relative_humidity)
-                
-                # Also initialize absolute humidity based on temperature
-                temperature = cell.get_parameter("temperature", 25.0)
-                abs_humidity = self.humidity_effects.calculate_absolute_humidity(
-                    temperature, self.ambient_relative_humidity)
-                cell.set_parameter("absolute_humidity", abs_humidity)
-                
-                # Initialize dew point
-                dew_point = self.humidity_effects.calculate_dew_point(
-                    temperature, self.ambient_relative_humidity)
-                cell.set_parameter("dew_point", dew_point)
+        # Only set cells that do not have a humidity yet
+        unset = np.isnan(self.grid.get_parameter_array("relative_humidity", np.nan))
+        if not unset.any():
+            return
+        self.grid.set_parameter_where("relative_humidity", self.ambient_relative_humidity, unset)
+        
+        # Also initialize absolute humidity based on temperature
+        temperature = self.grid.get_parameter_array("temperature", 25.0)
+        abs_humidity = self.humidity_effects.calculate_absolute_humidity(
+            temperature, self.ambient_relative_humidity)
+        self.grid.set_parameter_where("absolute_humidity", abs_humidity, unset)
+        
+        # Initialize dew point
+        dew_point = self.humidity_effects.calculate_dew_point(
+            temperature, self.ambient_relative_humidity)
+        self.grid.set_parameter_where("dew_point", dew_point, unset)
     
     def update_humidity_distributions(self, sources: List[Tuple[Tuple[int, int, int], float]],
                                     diffusivity: float = 0.1) -> None:
@@ -739,70 +732,26 @@ class HumidityManager:
             sources: List of (position, emission_rate) tuples for humidity sources
             diffusivity: Humidity diffusion factor (0-1)
         """
-        # Create temporary storage for new values
-        new_values = {}
+        current_abs_humidity = self.grid.get_parameter_array("absolute_humidity", 0.0)
         
-        # Process each cell
-        for position, cell in self.grid.iterate_cells():
-            current_abs_humidity = cell.get_parameter("absolute_humidity", 0.0)
-            
-            # Calculate source contributions
-            source_contribution = 0.0
-            for src_pos, emission in sources:
-                # Calculate distance to source
-                distance = sum((a - b) ** 2 for a, b in zip(position, src_pos)) ** 0.5
-                
-                # Skip if too far away
-                if distance > 10:  # Limit calculation radius for efficiency
-                    continue
-                    
-                # Effect decreases with square of distance
-                if distance < 0.1:  # Avoid division by zero
-                    strength = 1.0
-                else:
-                    strength = 1.0 / (1.0 + distance ** 2)
-                    
-                # Add weighted contribution
-                source_contribution += emission * strength
-            
-            # Get neighbor humidities for diffusion
-            neighbors = cell.get_all_neighbors()
-            neighbor_humidity_sum = 0.0
-            neighbor_count = 0
-            
-            for direction, neighbor in neighbors.items():
-                if neighbor:
-                    neighbor_humidity = neighbor.get_parameter("absolute_humidity", 0.0)
-                    neighbor_humidity_sum += neighbor_humidity
-                    neighbor_count += 1
-            
-            # Calculate diffusion effect
-            if neighbor_count > 0:
-                avg_neighbor_humidity = neighbor_humidity_sum / neighbor_count
-                diffusion_effect = (avg_neighbor_humidity - current_abs_humidity) * diffusivity
-            else:
-                diffusion_effect = 0.0
-            
-            # Calculate new absolute humidity
-            new_abs_humidity = current_abs_humidity + diffusion_effect + source_contribution * diffusivity
-            
-            # Store new humidity
-            new_values[position] = new_abs_humidity
+        # Source effect decreases with square of distance
+        source_contribution = np.zeros(self.grid.dimensions)
+        for src_pos, emission in sources:
+            accumulate_point_falloff(source_contribution, src_pos, emission)
         
-        # Update all cells with new absolute humidity values
-        for position, abs_humidity in new_values.items():
-            cell = self.grid.get_cell(position)
-            if cell:
-                cell.set_parameter("absolute_humidity", abs_humidity)
-                
-                # Update relative humidity based on temperature and new absolute humidity
-                temperature = cell.get_parameter("temperature", 25.0)
-                new_rh = self.humidity_effects.calculate_relative_humidity(temperature, abs_humidity)
-                cell.set_parameter("relative_humidity", new_rh)
-                
-                # Update dew point
-                dew_point = self.humidity_effects.calculate_dew_point(temperature, new_rh)
-                cell.set_parameter("dew_point", dew_point)
+        # Diffuse towards the neighbor average and add the source effect
+        new_abs_humidity = self.grid.diffuse_array(current_abs_humidity, diffusivity)
+        new_abs_humidity += source_contribution * diffusivity
+        self.grid.set_parameter_array("absolute_humidity", new_abs_humidity)
+        
+        # Update relative humidity based on temperature and new absolute humidity
+        temperature = self.grid.get_parameter_array("temperature", 25.0)
+        new_rh = self.humidity_effects.calculate_relative_humidity(temperature, new_abs_humidity)
+        self.grid.set_parameter_array("relative_humidity", new_rh)
+        
+        # Update dew point
+        dew_point = self.humidity_effects.calculate_dew_point(temperature, new_rh)
+        self.grid.set_parameter_array("dew_point", dew_point)
     
     def update_humidity_effects(self, time_step: float) -> None:
         """
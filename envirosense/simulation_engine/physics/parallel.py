@@ -0,0 +1,359 @@
+"""
+EnviroSense Physics Engine - Parallel Grid Stepping
+
+This module runs grid physics kernels on several cores by splitting an
+array-backed SpatialGrid into slabs along one axis. Parameter arrays live in
+shared memory, so workers read the halo cells of their slab straight from
+the neighboring slabs and only slab bounds travel between processes.
+"""
+
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+from .space import SpatialGrid, neighbor_counts, diffusion_step, trilinear_sample
+
+logger = logging.getLogger(__name__)
+
+# Shared arrays attached by a pool worker, keyed like ParallelGridStepper._arrays
+_worker_blocks: Dict[Any, shared_memory.SharedMemory] = {}
+_worker_arrays: Dict[Any, np.ndarray] = {}
+
+
+def _open_shared_arrays(specs: Dict[Any, Tuple[str, Tuple[int, ...]]],
+                        dimensions: Tuple[int, int, int]) -> Tuple[Dict[Any, shared_memory.SharedMemory],
+                                                                   Dict[Any, np.ndarray]]:
+    """
+    Attach to existing shared-memory blocks and wrap them as arrays.
+    
+    Args:
+        specs: Mapping of array keys to (block name, array shape)
+        dimensions: Grid dimensions
+    
+    Returns:
+        Tuple of (blocks, arrays); the arrays also hold the grid's inverse
+        neighbor counts under the key 'inverse_counts'
+    """
+    blocks, arrays = {}, {}
+    for key, (name, shape) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks[key] = block
+        arrays[key] = np.ndarray(shape, dtype=float, buffer=block.buf)
+    
+    counts = neighbor_counts(dimensions)
+    arrays['inverse_counts'] = np.divide(1.0, counts, out=np.zeros_like(counts), where=counts > 0)
+    return blocks, arrays
+
+
+def _init_worker(specs: Dict[Any, Tuple[str, Tuple[int, ...]]],
+                 dimensions: Tuple[int, int, int]) -> None:
+    """
+    Pool initializer attaching a worker to the stepper's shared arrays.
+    
+    Args:
+        specs: Mapping of array keys to (block name, array shape)
+        dimensions: Grid dimensions
+    """
+    global _worker_blocks, _worker_arrays
+    _worker_blocks, _worker_arrays = _open_shared_arrays(specs, dimensions)
+
+
+def _run_kernel(kernel: Callable, args: Tuple) -> None:
+    """
+    Run a slab kernel in a pool worker against its attached arrays.
+    
+    Args:
+        kernel: Slab kernel function
+        args: Kernel arguments after the arrays mapping
+    """
+    kernel(_worker_arrays, *args)
+
+
+def _slab_box(bounds: Tuple[int, int], axis: int) -> Tuple[slice, ...]:
+    """
+    Build the index tuple selecting a slab of a 3D array.
+    
+    Args:
+        bounds: Slab (start, stop) along the axis
+        axis: Decomposition axis
+    
+    Returns:
+        Index tuple of slices
+    """
+    box = [slice(None)] * 3
+    box[axis] = slice(*bounds)
+    return tuple(box)
+
+
+def _diffuse_slab(arrays: Dict[Any, np.ndarray], source: Any, target: Any,
+                  bounds: Tuple[int, int], axis: int, diffusion_rate: float) -> None:
+    """
+    Apply one explicit diffusion step to a slab.
+    
+    The stencil runs on the slab plus a one-cell halo read from the
+    neighboring slabs of the source array.
+    
+    Args:
+        arrays: Shared arrays
+        source: Key of the array holding the current values
+        target: Key of the array receiving the new values
+        bounds: Slab (start, stop) along the axis
+        axis: Decomposition axis
+        diffusion_rate: Rate of diffusion (0 to 1)
+    """
+    size = arrays[source].shape[axis]
+    halo_bounds = (max(0, bounds[0] - 1), min(size, bounds[1] + 1))
+    halo = _slab_box(halo_bounds, axis)
+    
+    new_values = diffusion_step(arrays[source][halo], diffusion_rate, arrays['inverse_counts'][halo])
+    inner = _slab_box((bounds[0] - halo_bounds[0], bounds[1] - halo_bounds[0]), axis)
+    arrays[target][_slab_box(bounds, axis)] = new_values[inner]
+
+
+def _advect_slab(arrays: Dict[Any, np.ndarray], source: Any, target: Any,
+                 bounds: Tuple[int, int], axis: int, time_step: float, cell_size: float) -> None:
+    """
+    Apply one semi-Lagrangian advection step to a slab.
+    
+    Back-traced points may fall in other slabs; they are sampled directly
+    from the shared source array.
+    
+    Args:
+        arrays: Shared arrays
+        source: Key of the array holding the current values
+        target: Key of the array receiving the new values
+        bounds: Slab (start, stop) along the axis
+        axis: Decomposition axis
+        time_step: Time step in seconds
+        cell_size: Grid cell size in meters
+    """
+    box = _slab_box(bounds, axis)
+    values = arrays[source]
+    velocity = arrays['velocity'][(slice(None),) + box]
+    
+    # No significant airflow, value stays the same
+    still = np.sqrt(np.einsum('i...,i...->...', velocity, velocity)) < 0.001
+    
+    # Calculate where the air at each cell came from
+    displacement = velocity * (time_step / cell_size)
+    displacement[:, still] = 0.0
+    coordinates = np.indices(velocity.shape[1:], dtype=float)
+    coordinates[axis] += bounds[0]
+    coordinates -= displacement
+    
+    new_values = trilinear_sample(values, coordinates)
+    np.copyto(new_values, values[box], where=still)
+    arrays[target][box] = new_values
+
+
+def _decay_slab(arrays: Dict[Any, np.ndarray], source: Any, target: Any,
+                bounds: Tuple[int, int], axis: int, factor: float) -> None:
+    """
+    Scale a slab by a decay factor.
+    
+    Args:
+        arrays: Shared arrays
+        source: Key of the array holding the current values
+        target: Key of the array receiving the new values
+        bounds: Slab (start, stop) along the axis
+        axis: Decomposition axis
+        factor: Multiplier applied to every value
+    """
+    box = _slab_box(bounds, axis)
+    np.multiply(arrays[source][box], factor, out=arrays[target][box])
+
+
+class ParallelGridStepper:
+    """
+    Steps grid physics kernels in parallel over slabs of a SpatialGrid.
+    
+    The grid is split into one slab per worker along an axis. Each tracked
+    parameter is double-buffered in shared memory: every stage reads the
+    current buffer, whose halo cells belong to the neighboring slabs, and
+    writes its own slab of the other buffer, then the buffers swap. The
+    process pool completing a stage is the barrier between steps, so no
+    halo copies are needed.
+    
+    Values live in the stepper between calls; use ``write_to_grid`` to copy
+    them back and ``load_from_grid`` after changing the grid directly. Use
+    the stepper as a context manager, or call ``close`` to stop the workers
+    and release the shared memory.
+    """
+    
+    def __init__(self, grid: SpatialGrid, parameters: List[str],
+                 num_workers: Optional[int] = None, axis: int = 0):
+        """
+        Initialize the stepper and start its worker processes.
+        
+        Args:
+            grid: Array-backed spatial grid to step
+            parameters: Names of the parameters to keep in shared memory
+            num_workers: Number of worker processes, or None for one per CPU;
+                with a single worker kernels run in this process
+            axis: Grid axis to split into slabs
+        """
+        if not grid.is_array_backed:
+            raise ValueError("Parallel stepping requires array storage")
+        if axis not in (0, 1, 2):
+            raise ValueError(f"Invalid axis: {axis}. Must be 0, 1 or 2")
+        
+        self.grid = grid
+        self.parameters = list(parameters)
+        self.axis = axis
+        
+        # Slab bounds along the axis, at most one per worker
+        num_workers = num_workers or os.cpu_count() or 1
+        size = grid.dimensions[axis]
+        edges = np.linspace(0, size, min(num_workers, size) + 1).round().astype(int)
+        self.slabs = [(int(lo), int(hi)) for lo, hi in zip(edges[:-1], edges[1:]) if hi > lo]
+        
+        # Two buffers per parameter plus the velocity field
+        shapes = {(name, buffer): grid.dimensions for name in self.parameters for buffer in (0, 1)}
+        shapes['velocity'] = (3,) + grid.dimensions
+        self._owned_blocks = []
+        specs = {}
+        for key, shape in shapes.items():
+            block = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+            self._owned_blocks.append(block)
+            specs[key] = (block.name, shape)
+        
+        self._blocks, self._arrays = _open_shared_arrays(specs, grid.dimensions)
+        self._arrays['velocity'].fill(0.0)
+        
+        # Index of the buffer holding each parameter's current values
+        self._current = {name: 0 for name in self.parameters}
+        self.load_from_grid()
+        
+        self._executor = None
+        if len(self.slabs) > 1:
+            self._executor = ProcessPoolExecutor(max_workers=len(self.slabs),
+                                                 initializer=_init_worker,
+                                                 initargs=(specs, grid.dimensions))
+    
+    def __enter__(self) -> 'ParallelGridStepper':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Stop the worker processes and release the shared memory."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        
+        self._arrays = {}
+        for block in self._blocks.values():
+            block.close()
+        self._blocks = {}
+        for block in self._owned_blocks:
+            block.close()
+            block.unlink()
+        self._owned_blocks = []
+    
+    def load_from_grid(self) -> None:
+        """Copy the tracked parameters from the grid into shared memory."""
+        for name in self.parameters:
+            self._arrays[(name, self._current[name])][...] = self.grid.get_parameter_array(name, 0.0)
+    
+    def write_to_grid(self) -> None:
+        """Copy the tracked parameters from shared memory back into the grid."""
+        for name in self.parameters:
+            self.grid.set_parameter_array(name, self.get_parameter_array(name))
+    
+    def get_parameter_array(self, name: str) -> np.ndarray:
+        """
+        Get a copy of a tracked parameter's current values.
+        
+        Args:
+            name: Parameter name
+        
+        Returns:
+            Array of shape ``grid.dimensions``
+        """
+        return self._arrays[(name, self._current[name])].copy()
+    
+    def set_velocity_field(self, velocity: np.ndarray) -> None:
+        """
+        Set the velocity field used for advection.
+        
+        Args:
+            velocity: Array of shape (3, width, length, height) in m/s, e.g.
+                from ``AirflowModel.get_velocity_array``
+        """
+        self._arrays['velocity'][...] = velocity
+    
+    def _run_stage(self, kernel: Callable, parameters: List[str], *args) -> None:
+        """
+        Run a slab kernel over every slab of several parameters and swap buffers.
+        
+        Args:
+            kernel: Slab kernel function
+            parameters: Names of the parameters to update
+            *args: Extra kernel arguments after the slab bounds and axis
+        """
+        tasks = []
+        for name in parameters:
+            source = (name, self._current[name])
+            target = (name, 1 - self._current[name])
+            tasks.extend((source, target, bounds, self.axis) + args for bounds in self.slabs)
+        
+        if self._executor is None:
+            for task in tasks:
+                kernel(self._arrays, *task)
+        else:
+            # Consuming the results waits for every slab and re-raises errors
+            list(self._executor.map(_run_kernel, [kernel] * len(tasks), tasks))
+        
+        for name in parameters:
+            self._current[name] = 1 - self._current[name]
+    
+    def diffuse(self, parameter: str, diffusion_rate: float) -> None:
+        """
+        Diffuse a parameter with the explicit neighbor-averaged stencil.
+        
+        Args:
+            parameter: Name of the parameter to diffuse
+            diffusion_rate: Rate of diffusion (0 to 1)
+        """
+        self._run_stage(_diffuse_slab, [parameter], diffusion_rate)
+    
+    def advect(self, parameter: str, time_step: float) -> None:
+        """
+        Advect a parameter along the velocity field (semi-Lagrangian).
+        
+        Args:
+            parameter: Name of the parameter to advect
+            time_step: Time step in seconds
+        """
+        self._run_stage(_advect_slab, [parameter], time_step, self.grid.cell_size)
+    
+    def decay(self, parameter: str, factor: float) -> None:
+        """
+        Scale a parameter by a decay factor (e.g. air exchange or first-order decay).
+        
+        Args:
+            parameter: Name of the parameter to decay
+            factor: Multiplier applied to every value
+        """
+        self._run_stage(_decay_slab, [parameter], factor)
+    
+    def step(self, diffusion_rate: float, time_step: float, decay_factor: float = 1.0,
+             parameters: Optional[List[str]] = None) -> None:
+        """
+        Advect, diffuse and decay several parameters, one pool stage per kernel.
+        
+        Args:
+            diffusion_rate: Rate of diffusion (0 to 1)
+            time_step: Time step for advection in seconds
+            decay_factor: Multiplier applied after diffusion (1 for no decay)
+            parameters: Names of the parameters to update, or None for all
+        """
+        parameters = self.parameters if parameters is None else parameters
+        if self._arrays['velocity'].any():
+            self._run_stage(_advect_slab, parameters, time_step, self.grid.cell_size)
+        self._run_stage(_diffuse_slab, parameters, diffusion_rate)
+        if decay_factor != 1.0:
+            self._run_stage(_decay_slab, parameters, decay_factor)
@@ -0,0 +1,315 @@
+"""
+EnviroSense Physics Engine - Grid Snapshot Store
+
+This module provides a chunked on-disk store for time series of SpatialGrid
+parameter fields. Snapshots are appended to fixed-size ``.npy`` chunk files
+that are memory-mapped, so long runs never hold their history in RAM and
+readers load only the time range and sub-volume they slice.
+"""
+
+import os
+import json
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import logging
+from .space import SpatialGrid
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILE = "metadata.json"
+STORE_VERSION = 1
+
+
+def _chunk_path(path: str, parameter_index: int, chunk: int) -> str:
+    """
+    Get the file path of a parameter's chunk.
+    
+    Args:
+        path: Store directory
+        parameter_index: Index of the parameter in the store's parameter list
+        chunk: Chunk number
+    
+    Returns:
+        Path of the chunk's ``.npy`` file
+    """
+    return os.path.join(path, f"p{parameter_index}", f"chunk_{chunk:06d}.npy")
+
+
+class SnapshotWriter:
+    """
+    Appends SpatialGrid parameter fields to a chunked on-disk store.
+    
+    Each parameter is stored as a sequence of memory-mapped chunk files of
+    shape (chunk_steps, width, length, height). Only the chunk being filled
+    is open, so memory use does not grow with the length of the run. The
+    metadata (parameters, dimensions and snapshot times) is rewritten when a
+    chunk fills up and on ``flush``/``close``; readers see the snapshots
+    recorded up to then.
+    """
+    
+    def __init__(self, path: str, parameters: List[str], dimensions: Tuple[int, int, int],
+                 chunk_steps: int = 16, dtype: Union[str, np.dtype] = np.float32,
+                 cell_size: Optional[float] = None):
+        """
+        Create a new snapshot store.
+        
+        Args:
+            path: Directory for the store (created if needed)
+            parameters: Names of the parameters to record
+            dimensions: Grid dimensions (width, length, height)
+            chunk_steps: Number of snapshots per chunk file
+            dtype: Storage data type (float32 halves the size of float64)
+            cell_size: Optional grid cell size in meters, kept in the metadata
+        
+        Raises:
+            FileExistsError: If the directory already holds a store
+        """
+        if chunk_steps < 1:
+            raise ValueError(f"chunk_steps must be at least 1, got {chunk_steps}")
+        if os.path.exists(os.path.join(path, METADATA_FILE)):
+            raise FileExistsError(f"A snapshot store already exists at {path}")
+        
+        self.path = path
+        self.parameters = list(parameters)
+        self.dimensions = tuple(int(d) for d in dimensions)
+        self.chunk_steps = int(chunk_steps)
+        self.dtype = np.dtype(dtype)
+        self.cell_size = cell_size
+        self.times: List[float] = []
+        
+        # Open chunk memmaps of the chunk being filled, one per parameter
+        self._chunks: List[Optional[np.memmap]] = [None] * len(self.parameters)
+        self._closed = False
+        
+        for index in range(len(self.parameters)):
+            os.makedirs(os.path.join(path, f"p{index}"), exist_ok=True)
+        self._write_metadata()
+    
+    @classmethod
+    def for_grid(cls, path: str, grid: SpatialGrid, parameters: List[str],
+                 **kwargs) -> 'SnapshotWriter':
+        """
+        Create a store matching a grid's dimensions and cell size.
+        
+        Args:
+            path: Directory for the store
+            grid: Grid that will be recorded
+            parameters: Names of the parameters to record
+            **kwargs: Further SnapshotWriter arguments
+        
+        Returns:
+            New SnapshotWriter
+        """
+        return cls(path, parameters, grid.dimensions, cell_size=grid.cell_size, **kwargs)
+    
+    def __enter__(self) -> 'SnapshotWriter':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    @property
+    def num_steps(self) -> int:
+        """Number of snapshots written."""
+        return len(self.times)
+    
+    def append(self, grid: SpatialGrid, time: Optional[float] = None) -> int:
+        """
+        Append a snapshot of the recorded parameters.
+        
+        Args:
+            grid: Grid to record; cells where a parameter is unset store 0
+            time: Simulation time of the snapshot, or None for the step number
+        
+        Returns:
+            Step index of the new snapshot
+        
+        Raises:
+            ValueError: If the writer is closed or the grid dimensions do not match
+        """
+        self._check_open()
+        if tuple(grid.dimensions) != self.dimensions:
+            raise ValueError(f"Grid dimensions {grid.dimensions} do not match store "
+                             f"dimensions {self.dimensions}")
+        
+        step = self.num_steps
+        chunk, slot = divmod(step, self.chunk_steps)
+        for index, name in enumerate(self.parameters):
+            if slot == 0:
+                self._chunks[index] = np.lib.format.open_memmap(
+                    _chunk_path(self.path, index, chunk), mode='w+', dtype=self.dtype,
+                    shape=(self.chunk_steps,) + self.dimensions)
+            self._chunks[index][slot] = grid.get_parameter_array(name, 0.0)
+        
+        self.times.append(float(step if time is None else time))
+        
+        # A full chunk is final; flush it and publish it to readers
+        if slot == self.chunk_steps - 1:
+            self.flush()
+            self._chunks = [None] * len(self.parameters)
+        return step
+    
+    def flush(self) -> None:
+        """Flush the open chunks to disk and update the metadata."""
+        self._check_open()
+        for chunk in self._chunks:
+            if chunk is not None:
+                chunk.flush()
+        self._write_metadata()
+    
+    def close(self) -> None:
+        """Flush and close the store. Closing an already closed store does nothing."""
+        if self._closed:
+            return
+        self.flush()
+        self._chunks = [None] * len(self.parameters)
+        self._closed = True
+    
+    def _check_open(self) -> None:
+        """Raise ValueError if the store has been closed."""
+        if self._closed:
+            raise ValueError("SnapshotWriter is closed")
+    
+    def _write_metadata(self) -> None:
+        """Atomically rewrite the store metadata."""
+        metadata = {
+            'version': STORE_VERSION,
+            'parameters': self.parameters,
+            'dimensions': list(self.dimensions),
+            'chunk_steps': self.chunk_steps,
+            'dtype': self.dtype.str,
+            'cell_size': self.cell_size,
+            'times': self.times,
+        }
+        
+        temporary = os.path.join(self.path, METADATA_FILE + ".tmp")
+        with open(temporary, 'w') as f:
+            json.dump(metadata, f)
+        os.replace(temporary, os.path.join(self.path, METADATA_FILE))
+
+
+class SnapshotReader:
+    """
+    Lazily reads snapshots from a store written by SnapshotWriter.
+    
+    Chunk files are memory-mapped on first access, and ``read`` copies only
+    the requested steps and sub-volume into memory.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a snapshot store.
+        
+        Args:
+            path: Store directory
+        """
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            metadata = json.load(f)
+        
+        self.path = path
+        self.parameters: List[str] = metadata['parameters']
+        self.dimensions = tuple(metadata['dimensions'])
+        self.chunk_steps = int(metadata['chunk_steps'])
+        self.dtype = np.dtype(metadata['dtype'])
+        self.cell_size = metadata.get('cell_size')
+        self.times = np.asarray(metadata['times'], dtype=float)
+        
+        self._parameter_index = {name: index for index, name in enumerate(self.parameters)}
+        self._chunks: Dict[Tuple[int, int], np.memmap] = {}
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    @property
+    def num_steps(self) -> int:
+        """Number of snapshots in the store."""
+        return len(self.times)
+    
+    def find_step(self, time: float) -> int:
+        """
+        Find the snapshot closest to a simulation time.
+        
+        Args:
+            time: Simulation time
+        
+        Returns:
+            Step index of the nearest snapshot
+        """
+        if not self.num_steps:
+            raise ValueError("The snapshot store is empty")
+        return int(np.argmin(np.abs(self.times - time)))
+    
+    def _chunk(self, parameter_index: int, chunk: int) -> np.memmap:
+        """
+        Get the memory map of a chunk file, opening it on first use.
+        
+        Args:
+            parameter_index: Index of the parameter
+            chunk: Chunk number
+        
+        Returns:
+            Read-only memory map of shape (chunk_steps, *dimensions)
+        """
+        key = (parameter_index, chunk)
+        if key not in self._chunks:
+            self._chunks[key] = np.load(_chunk_path(self.path, parameter_index, chunk), mmap_mode='r')
+        return self._chunks[key]
+    
+    def read(self, parameter: str, steps: Union[int, slice, Sequence[int], None] = None,
+             region: Optional[Tuple[Union[int, slice], ...]] = None) -> np.ndarray:
+        """
+        Read a parameter over a range of steps and an optional sub-volume.
+        
+        Args:
+            parameter: Parameter name
+            steps: Step index, slice or sequence of indices (None for all)
+            region: Optional index tuple into the grid dimensions, e.g.
+                ``(slice(0, 10), slice(None), 5)`` for part of one layer
+        
+        Returns:
+            Array of shape (steps, *region shape), or the region shape when
+            ``steps`` is a single index
+        """
+        if parameter not in self._parameter_index:
+            raise ValueError(f"Unknown parameter: {parameter}. "
+                             f"Store contains {self.parameters}")
+        parameter_index = self._parameter_index[parameter]
+        
+        indices = np.arange(self.num_steps)[slice(None) if steps is None else steps]
+        single = np.ndim(indices) == 0
+        indices = np.atleast_1d(indices)
+        region = tuple(region) if region is not None else ()
+        
+        # Read each chunk's share of the steps, as a slice where contiguous
+        pieces = []
+        chunks = indices // self.chunk_steps
+        boundaries = np.flatnonzero(np.diff(chunks)) + 1
+        for group in np.split(np.arange(len(indices)), boundaries):
+            if not len(group):
+                continue
+            local = indices[group] % self.chunk_steps
+            mapped = self._chunk(parameter_index, int(chunks[group[0]]))
+            if np.all(np.diff(local) == 1):
+                pieces.append(np.array(mapped[(slice(local[0], local[-1] + 1),) + region]))
+            else:
+                pieces.append(np.array(mapped[(local,) + region]))
+        
+        if not pieces:
+            shape = np.empty(self.dimensions, dtype=bool)[region].shape
+            return np.empty((0,) + shape, dtype=self.dtype)
+        
+        result = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+        return result[0] if single else result
+    
+    def get_snapshot(self, parameter: str, step: int) -> np.ndarray:
+        """
+        Read one full snapshot of a parameter.
+        
+        Args:
+            parameter: Parameter name
+            step: Step index
+        
+        Returns:
+            Array of shape ``dimensions``
+        """
+        return self.read(parameter, int(step))
@@ -6,12 +6,334 @@ that models physical environments for environmental simulations.
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Union, Any
+import scipy.sparse as sp
+from collections.abc import Mapping
+from typing import Dict, List, Tuple, Optional, Union, Any, Iterator
 import logging
+from .implicit_diffusion import ImplicitDiffusionSolver
 
 logger = logging.getLogger(__name__)
 
 
+def axis_slices(ndim: int, axis: int) -> Tuple[Tuple[slice, ...], Tuple[slice, ...]]:
+    """
+    Build index tuples selecting the lower and upper overlapping halves of an axis.
+    
+    Args:
+        ndim: Number of array dimensions
+        axis: Axis to shift along
+        
+    Returns:
+        Tuple of (lower, upper) index tuples, where ``lower`` drops the last
+        cell along the axis and ``upper`` drops the first
+    """
+    lower = [slice(None)] * ndim
+    upper = [slice(None)] * ndim
+    lower[axis] = slice(None, -1)
+    upper[axis] = slice(1, None)
+    return tuple(lower), tuple(upper)
+
+
+def neighbor_counts(shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Count the in-grid face neighbors of every cell.
+    
+    Args:
+        shape: Grid shape
+        
+    Returns:
+        Array of neighbor counts (6 in the interior, fewer on faces and edges)
+    """
+    counts = np.zeros(shape)
+    for axis in range(len(shape)):
+        lower, upper = axis_slices(len(shape), axis)
+        counts[upper] += 1.0
+        counts[lower] += 1.0
+    return counts
+
+
+def full_box(shape: Tuple[int, ...]) -> Tuple[slice, ...]:
+    """
+    Build a box covering a whole grid.
+    
+    Args:
+        shape: Grid shape
+        
+    Returns:
+        Tuple of slices with explicit bounds, one per axis
+    """
+    return tuple(slice(0, int(size)) for size in shape)
+
+
+def expand_box(box: Tuple[slice, ...], reach: Union[int, Tuple[int, ...]],
+               shape: Tuple[int, ...]) -> Tuple[slice, ...]:
+    """
+    Grow a box by a number of cells on every side, clipped to the grid.
+    
+    Args:
+        box: Tuple of slices with explicit bounds
+        reach: Cells to add on each side, either for all axes or per axis
+        shape: Grid shape
+        
+    Returns:
+        The expanded box
+    """
+    if np.isscalar(reach):
+        reach = (reach,) * len(box)
+    return tuple(
+        slice(max(0, b.start - int(r)), min(int(size), b.stop + int(r)))
+        for b, r, size in zip(box, reach, shape)
+    )
+
+
+def relative_box(box: Tuple[slice, ...], container: Tuple[slice, ...]) -> Tuple[slice, ...]:
+    """
+    Express a box relative to the start of a box that contains it.
+    
+    Args:
+        box: Inner box
+        container: Outer box
+        
+    Returns:
+        Slices selecting ``box`` from an array covering ``container``
+    """
+    return tuple(slice(b.start - c.start, b.stop - c.start) for b, c in zip(box, container))
+
+
+def box_indices(box: Tuple[slice, ...], shape: Tuple[int, ...]) -> np.ndarray:
+    """
+    Get the flat (C-order) indices of the cells in a box.
+    
+    Args:
+        box: Tuple of slices with explicit bounds
+        shape: Grid shape
+        
+    Returns:
+        Flat indices in the order of ``values[box].ravel()``
+    """
+    return np.ravel_multi_index(np.ix_(*(np.arange(b.start, b.stop) for b in box)), shape).ravel()
+
+
+def active_box(values: np.ndarray, epsilon: float,
+               within: Optional[Tuple[slice, ...]] = None) -> Optional[Tuple[slice, ...]]:
+    """
+    Find the bounding box of the cells whose magnitude exceeds a threshold.
+    
+    Args:
+        values: Parameter values
+        epsilon: Cells with ``abs(value) <= epsilon`` are inactive
+        within: Optional box known to contain every active cell; only this
+            box is scanned
+        
+    Returns:
+        Bounding box of the active cells, or None if no cell is active
+    """
+    if within is None:
+        within = full_box(values.shape)
+    active = np.abs(values[within]) > epsilon
+    if not active.any():
+        return None
+    
+    box = []
+    for axis, bounds in enumerate(within):
+        others = tuple(a for a in range(active.ndim) if a != axis)
+        hits = np.flatnonzero(active.any(axis=others))
+        box.append(slice(bounds.start + int(hits[0]), bounds.start + int(hits[-1]) + 1))
+    return tuple(box)
+
+
+def diffusion_step(values: np.ndarray, diffusion_rate: float,
+                   inverse_neighbor_counts: np.ndarray,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Apply one explicit step of the 6-point neighbor-averaged diffusion stencil.
+    
+    Each cell moves towards the mean of its in-grid face neighbors:
+    ``new = v + rate * (sum(neighbors) / count - v)``, which is the same
+    neighbor-count normalization used by the per-cell implementation.
+    Cells outside the grid do not contribute, giving zero-flux edges.
+    
+    Leading axes beyond those of ``inverse_neighbor_counts`` are treated as
+    a stack of independent grids, so several parameters stacked into one
+    (P, nx, ny, nz) array diffuse in a single pass.
+    
+    Args:
+        values: Parameter values, optionally stacked along leading axes
+        diffusion_rate: Rate of diffusion (0 to 1)
+        inverse_neighbor_counts: Reciprocal of the neighbor count of each cell
+        out: Optional output buffer (must not alias ``values``)
+        
+    Returns:
+        Array of diffused values (``out`` if provided)
+    """
+    if out is None:
+        out = np.empty_like(values)
+    out.fill(0.0)
+    
+    # Sum the face neighbors along each grid axis
+    for axis in range(values.ndim - inverse_neighbor_counts.ndim, values.ndim):
+        lower, upper = axis_slices(values.ndim, axis)
+        out[upper] += values[lower]
+        out[lower] += values[upper]
+    
+    # Relax towards the neighbor mean, in place
+    out *= inverse_neighbor_counts
+    out -= values
+    out *= diffusion_rate
+    out += values
+    return out
+
+
+def trilinear_stencil(coordinates: np.ndarray,
+                      shape: Tuple[int, ...]) -> Tuple[Tuple[np.ndarray, ...],
+                                                       Tuple[np.ndarray, ...],
+                                                       Tuple[np.ndarray, ...]]:
+    """
+    Precompute trilinear interpolation indices and weights.
+    
+    Coordinates are clamped to the grid, so samples outside it take the
+    value of the nearest face. The result can be reused with
+    ``trilinear_gather`` for any number of arrays of the same shape.
+    
+    Args:
+        coordinates: Array of shape (3, ...) holding fractional grid indices
+        shape: Shape of the arrays that will be sampled
+        
+    Returns:
+        Tuple of (lower indices, upper indices, fractions), one entry per axis
+    """
+    lower, upper, fractions = [], [], []
+    for axis, size in enumerate(shape):
+        coord = np.clip(coordinates[axis], 0.0, size - 1)
+        base = np.minimum(np.floor(coord).astype(np.intp), max(size - 2, 0))
+        lower.append(base)
+        upper.append(np.minimum(base + 1, size - 1))
+        fractions.append(coord - base)
+    return tuple(lower), tuple(upper), tuple(fractions)
+
+
+def trilinear_gather(values: np.ndarray,
+                     stencil: Tuple[Tuple[np.ndarray, ...],
+                                    Tuple[np.ndarray, ...],
+                                    Tuple[np.ndarray, ...]]) -> np.ndarray:
+    """
+    Sample a 3D array with a precomputed trilinear stencil.
+    
+    Args:
+        values: Array to sample
+        stencil: Result of ``trilinear_stencil`` for ``values.shape``
+        
+    Returns:
+        Interpolated values with the shape of the stencil coordinates
+    """
+    (x0, y0, z0), _, (fx, fy, fz) = stencil
+    nx, ny, nz = values.shape
+    
+    # Gather corners from the flattened array: the upper corner on an axis is
+    # one stride past the lower one, or the same node on axes of length 1
+    flat = values.ravel()
+    dx = ny * nz if nx > 1 else 0
+    dy = nz if ny > 1 else 0
+    dz = 1 if nz > 1 else 0
+    i00 = (x0 * ny + y0) * nz + z0
+    i01 = i00 + dy
+    i10 = i00 + dx
+    i11 = i10 + dy
+    
+    def along_z(index: np.ndarray) -> np.ndarray:
+        lower = flat[index]
+        return lower + fz * (flat[index + dz] - lower)
+    
+    # Interpolate along z, then y, then x
+    c00 = along_z(i00)
+    c01 = along_z(i01)
+    c10 = along_z(i10)
+    c11 = along_z(i11)
+    c0 = c00 + fy * (c01 - c00)
+    c1 = c10 + fy * (c11 - c10)
+    return c0 + fx * (c1 - c0)
+
+
+def trilinear_matrix(stencil: Tuple[Tuple[np.ndarray, ...],
+                                    Tuple[np.ndarray, ...],
+                                    Tuple[np.ndarray, ...]],
+                     shape: Tuple[int, int, int]) -> sp.csr_matrix:
+    """
+    Express a trilinear stencil as a sparse interpolation matrix.
+    
+    Row ``i`` holds the weights of the (up to eight) cells sampled for the
+    ``i``-th stencil point, so ``matrix @ values.ravel()`` equals
+    ``trilinear_gather(values, stencil).ravel()``. Multiplying a matrix of
+    flattened arrays samples all of them in one pass, and zero weights are
+    dropped so points on grid nodes copy their cell exactly.
+    
+    Args:
+        stencil: Result of ``trilinear_stencil``
+        shape: Shape of the arrays that will be sampled
+        
+    Returns:
+        Sparse matrix of shape (number of stencil points, prod(shape))
+    """
+    (x0, y0, z0), (x1, y1, z1), (fx, fy, fz) = stencil
+    size = int(np.prod(shape))
+    points = int(np.size(fx))
+    rows = np.arange(points)
+    
+    indices, weights = [], []
+    for xi, wx in ((x0, 1.0 - fx), (x1, fx)):
+        for yi, wy in ((y0, 1.0 - fy), (y1, fy)):
+            for zi, wz in ((z0, 1.0 - fz), (z1, fz)):
+                indices.append(np.ravel_multi_index((xi, yi, zi), shape).ravel())
+                weights.append((wx * wy * wz).ravel())
+    
+    matrix = sp.csr_matrix((np.concatenate(weights), (np.tile(rows, 8), np.concatenate(indices))),
+                           shape=(points, size))
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def trilinear_sample(values: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    """
+    Sample a 3D array at fractional grid indices with trilinear interpolation.
+    
+    Args:
+        values: Array to sample
+        coordinates: Array of shape (3, ...) holding fractional grid indices
+        
+    Returns:
+        Interpolated values with the shape of ``coordinates[0]``
+    """
+    return trilinear_gather(values, trilinear_stencil(coordinates, values.shape))
+
+
+def accumulate_point_falloff(field: np.ndarray, position: Tuple[float, float, float],
+                             weight: float, max_distance: float = 10.0) -> None:
+    """
+    Add a point source with inverse-square falloff to a grid array in place.
+    
+    Cells at grid distance ``d`` receive ``weight / (1 + d**2)`` (``weight``
+    when ``d < 0.1``), and cells beyond ``max_distance`` are untouched.
+    Only the bounding box of the source's reach is visited.
+    
+    Args:
+        field: Array to accumulate into
+        position: Source position in grid coordinates
+        weight: Contribution at the source position
+        max_distance: Reach of the source in grid cells
+    """
+    lower = [max(0, int(np.floor(p - max_distance))) for p in position]
+    upper = [min(n, int(np.floor(p + max_distance)) + 1) for p, n in zip(position, field.shape)]
+    if any(lo >= hi for lo, hi in zip(lower, upper)):
+        return
+    
+    dx, dy, dz = np.ogrid[lower[0]:upper[0], lower[1]:upper[1], lower[2]:upper[2]]
+    dist_sq = (dx - position[0]) ** 2 + (dy - position[1]) ** 2 + (dz - position[2]) ** 2
+    
+    strength = np.where(dist_sq < 0.01, 1.0, 1.0 / (1.0 + dist_sq))
+    strength[dist_sq > max_distance ** 2] = 0.0
+    field[lower[0]:upper[0], lower[1]:upper[1], lower[2]:upper[2]] += weight * strength
+
+
 class GridCell:
     """
     Represents a discrete cell in the spatial grid.
@@ -56,6 +378,27 @@ class GridCell:
         """
         return self.parameters.get(name, default)
     
+    def has_parameter(self, name: str) -> bool:
+        """
+        Check whether an environmental parameter is set in this cell.
+        
+        Args:
+            name: Parameter name
+            
+        Returns:
+            True if the parameter has a value in this cell
+        """
+        return name in self.parameters
+    
+    def get_parameter_names(self) -> List[str]:
+        """
+        Get the names of all parameters set in this cell.
+        
+        Returns:
+            List of parameter names
+        """
+        return list(self.parameters.keys())
+    
     def add_neighbor(self, direction: str, cell: 'GridCell') -> None:
         """
         Add a reference to a neighboring cell.
@@ -89,6 +432,184 @@ class GridCell:
         return self.neighbors
 
 
+class GridCellView(GridCell):
+    """
+    Lightweight view of a single cell in an array-backed SpatialGrid.
+    
+    Views hold no parameter state of their own; every read and write goes
+    straight to the grid's per-parameter arrays. They are created on demand
+    so that cell-oriented code keeps working against array storage.
+    """
+    
+    __slots__ = ('_grid', 'position')
+    
+    def __init__(self, grid: 'SpatialGrid', position: Tuple[int, int, int]):
+        """
+        Initialize a view of the cell at the specified position.
+        
+        Args:
+            grid: The array-backed grid that owns the cell
+            position: Tuple of (x, y, z) indices in the grid
+        """
+        self._grid = grid
+        self.position = position
+    
+    @property
+    def volume(self) -> float:
+        """Cell volume in cubic meters."""
+        return self._grid.cell_size ** 3
+    
+    @property
+    def parameters(self) -> Dict[str, float]:
+        """Snapshot of the parameters set in this cell."""
+        return {
+            name: float(values[self.position])
+            for name, values in self._grid.fields.items()
+            if not np.isnan(values[self.position])
+        }
+    
+    @property
+    def neighbors(self) -> Dict[str, 'GridCellView']:
+        """Views of the neighboring cells keyed by direction."""
+        return self.get_all_neighbors()
+    
+    def set_parameter(self, name: str, value: float) -> None:
+        """
+        Set the value of an environmental parameter in this cell.
+        
+        Args:
+            name: Parameter name
+            value: Parameter value
+        """
+        self._grid._field_for_write(name)[self.position] = value
+        self._grid._include_in_active_region(name, self.position)
+    
+    def get_parameter(self, name: str, default: float = 0.0) -> float:
+        """
+        Get the value of an environmental parameter in this cell.
+        
+        Args:
+            name: Parameter name
+            default: Default value if parameter is not present
+            
+        Returns:
+            The parameter value
+        """
+        values = self._grid.fields.get(name)
+        if values is None:
+            return default
+        value = values[self.position]
+        if np.isnan(value):
+            return default
+        return float(value)
+    
+    def has_parameter(self, name: str) -> bool:
+        """
+        Check whether an environmental parameter is set in this cell.
+        
+        Args:
+            name: Parameter name
+            
+        Returns:
+            True if the parameter has a value in this cell
+        """
+        values = self._grid.fields.get(name)
+        return values is not None and not np.isnan(values[self.position])
+    
+    def get_parameter_names(self) -> List[str]:
+        """
+        Get the names of all parameters set in this cell.
+        
+        Returns:
+            List of parameter names
+        """
+        return [name for name in self._grid.fields if self.has_parameter(name)]
+    
+    def add_neighbor(self, direction: str, cell: GridCell) -> None:
+        """
+        Neighbors are implied by array adjacency and cannot be rewired.
+        
+        Args:
+            direction: Label for the neighbor direction
+            cell: The neighboring GridCell
+            
+        Raises:
+            TypeError: Always, since array-backed grids do not support rewiring neighbors
+        """
+        raise TypeError("Array-backed grids do not support rewiring neighbors; "
+                        "neighbors are derived from cell indices")
+    
+    def get_neighbor(self, direction: str) -> Optional['GridCellView']:
+        """
+        Get a view of a neighboring cell.
+        
+        Args:
+            direction: Label for the neighbor direction
+            
+        Returns:
+            The neighboring cell view, or None if no neighbor exists
+        """
+        offset = SpatialGrid.CARDINAL_DIRECTIONS.get(direction)
+        if offset is None:
+            return None
+        return self._grid.get_cell(tuple(p + d for p, d in zip(self.position, offset)))
+    
+    def get_all_neighbors(self) -> Dict[str, 'GridCellView']:
+        """
+        Get views of all neighboring cells.
+        
+        Returns:
+            Dictionary mapping directions to neighboring cell views
+        """
+        neighbors = {}
+        for direction in SpatialGrid.CARDINAL_DIRECTIONS:
+            neighbor = self.get_neighbor(direction)
+            if neighbor is not None:
+                neighbors[direction] = neighbor
+        return neighbors
+
+
+class GridCellMapping(Mapping):
+    """
+    Read-only position -> cell mapping for array-backed grids.
+    
+    Stands in for the ``SpatialGrid.grid`` dictionary so that code
+    indexing cells by position works unchanged, while cell views are only
+    materialized when accessed.
+    """
+    
+    def __init__(self, grid: 'SpatialGrid'):
+        """
+        Initialize the mapping.
+        
+        Args:
+            grid: The array-backed grid to expose
+        """
+        self._grid = grid
+    
+    def __getitem__(self, position: Tuple[int, int, int]) -> GridCellView:
+        if not self._grid.is_position_valid(position):
+            raise KeyError(position)
+        return GridCellView(self._grid, tuple(position))
+    
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        width, length, height = self._grid.dimensions
+        for x in range(width):
+            for y in range(length):
+                for z in range(height):
+                    yield (x, y, z)
+    
+    def __len__(self) -> int:
+        width, length, height = self._grid.dimensions
+        return width * length * height
+    
+    def __contains__(self, position: object) -> bool:
+        try:
+            return self._grid.is_position_valid(position)
+        except (TypeError, ValueError):
+            return False
+
+
 class SpatialGrid:
     """
     Implements a 3D discretized space with configurable resolution.
@@ -96,8 +617,23 @@ class SpatialGrid:
     The grid stores environmental parameters at each point and provides
     methods for propagating values between grid points to simulate
     environmental physics.
+    
+    Two storage engines are available. ``cells`` keeps one GridCell object
+    per position with explicit neighbor links. ``array`` keeps one
+    contiguous float array of shape ``dimensions`` per parameter (unset
+    cells hold NaN) and exposes cells as on-demand views, which uses far
+    less memory and lets physics kernels operate on whole arrays.
     """
     
+    # Storage engines
+    STORAGE_CELLS = "cells"
+    STORAGE_ARRAY = "array"
+    
+    # Diffusion time-stepping schemes
+    DIFFUSION_EXPLICIT = "explicit"
+    DIFFUSION_CRANK_NICOLSON = ImplicitDiffusionSolver.SCHEME_CRANK_NICOLSON
+    DIFFUSION_BACKWARD_EULER = ImplicitDiffusionSolver.SCHEME_BACKWARD_EULER
+    
     # Direction vectors for six cardinal directions (3D)
     CARDINAL_DIRECTIONS = {
         'east': (1, 0, 0),
@@ -108,21 +644,56 @@ class SpatialGrid:
         'down': (0, 0, -1)
     }
     
-    def __init__(self, dimensions: Tuple[int, int, int], cell_size: float = 0.1):
+    def __init__(self, dimensions: Tuple[int, int, int], cell_size: float = 0.1,
+                 storage: str = STORAGE_CELLS):
         """
         Initialize the spatial grid with the specified dimensions.
         
         Args:
             dimensions: Tuple of (width, length, height) in grid cells
             cell_size: Size of each grid cell in meters
+            storage: Storage engine, either 'cells' or 'array'
         """
-        self.dimensions = dimensions
+        if storage not in (self.STORAGE_CELLS, self.STORAGE_ARRAY):
+            raise ValueError(f"Invalid storage: {storage}. Must be 'cells' or 'array'.")
+        
+        self.dimensions = tuple(int(d) for d in dimensions)
         self.cell_size = cell_size
-        self.grid = {}  # Dictionary mapping position tuples to GridCell objects
+        self.storage = storage
         self.boundaries = {}  # Dictionary of boundary conditions
         
-        # Initialize grid cells
-        self._initialize_grid()
+        # Per-parameter arrays (array storage only) and the names of
+        # arrays that may still contain unset (NaN) cells
+        self.fields: Dict[str, np.ndarray] = {}
+        self._partial_fields = set()
+        
+        # Cached stencil normalization and the spare buffer for double-buffered kernels
+        self._inverse_neighbor_counts = None
+        self._spare_buffer = None
+        
+        # Implicit diffusion solvers by (parameter, scheme), each caching its factorization
+        self._implicit_solvers: Dict[Tuple[str, str], ImplicitDiffusionSolver] = {}
+        
+        # Active-region tracking (array storage only): the threshold of each
+        # tracked parameter and the bounding box of its cells above it (None
+        # if there are none). A tracked parameter without a box is rescanned
+        # on next use.
+        self._active_epsilon: Dict[str, float] = {}
+        self._active_boxes: Dict[str, Optional[Tuple[slice, ...]]] = {}
+        
+        if storage == self.STORAGE_ARRAY:
+            # Mapping of positions to cell views, built on access
+            self.grid = GridCellMapping(self)
+        else:
+            self.grid = {}  # Dictionary mapping position tuples to GridCell objects
+            
+            # Initialize grid cells
+            self._initialize_grid()
+    
+    @property
+    def is_array_backed(self) -> bool:
+        """Whether the grid uses the array storage engine."""
+        return self.storage == self.STORAGE_ARRAY
         
     def _initialize_grid(self) -> None:
         """
@@ -173,8 +744,206 @@ class SpatialGrid:
         Returns:
             The GridCell at that position, or None if position is invalid
         """
+        if self.is_array_backed:
+            if not self.is_position_valid(position):
+                return None
+            return GridCellView(self, tuple(position))
         return self.grid.get(position)
     
+    def _field_for_write(self, name: str) -> np.ndarray:
+        """
+        Get the backing array for a parameter, creating it if needed.
+        
+        New arrays start with every cell unset (NaN).
+        
+        Args:
+            name: Parameter name
+            
+        Returns:
+            The live parameter array
+        """
+        values = self.fields.get(name)
+        if values is None:
+            values = np.full(self.dimensions, np.nan)
+            self.fields[name] = values
+            self._partial_fields.add(name)
+        return values
+    
+    def get_parameter_names(self) -> List[str]:
+        """
+        Get the names of all parameters stored in the grid.
+        
+        Returns:
+            List of parameter names
+        """
+        if self.is_array_backed:
+            return list(self.fields.keys())
+        
+        names = {}
+        for cell in self.grid.values():
+            names.update(dict.fromkeys(cell.parameters))
+        return list(names)
+    
+    def get_parameter_array(self, name: str, default: float = 0.0) -> np.ndarray:
+        """
+        Get a parameter as a float array of shape ``dimensions``.
+        
+        Cells where the parameter is unset take the default value. With
+        array storage the live backing array is returned whenever every
+        cell is set, so callers must not modify it in place unless they
+        intend to change the grid; otherwise a new array is returned.
+        
+        Args:
+            name: Parameter name
+            default: Value for cells where the parameter is not present
+            
+        Returns:
+            Array of parameter values
+        """
+        if not self.is_array_backed:
+            values = np.full(self.dimensions, default, dtype=float)
+            for position, cell in self.grid.items():
+                if name in cell.parameters:
+                    values[position] = cell.parameters[name]
+            return values
+        
+        values = self.fields.get(name)
+        if values is None:
+            return np.full(self.dimensions, default, dtype=float)
+        
+        if name in self._partial_fields:
+            unset = np.isnan(values)
+            if unset.any():
+                return np.where(unset, default, values)
+            self._partial_fields.discard(name)
+        return values
+    
+    def set_parameter_array(self, name: str, values: Union[np.ndarray, float]) -> None:
+        """
+        Set a parameter in every cell from an array of shape ``dimensions``.
+        
+        With array storage the array is adopted as the backing store
+        without copying, so callers can hand over freshly computed buffers.
+        
+        Args:
+            name: Parameter name
+            values: Array of parameter values, or a scalar for all cells
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 0:
+            values = np.full(self.dimensions, float(values))
+        elif values.shape != self.dimensions:
+            raise ValueError(f"Expected array of shape {self.dimensions}, got {values.shape}")
+        
+        if not self.is_array_backed:
+            for position, cell in self.grid.items():
+                cell.set_parameter(name, float(values[position]))
+            return
+        
+        self.fields[name] = values
+        self._partial_fields.discard(name)
+        self._active_boxes.pop(name, None)
+    
+    def get_parameter_stack(self, names: List[str], default: float = 0.0) -> np.ndarray:
+        """
+        Get several parameters stacked into one array of shape (P, *dimensions).
+        
+        The stack is always a new array, so it can be updated in place.
+        
+        Args:
+            names: Parameter names, in stack order
+            default: Value for cells where a parameter is not present
+            
+        Returns:
+            Array of parameter values, one slice per name
+        """
+        stack = np.empty((len(names),) + tuple(self.dimensions))
+        for index, name in enumerate(names):
+            stack[index] = self.get_parameter_array(name, default)
+        return stack
+    
+    def set_parameter_stack(self, names: List[str], stack: np.ndarray) -> None:
+        """
+        Set several parameters from an array of shape (P, *dimensions).
+        
+        With array storage each slice is adopted as the backing store of its
+        parameter without copying.
+        
+        Args:
+            names: Parameter names, in stack order
+            stack: Array of parameter values, one slice per name
+        """
+        if stack.shape != (len(names),) + tuple(self.dimensions):
+            raise ValueError(f"Expected array of shape {(len(names),) + tuple(self.dimensions)}, "
+                             f"got {stack.shape}")
+        for index, name in enumerate(names):
+            self.set_parameter_array(name, stack[index])
+    
+    def set_parameter_where(self, name: str, values: Union[np.ndarray, float],
+                            mask: np.ndarray) -> None:
+        """
+        Set a parameter only in the cells selected by a mask.
+        
+        Cells outside the mask are left untouched, including whether the
+        parameter is set in them at all.
+        
+        Args:
+            name: Parameter name
+            values: Array of shape ``dimensions`` (or a scalar) to take values from
+            mask: Boolean array of shape ``dimensions`` selecting the cells to set
+        """
+        values = np.broadcast_to(np.asarray(values, dtype=float), self.dimensions)
+        
+        if not self.is_array_backed:
+            for position in zip(*np.nonzero(mask)):
+                position = tuple(int(i) for i in position)
+                self.grid[position].set_parameter(name, float(values[position]))
+            return
+        
+        if mask.any():
+            self._field_for_write(name)[mask] = values[mask]
+            self._active_boxes.pop(name, None)
+    
+    def scatter_add_parameters(self, names: List[str], parameter_indices: np.ndarray,
+                               cell_indices: np.ndarray, values: np.ndarray) -> None:
+        """
+        Add values to cells of several parameters in one scatter.
+        
+        Entries that hit the same cell of the same parameter are summed, and
+        unset cells count as zero. Only the touched cells are written, so
+        tracked active regions grow to contain them instead of being rescanned.
+        
+        Args:
+            names: Parameter names
+            parameter_indices: Index into ``names`` of each entry
+            cell_indices: Flat (C-order) index of each entry's cell
+            values: Value added by each entry
+        """
+        size = int(np.prod(self.dimensions))
+        keys = np.asarray(parameter_indices, dtype=np.int64) * size + np.asarray(cell_indices, dtype=np.int64)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.zeros(len(keys))
+        np.add.at(totals, inverse.ravel(), values)
+        
+        # Keys are sorted, so each parameter's cells form one run
+        bounds = np.searchsorted(keys, np.arange(len(names) + 1) * size)
+        for index, name in enumerate(names):
+            lo, hi = bounds[index], bounds[index + 1]
+            if lo == hi:
+                continue
+            positions = np.unravel_index(keys[lo:hi] - index * size, self.dimensions)
+            
+            if not self.is_array_backed:
+                for position, total in zip(zip(*(p.tolist() for p in positions)), totals[lo:hi].tolist()):
+                    cell = self.grid[position]
+                    cell.set_parameter(name, cell.get_parameter(name, 0.0) + total)
+                continue
+            
+            field = self._field_for_write(name)
+            field[positions] = np.nan_to_num(field[positions], nan=0.0) + totals[lo:hi]
+            self._include_in_active_region(name, tuple(int(p.min()) for p in positions))
+            self._include_in_active_region(name, tuple(int(p.max()) for p in positions))
+    
     def set_parameter_at(self, position: Tuple[int, int, int], 
                          name: str, value: float) -> bool:
         """
@@ -188,6 +957,13 @@ class SpatialGrid:
         Returns:
             True if successful, False if position is invalid
         """
+        if self.is_array_backed:
+            if not self.is_position_valid(position):
+                return False
+            self._field_for_write(name)[tuple(position)] = value
+            self._include_in_active_region(name, position)
+            return True
+        
         cell = self.get_cell(position)
         if cell:
             cell.set_parameter(name, value)
@@ -207,6 +983,13 @@ class SpatialGrid:
         Returns:
             The parameter value
         """
+        if self.is_array_backed:
+            values = self.fields.get(name)
+            if values is None or not self.is_position_valid(position):
+                return default
+            value = values[tuple(position)]
+            return default if np.isnan(value) else float(value)
+        
         cell = self.get_cell(position)
         if cell:
             return cell.get_parameter(name, default)
@@ -225,6 +1008,20 @@ class SpatialGrid:
         Returns:
             The average parameter value
         """
+        if self.is_array_backed:
+            values = self.fields.get(name)
+            if values is None:
+                return default
+            if zone_positions is not None:
+                positions = [pos for pos in zone_positions if self.is_position_valid(pos)]
+                if not positions:
+                    return default
+                values = values[tuple(np.asarray(positions).T)]
+            set_values = values[~np.isnan(values)]
+            if set_values.size == 0:
+                return default
+            return float(set_values.mean())
+        
         if zone_positions is None:
             # Average across all cells
             positions = [pos for pos, _ in self.iterate_cells()]
@@ -283,6 +1080,14 @@ class SpatialGrid:
         """
         width, length, height = self.dimensions
         
+        if self.is_array_backed:
+            for face, conditions in self.boundaries.items():
+                for parameter, config in conditions.items():
+                    if config['type'] == 'fixed':
+                        self._field_for_write(parameter)[self._face_slice(face)] = config['value']
+                        self._active_boxes.pop(parameter, None)
+            return
+        
         # Handle each boundary face
         for face, conditions in self.boundaries.items():
             for parameter, config in conditions.items():
@@ -309,6 +1114,26 @@ class SpatialGrid:
                     self._apply_face_boundary(parameter, condition_type, value,
                                              [(0, y, z) for y in range(length) for z in range(height)])
     
+    def _face_slice(self, face: str) -> Tuple[Union[int, slice], ...]:
+        """
+        Get the array index selecting all cells on a grid face.
+        
+        Args:
+            face: The grid face ('top', 'bottom', 'north', 'south', 'east', 'west')
+            
+        Returns:
+            Index tuple usable on arrays of shape ``dimensions``
+        """
+        all_ = slice(None)
+        return {
+            'top': (all_, all_, -1),
+            'bottom': (all_, all_, 0),
+            'north': (all_, -1, all_),
+            'south': (all_, 0, all_),
+            'east': (-1, all_, all_),
+            'west': (0, all_, all_),
+        }[face]
+    
     def _apply_face_boundary(self, parameter: str, condition_type: str, 
                             value: Any, positions: List[Tuple[int, int, int]]) -> None:
         """
@@ -333,41 +1158,290 @@ class SpatialGrid:
         Returns:
             List of tuples containing position and cell
         """
+        if self.is_array_backed:
+            return [(position, GridCellView(self, position)) for position in self.grid]
         return list(self.grid.items())
     
-    def diffuse_parameter(self, parameter: str, diffusion_rate: float) -> None:
+    def enable_active_region(self, parameter: str, epsilon: float = 1e-6) -> None:
+        """
+        Track the region where a parameter is active and restrict kernels to it.
+        
+        Cells whose magnitude is at most ``epsilon`` are treated as inactive
+        background (zero, the outside-air concentration). Diffusion,
+        advection and air exchange then only update the bounding box of the
+        active cells, grown by the reach of their stencil, which makes
+        plume-like parameters much cheaper to simulate. Cells left outside
+        the box keep their (negligible) values. Unset cells are set to zero.
+        
+        Point writes (``set_parameter_at`` and cell views) grow the region;
+        whole-array writes trigger a rescan. Callers that modify the array
+        returned by ``get_parameter_array`` in place must call
+        ``refresh_active_region``.
+        
+        Args:
+            parameter: Name of the parameter to track
+            epsilon: Magnitude at or below which a cell is inactive
+            
+        Raises:
+            ValueError: If the grid does not use array storage
+        """
+        if not self.is_array_backed:
+            raise ValueError("Active-region tracking requires array storage")
+        
+        if parameter in self._partial_fields or parameter not in self.fields:
+            self.set_parameter_array(parameter, self.get_parameter_array(parameter, 0.0))
+        self._active_epsilon[parameter] = float(epsilon)
+        self._active_boxes.pop(parameter, None)
+    
+    def disable_active_region(self, parameter: str) -> None:
+        """
+        Stop tracking the active region of a parameter.
+        
+        Args:
+            parameter: Name of the parameter
+        """
+        self._active_epsilon.pop(parameter, None)
+        self._active_boxes.pop(parameter, None)
+    
+    def has_active_region(self, parameter: str) -> bool:
+        """
+        Check whether a parameter's active region is tracked.
+        
+        Args:
+            parameter: Name of the parameter
+            
+        Returns:
+            True if kernels are restricted to the parameter's active region
+        """
+        return parameter in self._active_epsilon
+    
+    def get_active_region(self, parameter: str) -> Optional[Tuple[slice, ...]]:
+        """
+        Get the bounding box of the cells where a parameter is active.
+        
+        Args:
+            parameter: Name of the parameter
+            
+        Returns:
+            Tuple of slices, or None if no cell is active. Untracked
+            parameters are active over the whole grid.
+        """
+        if parameter not in self._active_epsilon:
+            return full_box(self.dimensions)
+        if parameter not in self._active_boxes:
+            self.refresh_active_region(parameter)
+        return self._active_boxes[parameter]
+    
+    def refresh_active_region(self, parameter: str,
+                              within: Optional[Tuple[slice, ...]] = None) -> None:
+        """
+        Rescan the active region of a tracked parameter.
+        
+        Args:
+            parameter: Name of the parameter
+            within: Optional box known to contain every active cell; only
+                this box is scanned
+        """
+        if parameter in self._active_epsilon:
+            self._active_boxes[parameter] = active_box(
+                self.fields[parameter], self._active_epsilon[parameter], within)
+    
+    def _include_in_active_region(self, parameter: str, position: Tuple[int, int, int]) -> None:
+        """
+        Grow a tracked parameter's active region to contain a cell.
+        
+        Args:
+            parameter: Name of the parameter
+            position: Grid position of the cell
+        """
+        if parameter not in self._active_boxes:
+            return
+        
+        box = self._active_boxes[parameter]
+        if box is None:
+            box = tuple(slice(int(p), int(p) + 1) for p in position)
+        else:
+            box = tuple(slice(min(b.start, int(p)), max(b.stop, int(p) + 1))
+                        for b, p in zip(box, position))
+        self._active_boxes[parameter] = box
+    
+    @property
+    def inverse_neighbor_counts(self) -> np.ndarray:
+        """Reciprocal of each cell's in-grid neighbor count (cached)."""
+        if self._inverse_neighbor_counts is None:
+            counts = neighbor_counts(self.dimensions)
+            self._inverse_neighbor_counts = np.divide(
+                1.0, counts, out=np.zeros_like(counts), where=counts > 0)
+        return self._inverse_neighbor_counts
+    
+    def diffuse_array(self, values: np.ndarray, diffusion_rate: float,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Apply one diffusion step to an array of shape ``dimensions``.
+        
+        Args:
+            values: Parameter values, or a stack of shape (P, *dimensions)
+            diffusion_rate: Rate of diffusion (0 to 1)
+            out: Optional output buffer (must not alias ``values``)
+            
+        Returns:
+            Array of diffused values (``out`` if provided)
+        """
+        if int(np.prod(self.dimensions)) <= 1:
+            # A single cell has no neighbors to exchange with
+            if out is None:
+                return values.copy()
+            np.copyto(out, values)
+            return out
+        return diffusion_step(values, diffusion_rate, self.inverse_neighbor_counts, out)
+    
+    def diffuse_parameter(self, parameter: str, diffusion_rate: float,
+                          scheme: str = DIFFUSION_EXPLICIT) -> None:
         """
         Diffuse a parameter across the grid using a simple diffusion model.
         
+        The whole grid is updated in one vectorized stencil pass. With array
+        storage the result is written to a spare buffer that is swapped with
+        the parameter array, and the previous array becomes the spare for the
+        next call, so repeated steps do not allocate.
+        
+        Args:
+            parameter: Name of the parameter to diffuse
+            diffusion_rate: Rate of diffusion (0 to 1 for the explicit scheme)
+            scheme: 'explicit', or an implicit scheme ('crank_nicolson' or
+                'backward_euler', see diffuse_parameter_implicit)
+        """
+        if scheme != self.DIFFUSION_EXPLICIT:
+            self.diffuse_parameter_implicit(parameter, diffusion_rate, scheme)
+            return
+        
+        if self.has_active_region(parameter):
+            self._diffuse_active_region(parameter, diffusion_rate)
+            return
+        
+        values = self.get_parameter_array(parameter, 0.0)
+        new_values = self.diffuse_array(values, diffusion_rate, self.acquire_buffer())
+        self.set_parameter_array(parameter, new_values)
+        self.release_buffer(values)
+    
+    def _diffuse_active_region(self, parameter: str, diffusion_rate: float) -> None:
+        """
+        Diffuse a tracked parameter within its active region.
+        
+        Only cells within one step of the active cells can change, so the
+        stencil runs on the active box grown by two cells (one for the
+        cells that change, one for their neighbors) and the changed cells
+        are written back in place.
+        
         Args:
             parameter: Name of the parameter to diffuse
             diffusion_rate: Rate of diffusion (0 to 1)
         """
-        # Create a copy of the current parameter values
-        new_values = {}
+        region = self.get_active_region(parameter)
+        if region is None or int(np.prod(self.dimensions)) <= 1:
+            return
+        
+        target = expand_box(region, 1, self.dimensions)
+        halo = expand_box(region, 2, self.dimensions)
+        
+        values = self.fields[parameter]
+        new_values = diffusion_step(values[halo], diffusion_rate, self.inverse_neighbor_counts[halo])
+        values[target] = new_values[relative_box(target, halo)]
+        self.refresh_active_region(parameter, target)
+    
+    def diffuse_parameter_implicit(self, parameter: str, diffusion_rate: float,
+                                   scheme: str = DIFFUSION_CRANK_NICOLSON,
+                                   face_weights: Optional[List[np.ndarray]] = None) -> None:
+        """
+        Diffuse a parameter with an implicit scheme that is stable for any rate.
         
-        # Calculate diffusion for each cell
-        for position, cell in self.iterate_cells():
-            current_value = cell.get_parameter(parameter, 0.0)
-            total_diffusion = 0.0
-            neighbor_count = 0
+        Uses the same neighbor-averaged stencil as diffuse_parameter, so a
+        rate of ``k`` corresponds to ``k`` times the explicit rate of one
+        step; rates above 1 let long simulations take large time steps.
+        Faces with a 'fixed' boundary condition for the parameter hold their
+        value, and the other faces are reflective. The sparse factorization
+        is cached per parameter and scheme and reused while the rate, face
+        weights and boundary conditions are unchanged.
+        
+        Args:
+            parameter: Name of the parameter to diffuse
+            diffusion_rate: Rate of diffusion per step (may exceed 1)
+            scheme: 'crank_nicolson' (second order) or 'backward_euler'
+                (first order, damps oscillations at very large rates)
+            face_weights: Optional per-axis face weights, such as the barrier
+                permeability from BarrierHandler.get_face_permeability
+        """
+        solver = self._implicit_solvers.get((parameter, scheme))
+        if solver is None:
+            solver = ImplicitDiffusionSolver(self.dimensions, scheme)
+            self._implicit_solvers[(parameter, scheme)] = solver
+        
+        fixed_mask, fixed_values = self._fixed_boundary_arrays(parameter)
+        values = self.get_parameter_array(parameter, 0.0)
+        new_values = solver.step(values, diffusion_rate, face_weights,
+                                 fixed_mask, fixed_values, out=self.acquire_buffer())
+        self.set_parameter_array(parameter, new_values)
+        self.release_buffer(values)
+    
+    def _fixed_boundary_arrays(self, parameter: str) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Collect the cells held by 'fixed' boundary conditions for a parameter.
+        
+        Args:
+            parameter: Parameter name
             
-            # Get diffusion from all neighbors
-            for direction, neighbor in cell.get_all_neighbors().items():
-                neighbor_value = neighbor.get_parameter(parameter, 0.0)
-                total_diffusion += neighbor_value - current_value
-                neighbor_count += 1
-                
-            if neighbor_count > 0:
-                # Apply diffusion equation
-                new_value = current_value + (diffusion_rate * total_diffusion / neighbor_count)
-                new_values[position] = new_value
-        
-        # Update all cells with new values
-        for position, value in new_values.items():
-            cell = self.get_cell(position)
-            if cell:
-                cell.set_parameter(parameter, value)
+        Returns:
+            Tuple of (mask, values) arrays, or (None, None) without fixed faces
+        """
+        fixed_mask = None
+        fixed_values = None
+        for face, conditions in self.boundaries.items():
+            config = conditions.get(parameter)
+            if config is None or config['type'] != 'fixed':
+                continue
+            if fixed_mask is None:
+                fixed_mask = np.zeros(self.dimensions, dtype=bool)
+                fixed_values = np.zeros(self.dimensions)
+            index = self._face_slice(face)
+            fixed_mask[index] = True
+            fixed_values[index] = config['value']
+        return fixed_mask, fixed_values
+    
+    def acquire_buffer(self) -> np.ndarray:
+        """
+        Get a scratch array of shape ``dimensions`` for a kernel's output.
+        
+        Returns the array last handed to ``release_buffer`` if there is one,
+        otherwise a new array. The contents are undefined.
+        
+        Returns:
+            Float array of shape ``dimensions``
+        """
+        buffer = self._spare_buffer
+        self._spare_buffer = None
+        if buffer is None or buffer.shape != self.dimensions:
+            buffer = np.empty(self.dimensions)
+        return buffer
+    
+    def release_buffer(self, values: np.ndarray) -> None:
+        """
+        Hand back an array that is no longer referenced for reuse.
+        
+        Kernels that replace a parameter array release the previous one so
+        the next step can write into it instead of allocating. Release an
+        array only after ``set_parameter_array`` has replaced it, since
+        ``get_parameter_array`` may return the grid's live storage.
+        
+        Args:
+            values: Array of shape ``dimensions`` that nothing else refers to
+            
+        Raises:
+            ValueError: If the array is still the storage of a parameter
+        """
+        if any(values is field for field in self.fields.values()):
+            raise ValueError("Cannot release an array that is still a parameter's storage")
+        if values.shape == self.dimensions and values.dtype == np.float64:
+            self._spare_buffer = values
                 
     def physical_coordinates(self, grid_pos: Tuple[int, int, int]) -> Tuple[float, float, float]:
         """
@@ -409,6 +1483,8 @@ class SpatialGrid:
         Returns:
             True if the position is valid, False otherwise
         """
+        if len(position) != 3:
+            return False
         x, y, z = position
         width, length, height = self.dimensions
         return 0 <= x < width and 0 <= y < length and 0 <= z < height
@@ -0,0 +1,207 @@
+"""
+EnviroSense Physics Engine - Spatial Indexes
+
+This module provides spatial indexes for proximity queries over the objects
+of a simulation: a KD-tree over points (chemical sources, sensors) and a
+uniform grid hash over axis-aligned bounding boxes (walls, barriers,
+material regions). Both are rebuilt from scratch when their contents change,
+which is cheap next to the linear scans they replace.
+"""
+
+import itertools
+import numpy as np
+from scipy.spatial import cKDTree
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+
+# Box used for objects without a bounding box, which match every query
+UNBOUNDED_BOX: Box = ((-np.inf, -np.inf, -np.inf), (np.inf, np.inf, np.inf))
+
+
+def bounding_boxes(objects: Iterable[Any]) -> np.ndarray:
+    """
+    Collect the bounding boxes of geometry objects.
+    
+    Args:
+        objects: Objects with a ``get_bounding_box`` method; objects that do
+            not implement it get an unbounded box
+    
+    Returns:
+        Array of shape (N, 2, 3) holding each object's (min_point, max_point)
+    """
+    boxes = []
+    for obj in objects:
+        try:
+            boxes.append(obj.get_bounding_box())
+        except NotImplementedError:
+            boxes.append(UNBOUNDED_BOX)
+    return np.asarray(boxes, dtype=float).reshape(-1, 2, 3)
+
+
+class PointIndex:
+    """
+    KD-tree over a set of 3D points for radius and nearest-neighbor queries.
+    
+    Query results are indices into the point array the index was built
+    from, so callers keep their objects in a parallel list.
+    """
+    
+    def __init__(self, points: Optional[Sequence[Sequence[float]]] = None):
+        """
+        Build the index.
+        
+        Args:
+            points: Points of shape (N, 3)
+        """
+        self.rebuild(points if points is not None else [])
+    
+    def __len__(self) -> int:
+        return len(self.points)
+    
+    def rebuild(self, points: Sequence[Sequence[float]]) -> None:
+        """
+        Rebuild the index for a new set of points.
+        
+        Args:
+            points: Points of shape (N, 3)
+        """
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self._tree = cKDTree(self.points) if len(self.points) else None
+    
+    def query_radius(self, center: Sequence[float], radius: float) -> np.ndarray:
+        """
+        Find the points within a distance of a center.
+        
+        Args:
+            center: Query position (x, y, z)
+            radius: Search radius (inclusive)
+        
+        Returns:
+            Ascending indices of the points within the radius
+        """
+        if self._tree is None or radius < 0:
+            return np.empty(0, dtype=int)
+        return np.asarray(self._tree.query_ball_point(center, radius, return_sorted=True), dtype=int)
+    
+    def query_nearest(self, point: Sequence[float], k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the points closest to a position.
+        
+        Args:
+            point: Query position (x, y, z)
+            k: Number of neighbors to return
+        
+        Returns:
+            Tuple of (distances, indices), nearest first, with at most ``k`` entries
+        """
+        if self._tree is None:
+            return np.empty(0), np.empty(0, dtype=int)
+        distances, indices = self._tree.query(point, k=min(k, len(self.points)))
+        return np.atleast_1d(distances), np.atleast_1d(indices)
+
+
+class BoxIndex:
+    """
+    Uniform grid hash over axis-aligned boxes for point containment queries.
+    
+    Each box is registered in every hash cell it overlaps, so a point query
+    only tests the boxes registered in the point's cell. Boxes that would
+    span more than ``MAX_CELLS_PER_BOX`` cells (such as floors under a whole
+    site, or unbounded objects) are kept in a short list tested by every
+    query instead.
+    """
+    
+    MAX_CELLS_PER_BOX = 64
+    
+    def __init__(self, boxes: Optional[Sequence[Box]] = None, cell_size: Optional[float] = None):
+        """
+        Build the index.
+        
+        Args:
+            boxes: Boxes as (min_point, max_point) pairs, shape (N, 2, 3)
+            cell_size: Edge length of the hash cells, or None to derive it
+                from the typical box size
+        """
+        self.rebuild(boxes if boxes is not None else [], cell_size)
+    
+    def __len__(self) -> int:
+        return len(self.mins)
+    
+    def rebuild(self, boxes: Sequence[Box], cell_size: Optional[float] = None) -> None:
+        """
+        Rebuild the index for a new set of boxes.
+        
+        Args:
+            boxes: Boxes as (min_point, max_point) pairs, shape (N, 2, 3)
+            cell_size: Edge length of the hash cells, or None to derive it
+        """
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 2, 3)
+        self.mins = boxes[:, 0]
+        self.maxs = boxes[:, 1]
+        finite = np.all(np.isfinite(self.mins) & np.isfinite(self.maxs), axis=1)
+        
+        self.cell_size = float(cell_size) if cell_size else self._default_cell_size(finite)
+        
+        cells: Dict[Tuple[int, ...], list] = {}
+        unbounded = []
+        for index in range(len(self.mins)):
+            if not finite[index]:
+                unbounded.append(index)
+                continue
+            lower = np.floor(self.mins[index] / self.cell_size).astype(int)
+            upper = np.floor(self.maxs[index] / self.cell_size).astype(int)
+            if np.prod(upper - lower + 1) > self.MAX_CELLS_PER_BOX:
+                unbounded.append(index)
+                continue
+            for key in itertools.product(*(range(lo, hi + 1) for lo, hi in zip(lower, upper))):
+                cells.setdefault(key, []).append(index)
+        
+        self._cells = {key: np.array(indices, dtype=int) for key, indices in cells.items()}
+        self._unbounded = np.array(unbounded, dtype=int)
+    
+    def _default_cell_size(self, finite: np.ndarray) -> float:
+        """
+        Pick a hash cell size of about the typical box's largest extent.
+        
+        Args:
+            finite: Mask of the boxes with finite bounds
+        
+        Returns:
+            Cell edge length
+        """
+        if not finite.any():
+            return 1.0
+        extents = (self.maxs[finite] - self.mins[finite]).max(axis=1)
+        cell_size = float(np.median(extents))
+        if cell_size <= 0:
+            # Degenerate (point-like) boxes: spread them over the occupied volume
+            span = float((self.maxs[finite].max(axis=0) - self.mins[finite].min(axis=0)).max())
+            cell_size = span / max(1.0, finite.sum() ** (1 / 3))
+        return cell_size if cell_size > 0 else 1.0
+    
+    def query_point(self, point: Sequence[float]) -> np.ndarray:
+        """
+        Find the boxes containing a point (boundaries included).
+        
+        Args:
+            point: Query position (x, y, z)
+        
+        Returns:
+            Ascending indices of the boxes containing the point
+        """
+        point = np.asarray(point, dtype=float)
+        key = tuple(np.floor(point / self.cell_size).astype(int))
+        candidates = self._cells.get(key)
+        if candidates is None:
+            candidates = self._unbounded
+        elif len(self._unbounded):
+            candidates = np.concatenate((candidates, self._unbounded))
+        
+        if not len(candidates):
+            return candidates
+        inside = np.all((self.mins[candidates] <= point) & (point <= self.maxs[candidates]), axis=1)
+        return np.sort(candidates[inside])
@@ -4,12 +4,27 @@ EnviroSense Physics Engine - Core Tests
 This module provides simple tests for the core physical space modeling components.
 """
 
+import os
+import tempfile
 import unittest
 import numpy as np
 from envirosense.core.physics.space import SpatialGrid, GridCell
 from envirosense.core.physics.geometry import Room, Material, Wall, GeometryLoader
-from envirosense.core.physics.coordinates import Vector3D, CoordinateSystem, Transform
+from envirosense.core.physics.coordinates import Vector3D, Vector3DArray, CoordinateSystem, Transform
 from envirosense.core.physics.airflow import VentilationSource, AirflowModel
+from envirosense.core.physics.barriers import Barrier, BarrierHandler
+from envirosense.core.physics.implicit_diffusion import build_laplacian
+from envirosense.core.physics.parallel import ParallelGridStepper
+from envirosense.core.physics.snapshots import SnapshotWriter, SnapshotReader
+from envirosense.core.physics.spatial_index import PointIndex, BoxIndex
+from envirosense.core.physics.humidity_effects import HumidityEffects
+from envirosense.core.physics.thermal_effects import ThermalEffects
+from envirosense.core.physics.emf import EMFField, PowerLine, Transformer
+from envirosense.core.physics.thermal import ThermalProfile, TransformerHeat, ElectronicEquipment
+from envirosense.core.physics.acoustic import AcousticProfile, TransformerSound, DischargeSound
+from envirosense.core.physics.vibration.sources.compressor import CompressorVibration
+from envirosense.core.physics.vibration.propagation import SpatialPropagationModel, COMMON_MATERIALS
+from envirosense.core.physics.spectral_synthesis import synthesize_tones
 
 
 class TestSpatialGrid(unittest.TestCase):
@@ -67,6 +82,150 @@ class TestSpatialGrid(unittest.TestCase):
         self.assertLess(value_origin, 100.0)  # Value decreased
         self.assertGreater(value_neighbor, 0.0)  # Neighbor received some value
 
+    def test_diffusion_stencil(self):
+        """Test that the diffusion stencil normalizes by neighbor count."""
+        for storage in (SpatialGrid.STORAGE_CELLS, SpatialGrid.STORAGE_ARRAY):
+            grid = SpatialGrid((3, 3, 3), 0.1, storage=storage)
+            grid.set_parameter_at((0, 0, 0), "concentration", 100.0)
+
+            grid.diffuse_parameter("concentration", 0.1)
+
+            # Corner cell has 3 neighbors, edge cell (1, 0, 0) has 4
+            self.assertAlmostEqual(grid.get_parameter_at((0, 0, 0), "concentration"), 90.0)
+            self.assertAlmostEqual(grid.get_parameter_at((1, 0, 0), "concentration"), 2.5)
+            self.assertEqual(grid.get_parameter_at((2, 2, 2), "concentration", -1.0), 0.0)
+
+            # The second step relaxes the corner towards its neighbor mean
+            grid.diffuse_parameter("concentration", 0.1)
+            self.assertAlmostEqual(grid.get_parameter_at((0, 0, 0), "concentration"),
+                                   90.0 + 0.1 * ((2.5 * 3) / 3 - 90.0))
+
+    def test_release_buffer_rejects_live_storage(self):
+        """Test that a parameter's backing array cannot be released for reuse."""
+        grid = SpatialGrid((3, 3, 3), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        grid.set_parameter_array("concentration", np.ones((3, 3, 3)))
+        values = grid.get_parameter_array("concentration")
+        with self.assertRaises(ValueError):
+            grid.release_buffer(values)
+
+        # Once replaced, the old array is reused by the next step
+        grid.set_parameter_array("concentration", grid.acquire_buffer())
+        grid.release_buffer(values)
+        self.assertIs(grid.acquire_buffer(), values)
+
+    def test_array_storage(self):
+        """Test that array storage behaves like cell storage."""
+        grid = SpatialGrid((4, 3, 2), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        self.assertEqual(len(grid.grid), 4 * 3 * 2)
+
+        # Unset parameters fall back to the default
+        self.assertEqual(grid.get_parameter_at((1, 1, 1), "temperature", 20.0), 20.0)
+
+        grid.set_parameter_at((1, 1, 1), "temperature", 25.0)
+        self.assertEqual(grid.get_parameter_at((1, 1, 1), "temperature"), 25.0)
+        self.assertEqual(grid.fields["temperature"].shape, (4, 3, 2))
+
+        # Cell views read and write the backing arrays
+        cell = grid.get_cell((1, 1, 1))
+        self.assertTrue(cell.has_parameter("temperature"))
+        self.assertFalse(grid.get_cell((0, 0, 0)).has_parameter("temperature"))
+        cell.get_neighbor("west").set_parameter("temperature", 30.0)
+        self.assertEqual(grid.get_parameter_at((0, 1, 1), "temperature"), 30.0)
+        self.assertEqual(len(cell.get_all_neighbors()), 5)
+        with self.assertRaises(TypeError):
+            cell.add_neighbor("west", grid.get_cell((2, 1, 1)))
+
+        # Only set cells count towards averages
+        self.assertAlmostEqual(grid.get_average_parameter(None, "temperature"), 27.5)
+
+        # Unset cells take the default in array form
+        values = grid.get_parameter_array("temperature", 20.0)
+        self.assertEqual(values[0, 0, 0], 20.0)
+        self.assertEqual(values[1, 1, 1], 25.0)
+        self.assertIsNone(grid.get_cell((4, 0, 0)))
+
+    def test_implicit_diffusion(self):
+        """Test implicit diffusion against the explicit stencil and at large rates."""
+        explicit = SpatialGrid((6, 5, 4), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        implicit = SpatialGrid((6, 5, 4), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        for grid in (explicit, implicit):
+            grid.set_parameter_at((1, 1, 1), "concentration", 100.0)
+
+        for _ in range(50):
+            explicit.diffuse_parameter("concentration", 0.02)
+            implicit.diffuse_parameter("concentration", 0.02, SpatialGrid.DIFFUSION_CRANK_NICOLSON)
+
+        np.testing.assert_allclose(implicit.get_parameter_array("concentration"),
+                                   explicit.get_parameter_array("concentration"), rtol=0.02, atol=0.01)
+
+        # Backward Euler stays bounded far past the explicit limit and, like the
+        # explicit stencil, conserves the neighbor-count weighted total
+        grid = SpatialGrid((6, 5, 4), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        grid.set_parameter_at((1, 1, 1), "concentration", 100.0)
+        grid.diffuse_parameter("concentration", 50.0, SpatialGrid.DIFFUSION_BACKWARD_EULER)
+        values = grid.get_parameter_array("concentration")
+        _, counts = build_laplacian((6, 5, 4))
+        self.assertAlmostEqual((values.ravel() * counts).sum(), 600.0, places=6)
+        self.assertGreaterEqual(values.min(), 0.0)
+        self.assertLess(values.max(), 100.0)
+
+        # Fixed boundaries hold their values through the solve
+        grid.set_boundary_condition("east", "concentration", "fixed", 5.0)
+        grid.apply_boundary_conditions()
+        grid.diffuse_parameter("concentration", 50.0, SpatialGrid.DIFFUSION_BACKWARD_EULER)
+        np.testing.assert_allclose(grid.get_parameter_array("concentration")[-1], 5.0)
+
+        with self.assertRaises(ValueError):
+            grid.diffuse_parameter("concentration", 0.1, "leapfrog")
+
+    def test_active_region(self):
+        """Test that active-region tracking matches full-grid updates."""
+        grids = []
+        for track in (False, True):
+            grid = SpatialGrid((20, 16, 8), 0.5, storage=SpatialGrid.STORAGE_ARRAY)
+            grid.set_parameter_at((5, 5, 3), "voc", 100.0)
+            if track:
+                grid.enable_active_region("voc", epsilon=0.0)
+                self.assertEqual(grid.get_active_region("voc"), (slice(5, 6), slice(5, 6), slice(3, 4)))
+            airflow = AirflowModel(grid)
+            airflow.get_velocity_array()[0] = 0.5
+            airflow.set_air_exchange_rate(2.0)
+            grids.append((grid, airflow))
+
+        for grid, airflow in grids:
+            for _ in range(3):
+                airflow.apply_airflow_step(["voc"], 1.0)
+                grid.diffuse_parameter("voc", 0.2)
+            grid.set_parameter_at((15, 12, 6), "voc", 1.0)
+            airflow.advect_parameter("voc", 1.0)
+
+        np.testing.assert_array_equal(grids[1][0].get_parameter_array("voc"),
+                                      grids[0][0].get_parameter_array("voc"))
+
+        # The region grows with the plume and point writes, but not to the whole grid
+        region = grids[1][0].get_active_region("voc")
+        self.assertEqual(region[0].start, 3)
+        self.assertEqual(region[0].stop, 17)
+
+        with self.assertRaises(ValueError):
+            SpatialGrid((3, 3, 3)).enable_active_region("voc")
+
+    def test_scatter_add_parameters(self):
+        """Test adding values to several parameters in one scatter."""
+        parameter_indices = np.array([0, 0, 1, 0])
+        cell_indices = np.array([0, 0, 5, 26])
+        values = np.array([1.0, 2.0, 4.0, 8.0])
+
+        for storage in (SpatialGrid.STORAGE_CELLS, SpatialGrid.STORAGE_ARRAY):
+            grid = SpatialGrid((3, 3, 3), 0.5, storage=storage)
+            grid.set_parameter_at((2, 2, 2), "co2", 1.0)
+            grid.scatter_add_parameters(["co2", "voc"], parameter_indices, cell_indices, values)
+
+            self.assertEqual(grid.get_parameter_at((0, 0, 0), "co2"), 3.0)
+            self.assertEqual(grid.get_parameter_at((2, 2, 2), "co2"), 9.0)
+            self.assertEqual(grid.get_parameter_at((0, 1, 2), "voc"), 4.0)
+            self.assertFalse(grid.get_cell((1, 1, 1)).has_parameter("voc"))
+
 
 class TestGeometry(unittest.TestCase):
     """Tests for the geometry classes."""
@@ -103,6 +262,253 @@ class TestGeometry(unittest.TestCase):
         self.assertEqual(room.name, "office_room")
         self.assertEqual(len(room.get_all_objects()), 7)  # 6 standard walls + window
 
+    def test_room_voxelization(self):
+        """Test that room voxels match per-point geometry queries."""
+        room = Room("test_room", (3.0, 2.0, 2.0))
+        room.create_standard_walls()
+        room.add_window("test_room_north_wall", (1.0, 0.5), (1.0, 1.0))
+        room.add_door("test_room_east_wall", 0.5, 1.0, is_open=True)
+        grid = SpatialGrid((16, 11, 11), 0.2)
+
+        voxels = room.voxelize(grid)
+        self.assertIs(room.voxelize(grid), voxels)
+        permeability = voxels.get_permeability("formaldehyde")
+        for position in np.ndindex(grid.dimensions):
+            point = grid.physical_coordinates(position)
+            objects = room.get_objects_at(point)
+            self.assertEqual(voxels.solid_mask[position], bool(objects))
+            if objects:
+                self.assertIs(voxels.materials[voxels.material_ids[position]], objects[-1].material)
+            self.assertAlmostEqual(permeability[position],
+                                   room.get_parameter_effects("formaldehyde", point, 1.0))
+
+        # Adding objects invalidates the voxelization
+        room.add_object(Wall("inner_wall", Material.from_library("wood"), (1.5, 0, 0), (1.7, 2, 2)))
+        self.assertIsNot(room.voxelize(grid), voxels)
+        self.assertTrue(room.voxelize(grid).get_object_mask("inner_wall").any())
+
+
+class TestBarriers(unittest.TestCase):
+    """Tests for barrier-aware diffusion."""
+
+    def test_barrier_blocks_diffusion(self):
+        """Test that an impermeable barrier stops diffusion across its faces."""
+        grid = SpatialGrid((4, 1, 1), 1.0, storage=SpatialGrid.STORAGE_ARRAY)
+        handler = BarrierHandler(grid)
+        handler.add_barrier(Barrier(
+            name="partition",
+            material=Material.from_library("drywall"),
+            start_point=(1.5, -1.0, -1.0),
+            end_point=(1.5, 1.0, 1.0),
+            permeability={"voc": 0.0}
+        ))
+
+        # Only the face between cells 1 and 2 is covered
+        faces = handler.get_face_permeability("voc")
+        self.assertEqual(faces[0].shape, (3, 1, 1))
+        self.assertEqual(list(faces[0].ravel()), [1.0, 0.0, 1.0])
+
+        grid.set_parameter_at((0, 0, 0), "voc", 10.0)
+        for _ in range(10):
+            handler.diffuse_parameter_with_barriers("voc", 0.5)
+
+        self.assertGreater(grid.get_parameter_at((1, 0, 0), "voc"), 0.0)
+        self.assertEqual(grid.get_parameter_at((2, 0, 0), "voc"), 0.0)
+        self.assertEqual(grid.get_parameter_at((3, 0, 0), "voc"), 0.0)
+
+        # Removing the barrier reopens the face
+        handler.remove_barrier("partition")
+        handler.diffuse_parameter_with_barriers("voc", 0.5)
+        self.assertGreater(grid.get_parameter_at((2, 0, 0), "voc"), 0.0)
+
+
+class TestEnvironmentalEffects(unittest.TestCase):
+    """Tests for the whole-grid humidity and thermal passes."""
+
+    def test_array_inputs_match_scalars(self):
+        """Test that the effect formulas accept arrays elementwise."""
+        humidity = HumidityEffects()
+        thermal = ThermalEffects()
+        temps = np.array([10.0, 25.0, 40.0])
+        rhs = np.array([30.0, 65.0, 99.0])
+
+        dew_points = humidity.calculate_dew_point(temps, rhs)
+        growth = humidity.calculate_hygroscopic_growth("pm2.5_urban", 1.0, rhs)
+        rates = thermal.calculate_reaction_rate_adjustment(1.0, temps)
+        for i in range(3):
+            self.assertAlmostEqual(dew_points[i], humidity.calculate_dew_point(temps[i], rhs[i]))
+            self.assertAlmostEqual(growth[i], humidity.calculate_hygroscopic_growth(
+                "pm2.5_urban", 1.0, rhs[i]))
+            self.assertAlmostEqual(rates[i], thermal.calculate_reaction_rate_adjustment(1.0, temps[i]))
+
+    def test_grid_pass_skips_standard_cells(self):
+        """Test that only cells away from standard conditions are changed."""
+        grid = SpatialGrid((2, 1, 1), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        grid.set_parameter_array("temperature", np.array([25.0, 35.0]).reshape(2, 1, 1))
+        grid.set_parameter_array("relative_humidity", 50.0)
+        grid.set_parameter_array("voc_total", 1.0)
+
+        ThermalEffects().apply_temperature_effects(grid, time_step=10.0)
+        HumidityEffects().apply_humidity_effects(grid, time_step=10.0)
+
+        self.assertEqual(grid.get_parameter_at((0, 0, 0), "voc_total"), 1.0)
+        self.assertLess(grid.get_parameter_at((1, 0, 0), "voc_total"), 1.0)
+        self.assertFalse(grid.get_cell((0, 0, 0)).has_parameter("dew_point"))
+        self.assertAlmostEqual(grid.get_parameter_at((1, 0, 0), "dew_point"),
+                               HumidityEffects().calculate_dew_point(35.0, 50.0))
+
+
+class TestSignatureSources(unittest.TestCase):
+    """Tests for batched evaluation of EMF, thermal and acoustic sources."""
+
+    def setUp(self):
+        self.points = np.array([[0.5, 0.5, 1.0], [2.0, -1.0, 0.0], [0.0, 0.0, 0.05]])
+
+    def test_emf_points_match_scalar(self):
+        """Test that batched EMF fields match the per-point calculation."""
+        field = EMFField()
+        field.add_source(PowerLine("line", (0, 0, 0), (3, 0, 0), current=100, voltage=1000))
+        field.add_source(Transformer("xfmr", (1, 1, 0), 1e5, 1e4, 400))
+
+        e_field, b_field = field.calculate_field_at_points(self.points)
+        self.assertEqual(e_field.shape, (3, 3))
+        for i, point in enumerate(self.points):
+            e_vec, b_vec = field.calculate_field_at(tuple(point))
+            np.testing.assert_allclose(e_field[i], e_vec.to_tuple())
+            np.testing.assert_allclose(b_field[i], b_vec.to_tuple())
+
+        X, Y, E_mag, B_mag = field.calculate_field_grid((0, 2, 4), (0, 1, 3), 1.0)
+        self.assertEqual(E_mag.shape, (3, 4))
+        self.assertAlmostEqual(B_mag[2, 1], field.calculate_field_at((X[2, 1], Y[2, 1], 1.0))[1].magnitude())
+
+    def test_thermal_and_acoustic_points_match_scalar(self):
+        """Test that batched temperatures and sound levels match the per-point calculation."""
+        thermal = ThermalProfile()
+        thermal.add_source(TransformerHeat("xfmr", (0, 0, 0), (1, 1, 1), 1e5))
+        thermal.add_source(ElectronicEquipment("rack", (2, -1, 0), (0.5, 0.5, 0.5), 500))
+        acoustic = AcousticProfile()
+        acoustic.add_source(TransformerSound("hum", (1, 0, 0), 1e5))
+
+        temperatures = thermal.calculate_temperature_at_points(self.points)
+        levels = acoustic.calculate_combined_spl_at_points(self.points)
+        for i, point in enumerate(self.points):
+            self.assertAlmostEqual(temperatures[i], thermal.calculate_temperature_at(tuple(point)))
+            self.assertAlmostEqual(levels[i], acoustic.calculate_combined_spl(tuple(point)))
+
+
+class TestSpectralSynthesis(unittest.TestCase):
+    """Tests for inverse-FFT synthesis of line spectra."""
+
+    def test_ifft_matches_direct_sum(self):
+        """Test that inverse-FFT synthesis matches summing one sine per component."""
+        rng = np.random.default_rng(3)
+        frequencies = rng.uniform(0, 5000, 40)
+        amplitudes = rng.random(40)
+        phases = rng.uniform(0, 2 * np.pi, 40)
+
+        # Lengths shorter than, equal to and spanning several frames
+        for num_samples in (7, 512, 10001):
+            time_points = 0.25 + np.arange(num_samples) / 10000.0
+            direct = synthesize_tones(time_points, frequencies, amplitudes, phases, method="direct")
+            ifft = synthesize_tones(time_points, frequencies, amplitudes, phases, method="ifft",
+                                    frame_length=512)
+            np.testing.assert_allclose(ifft, direct, atol=1e-8)
+
+        with self.assertRaises(ValueError):
+            synthesize_tones(time_points, frequencies, amplitudes, method="wavelet")
+
+    def test_streamed_blocks_continue_signal(self):
+        """Test that streamed blocks join into the signal of a single large block."""
+        compressor = CompressorVibration("comp", (0, 0, 0), comp_type=CompressorVibration.TYPE_RECIPROCATING)
+        corona = DischargeSound("corona", (0, 0, 0), DischargeSound.TYPE_CORONA, 11000)
+
+        for stream in (lambda size, count: compressor.stream_time_signal(size, 20000, count, start_time=1.0),
+                       lambda size, count: corona.stream_time_signal(size, count, start_time=1.0)):
+            np.random.seed(5)
+            blocks = list(stream(1000, 4))
+            np.random.seed(5)
+            (time_points, whole), = stream(4000, 1)
+
+            # Impact tails, modulation phase and filter state carry across blocks
+            np.testing.assert_allclose(np.concatenate([t for t, _ in blocks]), time_points)
+            np.testing.assert_allclose(np.concatenate([v for _, v in blocks]), whole, atol=1e-9)
+            self.assertAlmostEqual(time_points[0], 1.0)
+
+
+class TestVibrationPropagation(unittest.TestCase):
+    """Tests for cached transfer functions of the spatial propagation model."""
+
+    def test_cached_responses_match_paths(self):
+        """Test that batched responses match per-path attenuation and follow layout changes."""
+        model = SpatialPropagationModel("plant")
+        model.add_region("slab", ((1, -1, -1), (2, 1, 1)), COMMON_MATERIALS['concrete'])
+        receivers = [(3.0, 0.0, 0.0), (0.0, 2.0, 0.0), Vector3D(3.0, 0.5, 0.0)]
+
+        frequencies, responses = model.calculate_spatial_responses((0, 0, 0), receivers, (0, 500, 11))
+        self.assertEqual(responses.shape, (3, 11))
+        for receiver, response in zip(receivers, responses):
+            path = model.find_path_through_regions((0, 0, 0), receiver)
+            expected = [path.calculate_attenuation(f) for f in frequencies]
+            np.testing.assert_allclose(response, expected)
+
+        # Repeated queries, on any frequency grid, reuse the traced paths
+        traced = []
+        find_path = model.find_path_through_regions
+        model.find_path_through_regions = lambda *args: traced.append(args) or find_path(*args)
+        model.calculate_spatial_response((0, 0, 0), receivers, (0, 1000, 5))
+        self.assertEqual(traced, [])
+
+        # Changing the layout traces the paths again
+        model.add_region("mat", ((-1, 1.5, -1), (1, 2.5, 1)), COMMON_MATERIALS['rubber'])
+        _, updated = model.calculate_spatial_responses((0, 0, 0), receivers, (0, 500, 11))
+        np.testing.assert_allclose(updated[0], responses[0])
+        self.assertTrue(np.all(updated[1] < responses[1]))
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Tests for the spatial indexes."""
+
+    def test_point_index_matches_scan(self):
+        """Test that radius queries match a linear distance scan."""
+        rng = np.random.default_rng(3)
+        points = rng.uniform(0, 20, (500, 3))
+        index = PointIndex(points)
+
+        for center in rng.uniform(0, 20, (20, 3)):
+            expected = np.flatnonzero(np.linalg.norm(points - center, axis=1) <= 3.0)
+            np.testing.assert_array_equal(index.query_radius(center, 3.0), expected)
+
+        distances, indices = index.query_nearest(points[7], k=1)
+        self.assertEqual(indices[0], 7)
+        self.assertEqual(len(PointIndex().query_radius((0, 0, 0), 1.0)), 0)
+
+    def test_box_index_matches_scan(self):
+        """Test that point queries match a linear containment scan."""
+        rng = np.random.default_rng(4)
+        mins = rng.uniform(0, 20, (300, 3))
+        maxs = mins + rng.uniform(0, 2, (300, 3))
+        boxes = list(zip(map(tuple, mins), map(tuple, maxs)))
+        boxes.append(((0, 0, 0), (20, 20, 20)))  # Too large to hash
+        index = BoxIndex(boxes)
+
+        all_mins = np.vstack([mins, [0, 0, 0]])
+        all_maxs = np.vstack([maxs, [20, 20, 20]])
+        for point in np.vstack([rng.uniform(0, 20, (200, 3)), maxs[:10], mins[:10]]):
+            expected = np.flatnonzero(np.all((all_mins <= point) & (point <= all_maxs), axis=1))
+            np.testing.assert_array_equal(index.query_point(point), expected)
+
+    def test_room_objects_at(self):
+        """Test that room lookups see objects added after a query."""
+        material = Material.from_library("drywall")
+        room = Room("test_room", (5.0, 4.0, 3.0))
+        room.add_object(Wall("north_wall", material, (0, 4, 0), (5, 4, 3)))
+        self.assertEqual([obj.name for obj in room.get_objects_at((2.5, 4, 1.5))], ["north_wall"])
+
+        room.add_object(Wall("inner_wall", material, (2.5, 0, 0), (2.5, 4, 3)))
+        self.assertEqual([obj.name for obj in room.get_objects_at((2.5, 4, 1.5))],
+                         ["north_wall", "inner_wall"])
+        self.assertEqual(room.get_objects_at((1, 1, 1)), [])
+
 
 class TestCoordinates(unittest.TestCase):
     """Tests for the coordinate transformation utilities."""
@@ -160,6 +566,41 @@ class TestCoordinates(unittest.TestCase):
         self.assertAlmostEqual(local_point_2[1], local_point[1])
         self.assertAlmostEqual(local_point_2[2], local_point[2])
 
+    def test_vector_array_operations(self):
+        """Test that batched vector operations match Vector3D."""
+        vectors = [Vector3D(1, 2, 3), Vector3D(0, 0, 0), Vector3D(-2, 0.5, 4)]
+        other = Vector3D(4, 5, 6)
+        batch = Vector3DArray.from_vectors(vectors)
+        self.assertEqual(len(batch), 3)
+
+        sums = batch + other
+        crosses = batch.cross(other)
+        units = (2 * batch).normalize()
+        dots = batch.dot(other)
+        for i, vector in enumerate(vectors):
+            self.assertEqual(sums[i].to_tuple(), (vector + other).to_tuple())
+            np.testing.assert_allclose(crosses[i].to_tuple(), vector.cross(other).to_tuple())
+            np.testing.assert_allclose(units[i].to_tuple(), vector.normalize().to_tuple())
+            self.assertAlmostEqual(dots[i], vector.dot(other))
+
+        # Vector3D is slotted and supports scalar * vector
+        self.assertFalse(hasattr(other, "__dict__"))
+        self.assertEqual((2 * other).to_tuple(), (8, 10, 12))
+
+    def test_batch_transforms(self):
+        """Test batched coordinate system and transform conversions."""
+        cs = CoordinateSystem(CoordinateSystem.CYLINDRICAL, Vector3D(1, 2, 3), (0.1, 0.2, 0.3))
+        transform = Transform(Vector3D(1, 0, 0), (0, 0, 0.5), Vector3D(2, 2, 2))
+        points = np.array([[1.0, 0.5, 2.0], [2.0, -1.0, 0.0]])
+
+        global_points = cs.local_to_global_points(points)
+        world_points = transform.transform_points(Vector3DArray(points))
+        for i, point in enumerate(points):
+            np.testing.assert_allclose(global_points[i], cs.local_to_global(tuple(point)))
+            np.testing.assert_allclose(world_points[i], transform.transform_point(tuple(point)))
+        np.testing.assert_allclose(cs.global_to_local_points(global_points), points, atol=1e-12)
+        np.testing.assert_allclose(transform.inverse_transform_points(world_points), points, atol=1e-12)
+
 
 class TestAirflow(unittest.TestCase):
     """Tests for the airflow modeling components."""
@@ -207,7 +648,7 @@ class TestAirflow(unittest.TestCase):
         
         # Calculate velocity field
         velocity_field = airflow.calculate_velocity_field()
-        self.assertEqual(len(velocity_field), 10 * 10 * 5)
+        self.assertEqual(velocity_field.shape, (3, 10, 10, 5))
         
         # Test velocity at a point
         velocity = airflow.get_velocity_at((5, 5, 2))
@@ -229,6 +670,161 @@ class TestAirflow(unittest.TestCase):
         # Some contaminant should have reached nearby cells
         self.assertGreater(voc_nearby, 0.0)
 
+    def test_velocity_field_tracks_source_changes(self):
+        """Test that source mutations update the cached velocity field."""
+        grid = SpatialGrid((10, 10, 5), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        airflow = AirflowModel(grid)
+        source = VentilationSource(
+            name="window",
+            position=(0.5, 0.5, 0.2),
+            direction=(1, 0, 0),
+            flow_rate=0.01,
+            source_type=VentilationSource.TYPE_BIDIRECTIONAL,
+            radius=0.1
+        )
+        airflow.add_source(source)
+
+        # Matches the per-point calculation
+        expected = source.get_velocity_at(grid.physical_coordinates((7, 5, 2)))
+        self.assertAlmostEqual(airflow.get_velocity_at((7, 5, 2)).x, expected.x)
+
+        # Flow rate changes rescale the field
+        before = airflow.get_velocity_at((7, 5, 2)).x
+        source.set_flow_rate(0.02)
+        self.assertAlmostEqual(airflow.get_velocity_at((7, 5, 2)).x, 2 * before)
+
+        # Reversing a bidirectional source moves the influence upstream
+        source.toggle_direction()
+        self.assertAlmostEqual(airflow.get_velocity_at((7, 5, 2)).x, 0.0)
+        expected = source.get_velocity_at(grid.physical_coordinates((3, 5, 2)))
+        self.assertAlmostEqual(airflow.get_velocity_at((3, 5, 2)).x, expected.x)
+        self.assertNotAlmostEqual(expected.x, 0.0)
+
+        airflow.remove_source("window")
+        self.assertFalse(airflow.get_velocity_array().any())
+
+    def test_advection_interpolates(self):
+        """Test semi-Lagrangian advection with trilinear interpolation."""
+        grid = SpatialGrid((5, 2, 2), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        airflow = AirflowModel(grid)
+
+        # Uniform 1 m/s flow along x
+        airflow.get_velocity_array()[0] = 1.0
+
+        grid.set_parameter_array("voc", 0.0)
+        grid.set_parameter_at((2, 0, 0), "voc", 10.0)
+
+        # Half a cell of back-trace splits the value between two cells
+        airflow.advect_parameter("voc", time_step=0.05)
+        self.assertAlmostEqual(grid.get_parameter_at((2, 0, 0), "voc"), 5.0)
+        self.assertAlmostEqual(grid.get_parameter_at((3, 0, 0), "voc"), 5.0)
+        self.assertAlmostEqual(grid.get_parameter_at((1, 0, 0), "voc"), 0.0)
+
+    def test_fused_step_matches_separate_passes(self):
+        """Test that the stacked airflow step matches per-parameter passes."""
+        rng = np.random.default_rng(3)
+        initial = {name: rng.random((6, 5, 4)) for name in ("voc", "co2", "pm25")}
+        grids = []
+        for _ in range(2):
+            grid = SpatialGrid((6, 5, 4), 0.2, storage=SpatialGrid.STORAGE_ARRAY)
+            for name, values in initial.items():
+                grid.set_parameter_array(name, values.copy())
+            airflow = AirflowModel(grid)
+            airflow.get_velocity_array()[0] = 1.0
+            airflow.set_air_exchange_rate(6.0)
+            grids.append((grid, airflow))
+
+        names = list(initial)
+        grids[0][1].apply_airflow_step(names, 0.05)
+
+        grid, airflow = grids[1]
+        for name in names:
+            airflow.advect_parameter(name, 0.05)
+            grid.diffuse_parameter(name, airflow.diffusion_coefficient * 0.05)
+        airflow._apply_air_exchange(names, 0.05)
+
+        for name in names:
+            np.testing.assert_allclose(grids[0][0].get_parameter_array(name),
+                                       grid.get_parameter_array(name), atol=1e-12)
+
+
+class TestParallelStepping(unittest.TestCase):
+    """Tests for slab-parallel grid stepping."""
+
+    def test_slabs_match_serial_kernels(self):
+        """Test that slab kernels with shared halos match whole-grid kernels."""
+        rng = np.random.default_rng(5)
+        grid = SpatialGrid((12, 9, 6), 0.2, storage=SpatialGrid.STORAGE_ARRAY)
+        reference = SpatialGrid((12, 9, 6), 0.2, storage=SpatialGrid.STORAGE_ARRAY)
+        for name in ("voc", "co2"):
+            values = rng.random((12, 9, 6))
+            grid.set_parameter_array(name, values.copy())
+            reference.set_parameter_array(name, values.copy())
+
+        airflow = AirflowModel(reference)
+        airflow.get_velocity_array()[1] = 0.3
+        airflow.set_air_exchange_rate(0.0)
+
+        with ParallelGridStepper(grid, ["voc", "co2"], num_workers=3, axis=1) as stepper:
+            self.assertEqual(stepper.slabs, [(0, 3), (3, 6), (6, 9)])
+            stepper.set_velocity_field(airflow.get_velocity_array())
+            for _ in range(3):
+                stepper.step(airflow.diffusion_coefficient * 0.5, 0.5, decay_factor=0.9)
+            stepper.write_to_grid()
+
+        for _ in range(3):
+            airflow.apply_airflow_step(["voc", "co2"], 0.5)
+            for name in ("voc", "co2"):
+                reference.set_parameter_array(name, reference.get_parameter_array(name) * 0.9)
+
+        for name in ("voc", "co2"):
+            np.testing.assert_allclose(grid.get_parameter_array(name),
+                                       reference.get_parameter_array(name), atol=1e-12)
+
+
+class TestSnapshots(unittest.TestCase):
+    """Tests for the chunked snapshot store."""
+
+    def test_write_and_slice(self):
+        """Test appending snapshots and reading time ranges and sub-volumes."""
+        rng = np.random.default_rng(7)
+        grid = SpatialGrid((5, 4, 3), 0.1, storage=SpatialGrid.STORAGE_ARRAY)
+        history = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run")
+            with SnapshotWriter.for_grid(path, grid, ["voc", "co2"], chunk_steps=4,
+                                         dtype=np.float64) as writer:
+                for step in range(10):
+                    grid.set_parameter_array("voc", rng.random((5, 4, 3)))
+                    history.append(grid.get_parameter_array("voc").copy())
+                    writer.append(grid, time=60.0 * step)
+            history = np.array(history)
+
+            reader = SnapshotReader(path)
+            self.assertEqual(len(reader), 10)
+            self.assertEqual(reader.find_step(130.0), 2)
+
+            # Ranges span chunk boundaries; unset parameters read as zero
+            np.testing.assert_array_equal(reader.read("voc"), history)
+            np.testing.assert_array_equal(reader.read("voc", slice(2, 9), (slice(1, 3), slice(None), 2)),
+                                          history[2:9, 1:3, :, 2])
+            np.testing.assert_array_equal(reader.read("voc", [7, 1, 3]), history[[7, 1, 3]])
+            np.testing.assert_array_equal(reader.get_snapshot("voc", 9), history[9])
+            self.assertEqual(reader.read("co2").max(), 0.0)
+
+            with self.assertRaises(ValueError):
+                reader.read("pm25")
+            with self.assertRaises(FileExistsError):
+                SnapshotWriter(path, ["voc"], (5, 4, 3))
+
+            # 10 steps leave a partly filled chunk; a closed writer rejects further use
+            with self.assertRaisesRegex(ValueError, "closed"):
+                writer.append(grid)
+            with self.assertRaisesRegex(ValueError, "closed"):
+                writer.flush()
+            writer.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -22,7 +22,7 @@ import time
 from typing import Tuple, List, Dict, Optional, Union
 from abc import ABC, abstractmethod
 
-from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.coordinates import Vector3D, as_points
 
 # Constants
 STEFAN_BOLTZMANN = 5.670374419e-8  # Stefan-Boltzmann constant (W/(m²·K⁴))
@@ -75,6 +75,42 @@ class ThermalSource(ABC):
         """
         pass
     
+    def calculate_temperature_at_points(self, points: np.ndarray,
+                                        ambient_temperature: float = AMBIENT_TEMPERATURE) -> np.ndarray:
+        """
+        Calculate temperature at a batch of points in space.
+        
+        Subclasses override this with a vectorized implementation; the default
+        falls back to calling calculate_temperature_at for each point.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            ambient_temperature: Ambient temperature in Kelvin
+            
+        Returns:
+            Array of shape (N,) with temperatures in Kelvin
+        """
+        points = as_points(points)
+        return np.array([self.calculate_temperature_at(tuple(point), ambient_temperature)
+                         for point in points], dtype=float)
+    
+    def _box_offsets(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Measure points against the axis-aligned bounding box of a source
+        that defines ``dimensions``.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Tuple of (inside, distance_to_surface) arrays of shape (N,)
+        """
+        half_extent = np.array(self.dimensions) / 2
+        offset = np.abs(points - np.array(self.position.to_tuple()))
+        inside = np.all(offset <= half_extent, axis=1)
+        distance_to_surface = np.linalg.norm(np.maximum(0, offset - half_extent), axis=1)
+        return inside, distance_to_surface
+    
     @property
     @abstractmethod
     def source_type(self) -> str:
@@ -205,20 +241,32 @@ class PowerLineHeat(ThermalSource):
         Returns:
             Temperature at the specified position in Kelvin
         """
-        if not self.enabled:
-            return ambient_temperature
+        return float(self.calculate_temperature_at_points(as_points(position), ambient_temperature)[0])
+    
+    def calculate_temperature_at_points(self, points: np.ndarray,
+                                        ambient_temperature: float = AMBIENT_TEMPERATURE) -> np.ndarray:
+        """
+        Calculate temperature at a batch of points due to the power line.
         
-        pos = Vector3D(*position)
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            ambient_temperature: Ambient temperature in Kelvin
+            
+        Returns:
+            Array of shape (N,) with temperatures in Kelvin
+        """
+        points = as_points(points)
+        if not self.enabled:
+            return np.full(len(points), ambient_temperature, dtype=float)
         
         # Find closest point on the line
-        closest = self._closest_point_on_line(pos)
+        start = np.array(self.start_point.to_tuple())
+        direction = np.array(self._direction.to_tuple())
+        t = np.clip((points - start) @ direction, 0, self._length)
+        closest = start + t[:, None] * direction
         
         # Calculate distance from the line
-        distance = (pos - closest).magnitude()
-        
-        if distance < self.diameter / 2:
-            # Inside the conductor - return source temperature
-            return self.temperature
+        distance = np.linalg.norm(points - closest, axis=1)
         
         # Temperature decreases with distance from the line
         # Use an exponential decay model based on distance
@@ -231,7 +279,8 @@ class PowerLineHeat(ThermalSource):
         temperature = ambient_temperature + (self.temperature - ambient_temperature) * \
                       np.exp(-distance / r_0)
         
-        return temperature
+        # Inside the conductor - use the source temperature
+        return np.where(distance < self.diameter / 2, self.temperature, temperature)
     
     def _closest_point_on_line(self, point: Vector3D) -> Vector3D:
         """
@@ -375,34 +424,28 @@ class TransformerHeat(ThermalSource):
         Returns:
             Temperature at the specified position in Kelvin
         """
-        if not self.enabled:
-            return ambient_temperature
-        
-        pos = Vector3D(*position)
-        
-        # Calculate distance from the center of the transformer
-        distance = (pos - self.position).magnitude()
-        
-        # Check if point is inside the transformer bounding box
-        half_width = self.dimensions[0] / 2
-        half_depth = self.dimensions[1] / 2
-        half_height = self.dimensions[2] / 2
+        return float(self.calculate_temperature_at_points(as_points(position), ambient_temperature)[0])
+    
+    def calculate_temperature_at_points(self, points: np.ndarray,
+                                        ambient_temperature: float = AMBIENT_TEMPERATURE) -> np.ndarray:
+        """
+        Calculate temperature at a batch of points due to the transformer.
         
-        if (abs(pos.x - self.position.x) <= half_width and
-            abs(pos.y - self.position.y) <= half_depth and
-            abs(pos.z - self.position.z) <= half_height):
-            # Inside the transformer - use a slightly lower temperature than core
-            # Temperature is not uniform inside a transformer
-            return self.temperature - (self.temperature - ambient_temperature) * 0.1
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            ambient_temperature: Ambient temperature in Kelvin
+            
+        Returns:
+            Array of shape (N,) with temperatures in Kelvin
+        """
+        points = as_points(points)
+        if not self.enabled:
+            return np.full(len(points), ambient_temperature, dtype=float)
         
         # Outside the transformer - use exponential decay model
         # Adjusted for shape by using the distance to the surface
-        
-        # Calculate distance to surface (simplified as distance from bounding box)
-        dx = max(0, abs(pos.x - self.position.x) - half_width)
-        dy = max(0, abs(pos.y - self.position.y) - half_depth)
-        dz = max(0, abs(pos.z - self.position.z) - half_height)
-        distance_to_surface = np.sqrt(dx**2 + dy**2 + dz**2)
+        # (simplified as distance from bounding box)
+        inside, distance_to_surface = self._box_offsets(points)
         
         # Characteristic length depends on power and cooling method
         if self.cooling_method == self.COOLING_OIL_NATURAL:
@@ -420,7 +463,10 @@ class TransformerHeat(ThermalSource):
         temperature = ambient_temperature + (self.temperature - ambient_temperature) * \
                       np.exp(-distance_to_surface / r_0)
         
-        return temperature
+        # Inside the transformer - use a slightly lower temperature than core
+        # Temperature is not uniform inside a transformer
+        core_temperature = self.temperature - (self.temperature - ambient_temperature) * 0.1
+        return np.where(inside, core_temperature, temperature)
 
 
 class ElectronicEquipment(ThermalSource):
@@ -509,34 +555,32 @@ class ElectronicEquipment(ThermalSource):
         Returns:
             Temperature at the specified position in Kelvin
         """
-        if not self.enabled or not self.active:
-            return ambient_temperature
-        
-        pos = Vector3D(*position)
-        
-        # Check if point is inside the equipment bounding box
-        half_width = self.dimensions[0] / 2
-        half_depth = self.dimensions[1] / 2
-        half_height = self.dimensions[2] / 2
+        return float(self.calculate_temperature_at_points(as_points(position), ambient_temperature)[0])
+    
+    def calculate_temperature_at_points(self, points: np.ndarray,
+                                        ambient_temperature: float = AMBIENT_TEMPERATURE) -> np.ndarray:
+        """
+        Calculate temperature at a batch of points due to the electronic equipment.
         
-        if (abs(pos.x - self.position.x) <= half_width and
-            abs(pos.y - self.position.y) <= half_depth and
-            abs(pos.z - self.position.z) <= half_height):
-            # Inside the equipment - return source temperature
-            return self.temperature
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            ambient_temperature: Ambient temperature in Kelvin
+            
+        Returns:
+            Array of shape (N,) with temperatures in Kelvin
+        """
+        points = as_points(points)
+        if not self.enabled or not self.active:
+            return np.full(len(points), ambient_temperature, dtype=float)
         
         # Calculate distance to surface
-        dx = max(0, abs(pos.x - self.position.x) - half_width)
-        dy = max(0, abs(pos.y - self.position.y) - half_depth)
-        dz = max(0, abs(pos.z - self.position.z) - half_height)
-        distance = np.sqrt(dx**2 + dy**2 + dz**2)
+        inside, distance = self._box_offsets(points)
         
         # For electronic equipment, heat dissipation is often directional
         # due to cooling systems, vents, etc.
         # Simplified model: stronger heat in +z direction (typical cooling design)
-        direction_factor = 1.0
-        if pos.z > self.position.z + half_height:  # Above the equipment
-            direction_factor = 1.5  # More heat rises
+        above = points[:, 2] > self.position.z + self.dimensions[2] / 2
+        direction_factor = np.where(above, 1.5, 1.0)  # More heat rises
         
         # Characteristic length depends on power
         r_0 = 0.3 * (self.power / 100.0)**0.3
@@ -545,7 +589,8 @@ class ElectronicEquipment(ThermalSource):
         temperature = ambient_temperature + direction_factor * \
                       (self.temperature - ambient_temperature) * np.exp(-distance / r_0)
         
-        return temperature
+        # Inside the equipment - use the source temperature
+        return np.where(inside, self.temperature, temperature)
 
 
 class ThermalProfile:
@@ -648,6 +693,28 @@ class ThermalProfile:
         
         return max_temp
     
+    def calculate_temperature_at_points(self, points: np.ndarray) -> np.ndarray:
+        """
+        Calculate the combined temperature at a batch of points from all sources.
+        
+        Args:
+            points: Array of shape (N, 3) with the (x, y, z) coordinates
+            
+        Returns:
+            Array of shape (N,) with combined temperatures in Kelvin
+        """
+        points = as_points(points)
+        ambient_temp = self.ambient_temperature
+        
+        # "Maximum temperature wins", as in calculate_temperature_at
+        max_temp = np.full(len(points), ambient_temp, dtype=float)
+        for source in self.sources.values():
+            if source.enabled:
+                np.maximum(max_temp, source.calculate_temperature_at_points(points, ambient_temp),
+                           out=max_temp)
+        
+        return max_temp
+    
     def calculate_temperature_grid(self, 
                                  x_range: Tuple[float, float, int],
                                  y_range: Tuple[float, float, int],
@@ -670,13 +737,9 @@ class ThermalProfile:
         y = np.linspace(y_range[0], y_range[1], y_range[2])
         X, Y = np.meshgrid(x, y)
         
-        # Initialize temperature array
-        T = np.ones_like(X) * self.ambient_temperature
-        
-        # Calculate temperature at each point
-        for i in range(X.shape[0]):
-            for j in range(X.shape[1]):
-                T[i, j] = self.calculate_temperature_at((X[i, j], Y[i, j], z))
+        # Calculate temperature at every point in one batch
+        points = np.column_stack((X.ravel(), Y.ravel(), np.full(X.size, z)))
+        T = self.calculate_temperature_at_points(points).reshape(X.shape)
                 
         return X, Y, T
     
@@ -902,12 +965,8 @@ class ThermalVisualizer:
         for k, z_val in enumerate(z):
             # Calculate temperature grid for this slice
             X, Y = np.meshgrid(x, y)
-            T = np.zeros_like(X)
-            
-            # Calculate temperature at each point
-            for i in range(X.shape[0]):
-                for j in range(X.shape[1]):
-                    T[i, j] = thermal_profile.calculate_temperature_at((X[i, j], Y[i, j], z_val))
+            points = np.column_stack((X.ravel(), Y.ravel(), np.full(X.size, z_val)))
+            T = thermal_profile.calculate_temperature_at_points(points).reshape(X.shape)
             
             # Convert to Celsius if requested
             if show_celsius:
@@ -10,7 +10,7 @@ import numpy as np
 import math
 from typing import Dict, List, Tuple, Optional, Union, Any
 import logging
-from .space import SpatialGrid, GridCell
+from .space import SpatialGrid, GridCell, accumulate_point_falloff
 
 logger = logging.getLogger(__name__)
 
@@ -57,11 +57,14 @@ class ThermalEffects:
             "acetaldehyde": {"freezing": -123.0, "boiling": 20.2},
         }
     
-    def calculate_reaction_rate_adjustment(self, base_rate: float, temperature: float, 
-                                           reaction_type: str = "voc_degradation") -> float:
+    def calculate_reaction_rate_adjustment(self, base_rate: Union[float, np.ndarray],
+                                           temperature: Union[float, np.ndarray],
+                                           reaction_type: str = "voc_degradation") -> Union[float, np.ndarray]:
         """
         Adjust chemical reaction rate based on temperature using the Arrhenius equation.
         
+        Accepts scalars or NumPy arrays (broadcast elementwise).
+        
         Args:
             base_rate: Base reaction rate at standard temperature (25°C)
             temperature: Current temperature in Celsius
@@ -85,7 +88,7 @@ class ThermalEffects:
         
         # Calculate rate constant ratio using Arrhenius equation
         # k = A * exp(-Ea/RT)
-        k_current = A * math.exp(-Ea / (self.R * temp_kelvin))
+        k_current = A * np.exp(-Ea / (self.R * temp_kelvin))
         k_standard = A * math.exp(-Ea / (self.R * std_temp_kelvin))
         
         # Adjust base rate by ratio of rate constants
@@ -94,11 +97,14 @@ class ThermalEffects:
         
         return adjusted_rate
     
-    def calculate_vapor_pressure(self, chemical: str, temperature: float) -> float:
+    def calculate_vapor_pressure(self, chemical: str,
+                                 temperature: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
         """
         Calculate vapor pressure of a chemical at a given temperature using the
         Clausius-Clapeyron equation.
         
+        Accepts a scalar or NumPy array of temperatures.
+        
         Args:
             chemical: Chemical name
             temperature: Temperature in Celsius
@@ -108,6 +114,8 @@ class ThermalEffects:
         """
         if chemical not in self.vapor_pressure_params:
             logger.warning(f"No vapor pressure data for {chemical}. Returning estimate.")
+            if isinstance(temperature, np.ndarray):
+                return np.full_like(temperature, 1000.0, dtype=float)
             return 1000.0  # Default estimate
             
         # Get reference data
@@ -120,15 +128,18 @@ class ThermalEffects:
         # Clausius-Clapeyron equation
         # ln(P2/P1) = (ΔHvap/R) * (1/T1 - 1/T2)
         exponent = (delta_h_vap / self.R) * ((1 / ref_temp_kelvin) - (1 / temp_kelvin))
-        new_pressure = ref_pressure * math.exp(exponent)
+        new_pressure = ref_pressure * np.exp(exponent)
         
         return new_pressure
     
-    def calculate_volatilization_rate(self, chemical: str, temperature: float, 
-                                     base_rate: float, surface_area: float = 1.0) -> float:
+    def calculate_volatilization_rate(self, chemical: str, temperature: Union[float, np.ndarray],
+                                     base_rate: Union[float, np.ndarray],
+                                     surface_area: float = 1.0) -> Union[float, np.ndarray]:
         """
         Calculate volatilization rate for a chemical at a given temperature.
         
+        Accepts scalars or NumPy arrays for temperature and base rate.
+        
         Args:
             chemical: Chemical name
             temperature: Temperature in Celsius
@@ -199,45 +210,50 @@ class ThermalEffects:
         if chemical_params is None:
             chemical_params = ["formaldehyde", "benzene", "toluene", "xylene", "voc_total"]
             
-        # Process each cell
-        for position, cell in grid.iterate_cells():
-            temperature = cell.get_parameter("temperature", 25.0)  # Default to 25°C
+        temperature = grid.get_parameter_array("temperature", 25.0)  # Default to 25°C
+        
+        # Skip cells at standard temp (25°C)
+        active = np.abs(temperature - 25.0) >= 0.1
+        if not active.any():
+            return
+        
+        # Reaction rate adjustment, shared by every chemical parameter
+        reaction_rate = 0.0001 * time_step  # Base degradation rate per second
+        adjusted_rate = self.calculate_reaction_rate_adjustment(reaction_rate, temperature)
+        
+        present = set(grid.get_parameter_names())
+        
+        # Apply temperature effects to each chemical parameter
+        for param in chemical_params:
+            if param not in present:
+                continue
+            current_value = grid.get_parameter_array(param, 0.0)
             
-            # Skip if temperature is at standard temp (25°C)
-            if abs(temperature - 25.0) < 0.1:
+            # Skip cells with no chemical present
+            cells = active & (current_value > 0.0)
+            if not cells.any():
                 continue
-                
-            # Apply temperature effects to each chemical parameter
-            for param in chemical_params:
-                current_value = cell.get_parameter(param, 0.0)
-                
-                # Skip if no chemical present
-                if current_value <= 0.0:
-                    continue
-                    
-                # Determine chemical name (strip suffixes like _ppb if present)
-                chemical = param.split('_')[0]
-                
-                # Reaction rate adjustment
-                reaction_rate = 0.0001 * time_step  # Base degradation rate per second
-                adjusted_rate = self.calculate_reaction_rate_adjustment(
-                    reaction_rate, temperature)
-                
-                # Calculate degradation
-                degradation = current_value * adjusted_rate
-                
-                # Volatilization adjustment for emission sources
-                if cell.get_parameter(f"{param}_source", 0.0) > 0:
-                    base_emission = cell.get_parameter(f"{param}_emission_rate", 0.0)
-                    if base_emission > 0:
-                        adjusted_emission = self.calculate_volatilization_rate(
-                            chemical, temperature, base_emission)
-                        # Update emission rate
-                        cell.set_parameter(f"{param}_emission_rate", adjusted_emission)
-                
-                # Apply combined effects
-                new_value = max(0.0, current_value - degradation)
-                cell.set_parameter(param, new_value)
+            
+            # Determine chemical name (strip suffixes like _ppb if present)
+            chemical = param.split('_')[0]
+            
+            # Calculate degradation
+            degradation = current_value * adjusted_rate
+            
+            # Volatilization adjustment for emission sources
+            base_emission = grid.get_parameter_array(f"{param}_emission_rate", 0.0)
+            emitting = (cells & (grid.get_parameter_array(f"{param}_source", 0.0) > 0)
+                        & (base_emission > 0))
+            if emitting.any():
+                adjusted_emission = np.zeros(grid.dimensions)
+                adjusted_emission[emitting] = self.calculate_volatilization_rate(
+                    chemical, temperature[emitting], base_emission[emitting])
+                # Update emission rate
+                grid.set_parameter_where(f"{param}_emission_rate", adjusted_emission, emitting)
+            
+            # Apply combined effects
+            new_value = np.maximum(0.0, current_value - degradation)
+            grid.set_parameter_where(param, new_value, cells)
     
     def apply_temperature_gradient(self, grid: SpatialGrid,
                                   source_positions: List[Tuple[int, int, int]],
@@ -257,67 +273,19 @@ class ThermalEffects:
         if len(source_positions) != len(source_temperatures):
             raise ValueError("source_positions and source_temperatures must have the same length")
             
-        # Create a new grid to store updated temperatures
-        new_temps = {}
-        
         # Initialize all cells with ambient temperature if they don't have a temperature
-        for position, cell in grid.iterate_cells():
-            if not cell.has_parameter("temperature"):
-                cell.set_parameter("temperature", ambient_temperature)
-                
-        # Apply heat diffusion
-        for position, cell in grid.iterate_cells():
-            current_temp = cell.get_parameter("temperature", ambient_temperature)
-            
-            # Calculate temperature from nearby sources
-            source_contribution = 0.0
-            for src_pos, src_temp in zip(source_positions, source_temperatures):
-                # Calculate distance to source
-                distance = sum((a - b) ** 2 for a, b in zip(position, src_pos)) ** 0.5
-                
-                # Skip if too far away
-                if distance > 10:  # Limit calculation radius for efficiency
-                    continue
-                    
-                # Heat falls off with square of distance
-                if distance < 0.1:  # Avoid division by zero
-                    strength = 1.0
-                else:
-                    strength = 1.0 / (1.0 + distance ** 2)
-                    
-                # Add weighted contribution
-                temp_diff = src_temp - ambient_temperature
-                source_contribution += temp_diff * strength
-            
-            # Get neighbor temperatures for diffusion
-            neighbors = cell.get_all_neighbors()
-            neighbor_temp_sum = 0.0
-            neighbor_count = 0
-            
-            for direction, neighbor in neighbors.items():
-                if neighbor:
-                    neighbor_temp = neighbor.get_parameter("temperature", ambient_temperature)
-                    neighbor_temp_sum += neighbor_temp
-                    neighbor_count += 1
-            
-            # Calculate diffusion effect
-            if neighbor_count > 0:
-                avg_neighbor_temp = neighbor_temp_sum / neighbor_count
-                diffusion_effect = (avg_neighbor_temp - current_temp) * diffusivity
-            else:
-                diffusion_effect = 0.0
-            
-            # Calculate new temperature
-            new_temp = current_temp + diffusion_effect + source_contribution * diffusivity
-            
-            # Store new temperature
-            new_temps[position] = new_temp
-        
-        # Update all cells with new temperatures
-        for position, temp in new_temps.items():
-            cell = grid.get_cell(position)
-            if cell:
-                cell.set_parameter("temperature", temp)
+        temperatures = grid.get_parameter_array("temperature", ambient_temperature)
+        
+        # Temperature pushed from nearby sources; heat falls off with square of distance
+        source_contribution = np.zeros(grid.dimensions)
+        for src_pos, src_temp in zip(source_positions, source_temperatures):
+            accumulate_point_falloff(source_contribution, src_pos, src_temp - ambient_temperature)
+        
+        # Diffuse towards the neighbor average and add the source effect
+        new_temps = grid.diffuse_array(temperatures, diffusivity)
+        new_temps += source_contribution * diffusivity
+        
+        grid.set_parameter_array("temperature", new_temps)
 
 
 class ThermalSource:
@@ -479,10 +447,9 @@ class ThermalManager:
         """
         Initialize temperatures across the grid with ambient temperature.
         """
-        for position, cell in self.grid.iterate_cells():
-            # Only set if not already set
-            if not cell.has_parameter("temperature"):
-                cell.set_parameter("temperature", self.ambient_temperature)
+        # Cells that already have a temperature keep it
+        self.grid.set_parameter_array(
+            "temperature", self.grid.get_parameter_array("temperature", self.ambient_temperature))
     
     def update_sources(self) -> None:
         """
@@ -0,0 +1,254 @@
+"""
+EnviroSense Physics Engine - Thermal Imaging
+
+This module renders temperature fields into thermal camera frames using a
+vectorized pinhole camera model. All rays of a frame are traced together, so
+a frame costs a few array operations per ray step instead of a Python loop
+per pixel.
+
+Camera orientation follows the {'yaw', 'pitch', 'roll'} convention used by
+Environment3DState.get_thermal_field_view, in degrees. With all angles zero
+the camera looks along +x with +z up; yaw turns towards +y and pitch tilts
+towards +z. Image row 0 is the top of the frame.
+"""
+
+import math
+from typing import Dict, Tuple, Optional
+
+import numpy as np
+
+from .coordinates import normalize_vectors
+from .space import trilinear_sample
+
+KELVIN_OFFSET = 273.15  # Celsius to Kelvin
+
+# Rays traced per batch when marching, bounding the (rays, steps, 3) sample buffer
+DEFAULT_CHUNK_SIZE = 4096
+
+# Rise above ambient (Kelvin) below which a profile pixel shows no source
+DEFAULT_MIN_SOURCE_RISE = 0.01
+
+
+def camera_basis(camera_orientation: Optional[Dict[str, float]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the camera's forward, right and up unit vectors.
+    
+    Args:
+        camera_orientation: Dict with 'yaw', 'pitch' and 'roll' in degrees (missing angles are 0)
+    
+    Returns:
+        Tuple of (forward, right, up) arrays of shape (3,)
+    """
+    orientation = camera_orientation or {}
+    yaw = math.radians(orientation.get("yaw", 0.0))
+    pitch = math.radians(orientation.get("pitch", 0.0))
+    roll = math.radians(orientation.get("roll", 0.0))
+    
+    forward = np.array([math.cos(pitch) * math.cos(yaw), math.cos(pitch) * math.sin(yaw), math.sin(pitch)])
+    right = np.array([math.sin(yaw), -math.cos(yaw), 0.0])
+    up = np.cross(right, forward)
+    
+    # Roll rotates the image plane about the forward axis
+    right, up = (math.cos(roll) * right + math.sin(roll) * up,
+                 math.cos(roll) * up - math.sin(roll) * right)
+    return forward, right, up
+
+
+def camera_ray_directions(camera_orientation: Optional[Dict[str, float]],
+                          fov_degrees: Tuple[float, float],
+                          resolution: Tuple[int, int]) -> np.ndarray:
+    """
+    Compute the unit ray direction through the centre of every pixel.
+    
+    Args:
+        camera_orientation: Dict with 'yaw', 'pitch' and 'roll' in degrees
+        fov_degrees: Horizontal and vertical field of view in degrees
+        resolution: Image (width, height) in pixels
+    
+    Returns:
+        Array of shape (height, width, 3)
+    """
+    width, height = int(resolution[0]), int(resolution[1])
+    forward, right, up = camera_basis(camera_orientation)
+    
+    u = math.tan(math.radians(fov_degrees[0]) / 2) * ((2.0 * (np.arange(width) + 0.5) / width) - 1.0)
+    v = math.tan(math.radians(fov_degrees[1]) / 2) * (1.0 - (2.0 * (np.arange(height) + 0.5) / height))
+    
+    directions = forward + u[None, :, None] * right + v[:, None, None] * up
+    return normalize_vectors(directions)
+
+
+def ray_box_interval(origin: np.ndarray, directions: np.ndarray,
+                     box_min: np.ndarray, box_max: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distances along each ray at which it enters and leaves an axis-aligned box (slab method).
+    
+    Args:
+        origin: Ray origin of shape (3,)
+        directions: Unit ray directions of shape (N, 3)
+        box_min: Lower box corner of shape (3,)
+        box_max: Upper box corner of shape (3,)
+    
+    Returns:
+        Tuple of (entry, exit) arrays of N distances, both clipped at zero.
+        Rays that miss the box have exit <= entry.
+    """
+    safe = np.where(np.abs(directions) < 1e-12, 1e-12, directions)
+    t1 = (box_min - origin) / safe
+    t2 = (box_max - origin) / safe
+    entry = np.maximum(np.minimum(t1, t2).max(axis=1), 0.0)
+    exit_ = np.maximum(np.maximum(t1, t2).min(axis=1), 0.0)
+    return entry, exit_
+
+
+def ray_box_exit(origin: np.ndarray, directions: np.ndarray,
+                 box_min: np.ndarray, box_max: np.ndarray) -> np.ndarray:
+    """
+    Distance along each ray at which it leaves an axis-aligned box (slab method).
+    
+    Args:
+        origin: Ray origin of shape (3,)
+        directions: Unit ray directions of shape (N, 3)
+        box_min: Lower box corner of shape (3,)
+        box_max: Upper box corner of shape (3,)
+    
+    Returns:
+        Array of N exit distances, clipped at zero for rays that never enter the box
+    """
+    return ray_box_interval(origin, directions, box_min, box_max)[1]
+
+
+def render_grid_view(values: np.ndarray,
+                     cell_size: float,
+                     camera_position: Tuple[float, float, float],
+                     camera_orientation: Optional[Dict[str, float]],
+                     fov_degrees: Tuple[float, float],
+                     resolution: Tuple[int, int],
+                     origin: Tuple[float, float, float] = (0.0, 0.0, 0.0),
+                     absorption_per_m: float = 0.0,
+                     step: Optional[float] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Render a gridded temperature field as seen by a pinhole thermal camera.
+    
+    The grid's bounding faces are the opaque surfaces the camera sees: from
+    inside the grid each pixel shows the face where its ray leaves the grid,
+    from outside it shows the face where its ray enters it. Pixels whose ray
+    misses the grid are NaN. With absorption and the camera inside the grid,
+    the air along the ray also emits: each pixel shows the transmittance-
+    weighted average of the temperatures along the ray and at the exit point.
+    Air outside the grid neither emits nor absorbs, so only in-grid path
+    length is marched, at one trilinear sample per step.
+    
+    Args:
+        values: Temperature array of shape (nx, ny, nz), node (i, j, k) at origin + (i, j, k) * cell_size
+        cell_size: Grid spacing in meters
+        camera_position: Camera (x, y, z) position in meters
+        camera_orientation: Dict with 'yaw', 'pitch' and 'roll' in degrees
+        fov_degrees: Horizontal and vertical field of view in degrees
+        resolution: Image (width, height) in pixels
+        origin: Physical position of grid node (0, 0, 0)
+        absorption_per_m: Absorption coefficient of the air in 1/m
+        step: Ray marching step in meters (default: half a cell)
+        chunk_size: Number of rays marched per batch
+    
+    Returns:
+        Image of shape (height, width) in the units of ``values``, NaN where rays miss the grid
+    """
+    width, height = int(resolution[0]), int(resolution[1])
+    directions = camera_ray_directions(camera_orientation, fov_degrees, resolution).reshape(-1, 3)
+    camera = np.asarray(camera_position, dtype=float)
+    origin = np.asarray(origin, dtype=float)
+    box_max = origin + (np.asarray(values.shape) - 1) * cell_size
+    
+    t_entry, t_exit = ray_box_interval(camera, directions, origin, box_max)
+    hits = t_exit > t_entry
+    # Rays from outside the grid (t_entry > 0) see the face they enter through, rays from inside the far face
+    inside = hits & (t_entry <= 0)
+    surface_points = camera + directions * np.where(inside, t_exit, t_entry)[:, None]
+    image = np.full(len(directions), np.nan)
+    image[hits] = trilinear_sample(values, ((surface_points[hits] - origin) / cell_size).T)
+    
+    if absorption_per_m <= 0:
+        return image.reshape(height, width)
+    
+    # Each ray from inside the grid takes the steps whose midpoints lie inside it, and no more
+    step = step if step is not None else 0.5 * cell_size
+    path_lengths = np.where(inside, t_exit - t_entry, 0.0)
+    step_counts = np.maximum(np.ceil(path_lengths / step - 0.5), 0).astype(int)
+    # Emission of the k-th segment past the entry point, attenuated by the air before it
+    segment_weights = np.exp(-absorption_per_m * step * np.arange(step_counts.max(initial=0))) * \
+                      (1.0 - math.exp(-absorption_per_m * step))
+    
+    # March in grid index units, starting at each ray's first midpoint (one row per axis)
+    first_points = ((camera + directions * (t_entry + 0.5 * step)[:, None] - origin) / cell_size).T
+    index_steps = (directions * (step / cell_size)).T
+    for start in range(0, len(directions), chunk_size):
+        rays = slice(start, start + chunk_size)
+        counts = step_counts[rays]
+        if not counts.sum():
+            continue
+        
+        # Flatten the batch's ragged (ray, step) samples
+        ray_index = np.repeat(np.arange(len(counts)), counts)
+        steps_taken = np.arange(len(ray_index)) - np.repeat(np.cumsum(counts) - counts, counts)
+        points = np.empty((3, len(ray_index)))
+        for axis in range(3):
+            points[axis] = np.repeat(first_points[axis, rays], counts) + \
+                           np.repeat(index_steps[axis, rays], counts) * steps_taken
+        samples = trilinear_sample(values, points)
+        
+        weights = segment_weights[steps_taken]
+        exit_weight = np.exp(-absorption_per_m * path_lengths[rays])
+        image[rays] = (np.bincount(ray_index, weights * samples, len(counts)) + exit_weight * image[rays]) / \
+                      (np.bincount(ray_index, weights, len(counts)) + exit_weight)
+    
+    return image.reshape(height, width)
+
+
+def render_profile_view(profile,
+                        camera_position: Tuple[float, float, float],
+                        camera_orientation: Optional[Dict[str, float]],
+                        fov_degrees: Tuple[float, float],
+                        resolution: Tuple[int, int],
+                        max_range: float = 20.0,
+                        step: float = 0.1,
+                        min_rise: float = DEFAULT_MIN_SOURCE_RISE,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Render the analytic sources of a ThermalProfile as seen by a pinhole thermal camera.
+    
+    Each pixel shows the hottest temperature along its ray within ``max_range``,
+    matching the "maximum temperature wins" combination ThermalProfile uses.
+    Pixels whose ray sees no source more than ``min_rise`` above the profile's
+    ambient temperature are NaN, so the image can be layered over another
+    rendering (e.g., with ``np.fmax``) without painting ambient over it.
+    
+    Args:
+        profile: ThermalProfile providing calculate_temperature_at_points (Kelvin)
+        camera_position: Camera (x, y, z) position in meters
+        camera_orientation: Dict with 'yaw', 'pitch' and 'roll' in degrees
+        fov_degrees: Horizontal and vertical field of view in degrees
+        resolution: Image (width, height) in pixels
+        max_range: Farthest distance sampled along each ray in meters
+        step: Ray marching step in meters
+        min_rise: Smallest rise above ambient, in Kelvin, counted as seeing a source
+        chunk_size: Number of rays marched per batch
+    
+    Returns:
+        Image of shape (height, width) in degrees Celsius, NaN where no source is seen
+    """
+    width, height = int(resolution[0]), int(resolution[1])
+    directions = camera_ray_directions(camera_orientation, fov_degrees, resolution).reshape(-1, 3)
+    camera = np.asarray(camera_position, dtype=float)
+    
+    distances = (np.arange(int(math.ceil(max_range / step))) + 0.5) * step
+    image = np.empty(len(directions))
+    for start in range(0, len(directions), chunk_size):
+        rays = slice(start, start + chunk_size)
+        points = camera + directions[rays, None, :] * distances[None, :, None]
+        temperatures = profile.calculate_temperature_at_points(points.reshape(-1, 3))
+        image[rays] = temperatures.reshape(-1, len(distances)).max(axis=1)
+    
+    image[image - profile.ambient_temperature <= min_rise] = np.nan
+    return image.reshape(height, width) - KELVIN_OFFSET
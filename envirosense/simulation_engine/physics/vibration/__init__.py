@@ -7,7 +7,7 @@ propagation through materials, and analysis/visualization tools.
 """
 
 # Import base classes
-from envirosense.core.physics.vibration.base import Vector3D, VibrationSource
+from envirosense.core.physics.vibration.base import Vector3D, VibrationSource, stream_composite_time_signal
 
 # Import all sources
 from envirosense.core.physics.vibration.sources import (
@@ -26,6 +26,7 @@ from envirosense.core.physics.vibration.visualizer import VibrationVisualizer
 __all__ = [
     'Vector3D',
     'VibrationSource',
+    'stream_composite_time_signal',
     'TransformerVibration',
     'MotorVibration',
     'GeneratorVibration',
@@ -6,13 +6,20 @@ vibration sources, propagation, and analysis in the EnviroSense physics engine.
 """
 
 import numpy as np
-from typing import Tuple, List, Dict, Optional, Any, Union
+from typing import Tuple, List, Dict, Optional, Any, Union, Iterator, Sequence
 import matplotlib.pyplot as plt
 from abc import ABC, abstractmethod
 import uuid
 import json
 
 from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.spectral_synthesis import SYNTHESIS_AUTO
+
+# Decay times after which an impact's response is dropped (e^-20 ~ 2e-9)
+IMPACT_TAIL_DECAYS = 20
+
+# Sample rate used when neither the caller nor the source specifies one
+DEFAULT_SAMPLE_RATE = 10000
 
 
 class VibrationSource(ABC):
@@ -50,6 +57,9 @@ class VibrationSource(ABC):
         # Default properties
         self.is_active = True
         self.metadata = {}
+        
+        # How line spectra are synthesized ('direct', 'ifft' or 'auto')
+        self.synthesis_method = SYNTHESIS_AUTO
     
     @abstractmethod
     def generate_spectrum(self, freq_range: Tuple[float, float, int]) -> Tuple[np.ndarray, np.ndarray]:
@@ -78,6 +88,104 @@ class VibrationSource(ABC):
         """
         pass
     
+    def stream_time_signal(self,
+                           block_size: int,
+                           sample_rate: Optional[float] = None,
+                           num_blocks: Optional[int] = None,
+                           start_time: float = 0.0) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate the time-domain signal as a stream of fixed-size blocks.
+        
+        Consecutive blocks continue one signal: tone phases, modulations,
+        impact tails and noise state carry across block boundaries, and only
+        the current block is held in memory. The source's line spectrum and
+        phases are fixed when the stream starts.
+        
+        Args:
+            block_size: Samples per block
+            sample_rate: Sample rate in Hz, defaults to that of generate_time_signal
+            num_blocks: Number of blocks to yield, or None for an endless stream
+            start_time: Time of the first sample in seconds
+            
+        Yields:
+            Tuples of (time_points, amplitude) arrays of ``block_size`` samples
+        """
+        if block_size < 1:
+            raise ValueError(f"Block size must be positive, got {block_size}")
+        
+        sample_rate = self._resolve_sample_rate(sample_rate)
+        sample_spacing = 1.0 / sample_rate
+        state = self._start_signal(sample_rate)
+        
+        first_sample = int(round(start_time * sample_rate))
+        block = 0
+        while num_blocks is None or block < num_blocks:
+            time_points = (first_sample + np.arange(block_size)) * sample_spacing
+            yield time_points, self._render_signal(time_points, sample_spacing, state)
+            first_sample += block_size
+            block += 1
+    
+    def _resolve_sample_rate(self, sample_rate: Optional[float]) -> float:
+        """
+        Get the sample rate to generate signals at.
+        
+        Args:
+            sample_rate: Requested sample rate in Hz, or None for the source's default
+            
+        Returns:
+            Sample rate in Hz
+        """
+        return DEFAULT_SAMPLE_RATE if sample_rate is None else sample_rate
+    
+    def _start_signal(self, sample_rate: float) -> Dict[str, Any]:
+        """
+        Create the state of a new signal, such as its line spectrum and phases.
+        
+        Sources that support streaming override this together with
+        _render_signal.
+        
+        Args:
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Dictionary of signal state passed to _render_signal
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support signal streaming")
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the signal at a block of uniformly spaced time points.
+        
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
+            
+        Returns:
+            Array of signal values
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support signal streaming")
+    
+    def _generate_signal(self, duration: float, sample_rate: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Render a whole signal as a single block.
+        
+        Args:
+            duration: Signal duration in seconds
+            sample_rate: Sample rate in Hz, or None for the source's default
+            
+        Returns:
+            Tuple of (time_points, amplitude) arrays
+        """
+        sample_rate = self._resolve_sample_rate(sample_rate)
+        num_samples = int(duration * sample_rate)
+        time_points = np.linspace(0, duration, num_samples)
+        sample_spacing = duration / max(num_samples - 1, 1)
+        
+        state = self._start_signal(sample_rate)
+        return time_points, self._render_signal(time_points, sample_spacing, state)
+    
     def set_position(self, position: Union[Vector3D, Tuple[float, float, float]]) -> None:
         """
         Set the position of the vibration source.
@@ -157,6 +265,56 @@ class VibrationSource(ABC):
         return f"{self.__class__.__name__}({self.name}, pos={self.position})"
 
 
+def stream_composite_time_signal(sources: Sequence[VibrationSource],
+                                 block_size: int,
+                                 sample_rate: Optional[float] = None,
+                                 num_blocks: Optional[int] = None,
+                                 start_time: float = 0.0,
+                                 gains: Optional[Sequence[float]] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream the combined time-domain signal of several vibration sources.
+    
+    Args:
+        sources: Vibration sources to combine; inactive sources are skipped
+        block_size: Samples per block
+        sample_rate: Sample rate in Hz, defaults to the highest default of the sources
+        num_blocks: Number of blocks to yield, or None for an endless stream
+        start_time: Time of the first sample in seconds
+        gains: Optional per-source amplitude factors, such as path attenuations
+        
+    Yields:
+        Tuples of (time_points, composite amplitude) arrays of ``block_size`` samples
+    """
+    if gains is None:
+        gains = [1.0] * len(sources)
+    if len(gains) != len(sources):
+        raise ValueError(f"Expected {len(sources)} gains, got {len(gains)}")
+    
+    active = [(source, gain) for source, gain in zip(sources, gains) if source.is_active]
+    if sample_rate is None:
+        sample_rate = max((source._resolve_sample_rate(None) for source, _ in active),
+                          default=DEFAULT_SAMPLE_RATE)
+    
+    for source, _ in active:
+        if source._resolve_sample_rate(sample_rate) != sample_rate:
+            raise ValueError(f"Source {source.name} cannot be sampled at {sample_rate} Hz")
+    
+    streams = [(source.stream_time_signal(block_size, sample_rate, num_blocks, start_time), gain)
+               for source, gain in active]
+    
+    sample_spacing = 1.0 / sample_rate
+    first_sample = int(round(start_time * sample_rate))
+    block = 0
+    while num_blocks is None or block < num_blocks:
+        time_points = (first_sample + np.arange(block_size)) * sample_spacing
+        composite = np.zeros(block_size)
+        for stream, gain in streams:
+            composite += gain * next(stream)[1]
+        yield time_points, composite
+        first_sample += block_size
+        block += 1
+
+
 class Material:
     """
     Represents material properties for vibration propagation.
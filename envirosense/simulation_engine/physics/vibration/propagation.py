@@ -11,6 +11,10 @@ import math
 from dataclasses import dataclass
 
 from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.spatial_index import BoxIndex
+
+# Most source-receiver paths whose attenuation coefficients are cached
+MAX_CACHED_PATHS = 65536
 
 
 @dataclass
@@ -125,31 +129,27 @@ class VibrationPath:
                 position = sum(segment[0] for segment in path_segments[:i+1])
                 self.interfaces.append((position, material1, material2))
     
-    def calculate_attenuation(self, frequency: float) -> float:
+    def get_attenuation_coefficients(self) -> Tuple[float, float, float]:
         """
-        Calculate the attenuation of vibration along this path for a given frequency.
+        Get the frequency-independent coefficients of the path attenuation.
+        
+        The attenuation at frequency f is ``transmission * exp(-(decay + slope * f))``:
+        segment damping grows linearly with frequency, so the per-segment
+        exponentials combine into one.
         
-        Args:
-            frequency: Frequency in Hz
-            
         Returns:
-            Attenuation factor (0-1 where 0 is complete attenuation)
+            Tuple of (decay, slope, transmission)
         """
-        # Start with no attenuation
-        attenuation_factor = 1.0
-        
-        # Apply attenuation for each segment
+        # Sum the exponential attenuation of each segment
+        # Higher frequencies are attenuated more
+        decay = 0.0
+        slope = 0.0
         for distance, material in self.path_segments:
-            # Frequency-dependent damping coefficient
-            # Higher frequencies are attenuated more
-            effective_damping = material.damping_coefficient * (
-                1 + material.freq_damping_factor * frequency)
-            
-            # Exponential attenuation with distance
-            segment_attenuation = math.exp(-effective_damping * distance)
-            attenuation_factor *= segment_attenuation
+            decay += material.damping_coefficient * distance
+            slope += material.damping_coefficient * material.freq_damping_factor * distance
         
         # Apply attenuation at each interface
+        transmission = 1.0
         for _, material1, material2 in self.interfaces:
             # Simplified transmission coefficient calculation
             # Based on impedance mismatch (density * velocity)
@@ -158,16 +158,38 @@ class VibrationPath:
             
             # Transmission coefficient
             if z1 == 0 or z2 == 0:  # Avoid division by zero
-                transmission = 0
+                transmission = 0.0
             else:
                 # Simplified transmission calculation
                 # More accurate models would use the full acoustic equation
-                transmission = 4 * z1 * z2 / ((z1 + z2) ** 2)
+                transmission *= 4 * z1 * z2 / ((z1 + z2) ** 2)
+        
+        return decay, slope, transmission
+    
+    def calculate_attenuation(self, frequency: float) -> float:
+        """
+        Calculate the attenuation of vibration along this path for a given frequency.
+        
+        Args:
+            frequency: Frequency in Hz
             
-            # Apply interface attenuation
-            attenuation_factor *= transmission
+        Returns:
+            Attenuation factor (0-1 where 0 is complete attenuation)
+        """
+        return float(self.calculate_attenuation_array(frequency))
+    
+    def calculate_attenuation_array(self, frequencies: np.ndarray) -> np.ndarray:
+        """
+        Calculate the attenuation of vibration along this path for many frequencies.
         
-        return attenuation_factor
+        Args:
+            frequencies: Array of frequencies in Hz
+            
+        Returns:
+            Array of attenuation factors, shaped like ``frequencies``
+        """
+        decay, slope, transmission = self.get_attenuation_coefficients()
+        return transmission * np.exp(-(decay + slope * np.asarray(frequencies, dtype=float)))
     
     def calculate_time_delay(self) -> float:
         """
@@ -203,10 +225,8 @@ class VibrationPath:
         # Generate frequency array
         frequencies = np.linspace(min_freq, max_freq, num_points)
         
-        # Calculate attenuation for each frequency
-        attenuation = np.zeros(num_points)
-        for i, freq in enumerate(frequencies):
-            attenuation[i] = self.calculate_attenuation(freq)
+        # Calculate attenuation for all frequencies at once
+        attenuation = self.calculate_attenuation_array(frequencies)
         
         return frequencies, attenuation
     
@@ -224,12 +244,8 @@ class VibrationPath:
         Returns:
             Modified spectrum after propagation effects
         """
-        # Create output arrays
-        modified_spectrum = np.zeros_like(spectrum)
-        
         # Apply attenuation to each frequency component
-        for i, freq in enumerate(frequencies):
-            modified_spectrum[i] = spectrum[i] * self.calculate_attenuation(freq)
+        modified_spectrum = spectrum * self.calculate_attenuation_array(frequencies)
         
         return frequencies, modified_spectrum
     
@@ -260,8 +276,7 @@ class VibrationPath:
         frequencies = np.arange(len(spectrum)) * freq_resolution
         
         # Apply frequency-dependent attenuation
-        for i, freq in enumerate(frequencies):
-            spectrum[i] *= self.calculate_attenuation(freq)
+        spectrum *= self.calculate_attenuation_array(frequencies)
         
         # Convert back to time domain
         modified_signal = np.fft.irfft(spectrum, n=len(time_signal))
@@ -440,17 +455,16 @@ class PropagationModel:
             if path_id in self.paths:
                 path = self.paths[path_id]
                 
-                # Calculate attenuation for each frequency
-                for i, freq in enumerate(frequencies):
-                    attenuation = path.calculate_attenuation(freq)
-                    time_delay = path.calculate_time_delay()
-                    
-                    # Convert to complex representation with phase shift due to delay
-                    phase_shift = 2 * np.pi * freq * time_delay
-                    complex_attenuation = attenuation * np.exp(1j * phase_shift)
-                    
-                    # Add to combined response
-                    combined_response[i] += complex_attenuation
+                # Calculate attenuation for all frequencies
+                attenuation = path.calculate_attenuation_array(frequencies)
+                time_delay = path.calculate_time_delay()
+                
+                # Convert to complex representation with phase shift due to delay
+                phase_shift = 2 * np.pi * frequencies * time_delay
+                complex_attenuation = attenuation * np.exp(1j * phase_shift)
+                
+                # Add to combined response
+                combined_response += complex_attenuation
         
         # Calculate magnitude of combined response
         magnitude_response = np.abs(combined_response)
@@ -538,8 +552,19 @@ class SpatialPropagationModel(PropagationModel):
         # Bounding box is ((min_x, min_y, min_z), (max_x, max_y, max_z))
         self.regions = {}
         
+        # Bounding-box index over the regions, as (region materials, index); rebuilt on change
+        self._region_index = None
+        
         # Default material for space not covered by regions
         self.default_material = COMMON_MATERIALS['air']
+        
+        # Incremented whenever the material layout changes
+        self.revision = 0
+        
+        # Attenuation coefficients and delay per (source, receiver, num_segments),
+        # valid for the layout they were computed under
+        self._path_cache = {}
+        self._path_cache_layout = None
     
     def add_region(self, 
                  region_id: str,
@@ -554,6 +579,18 @@ class SpatialPropagationModel(PropagationModel):
             material: Material for this region
         """
         self.regions[region_id] = (bounding_box, material)
+        self._region_index = None
+        self.revision += 1
+    
+    def invalidate_path_cache(self) -> None:
+        """
+        Discard cached paths so they are traced again on next use.
+        
+        Call this after changing the materials of regions already in the model.
+        """
+        self._path_cache = {}
+        self._region_index = None
+        self.revision += 1
     
     def get_material_at_point(self, point: Union[Vector3D, Tuple[float, float, float]]) -> Material:
         """
@@ -569,15 +606,16 @@ class SpatialPropagationModel(PropagationModel):
         if isinstance(point, Vector3D):
             point = (point.x, point.y, point.z)
         
-        # Check each region
-        for region_id, (bounding_box, material) in self.regions.items():
-            min_point, max_point = bounding_box
-            
-            # Check if point is inside bounding box
-            if (min_point[0] <= point[0] <= max_point[0] and
-                min_point[1] <= point[1] <= max_point[1] and
-                min_point[2] <= point[2] <= max_point[2]):
-                return material
+        if self._region_index is None or len(self._region_index[0]) != len(self.regions):
+            regions = list(self.regions.values())
+            self._region_index = ([material for _, material in regions],
+                                  BoxIndex([bounding_box for bounding_box, _ in regions]))
+        
+        # The first region added that contains the point wins
+        materials, index = self._region_index
+        hits = index.query_point(point)
+        if len(hits):
+            return materials[hits[0]]
         
         # If not in any region, use default material
         return self.default_material
@@ -641,6 +679,78 @@ class SpatialPropagationModel(PropagationModel):
         
         return self.create_multi_segment_path(path_id, segments, path_name)
     
+    def get_path_coefficients(self,
+                              source_pos: Union[Vector3D, Tuple[float, float, float]],
+                              receiver_pos: Union[Vector3D, Tuple[float, float, float]],
+                              num_segments: int = 10) -> Tuple[float, float, float, float]:
+        """
+        Get the attenuation coefficients and delay of the path between two positions.
+        
+        Paths are traced through the regions once and cached per source,
+        receiver and segment count until the material layout changes.
+        
+        Args:
+            source_pos: Source position
+            receiver_pos: Receiver position
+            num_segments: Number of segments to divide the path into
+            
+        Returns:
+            Tuple of (decay, slope, transmission, time_delay); see
+            VibrationPath.get_attenuation_coefficients
+        """
+        layout = (self.revision, len(self.regions), self.default_material)
+        if self._path_cache_layout != layout:
+            self._path_cache = {}
+            self._path_cache_layout = layout
+        
+        if isinstance(source_pos, Vector3D):
+            source_pos = source_pos.to_tuple()
+        if isinstance(receiver_pos, Vector3D):
+            receiver_pos = receiver_pos.to_tuple()
+        key = (tuple(map(float, source_pos)), tuple(map(float, receiver_pos)), num_segments)
+        
+        coefficients = self._path_cache.get(key)
+        if coefficients is None:
+            path = self.find_path_through_regions(source_pos, receiver_pos, num_segments)
+            coefficients = path.get_attenuation_coefficients() + (path.calculate_time_delay(),)
+            
+            # Drop the oldest path when the cache is full
+            if len(self._path_cache) >= MAX_CACHED_PATHS:
+                del self._path_cache[next(iter(self._path_cache))]
+            self._path_cache[key] = coefficients
+        
+        return coefficients
+    
+    def calculate_spatial_responses(self,
+                                    source_pos: Union[Vector3D, Tuple[float, float, float]],
+                                    receiver_positions: List[Union[Vector3D, Tuple[float, float, float]]],
+                                    freq_range: Tuple[float, float, int],
+                                    num_segments: int = 10
+                                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate frequency responses at many receiver positions as one array.
+        
+        Args:
+            source_pos: Source position
+            receiver_positions: List of receiver positions
+            freq_range: Tuple of (min_freq, max_freq, num_points)
+            num_segments: Number of segments to divide paths into
+            
+        Returns:
+            Tuple of (frequencies, responses) where responses has shape
+            (num_receivers, num_points)
+        """
+        min_freq, max_freq, num_points = freq_range
+        frequencies = np.linspace(min_freq, max_freq, num_points)
+        
+        coefficients = np.array([self.get_path_coefficients(source_pos, receiver_pos, num_segments)
+                                 for receiver_pos in receiver_positions]).reshape(-1, 4)
+        decay, slope, transmission = coefficients[:, 0:1], coefficients[:, 1:2], coefficients[:, 2:3]
+        
+        # Attenuation for all receivers and frequencies at once
+        responses = transmission * np.exp(-(decay + slope * frequencies))
+        return frequencies, responses
+    
     def calculate_spatial_response(self,
                                  source_pos: Union[Vector3D, Tuple[float, float, float]],
                                  receiver_positions: List[Union[Vector3D, Tuple[float, float, float]]],
@@ -659,16 +769,7 @@ class SpatialPropagationModel(PropagationModel):
         Returns:
             Dictionary mapping receiver index to (frequencies, response) arrays
         """
-        results = {}
+        frequencies, responses = self.calculate_spatial_responses(
+            source_pos, receiver_positions, freq_range, num_segments)
         
-        for i, receiver_pos in enumerate(receiver_positions):
-            # Find path through regions
-            path = self.find_path_through_regions(source_pos, receiver_pos, num_segments)
-            
-            # Calculate frequency response
-            frequencies, response = path.calculate_frequency_response(freq_range)
-            
-            # Store result
-            results[i] = (frequencies, response)
-        
-        return results
+        return {i: (frequencies, response) for i, response in enumerate(responses)}
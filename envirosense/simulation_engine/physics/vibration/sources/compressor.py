@@ -10,7 +10,8 @@ from typing import Tuple, List, Dict, Optional, Any, Union
 import math
 
 from envirosense.core.physics.coordinates import Vector3D
-from envirosense.core.physics.vibration.base import VibrationSource
+from envirosense.core.physics.spectral_synthesis import synthesize_tones, add_periodic_events
+from envirosense.core.physics.vibration.base import VibrationSource, IMPACT_TAIL_DECAYS
 
 
 class CompressorVibration(VibrationSource):
@@ -404,6 +405,18 @@ class CompressorVibration(VibrationSource):
         Returns:
             Tuple of (time_points, amplitude) arrays
         """
+        return self._generate_signal(duration, sample_rate)
+    
+    def _resolve_sample_rate(self, sample_rate: Optional[float]) -> float:
+        """
+        Get the sample rate to generate signals at.
+        
+        Args:
+            sample_rate: Requested sample rate in Hz, or None for the default
+            
+        Returns:
+            Sample rate in Hz
+        """
         # If no sample rate provided, calculate based on compressor type
         if sample_rate is None:
             if self.comp_type == self.TYPE_RECIPROCATING:
@@ -415,60 +428,68 @@ class CompressorVibration(VibrationSource):
             else:
                 # Default sample rate
                 sample_rate = 10000
+        return sample_rate
+    
+    def _start_signal(self, sample_rate: float) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: frequency components and their random phases.
         
-        # Generate time points
-        num_samples = int(duration * sample_rate)
-        time_points = np.linspace(0, duration, num_samples)
-        
+        Args:
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Dictionary of signal state
+        """
         # Get frequency components
         components = self._get_frequency_components()
         
         # Get base amplitude
         base_amplitude = self._calculate_base_amplitude()
         
-        # Initialize signal
-        signal = np.zeros_like(time_points)
+        # Component frequencies and amplitudes, skipping frequencies above Nyquist frequency
+        frequencies = np.array(list(components.keys()), dtype=float)
+        amplitudes = base_amplitude * np.array(list(components.values()), dtype=float)
+        below_nyquist = frequencies <= sample_rate / 2
+        
+        return {
+            'components': components,
+            'base_amplitude': base_amplitude,
+            'frequencies': frequencies[below_nyquist],
+            'amplitudes': amplitudes[below_nyquist],
+            # Random phase shifts for realism
+            'phases': 2 * np.pi * np.random.random(np.count_nonzero(below_nyquist))
+        }
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the compressor signal at a block of time points.
         
-        # Add each frequency component to the signal
-        for component_freq, relative_amp in components.items():
-            # Skip frequencies above Nyquist frequency
-            if component_freq > sample_rate / 2:
-                continue
-                
-            # Component amplitude
-            component_amp = base_amplitude * relative_amp
-            
-            # Generate component signal (sine wave)
-            # Add random phase shift for realism
-            phase_shift = 2 * np.pi * np.random.random()
-            component = component_amp * np.sin(2 * np.pi * component_freq * time_points + phase_shift)
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
             
-            # Add to total signal
-            signal += component
+        Returns:
+            Array of signal values
+        """
+        base_amplitude = state['base_amplitude']
+        
+        # Sum a sine wave per component
+        signal = synthesize_tones(time_points, state['frequencies'], state['amplitudes'],
+                                  state['phases'], method=self.synthesis_method)
         
         # Add special characteristics based on compressor type and condition
         if self.comp_type == self.TYPE_RECIPROCATING:
             # Add impulsive content from valve actions
-            # This creates periodic impacts at the compression frequency
+            # This creates periodic exponentially decaying impacts at the compression frequency
             impact_interval = 1.0 / self.compression_freq
             impact_strength = 0.8 * base_amplitude
+            decay_time = 0.005  # seconds
             
-            for t in np.arange(0, duration, impact_interval):
-                # Find closest time point
-                idx = int(t * sample_rate)
-                if idx < len(signal):
-                    # Add an exponentially decaying impulse
-                    decay_time = 0.005  # seconds
-                    
-                    # Time points relative to impact
-                    rel_time = time_points[idx:] - time_points[idx]
-                    
-                    # Create decaying impulse
-                    decay = impact_strength * np.exp(-rel_time / decay_time)
-                    
-                    # Add to signal, limited to len(signal)
-                    max_len = min(len(decay), len(signal) - idx)
-                    signal[idx:idx + max_len] += decay[:max_len]
+            add_periodic_events(signal, time_points, sample_spacing, impact_interval,
+                                IMPACT_TAIL_DECAYS * decay_time,
+                                lambda rel_time: impact_strength * np.exp(-rel_time / decay_time))
             
             # Add modulations based on crankshaft rotation
             mod_freq = self.rotation_freq
@@ -479,24 +500,12 @@ class CompressorVibration(VibrationSource):
         # Add valve leak effects if applicable
         if self.condition == self.CONDITION_VALVE_LEAK and self.comp_type == self.TYPE_RECIPROCATING:
             # Add high-frequency noise bursts at compression points
-            for t in np.arange(0, duration, impact_interval):
-                # Find closest time point
-                idx = int(t * sample_rate)
-                if idx < len(signal):
-                    # Duration of leak noise
-                    leak_duration = 0.02  # seconds
-                    leak_samples = int(leak_duration * sample_rate)
-                    end_idx = min(idx + leak_samples, len(signal))
-                    
-                    # Generate leak noise (filtered random)
-                    leak_noise = 0.4 * base_amplitude * np.random.normal(0, 1, end_idx - idx)
-                    
-                    # Apply envelope
-                    envelope = np.exp(-np.linspace(0, 5, end_idx - idx))
-                    leak_noise *= envelope
-                    
-                    # Add to signal
-                    signal[idx:end_idx] += leak_noise
+            leak_duration = 0.02  # seconds
+            
+            # Generate leak noise (filtered random) with a decaying envelope
+            add_periodic_events(
+                signal, time_points, sample_spacing, impact_interval, leak_duration,
+                lambda rel_time: 0.4 * base_amplitude * np.random.normal(0, 1, len(rel_time)) * np.exp(-5 * rel_time / leak_duration))
         
         # Add ambient noise
         noise_level = 0.01 * base_amplitude  # Base noise level
@@ -506,4 +515,4 @@ class CompressorVibration(VibrationSource):
         noise = noise_level * np.random.normal(0, 1, len(time_points))
         signal += noise
         
-        return time_points, signal
+        return signal
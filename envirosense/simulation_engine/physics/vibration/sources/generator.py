@@ -10,7 +10,8 @@ from typing import Tuple, List, Dict, Optional, Any, Union
 import math
 
 from envirosense.core.physics.coordinates import Vector3D
-from envirosense.core.physics.vibration.base import VibrationSource
+from envirosense.core.physics.spectral_synthesis import synthesize_tones, add_periodic_events
+from envirosense.core.physics.vibration.base import VibrationSource, IMPACT_TAIL_DECAYS
 
 
 class GeneratorVibration(VibrationSource):
@@ -327,70 +328,93 @@ class GeneratorVibration(VibrationSource):
         Returns:
             Tuple of (time_points, amplitude) arrays
         """
+        return self._generate_signal(duration, sample_rate)
+    
+    def _resolve_sample_rate(self, sample_rate: Optional[float]) -> float:
+        """
+        Get the sample rate to generate signals at.
+        
+        Args:
+            sample_rate: Requested sample rate in Hz, or None for the default
+            
+        Returns:
+            Sample rate in Hz
+        """
         # If no sample rate provided, use 10x the highest expected frequency
         if sample_rate is None:
             # Use 10x a reasonable max frequency (8x firing frequency should capture most harmonics)
             sample_rate = 10 * 8 * self.firing_freq
         
         # Ensure sample rate is at least 10 kHz for good resolution
-        sample_rate = max(10000, sample_rate)
-        
-        # Generate time points
-        num_samples = int(duration * sample_rate)
-        time_points = np.linspace(0, duration, num_samples)
+        return max(10000, sample_rate)
+    
+    def _start_signal(self, sample_rate: float) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: frequency components and their random phases.
         
+        Args:
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Dictionary of signal state
+        """
         # Get frequency components
         components = self._get_frequency_components()
         
         # Get base amplitude
         base_amplitude = self._calculate_base_amplitude()
         
-        # Initialize signal
-        signal = np.zeros_like(time_points)
+        # Component frequencies and amplitudes, skipping frequencies above Nyquist frequency
+        frequencies = np.array(list(components.keys()), dtype=float)
+        amplitudes = base_amplitude * np.array(list(components.values()), dtype=float)
+        below_nyquist = frequencies <= sample_rate / 2
+        
+        return {
+            'components': components,
+            'base_amplitude': base_amplitude,
+            'frequencies': frequencies[below_nyquist],
+            'amplitudes': amplitudes[below_nyquist],
+            # Random phase shifts for realism
+            'phases': 2 * np.pi * np.random.random(np.count_nonzero(below_nyquist)),
+            'misfires': np.zeros(0),
+            'misfire_horizon': None
+        }
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the generator signal at a block of time points.
         
-        # Add each frequency component to the signal
-        for component_freq, relative_amp in components.items():
-            # Skip frequencies above Nyquist frequency
-            if component_freq > sample_rate / 2:
-                continue
-                
-            # Component amplitude
-            component_amp = base_amplitude * relative_amp
-            
-            # Generate component signal (sine wave)
-            # Add random phase shift for realism
-            phase_shift = 2 * np.pi * np.random.random()
-            component = component_amp * np.sin(2 * np.pi * component_freq * time_points + phase_shift)
+        Misfires are drawn ahead of the block they start in, so a dip that
+        spans a block boundary is applied to both blocks.
+        
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
             
-            # Add to total signal
-            signal += component
+        Returns:
+            Array of signal values
+        """
+        base_amplitude = state['base_amplitude']
+        
+        # Sum a sine wave per component
+        signal = synthesize_tones(time_points, state['frequencies'], state['amplitudes'],
+                                  state['phases'], method=self.synthesis_method)
         
         # Add special characteristics based on condition and fuel type
         if self.fuel_type == self.FUEL_DIESEL:
             # Add diesel knock characteristic
-            # This creates periodic impacts at the firing frequency
-            impact_interval = 1.0 / self.firing_freq
+            # This creates periodic exponentially decaying impacts at the firing frequency
             impact_strength = 0.5 * base_amplitude
+            decay_time = 0.002  # seconds
             
-            for t in np.arange(0, duration, impact_interval):
-                # Find closest time point
-                idx = int(t * sample_rate)
-                if idx < len(signal):
-                    # Add an exponentially decaying impulse
-                    decay_time = 0.002  # seconds
-                    
-                    # Time points relative to impact
-                    rel_time = time_points[idx:] - time_points[idx]
-                    
-                    # Create decaying impulse
-                    decay = impact_strength * np.exp(-rel_time / decay_time)
-                    
-                    # Add to signal, limited to len(signal)
-                    max_len = min(len(decay), len(signal) - idx)
-                    signal[idx:idx + max_len] += decay[:max_len]
+            add_periodic_events(signal, time_points, sample_spacing, 1.0 / self.firing_freq,
+                                IMPACT_TAIL_DECAYS * decay_time,
+                                lambda rel_time: impact_strength * np.exp(-rel_time / decay_time))
         
         # Add fuel system irregularity if in that condition
-        if self.condition == self.CONDITION_FUEL_SYSTEM:
+        if self.condition == self.CONDITION_FUEL_SYSTEM and len(time_points):
             # Create irregular firing pattern by modulating the signal
             mod_freq = self.firing_freq / self.num_cylinders
             mod_depth = 0.3
@@ -399,17 +423,25 @@ class GeneratorVibration(VibrationSource):
             # Apply modulation
             signal *= modulation
             
-            # Add random misfires
-            num_misfires = int(duration * self.firing_freq * 0.1)  # 10% misfire rate
-            for _ in range(num_misfires):
-                misfire_time = duration * np.random.random()
-                idx = int(misfire_time * sample_rate)
-                if idx < len(signal):
-                    # Create a dip in amplitude around the misfire
-                    width = int(0.05 * self.firing_freq * sample_rate)  # Width of dip
-                    start = max(0, idx - width//2)
-                    end = min(len(signal), idx + width//2)
-                    signal[start:end] *= 0.3  # Reduce amplitude during misfire
+            # Add random misfires (10% misfire rate), drawn up to the end of
+            # the last dip that can reach this block
+            half_width = 0.05 * self.firing_freq / 2  # Half width of dip in seconds
+            horizon = time_points[-1] + half_width
+            if state['misfire_horizon'] is None:
+                state['misfire_horizon'] = time_points[0] - half_width
+            span = max(0.0, horizon - state['misfire_horizon'])
+            num_misfires = np.random.poisson(span * self.firing_freq * 0.1)
+            new_misfires = state['misfire_horizon'] + span * np.random.random(num_misfires)
+            state['misfire_horizon'] = max(state['misfire_horizon'], horizon)
+            
+            # Keep misfires whose dip is not over yet
+            misfires = np.concatenate([state['misfires'], new_misfires])
+            state['misfires'] = misfires[misfires + half_width > time_points[-1]]
+            
+            for misfire_time in misfires:
+                # Create a dip in amplitude around the misfire
+                in_dip = np.abs(time_points - misfire_time) < half_width
+                signal[in_dip] *= 0.3  # Reduce amplitude during misfire
         
         # Add ambient noise
         noise_level = 0.01 * base_amplitude  # Base noise level
@@ -419,4 +451,4 @@ class GeneratorVibration(VibrationSource):
         noise = noise_level * np.random.normal(0, 1, len(time_points))
         signal += noise
         
-        return time_points, signal
+        return signal
@@ -10,7 +10,8 @@ from typing import Tuple, List, Dict, Optional, Any, Union
 import math
 
 from envirosense.core.physics.coordinates import Vector3D
-from envirosense.core.physics.vibration.base import VibrationSource
+from envirosense.core.physics.spectral_synthesis import synthesize_tones, add_periodic_events
+from envirosense.core.physics.vibration.base import VibrationSource, IMPACT_TAIL_DECAYS
 
 
 class MotorVibration(VibrationSource):
@@ -333,64 +334,84 @@ class MotorVibration(VibrationSource):
         Returns:
             Tuple of (time_points, amplitude) arrays
         """
+        return self._generate_signal(duration, sample_rate)
+    
+    def _resolve_sample_rate(self, sample_rate: Optional[float]) -> float:
+        """
+        Get the sample rate to generate signals at.
+        
+        Args:
+            sample_rate: Requested sample rate in Hz, or None for the default
+            
+        Returns:
+            Sample rate in Hz
+        """
         # If no sample rate provided, use 10x a reasonable max frequency
         if sample_rate is None:
             # Use 10 kHz as a reasonable default for most motor vibrations
             sample_rate = 10000
+        return sample_rate
+    
+    def _start_signal(self, sample_rate: float) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: frequency components and their random phases.
         
-        # Generate time points
-        num_samples = int(duration * sample_rate)
-        time_points = np.linspace(0, duration, num_samples)
-        
+        Args:
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Dictionary of signal state
+        """
         # Get frequency components
         components = self._get_frequency_components()
         
         # Get base amplitude
         base_amplitude = self._calculate_base_amplitude()
         
-        # Initialize signal
-        signal = np.zeros_like(time_points)
+        # Component frequencies and amplitudes, skipping frequencies above Nyquist frequency
+        frequencies = np.array(list(components.keys()), dtype=float)
+        amplitudes = base_amplitude * np.array(list(components.values()), dtype=float)
+        below_nyquist = frequencies <= sample_rate / 2
         
-        # Add each frequency component to the signal
-        for component_freq, relative_amp in components.items():
-            # Skip frequencies above Nyquist frequency
-            if component_freq > sample_rate / 2:
-                continue
-                
-            # Component amplitude
-            component_amp = base_amplitude * relative_amp
-            
-            # Generate component signal (sine wave)
-            # Add random phase shift for realism
-            phase_shift = 2 * np.pi * np.random.random()
-            component = component_amp * np.sin(2 * np.pi * component_freq * time_points + phase_shift)
+        return {
+            'components': components,
+            'base_amplitude': base_amplitude,
+            'frequencies': frequencies[below_nyquist],
+            'amplitudes': amplitudes[below_nyquist],
+            # Random phase shifts for realism
+            'phases': 2 * np.pi * np.random.random(np.count_nonzero(below_nyquist))
+        }
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the motor signal at a block of time points.
+        
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal, updated in place
             
-            # Add to total signal
-            signal += component
+        Returns:
+            Array of signal values
+        """
+        base_amplitude = state['base_amplitude']
+        
+        # Sum a sine wave per component
+        signal = synthesize_tones(time_points, state['frequencies'], state['amplitudes'],
+                                  state['phases'], method=self.synthesis_method)
         
         # Add special characteristics based on condition
         if self.condition == self.CONDITION_BEARING_WEAR:
             # Add impulsive content characteristic of bearing problems
-            # This creates periodic impacts
-            impact_freq = components.get(self._get_characteristic_frequencies()["bpfi"], 10)
-            impact_interval = 1.0 / impact_freq
+            # This creates periodic impacts, each an exponentially decaying sinusoid
+            impact_freq = state['components'].get(self._get_characteristic_frequencies()["bpfi"], 10)
+            decay_time = 0.01  # seconds
+            decay_freq = 2000  # Hz
             
-            for t in np.arange(0, duration, impact_interval):
-                # Find closest time point
-                idx = int(t * sample_rate)
-                if idx < len(signal):
-                    # Add an exponentially decaying sinusoid
-                    decay_time = 0.01  # seconds
-                    decay_freq = 2000  # Hz
-                    
-                    # Time points relative to impact
-                    rel_time = time_points[idx:] - time_points[idx]
-                    
-                    # Create decaying sinusoid
-                    decay = 0.5 * base_amplitude * np.exp(-rel_time / decay_time) * np.sin(2 * np.pi * decay_freq * rel_time)
-                    
-                    # Add to signal, limited to len(signal)
-                    signal[idx:idx + len(decay)] += decay[:len(signal) - idx]
+            add_periodic_events(
+                signal, time_points, sample_spacing, 1.0 / impact_freq, IMPACT_TAIL_DECAYS * decay_time,
+                lambda rel_time: 0.5 * base_amplitude * np.exp(-rel_time / decay_time) * np.sin(2 * np.pi * decay_freq * rel_time))
         
         # Add amplitude modulation if unbalanced
         if self.condition == self.CONDITION_UNBALANCED:
@@ -407,4 +428,4 @@ class MotorVibration(VibrationSource):
         noise = noise_level * np.random.normal(0, 1, len(time_points))
         signal += noise
         
-        return time_points, signal
+        return signal
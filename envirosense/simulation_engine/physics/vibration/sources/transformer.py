@@ -10,6 +10,7 @@ from typing import Tuple, List, Dict, Optional, Any, Union
 import math
 
 from envirosense.core.physics.coordinates import Vector3D
+from envirosense.core.physics.spectral_synthesis import synthesize_tones
 from envirosense.core.physics.vibration.base import VibrationSource
 
 
@@ -239,45 +240,72 @@ class TransformerVibration(VibrationSource):
         Returns:
             Tuple of (time_points, amplitude) arrays
         """
+        return self._generate_signal(duration, sample_rate)
+    
+    def _resolve_sample_rate(self, sample_rate: Optional[float]) -> float:
+        """
+        Get the sample rate to generate signals at.
+        
+        Args:
+            sample_rate: Requested sample rate in Hz, or None for the default
+            
+        Returns:
+            Sample rate in Hz
+        """
         # If no sample rate provided, use 10x the highest expected frequency
         if sample_rate is None:
             # Use 10x the highest harmonic (assume 10th harmonic is highest)
             sample_rate = 10 * self.fundamental_freq * 10
+        return sample_rate
+    
+    def _start_signal(self, sample_rate: float) -> Dict[str, Any]:
+        """
+        Create the state of a new signal: harmonics and their random phases.
         
-        # Generate time points
-        num_samples = int(duration * sample_rate)
-        time_points = np.linspace(0, duration, num_samples)
-        
+        Args:
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Dictionary of signal state
+        """
         # Get harmonics
         harmonics = self._get_harmonics()
         
         # Get base amplitude
         base_amplitude = self._calculate_base_amplitude()
         
-        # Initialize signal
-        signal = np.zeros_like(time_points)
+        # Harmonic frequencies and amplitudes, with random phase shifts for realism
+        frequencies = self.fundamental_freq * np.array(list(harmonics.keys()), dtype=float)
+        return {
+            'base_amplitude': base_amplitude,
+            'frequencies': frequencies,
+            'amplitudes': base_amplitude * np.array(list(harmonics.values()), dtype=float),
+            'phases': 2 * np.pi * np.random.random(len(frequencies))
+        }
+    
+    def _render_signal(self, time_points: np.ndarray, sample_spacing: float,
+                       state: Dict[str, Any]) -> np.ndarray:
+        """
+        Render the transformer signal at a block of time points.
         
-        # Add each harmonic component to the signal
-        for harmonic_factor, relative_amp in harmonics.items():
-            harmonic_freq = self.fundamental_freq * harmonic_factor
-            
-            # Component amplitude
-            component_amp = base_amplitude * relative_amp
-            
-            # Generate component signal (sine wave)
-            # Add random phase shift for realism
-            phase_shift = 2 * np.pi * np.random.random()
-            component = component_amp * np.sin(2 * np.pi * harmonic_freq * time_points + phase_shift)
+        Args:
+            time_points: Sample times in seconds
+            sample_spacing: Time between samples in seconds
+            state: Signal state from _start_signal
             
-            # Add to total signal
-            signal += component
+        Returns:
+            Array of signal values
+        """
+        # Sum a sine wave per harmonic
+        signal = synthesize_tones(time_points, state['frequencies'], state['amplitudes'],
+                                  state['phases'], method=self.synthesis_method)
         
         # Add ambient noise
-        noise_level = 0.005 * base_amplitude  # Base noise level
+        noise_level = 0.005 * state['base_amplitude']  # Base noise level
         if self.condition != self.CONDITION_NORMAL:
             noise_level *= 2  # More noise in abnormal conditions
         
         noise = noise_level * np.random.normal(0, 1, len(time_points))
         signal += noise
         
-        return time_points, signal
+        return signal
@@ -3,7 +3,8 @@
 from .base import BaseSensor
 from .config import SensorConfiguration, IndividualSensorConfig
 from .grid_guardian import VirtualGridGuardian
-from .registry import SENSOR_CLASS_REGISTRY
+from .registry import SENSOR_CLASS_REGISTRY, SENSOR_BANK_REGISTRY
+from .bank import SensorBank, VOCSensorBank
 
 # Import sensor classes for __all__ and for direct use if needed,
 # but their primary registration is in registry.py
@@ -47,4 +48,7 @@ __all__ = [
     "SolarPowerSensor",
     "InternalTemperatureSensor",
     "SENSOR_CLASS_REGISTRY",
+    "SensorBank",
+    "VOCSensorBank",
+    "SENSOR_BANK_REGISTRY",
 ]
\ No newline at end of file
@@ -0,0 +1,387 @@
+"""
+Struct-of-arrays sensor banks for fleet-scale simulation.
+
+A SensorBank simulates N sensors of the same type at once. Per-sensor
+parameters are stacked into arrays and each imperfection is applied to all
+sensors with a few array operations, instead of N sensor objects walking
+their own nested dicts. Banks mirror the BaseSensor sampling interface but
+exchange (N, C) arrays rather than per-sensor reading dicts.
+"""
+
+import abc
+import logging
+from typing import Dict, Any, Tuple, List, Optional, Union
+
+import numpy as np
+
+from .environmental import VOCArraySensor
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[float, List[float], np.ndarray]
+
+
+def _stack(value: Optional[ArrayLike], shape: Tuple[int, ...], default: float) -> np.ndarray:
+    """Broadcast a scalar, per-channel or per-sensor parameter to a writable array of the given shape."""
+    if value is None:
+        return np.full(shape, default)
+    return np.broadcast_to(np.asarray(value, dtype=float), shape).copy()
+
+
+class SensorBank(abc.ABC):
+    """
+    Abstract base class for banks of same-type sensors simulated together.
+    """
+
+    def __init__(self,
+                 sensor_type: str,
+                 sensor_ids: List[str],
+                 positions: ArrayLike,
+                 sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Initializes the SensorBank.
+
+        Args:
+            sensor_type: Type of the sensors in the bank (e.g., 'voc_array').
+            sensor_ids: Unique identifier of each sensor.
+            positions: Array of shape (N, 3) with each sensor's (x, y, z) position.
+            sampling_volumes: Optional sampling volume dict per sensor.
+            rng: Random generator for noise; a fresh default generator if None.
+        """
+        self.sensor_type = sensor_type
+        self.sensor_ids = list(sensor_ids)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if len(self.sensor_ids) != len(self.positions):
+            raise ValueError("sensor_ids and positions must have the same length.")
+        if sampling_volumes is None:
+            sampling_volumes = [None] * len(self.sensor_ids)
+        if len(sampling_volumes) != len(self.sensor_ids):
+            raise ValueError("sampling_volumes must have the same length as sensor_ids.")
+        self.sampling_volumes = list(sampling_volumes)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Environment queries take positions as tuples
+        self._position_list = [tuple(position) for position in self.positions.tolist()]
+
+    def __len__(self) -> int:
+        return len(self.sensor_ids)
+
+    @abc.abstractmethod
+    def get_ground_truth(self, environment_3d_state: Any) -> np.ndarray:
+        """
+        Retrieves the ideal readings of every sensor in the bank.
+
+        Returns:
+            Array with one row per sensor.
+        """
+        pass
+
+    @abc.abstractmethod
+    def apply_imperfections(self, true_values: np.ndarray, environment_3d_state: Any) -> np.ndarray:
+        """
+        Applies the sensors' imperfections to a batch of true readings.
+
+        Args:
+            true_values: Array with one row per sensor, as returned by get_ground_truth().
+            environment_3d_state: The current state of the 3D environment.
+
+        Returns:
+            Array of readings with imperfections applied.
+        """
+        pass
+
+    @abc.abstractmethod
+    def to_readings(self, values: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        """
+        Converts a batch of values to per-sensor reading dicts, keyed by sensor_id,
+        in the format the equivalent BaseSensor would produce.
+        """
+        pass
+
+    def sample(self, environment_3d_state: Any) -> np.ndarray:
+        """Samples every sensor in the bank."""
+        return self.apply_imperfections(self.get_ground_truth(environment_3d_state), environment_3d_state)
+
+    def sample_with_ground_truth(self, environment_3d_state: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Samples every sensor in the bank and returns the ground truth used.
+
+        Returns:
+            A tuple of (readings, ground_truth) arrays.
+        """
+        true_values = self.get_ground_truth(environment_3d_state)
+        return self.apply_imperfections(true_values, environment_3d_state), true_values
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(sensor_type='{self.sensor_type}', num_sensors={len(self)})"
+
+
+class VOCSensorBank(SensorBank):
+    """
+    Simulates N VOC arrays that share a channel list.
+
+    Applies the same imperfection chain as VOCArraySensor: cross-sensitivity,
+    EMA response, gaussian noise, drift, calibration and temperature
+    compensation. Values are (N, C) arrays with channels in `channels` order.
+    Per-sensor parameters accept a scalar, a (C,) per-channel array or an
+    (N, C) per-sensor array. The stage masks select which sensors each stage
+    applies to; None applies the stage wherever its parameters are set.
+    """
+
+    def __init__(self,
+                 sensor_ids: List[str],
+                 positions: ArrayLike,
+                 channels: List[str],
+                 sampling_volumes: Optional[List[Optional[Dict[str, Any]]]] = None,
+                 channel_units: str = "ppb",
+                 response_time_alpha: ArrayLike = 0.8,
+                 cross_sensitivity: Optional[np.ndarray] = None,
+                 noise_mean: Optional[ArrayLike] = None,
+                 noise_stddev: Optional[ArrayLike] = None,
+                 baseline_drift_ppb_per_hour: Optional[ArrayLike] = None,
+                 sensitivity_drift_percent_per_hour: Optional[ArrayLike] = None,
+                 gain_factor: Optional[ArrayLike] = None,
+                 offset_ppb: Optional[ArrayLike] = None,
+                 reference_temp_c: ArrayLike = 25.0,
+                 offset_ppb_per_celsius: Optional[ArrayLike] = None,
+                 noise_mask: Optional[np.ndarray] = None,
+                 drift_mask: Optional[np.ndarray] = None,
+                 calibration_mask: Optional[np.ndarray] = None,
+                 temperature_compensation_mask: Optional[np.ndarray] = None,
+                 rng: Optional[np.random.Generator] = None):
+        """
+        Initializes the VOCSensorBank.
+
+        Args:
+            sensor_ids: Unique identifier of each sensor.
+            positions: Array of shape (N, 3) with each sensor's position.
+            channels: Chemical channels measured by every sensor.
+            sampling_volumes: Optional sampling volume dict per sensor.
+            channel_units: Units reported with each reading.
+            response_time_alpha: EMA factor per sensor, in (0, 1].
+            cross_sensitivity: Interference factors [target, interferer], either one
+                               (C, C) matrix for all sensors or an (N, C, C) stack.
+            noise_mean: Gaussian noise mean per sensor/channel.
+            noise_stddev: Gaussian noise standard deviation per sensor/channel.
+            baseline_drift_ppb_per_hour: Baseline drift rate per sensor/channel.
+            sensitivity_drift_percent_per_hour: Sensitivity drift rate per sensor/channel.
+            gain_factor: Calibration gain per sensor/channel.
+            offset_ppb: Calibration offset per sensor/channel.
+            reference_temp_c: Temperature compensation reference per sensor.
+            offset_ppb_per_celsius: Temperature-induced offset per sensor/channel.
+            noise_mask: (N,) sensors that apply noise.
+            drift_mask: (N,) sensors that apply drift.
+            calibration_mask: (N,) sensors that apply calibration.
+            temperature_compensation_mask: (N, C) channels that apply temperature compensation.
+            rng: Random generator for noise.
+        """
+        super().__init__("voc_array", sensor_ids, positions, sampling_volumes, rng)
+        self.channels = list(channels)
+        self.channel_units = channel_units
+        n, c = len(self), len(self.channels)
+
+        self.response_time_alpha = _stack(response_time_alpha, (n,), 0.8)
+        if np.any((self.response_time_alpha <= 0) | (self.response_time_alpha > 1.0)):
+            raise ValueError("response_time_alpha must be between 0 (exclusive) and 1 (inclusive).")
+
+        if cross_sensitivity is None:
+            self.cross_sensitivity = np.zeros((c, c))
+        else:
+            self.cross_sensitivity = np.asarray(cross_sensitivity, dtype=float)
+            if self.cross_sensitivity.shape not in ((c, c), (n, c, c)):
+                raise ValueError(f"cross_sensitivity must have shape {(c, c)} or {(n, c, c)}, "
+                                 f"got {self.cross_sensitivity.shape}")
+
+        self.noise_mean = _stack(noise_mean, (n, c), 0.0)
+        self.noise_stddev = _stack(noise_stddev, (n, c), 0.0)
+        self.baseline_drift_ppb_per_hour = _stack(baseline_drift_ppb_per_hour, (n, c), 0.0)
+        self.sensitivity_drift_percent_per_hour = _stack(sensitivity_drift_percent_per_hour, (n, c), 0.0)
+        self.gain_factor = _stack(gain_factor, (n, c), 1.0)
+        self.offset_ppb = _stack(offset_ppb, (n, c), 0.0)
+        self.reference_temp_c = _stack(reference_temp_c, (n,), 25.0)
+        self.offset_ppb_per_celsius = _stack(offset_ppb_per_celsius, (n, c), 0.0)
+
+        self.noise_mask = (np.asarray(noise_mask, dtype=bool) if noise_mask is not None
+                           else (self.noise_stddev > 0).any(axis=1))
+        self.drift_mask = (np.asarray(drift_mask, dtype=bool) if drift_mask is not None
+                           else ((self.baseline_drift_ppb_per_hour != 0)
+                                 | (self.sensitivity_drift_percent_per_hour != 0)).any(axis=1))
+        self.calibration_mask = (np.asarray(calibration_mask, dtype=bool) if calibration_mask is not None
+                                 else ((self.gain_factor != 1.0) | (self.offset_ppb != 0)).any(axis=1))
+        self.temperature_compensation_mask = (np.asarray(temperature_compensation_mask, dtype=bool)
+                                              if temperature_compensation_mask is not None
+                                              else self.offset_ppb_per_celsius != 0)
+
+        # EMA state, as in VOCArraySensor._ema_filtered_values / _first_sample_taken
+        self._ema_filtered_values = np.zeros((n, c))
+        self._first_sample_taken = np.zeros(n, dtype=bool)
+
+    @classmethod
+    def from_sensors(cls, sensors: List[VOCArraySensor],
+                     rng: Optional[np.random.Generator] = None) -> 'VOCSensorBank':
+        """
+        Stacks existing VOCArraySensor instances into a bank, including their EMA state.
+
+        Args:
+            sensors: VOC arrays sharing the same channel list.
+            rng: Random generator for noise.
+
+        Returns:
+            A bank simulating the same sensors.
+        """
+        if not sensors:
+            raise ValueError("At least one sensor is required to build a VOCSensorBank.")
+        channels = list(sensors[0].channels)
+        if any(list(sensor.channels) != channels for sensor in sensors):
+            raise ValueError("All sensors in a VOCSensorBank must share the same channels.")
+        n, c = len(sensors), len(channels)
+        index = {channel: i for i, channel in enumerate(channels)}
+
+        def per_channel(mapping: Dict[str, float], default: float) -> List[float]:
+            return [mapping.get(channel, default) for channel in channels]
+
+        cross_sensitivity = np.zeros((n, c, c))
+        noise_mean, noise_stddev = np.zeros((n, c)), np.zeros((n, c))
+        baseline_drift, sensitivity_drift = np.zeros((n, c)), np.zeros((n, c))
+        gain_factor, offset_ppb = np.ones((n, c)), np.zeros((n, c))
+        reference_temp_c, offset_per_celsius = np.full(n, 25.0), np.zeros((n, c))
+        noise_mask, drift_mask, calibration_mask = np.zeros(n, bool), np.zeros(n, bool), np.zeros(n, bool)
+        temperature_compensation_mask = np.zeros((n, c), bool)
+
+        for row, sensor in enumerate(sensors):
+            for target, interferers in sensor.cross_sensitivity_matrix.items():
+                if target not in index:
+                    continue
+                for interferer, factor in interferers.items():
+                    if interferer in index:
+                        cross_sensitivity[row, index[target], index[interferer]] = factor
+
+            noise = sensor.noise_characteristics
+            if noise and noise.get("type") == "gaussian":
+                noise_mask[row] = True
+                noise_mean[row] = [noise.get(channel, {}).get("mean", noise.get("mean", 0.0)) for channel in channels]
+                noise_stddev[row] = [noise.get(channel, {}).get("stddev", noise.get("stddev", 0.0)) for channel in channels]
+
+            if sensor.drift_parameters:
+                drift_mask[row] = True
+                baseline_drift[row] = per_channel(sensor.drift_parameters.get("baseline_drift_ppb_per_hour", {}), 0.0)
+                sensitivity_drift[row] = per_channel(
+                    sensor.drift_parameters.get("sensitivity_drift_percent_per_hour", {}), 0.0)
+
+            if sensor.calibration_artifacts:
+                calibration_mask[row] = True
+                gain_factor[row] = per_channel(sensor.calibration_artifacts.get("gain_factor", {}), 1.0)
+                offset_ppb[row] = per_channel(sensor.calibration_artifacts.get("offset_ppb", {}), 0.0)
+
+            temperature = sensor.environmental_compensation_params.get("temperature")
+            if temperature:
+                reference_temp_c[row] = temperature.get("reference_temp_c", 25.0)
+                offsets = temperature.get("offset_ppb_per_celsius", {})
+                offset_per_celsius[row] = per_channel(offsets, 0.0)
+                temperature_compensation_mask[row] = [channel in offsets for channel in channels]
+
+        # A single shared matrix lets the cross-sensitivity stage use one matmul
+        if (cross_sensitivity == cross_sensitivity[0]).all():
+            cross_sensitivity = cross_sensitivity[0]
+
+        bank = cls(
+            sensor_ids=[sensor.sensor_id for sensor in sensors],
+            positions=[sensor.position_3d for sensor in sensors],
+            channels=channels,
+            sampling_volumes=[sensor.sampling_volume for sensor in sensors],
+            channel_units=sensors[0].channel_units,
+            response_time_alpha=[sensor.response_time_alpha for sensor in sensors],
+            cross_sensitivity=cross_sensitivity,
+            noise_mean=noise_mean,
+            noise_stddev=noise_stddev,
+            baseline_drift_ppb_per_hour=baseline_drift,
+            sensitivity_drift_percent_per_hour=sensitivity_drift,
+            gain_factor=gain_factor,
+            offset_ppb=offset_ppb,
+            reference_temp_c=reference_temp_c,
+            offset_ppb_per_celsius=offset_per_celsius,
+            noise_mask=noise_mask,
+            drift_mask=drift_mask,
+            calibration_mask=calibration_mask,
+            temperature_compensation_mask=temperature_compensation_mask,
+            rng=rng
+        )
+        bank._ema_filtered_values[:] = [per_channel(sensor._ema_filtered_values, 0.0) for sensor in sensors]
+        bank._first_sample_taken[:] = [sensor._first_sample_taken for sensor in sensors]
+        return bank
+
+    def get_ground_truth(self, environment_3d_state: Any) -> np.ndarray:
+        """
+        Queries the concentrations of every channel at every sensor with one
+        get_chemical_concentrations call.
+
+        Returns:
+            (N, C) array of true concentrations.
+        """
+        concentrations = environment_3d_state.get_chemical_concentrations(
+            chemical_ids=self.channels,
+            positions=self._position_list,
+            sampling_volumes=self.sampling_volumes
+        )
+        values = np.array([[row[channel] for channel in self.channels] for row in concentrations], dtype=float)
+        return np.round(values.reshape(len(self), len(self.channels)), 3)
+
+    def apply_imperfections(self, true_values: np.ndarray, environment_3d_state: Any) -> np.ndarray:
+        # 0. Cross-sensitivity on the true concentrations
+        if self.cross_sensitivity.ndim == 2:
+            perceived = true_values + true_values @ self.cross_sensitivity.T
+        else:
+            perceived = true_values + np.einsum('nij,nj->ni', self.cross_sensitivity, true_values)
+
+        # 1. Response time (EMA); the first sample starts the filter at the perceived value
+        alpha = self.response_time_alpha[:, None]
+        ema = alpha * perceived + (1.0 - alpha) * self._ema_filtered_values
+        first = self._first_sample_taken[:, None]
+        self._ema_filtered_values = np.where(first, ema, perceived)
+        values = np.where(first, np.round(ema, 3), perceived)
+        self._first_sample_taken[:] = True
+
+        # 2. Noise
+        if self.noise_mask.any():
+            noise = np.where(self.noise_stddev > 0, self.rng.normal(self.noise_mean, self.noise_stddev), 0.0)
+            noisy = np.maximum(0.0, np.round(values + noise, 3))
+            values = np.where(self.noise_mask[:, None], noisy, values)
+
+        # 3. Drift
+        if self.drift_mask.any():
+            if hasattr(environment_3d_state, 'simulation_time_seconds'):
+                hours = environment_3d_state.simulation_time_seconds / 3600.0
+                sensitivity = np.clip(1.0 + self.sensitivity_drift_percent_per_hour / 100.0 * hours, 0.1, 2.0)
+                drifted = np.maximum(0.0, np.round((values + self.baseline_drift_ppb_per_hour * hours) * sensitivity, 3))
+                values = np.where(self.drift_mask[:, None], drifted, values)
+            else:
+                logger.warning(f"Drift parameters exist for {self!r} but environment_3d_state lacks "
+                               f"'simulation_time_seconds'. Skipping drift.")
+
+        # 4. Calibration artifacts (gain, then offset)
+        if self.calibration_mask.any():
+            calibrated = np.maximum(0.0, np.round(values * self.gain_factor + self.offset_ppb, 3))
+            values = np.where(self.calibration_mask[:, None], calibrated, values)
+
+        # 5. Temperature compensation errors, querying only sensors that need it
+        rows = np.flatnonzero(self.temperature_compensation_mask.any(axis=1))
+        if rows.size:
+            try:
+                temperatures = np.asarray(environment_3d_state.get_temperatures_celsius(
+                    [self._position_list[i] for i in rows],
+                    [self.sampling_volumes[i] for i in rows]
+                ), dtype=float)
+                delta = (temperatures - self.reference_temp_c[rows])[:, None]
+                compensated = np.maximum(0.0, np.round(values[rows] + self.offset_ppb_per_celsius[rows] * delta, 3))
+                values[rows] = np.where(self.temperature_compensation_mask[rows], compensated, values[rows])
+            except Exception as e:
+                logger.warning(f"Could not apply temperature compensation for {self!r}: {e}")
+
+        return values
+
+    def to_readings(self, values: np.ndarray) -> Dict[str, Dict[str, Any]]:
+        return {
+            sensor_id: {"concentrations_ppb": dict(zip(self.channels, row)), "unit": self.channel_units}
+            for sensor_id, row in zip(self.sensor_ids, values.tolist())
+        }
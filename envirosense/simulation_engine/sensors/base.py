@@ -1,5 +1,5 @@
 import abc
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, List
 
 class BaseSensor(abc.ABC):
     """
@@ -9,6 +9,11 @@ class BaseSensor(abc.ABC):
     ML-specific features for generating training data.
     """
 
+    # True when sample() is exactly get_ground_truth() followed by apply_imperfections(),
+    # which lets callers compute the ground truth once and reuse it for both the reading
+    # and the training labels. Subclasses with a custom sample() must set this to False.
+    SAMPLES_FROM_GROUND_TRUTH: bool = True
+
     def __init__(self,
                  sensor_id: str,
                  sensor_type: str,
@@ -123,6 +128,58 @@ class BaseSensor(abc.ABC):
         # return true_reading.copy()
         pass
 
+    def sample_from_ground_truth(self, true_reading: Dict[str, Any], environment_3d_state: Any) -> Dict[str, Any]:
+        """
+        Produces a sensor reading from an already computed ground truth.
+        Errors reported by the ground truth are propagated as the reading.
+
+        Args:
+            true_reading: The ground truth as returned by `get_ground_truth()`.
+                          It is not modified.
+            environment_3d_state: The current state of the 3D environment.
+
+        Returns:
+            The reading with imperfections applied.
+        """
+        if "error" in true_reading:
+            return true_reading
+        return self.apply_imperfections(true_reading, environment_3d_state)
+
+    def sample_with_ground_truth(self, environment_3d_state: Any) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Samples the sensor and returns the ground truth used for that sample,
+        querying the environment only once.
+
+        Sensors with a custom `sample()` (SAMPLES_FROM_GROUND_TRUTH is False)
+        fall back to calling `sample()` and `get_ground_truth()` separately.
+
+        Args:
+            environment_3d_state: The current state of the 3D environment.
+
+        Returns:
+            A tuple of (reading, ground_truth).
+        """
+        if not self.SAMPLES_FROM_GROUND_TRUTH:
+            return self.sample(environment_3d_state), self.get_ground_truth(environment_3d_state)
+        true_reading = self.get_ground_truth(environment_3d_state)
+        return self.sample_from_ground_truth(true_reading, environment_3d_state), true_reading
+
+    @classmethod
+    def get_ground_truth_batch(cls, sensors: List['BaseSensor'], environment_3d_state: Any) -> List[Dict[str, Any]]:
+        """
+        Retrieves the ground truth for several sensors of this class.
+        Subclasses override this to serve the whole batch with a single
+        environment query; the default queries each sensor in turn.
+
+        Args:
+            sensors: Sensors of this class to query.
+            environment_3d_state: The current state of the 3D environment.
+
+        Returns:
+            One ground truth dict per sensor, in the same order.
+        """
+        return [sensor.get_ground_truth(environment_3d_state) for sensor in sensors]
+
 
     def enable(self) -> None:
         """Enables the sensor."""
@@ -0,0 +1,257 @@
+"""
+Precompiled response tables for EMFSensor.
+
+EMFSensor's frequency response, harmonic model and directional sensitivity
+are configured as dictionaries keyed by strings. Resolving those keys on
+every sample dominates the cost of EMF channels, so EMFResponseTables
+compiles them once, at sensor construction, into arrays:
+
+- the frequency-gain lookup (exact keys plus tolerance windows) becomes a
+  sorted breakpoint table searched with np.searchsorted,
+- the frequency-response curve becomes one attenuation factor per spectrum
+  component,
+- the directional cosine pattern becomes a unit axis (single samples) and a
+  3x3 gain matrix (batches).
+
+Every lookup also has a batched form that evaluates many frequencies or
+samples with a few array operations.
+"""
+
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HARMONIC_ORDERS = (3, 5, 7, 9)
+DEFAULT_HARMONIC_RATIO = 0.1
+DEFAULT_FREQUENCY_RESPONSE_CURVE = {
+    'fundamental': 1.0, '3th': 0.95, '5th': 0.85, '7th': 0.70, '9th': 0.50, 'high_frequency_noise': 0.30
+}
+# Responses for spectrum components missing from the configured curve
+DEFAULT_HARMONIC_RESPONSE = 0.5
+DEFAULT_COMPONENT_RESPONSE = 1.0
+
+
+def _is_exact_key(key: str, frequency: float) -> bool:
+    """True when get_frequency_gain's exact string match would select this key for its own frequency."""
+    return key == str(frequency) or (frequency == float(int(frequency)) and key == str(int(frequency)))
+
+
+class EMFResponseTables:
+    """
+    Frequency-response and directional-sensitivity tables compiled from an EMFSensor config.
+    """
+
+    def __init__(self,
+                 frequency_response_gain: Dict[str, float],
+                 frequency_tolerance_hz: float,
+                 default_frequency_gain: float,
+                 frequency_response_curve: Optional[Dict[str, float]] = None,
+                 harmonic_ratios: Optional[Dict[int, float]] = None,
+                 temp_coeff_per_10c: float = 0.001,
+                 reference_temp_c: float = 25.0,
+                 orientation: Tuple[float, float, float] = (0.0, 0.0, 1.0),
+                 orientation_uncertainty_stddev: Optional[float] = 0.05):
+        """
+        Compiles the tables.
+
+        Args:
+            frequency_response_gain: Gain per frequency, keyed by frequency strings (e.g., "50.0").
+                                     Non-numeric keys are ignored.
+            frequency_tolerance_hz: Distance within which a configured frequency matches.
+            default_frequency_gain: Gain for frequencies no key matches.
+            frequency_response_curve: Attenuation per spectrum component (e.g., 'fundamental', '3th').
+            harmonic_ratios: Ratio of each harmonic order to the fundamental (default 0.1).
+            temp_coeff_per_10c: Loss of response per 10 C away from the reference temperature.
+            reference_temp_c: Temperature at which the response curve applies unchanged.
+            orientation: Sensor axis; the sensitivity follows |cos| of the angle to it.
+            orientation_uncertainty_stddev: Std dev of the random alignment error, or None to disable it.
+        """
+        self.default_frequency_gain = float(default_frequency_gain)
+        self.frequency_tolerance_hz = float(frequency_tolerance_hz)
+
+        # --- Frequency gain lookup ---
+        numeric_keys: List[Tuple[float, float]] = [] # (frequency, gain) in config (= priority) order
+        self.exact_gains: Dict[float, float] = {}
+        self.non_numeric_gain_keys: List[str] = []
+        for key, gain in frequency_response_gain.items():
+            try:
+                frequency = float(key)
+            except ValueError:
+                self.non_numeric_gain_keys.append(key)
+                continue
+            numeric_keys.append((frequency, gain))
+            # get_frequency_gain tries str(float) before str(int), so the float form wins
+            if key == str(frequency):
+                self.exact_gains[frequency] = gain
+            elif _is_exact_key(key, frequency):
+                self.exact_gains.setdefault(frequency, gain)
+
+        def tolerance_gain(frequency: float) -> float:
+            for key_frequency, gain in numeric_keys:
+                if abs(frequency - key_frequency) <= self.frequency_tolerance_hz:
+                    return gain
+            return self.default_frequency_gain
+
+        # The gain is piecewise constant between the tolerance window edges (and exact keys),
+        # so it is tabulated once on each edge and once per interval between edges.
+        edges = sorted({f + side * self.frequency_tolerance_hz for f, _ in numeric_keys for side in (-1, 1)}
+                       | set(self.exact_gains))
+        self.gain_edges_hz = np.array(edges, dtype=float)
+        self.gain_at_edges = np.array([self.exact_gains.get(edge, tolerance_gain(edge)) for edge in edges], dtype=float)
+        self.gain_between_edges = np.array(
+            [self.default_frequency_gain]
+            + [tolerance_gain(0.5 * (low + high)) for low, high in zip(edges[:-1], edges[1:])]
+            + ([self.default_frequency_gain] if edges else []),
+            dtype=float)
+
+        # --- Spectrum model and frequency response ---
+        harmonic_ratios = harmonic_ratios if harmonic_ratios is not None else {}
+        self.harmonic_orders = np.array(HARMONIC_ORDERS)
+        self.harmonic_keys = [f'{n}th' for n in HARMONIC_ORDERS]
+        self.harmonic_scales = np.array([harmonic_ratios.get(n, DEFAULT_HARMONIC_RATIO) / n for n in HARMONIC_ORDERS])
+        self.harmonic_noise_scales = np.sqrt(self.harmonic_orders)
+
+        self.response_curve = dict(frequency_response_curve if frequency_response_curve is not None
+                                   else DEFAULT_FREQUENCY_RESPONSE_CURVE)
+        # Column order of batched spectra
+        self.spectrum_components = ['fundamental'] + self.harmonic_keys + ['high_frequency_noise']
+        self.component_responses = np.array([self.response('harmonics' if key in self.harmonic_keys else key, key)
+                                             for key in self.spectrum_components])
+        self.temp_coeff_per_10c = temp_coeff_per_10c
+        self.reference_temp_c = reference_temp_c
+
+        # --- Directional sensitivity ---
+        axis = np.asarray(orientation, dtype=float)
+        axis_norm = np.linalg.norm(axis)
+        self.orientation_is_zero = axis_norm < 1e-9
+        axis = np.zeros(3) if self.orientation_is_zero else axis / axis_norm
+        # Unit sensor axis: |axis @ d| = |cos| of the angle to a unit direction d
+        self.axis = axis
+        # Projection onto the sensor axis: |G @ d| = |cos| of the angle between d and the axis
+        self.directional_gain_matrix = np.outer(axis, axis)
+        self.orientation_uncertainty_stddev = orientation_uncertainty_stddev
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], frequency_tolerance_hz: float, default_frequency_gain: float) -> 'EMFResponseTables':
+        """Compiles the tables from an EMFSensor specific_params dict."""
+        return cls(frequency_response_gain=config.get("frequency_response_gain", {}),
+                   frequency_tolerance_hz=frequency_tolerance_hz,
+                   default_frequency_gain=default_frequency_gain,
+                   frequency_response_curve=config.get('frequency_response_curve'),
+                   harmonic_ratios={n: config.get(f'harmonic_{n}_ratio', DEFAULT_HARMONIC_RATIO) for n in HARMONIC_ORDERS},
+                   temp_coeff_per_10c=config.get('frequency_response_temp_coeff_per_10c', 0.001),
+                   reference_temp_c=config.get('frequency_response_ref_temp_c', 25.0),
+                   orientation=config.get('orientation', [0, 0, 1]),
+                   orientation_uncertainty_stddev=(config.get('orientation_uncertainty_stddev', 0.05)
+                                                   if config.get('orientation_uncertainty', True) else None))
+
+    def response(self, component: str, key: Optional[str] = None) -> float:
+        """
+        Attenuation for a spectrum component. Pass component='harmonics' and the
+        harmonic's key (e.g., '3th') for harmonics.
+        """
+        if component == 'harmonics':
+            return self.response_curve.get(key, DEFAULT_HARMONIC_RESPONSE)
+        return self.response_curve.get(component, DEFAULT_COMPONENT_RESPONSE)
+
+    def frequency_gains(self, frequencies_hz: np.ndarray) -> np.ndarray:
+        """
+        Gain for each frequency, matching EMFSensor.get_frequency_gain for numeric input.
+
+        Args:
+            frequencies_hz: Array of frequencies of any shape
+
+        Returns:
+            Array of gains of the same shape
+        """
+        frequencies_hz = np.asarray(frequencies_hz, dtype=float)
+        index = np.searchsorted(self.gain_edges_hz, frequencies_hz)
+        if not len(self.gain_edges_hz):
+            return self.gain_between_edges[index]
+        on_edge = self.gain_edges_hz[np.minimum(index, len(self.gain_edges_hz) - 1)] == frequencies_hz
+        return np.where(on_edge,
+                        self.gain_at_edges[np.minimum(index, len(self.gain_at_edges) - 1)],
+                        self.gain_between_edges[index])
+
+    def temperature_factors(self, temperatures_c: np.ndarray) -> np.ndarray:
+        """Frequency response scaling for each ambient temperature, capped to [0.5, 1.5]."""
+        temperatures_c = np.asarray(temperatures_c, dtype=float)
+        factors = 1.0 - (np.abs(temperatures_c - self.reference_temp_c) / 10.0 * self.temp_coeff_per_10c)
+        return np.clip(factors, 0.5, 1.5)
+
+    def harmonic_strengths(self, field_strengths: np.ndarray, frequency_noise: bool = True,
+                           rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Harmonic amplitudes for a batch of fundamental field strengths.
+
+        Args:
+            field_strengths: Array of N fundamental strengths
+            frequency_noise: Apply noise proportional to sqrt(harmonic order)
+            rng: Random generator (default: the global NumPy generator)
+
+        Returns:
+            Array of shape (N, len(HARMONIC_ORDERS))
+        """
+        strengths = np.asarray(field_strengths, dtype=float)[:, None] * self.harmonic_scales
+        if frequency_noise:
+            normal = rng.normal if rng is not None else np.random.normal
+            strengths = strengths * (1.0 + normal(0, 0.02, strengths.shape) * self.harmonic_noise_scales)
+        return strengths
+
+    def apply_frequency_response(self, spectra: np.ndarray, temperatures_c: np.ndarray) -> np.ndarray:
+        """
+        Applies the frequency response to a batch of spectra.
+
+        Args:
+            spectra: Array of shape (N, C), columns in spectrum_components order
+            temperatures_c: Ambient temperature per sample (N,) or a scalar
+
+        Returns:
+            Attenuated spectra of shape (N, C)
+        """
+        factors = np.broadcast_to(self.temperature_factors(temperatures_c), (len(spectra),))
+        return np.asarray(spectra, dtype=float) * self.component_responses * factors[:, None]
+
+    def alignments(self, field_vectors: np.ndarray) -> np.ndarray:
+        """
+        Noise-free directional sensitivity (|cos| of the angle to the sensor axis) per field vector.
+        Zero vectors have zero alignment.
+
+        Args:
+            field_vectors: Array of shape (N, 3)
+
+        Returns:
+            Array of N alignment factors in [0, 1]
+        """
+        field_vectors = np.asarray(field_vectors, dtype=float).reshape(-1, 3)
+        norms = np.linalg.norm(field_vectors, axis=1)
+        directions = field_vectors / np.where(norms < 1e-9, 1.0, norms)[:, None]
+        alignment = np.linalg.norm(directions @ self.directional_gain_matrix.T, axis=1)
+        return np.where(norms < 1e-9, 0.0, alignment)
+
+    def apply_directional_sensitivity(self, field_vectors: np.ndarray,
+                                      magnitudes: Optional[np.ndarray] = None,
+                                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Field magnitudes perceived by the sensor for a batch of field vectors.
+
+        Args:
+            field_vectors: Array of shape (N, 3)
+            magnitudes: Optional magnitudes (N,) used instead of the vectors' norms
+            rng: Random generator for the orientation uncertainty (default: the global NumPy generator)
+
+        Returns:
+            Array of N perceived magnitudes
+        """
+        field_vectors = np.asarray(field_vectors, dtype=float).reshape(-1, 3)
+        norms = np.linalg.norm(field_vectors, axis=1)
+        alignment = self.alignments(field_vectors)
+        if self.orientation_uncertainty_stddev is not None:
+            normal = rng.normal if rng is not None else np.random.normal
+            alignment = np.clip(alignment + normal(0, self.orientation_uncertainty_stddev, len(alignment)), 0, 1)
+        perceived = alignment * (norms if magnitudes is None else np.asarray(magnitudes, dtype=float))
+        # A zero field (or a zero sensor axis) perceives nothing, with or without uncertainty
+        return np.where((norms < 1e-9) | self.orientation_is_zero, 0.0, perceived)
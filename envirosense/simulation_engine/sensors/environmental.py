@@ -43,15 +43,10 @@ class VOCArraySensor(BaseSensor):
 
 
     def sample(self, environment_3d_state: Any) -> Dict[str, Any]:
-        # Get the ideal, noise-free readings first
+        # Get the ideal, noise-free readings first, then apply imperfections
+        # (cross-sensitivity, noise, drift, etc.). Errors from GT are propagated.
         true_sensor_values = self.get_ground_truth(environment_3d_state)
-        
-        if "error" in true_sensor_values: # Propagate error if GT failed
-            return true_sensor_values
-            
-        # Apply imperfections to the true values
-        # This is where cross-sensitivity, noise, drift, etc., will be modeled.
-        return self.apply_imperfections(true_sensor_values, environment_3d_state)
+        return self.sample_from_ground_truth(true_sensor_values, environment_3d_state)
 
     def get_ground_truth(self, environment_3d_state: Any) -> Dict[str, Any]:
         if not self.ground_truth_capability:
@@ -80,6 +75,45 @@ class VOCArraySensor(BaseSensor):
             
         return {"concentrations_ppb": ground_truth_concentrations, "unit": self.channel_units}
 
+    @classmethod
+    def get_ground_truth_batch(cls, sensors: List['VOCArraySensor'], environment_3d_state: Any) -> List[Dict[str, Any]]:
+        """
+        Retrieves ground truth for several VOC arrays with one get_chemical_concentrations
+        call per distinct channel set (normally a single call for the whole batch).
+        Falls back to per-sensor queries when the environment has no batched interface.
+        """
+        if not hasattr(environment_3d_state, 'get_chemical_concentrations'):
+            return super().get_ground_truth_batch(sensors, environment_3d_state)
+
+        results: List[Dict[str, Any]] = [{} for _ in sensors]
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for i, sensor in enumerate(sensors):
+            if sensor.ground_truth_capability:
+                groups.setdefault(tuple(sensor.channels), []).append(i)
+            else:
+                results[i] = sensor.get_ground_truth(environment_3d_state)
+
+        for channels, indices in groups.items():
+            try:
+                concentrations = environment_3d_state.get_chemical_concentrations(
+                    chemical_ids=list(channels),
+                    positions=[sensors[i].position_3d for i in indices],
+                    sampling_volumes=[sensors[i].sampling_volume for i in indices]
+                )
+                if len(concentrations) != len(indices):
+                    raise ValueError(f"expected {len(indices)} results, got {len(concentrations)}")
+            except Exception as e:
+                print(f"Error querying batched chemical concentrations for channels {list(channels)}: {e}")
+                for i in indices:
+                    results[i] = {"error": f"Failed to get chemical concentrations: {e}"}
+                continue
+            for i, sensor_concentrations in zip(indices, concentrations):
+                results[i] = {
+                    "concentrations_ppb": {channel: round(sensor_concentrations[channel], 3) for channel in channels},
+                    "unit": sensors[i].channel_units
+                }
+        return results
+
     def get_ml_metadata(self) -> Dict[str, Any]:
         return {
             "sensor_id": self.sensor_id,
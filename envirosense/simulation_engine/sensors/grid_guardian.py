@@ -130,6 +130,74 @@ class VirtualGridGuardian:
                     all_ground_truths[sensor_id] = {"error": str(e)}
         return all_ground_truths
 
+    def sample_environment_with_ground_truth(self,
+                                             environment_3d_state: Any
+                                             ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Collects readings and ground truth from all enabled sensors in a single pass.
+        Ground truth is computed once per sensor and reused to produce its reading,
+        and sensors of the same class are served by one `get_ground_truth_batch` call.
+        Sensors with a custom `sample()` are sampled and queried separately.
+
+        Args:
+            environment_3d_state: The current state of the 3D simulated environment.
+
+        Returns:
+            A tuple of (readings, ground_truths), keyed by sensor_id. Ground truths are
+            only included for sensors capable of providing them, as in get_ground_truth_data.
+        """
+        batches: Dict[type, List[str]] = {}
+        for sensor_id, sensor in self.sensors.items():
+            if sensor.is_enabled and sensor.SAMPLES_FROM_GROUND_TRUTH:
+                batches.setdefault(type(sensor), []).append(sensor_id)
+
+        true_readings: Dict[str, Dict[str, Any]] = {}
+        for sensor_class, sensor_ids in batches.items():
+            try:
+                batch = sensor_class.get_ground_truth_batch(
+                    [self.sensors[sensor_id] for sensor_id in sensor_ids], environment_3d_state
+                )
+            except Exception as e:
+                # Retry one sensor at a time so a single failure doesn't fail the whole class
+                print(f"Error getting batched ground truth for {sensor_class.__name__}: {e}")
+                batch = []
+                for sensor_id in sensor_ids:
+                    try:
+                        batch.append(self.sensors[sensor_id].get_ground_truth(environment_3d_state))
+                    except Exception as sensor_error:
+                        print(f"Error getting ground truth from sensor {sensor_id}: {sensor_error}")
+                        batch.append({"error": str(sensor_error)})
+            true_readings.update(zip(sensor_ids, batch))
+
+        all_readings: Dict[str, Dict[str, Any]] = {}
+        all_ground_truths: Dict[str, Dict[str, Any]] = {}
+        for sensor_id, sensor in self.sensors.items():
+            if not sensor.is_enabled:
+                continue
+            if sensor_id not in true_readings:
+                try:
+                    all_readings[sensor_id] = sensor.sample(environment_3d_state)
+                except Exception as e:
+                    print(f"Error sampling sensor {sensor_id}: {e}")
+                    all_readings[sensor_id] = {"error": str(e)}
+                if sensor.ground_truth_capability:
+                    try:
+                        all_ground_truths[sensor_id] = sensor.get_ground_truth(environment_3d_state)
+                    except Exception as e:
+                        print(f"Error getting ground truth from sensor {sensor_id}: {e}")
+                        all_ground_truths[sensor_id] = {"error": str(e)}
+                continue
+
+            true_reading = true_readings[sensor_id]
+            try:
+                all_readings[sensor_id] = sensor.sample_from_ground_truth(true_reading, environment_3d_state)
+            except Exception as e:
+                print(f"Error sampling sensor {sensor_id}: {e}")
+                all_readings[sensor_id] = {"error": str(e)}
+            if sensor.ground_truth_capability:
+                all_ground_truths[sensor_id] = true_reading
+        return all_readings, all_ground_truths
+
     def generate_training_sample(self,
                                  environment_3d_state: Any,
                                  scenario_labels: Optional[Dict[str, Any]] = None
@@ -149,8 +217,7 @@ class VirtualGridGuardian:
                 - Combined labels (Dict[label_name, value]), including sensor ground truths
                   and scenario labels.
         """
-        sensor_readings = self.sample_environment(environment_3d_state)
-        sensor_ground_truths = self.get_ground_truth_data(environment_3d_state)
+        sensor_readings, sensor_ground_truths = self.sample_environment_with_ground_truth(environment_3d_state)
 
         combined_labels: Dict[str, Any] = {}
         if scenario_labels:
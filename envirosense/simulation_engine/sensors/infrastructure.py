@@ -5,7 +5,7 @@ all inheriting from BaseSensor.
 """
 
 import random # For noise generation
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, Optional
 import numpy as np # For image array operations
 import logging
 
@@ -19,12 +19,17 @@ except ImportError:
     logger.warning("scipy.ndimage not found. Gaussian blur for ThermalCameraSensor will not be available.")
 
 from .base import BaseSensor
+from .emf_response import EMFResponseTables
+from envirosense.simulation_engine.physics.thermal_imaging import KELVIN_OFFSET, camera_ray_directions
 
 class ThermalCameraSensor(BaseSensor):
-    def __init__(self, sensor_id: str, position_3d: Tuple[float, float, float], sampling_volume: Dict[str, Any], specific_params: Dict[str, Any], **kwargs):
+    def __init__(self, sensor_id: str, position_3d: Tuple[float, float, float], sampling_volume: Dict[str, Any], specific_params: Dict[str, Any],
+                 rng: Optional[np.random.Generator] = None, **kwargs):
         super().__init__(sensor_id, "thermal_camera", position_3d, sampling_volume, **kwargs)
         self.resolution: List[int] = specific_params.get("resolution", [80, 60]) # width, height
         self.fov_degrees: List[float] = specific_params.get("fov_degrees", [90.0, 60.0]) # Horizontal, Vertical
+        # Camera orientation in degrees, see physics.thermal_imaging for the convention
+        self.orientation: Dict[str, float] = specific_params.get("orientation", {"yaw": 0.0, "pitch": 0.0, "roll": 0.0})
         # sampling_volume here might represent the camera's frustum or focus depth
 
         # Dead/Hot pixel configuration
@@ -39,13 +44,29 @@ class ThermalCameraSensor(BaseSensor):
         self.optical_blur_config: Dict[str, Any] = specific_params.get("optical_blur", {})
         # e.g., {"type": "gaussian", "sigma": 0.5}
 
+        # Scene emissivity, e.g., {"value": 0.95, "reflected_temp_c": 20.0}
+        self.emissivity_config: Dict[str, Any] = specific_params.get("emissivity", {})
+        # Off-axis (cos^4) vignetting, e.g., {"strength": 0.3, "reference_temp_c": 25.0}
+        self.vignetting_config: Dict[str, Any] = specific_params.get("vignetting", {})
+        self._vignetting_cos4: Optional[np.ndarray] = None # Cached per-pixel cos^4 of the off-axis angle
+
+        # "list" keeps the historical list-of-lists images, "array" returns numpy arrays
+        self.output_format: str = specific_params.get("output_format", "list")
+        if self.output_format not in ("list", "array"):
+            raise ValueError("output_format must be 'list' or 'array'.")
+
+        # Generator for pixel noise: the rng argument, else one seeded by specific_params["noise_seed"],
+        # else None to draw from the global NumPy generator (seeded per scenario by MLDataGenerator)
+        noise_seed = specific_params.get("noise_seed")
+        self.rng: Optional[np.random.Generator] = rng if rng is not None else \
+            (np.random.default_rng(noise_seed) if noise_seed is not None else None)
 
         self.response_time_alpha: float = specific_params.get("response_time_alpha", 0.7) # Default for thermal
         if not (0 < self.response_time_alpha <= 1.0):
             raise ValueError("response_time_alpha must be between 0 (exclusive) and 1 (inclusive).")
         
-        # Initialize with a zero array of the correct dimensions
-        self._ema_filtered_image: List[List[float]] = [[0.0 for _ in range(self.resolution[0])] for _ in range(self.resolution[1])]
+        # Initialize with a zero array of the correct dimensions (height, width)
+        self._ema_filtered_image: np.ndarray = np.zeros((self.resolution[1], self.resolution[0]))
         self._first_sample_taken: bool = False
 
     def sample(self, environment_3d_state: Any) -> Dict[str, Any]:
@@ -64,21 +85,24 @@ class ThermalCameraSensor(BaseSensor):
             return {"error": "Environment state does not support thermal field view queries."}
 
         try:
-            # Assuming camera orientation needs to be defined or is part of its state/config
-            # For now, using a placeholder orientation.
             # self.position_3d is the camera's location.
             # self.sampling_volume might define near/far clip planes or other view properties.
-            camera_orientation_placeholder = {"yaw": 0.0, "pitch": 0.0, "roll": 0.0}
-            
             thermal_image_array = environment_3d_state.get_thermal_field_view(
                 camera_position=self.position_3d,
-                camera_orientation=camera_orientation_placeholder, # TODO: Make this configurable/dynamic
+                camera_orientation=dict(self.orientation),
                 fov_degrees=tuple(self.fov_degrees), # Ensure it's a tuple
                 resolution=tuple(self.resolution)    # Ensure it's a tuple
             )
             
-            # Basic validation of returned image structure
-            if not isinstance(thermal_image_array, list) or \
+            # Basic validation of returned image structure. Rendering environments return
+            # (height, width) arrays; simpler ones return lists of rows.
+            if isinstance(thermal_image_array, np.ndarray):
+                if thermal_image_array.shape != (self.resolution[1], self.resolution[0]):
+                    logger.error(f"Thermal field view from environment has unexpected dimensions for {self.sensor_id}.")
+                    return {"error": "Received malformed thermal image data from environment."}
+                if self.output_format == "list":
+                    thermal_image_array = thermal_image_array.tolist()
+            elif not isinstance(thermal_image_array, list) or \
                not all(isinstance(row, list) for row in thermal_image_array) or \
                len(thermal_image_array) != self.resolution[1] or \
                (len(thermal_image_array) > 0 and len(thermal_image_array[0]) != self.resolution[0]):
@@ -97,80 +121,93 @@ class ThermalCameraSensor(BaseSensor):
             "type": self.sensor_type,
             "resolution": self.resolution,
             "fov_degrees": self.fov_degrees,
+            "orientation": self.orientation,
             "response_time_alpha": self.response_time_alpha,
             "noise_characteristics": self.noise_characteristics, # From BaseSensor
             "dead_pixels_config": self.dead_pixels,
             "hot_pixels_config": self.hot_pixels_config,
             "optical_blur_config": self.optical_blur_config,
+            "emissivity_config": self.emissivity_config,
+            "vignetting_config": self.vignetting_config,
             "calibration_artifacts": self.calibration_artifacts, # From BaseSensor
             "environmental_compensation_params": self.environmental_compensation_params # From BaseSensor
         }
 
+    def _off_axis_cos4(self, res_w: int, res_h: int) -> np.ndarray:
+        """Returns cos^4 of each pixel's angle to the optical axis, cached per resolution."""
+        if self._vignetting_cos4 is None or self._vignetting_cos4.shape != (res_h, res_w):
+            # With zero orientation the optical axis is +x, so the x component is cos(angle)
+            directions = camera_ray_directions(None, tuple(self.fov_degrees), (res_w, res_h))
+            self._vignetting_cos4 = directions[..., 0] ** 4
+        return self._vignetting_cos4
+
     def apply_imperfections(self, true_reading: Dict[str, Any], environment_3d_state: Any) -> Dict[str, Any]:
         if "thermal_image_celsius" not in true_reading or "resolution" not in true_reading:
             return {"error": "Invalid true_reading format for ThermalCamera apply_imperfections"}
 
-        current_true_image: List[List[float]] = true_reading["thermal_image_celsius"]
         res_w, res_h = true_reading["resolution"] # Should match self.resolution
+        # Copy, so the ground truth passed in is never modified
+        scene_image = np.array(true_reading["thermal_image_celsius"], dtype=float).reshape(res_h, res_w)
+
+        # Scene radiometry, seen before the detector: emissivity and vignetting
+        emissivity = self.emissivity_config.get("value", 1.0) if self.emissivity_config else 1.0
+        if emissivity != 1.0:
+            # Apparent temperature from the emitted plus reflected radiance (Stefan-Boltzmann, in Kelvin)
+            reflected_k = self.emissivity_config.get("reflected_temp_c", 20.0) + KELVIN_OFFSET
+            scene_k = np.maximum(scene_image + KELVIN_OFFSET, 0.0)
+            scene_image = (emissivity * scene_k ** 4 + (1.0 - emissivity) * reflected_k ** 4) ** 0.25 - KELVIN_OFFSET
+
+        vignetting_strength = self.vignetting_config.get("strength", 0.0) if self.vignetting_config else 0.0
+        if vignetting_strength > 0:
+            # The signal relative to the reference (e.g., housing) temperature falls off as cos^4 off-axis
+            reference_c = self.vignetting_config.get("reference_temp_c", 25.0)
+            falloff = 1.0 - vignetting_strength * (1.0 - self._off_axis_cos4(res_w, res_h))
+            scene_image = reference_c + (scene_image - reference_c) * falloff
 
         # Ensure dimensions match, otherwise re-initialize EMA buffer (or error)
-        if len(self._ema_filtered_image) != res_h or \
-           (res_h > 0 and len(self._ema_filtered_image[0]) != res_w):
+        if self._ema_filtered_image.shape != (res_h, res_w):
             logger.warning(f"EMA buffer dimensions mismatch for {self.sensor_id}. Re-initializing.")
-            self._ema_filtered_image = [[0.0 for _ in range(res_w)] for _ in range(res_h)]
+            self._ema_filtered_image = np.zeros((res_h, res_w))
             self._first_sample_taken = False # Force re-initialization
 
-        imperfect_image: List[List[float]] = [[0.0 for _ in range(res_w)] for _ in range(res_h)]
-
         if not self._first_sample_taken:
-            for r in range(res_h):
-                for c in range(res_w):
-                    true_pixel_val = current_true_image[r][c]
-                    self._ema_filtered_image[r][c] = true_pixel_val
-                    imperfect_image[r][c] = true_pixel_val
+            self._ema_filtered_image = scene_image.copy()
+            imperfect_image = scene_image
             self._first_sample_taken = True
         else:
-            for r in range(res_h):
-                for c in range(res_w):
-                    true_pixel_val = current_true_image[r][c]
-                    prev_ema_pixel = self._ema_filtered_image[r][c]
-                    current_ema_pixel = (true_pixel_val * self.response_time_alpha) + \
-                                        (prev_ema_pixel * (1.0 - self.response_time_alpha))
-                    self._ema_filtered_image[r][c] = current_ema_pixel
-                    imperfect_image[r][c] = round(current_ema_pixel, 2) # Round to reasonable precision for temps
-
-        # 1. Pixel noise (random Gaussian noise per pixel) - Applied after EMA
-        if self.noise_characteristics and self.noise_characteristics.get("type") == "gaussian_pixel":
+            self._ema_filtered_image = (scene_image * self.response_time_alpha) + \
+                                       (self._ema_filtered_image * (1.0 - self.response_time_alpha))
+            imperfect_image = np.round(self._ema_filtered_image, 2) # Round to reasonable precision for temps
+
+        # 1. Pixel noise - Applied after EMA. "netd" takes the detector's noise-equivalent
+        #    temperature difference in mK as the per-pixel standard deviation.
+        noise_type = self.noise_characteristics.get("type") if self.noise_characteristics else None
+        if noise_type in ("gaussian_pixel", "netd"):
             mean = self.noise_characteristics.get("mean", 0.0)
-            stddev = self.noise_characteristics.get("stddev_celsius", 0.0)
+            if noise_type == "netd":
+                stddev = self.noise_characteristics.get("netd_mk", 0.0) / 1000.0
+            else:
+                stddev = self.noise_characteristics.get("stddev_celsius", 0.0)
 
             if stddev > 0:
-                for r in range(res_h):
-                    for c in range(res_w):
-                        noise_val = random.gauss(mean, stddev)
-                        imperfect_image[r][c] += noise_val
-                        # Clamping temperature to a plausible range could be done here if needed
-                        imperfect_image[r][c] = round(imperfect_image[r][c], 2)
+                # Clamping temperature to a plausible range could be done here if needed
+                normal = self.rng.normal if self.rng is not None else np.random.normal
+                imperfect_image = np.round(imperfect_image + normal(mean, stddev, imperfect_image.shape), 2)
 
         # 2. Dead/hot pixels (applied after noise)
         for r_dead, c_dead in self.dead_pixels:
             if 0 <= r_dead < res_h and 0 <= c_dead < res_w:
-                imperfect_image[r_dead][c_dead] = self.dead_pixel_value
+                imperfect_image[r_dead, c_dead] = self.dead_pixel_value
         
         for r_hot, c_hot in self.hot_pixel_coordinates:
             if 0 <= r_hot < res_h and 0 <= c_hot < res_w:
-                imperfect_image[r_hot][c_hot] = self.hot_pixel_value
+                imperfect_image[r_hot, c_hot] = self.hot_pixel_value
 
         # 3. Optical blur (applied after dead/hot pixels)
         if SCIPY_AVAILABLE and self.optical_blur_config and self.optical_blur_config.get("type") == "gaussian":
             sigma = self.optical_blur_config.get("sigma", 0.0)
             if sigma > 0:
-                image_np = np.array(imperfect_image, dtype=float)
-                blurred_image_np = gaussian_filter(image_np, sigma=sigma)
-                imperfect_image = blurred_image_np.tolist()
-                for r in range(res_h): # Round again after blur
-                    for c in range(res_w):
-                        imperfect_image[r][c] = round(imperfect_image[r][c], 2)
+                imperfect_image = np.round(gaussian_filter(imperfect_image, sigma=sigma), 2)
 
         # 4. Calibration errors (global offset/gain for now) - Applied after blur
         if self.calibration_artifacts:
@@ -178,14 +215,8 @@ class ThermalCameraSensor(BaseSensor):
             global_gain = self.calibration_artifacts.get("global_gain_factor", 1.0)
 
             if global_offset != 0.0 or global_gain != 1.0:
-                for r in range(res_h):
-                    for c in range(res_w):
-                        pixel_val = imperfect_image[r][c]
-                        # Apply gain first, then offset
-                        pixel_val = (pixel_val * global_gain) + global_offset
-                        # Optional: Clamp to a plausible absolute temperature range, e.g., -273.15 C to a very high value
-                        # pixel_val = max(-273.15, pixel_val)
-                        imperfect_image[r][c] = round(pixel_val, 2)
+                # Apply gain first, then offset
+                imperfect_image = np.round((imperfect_image * global_gain) + global_offset, 2)
         
         # 5. Temperature compensation errors for camera electronics (affecting overall offset/gain of the image)
         if self.environmental_compensation_params and \
@@ -206,20 +237,12 @@ class ThermalCameraSensor(BaseSensor):
 
                 if offset_per_celsius != 0.0:
                     temp_induced_offset = offset_per_celsius * temp_delta_c
-                    for r in range(res_h):
-                        for c in range(res_w):
-                            imperfect_image[r][c] += temp_induced_offset
-                            imperfect_image[r][c] = round(imperfect_image[r][c], 2)
+                    imperfect_image = np.round(imperfect_image + temp_induced_offset, 2)
                 
                 # TODO: Implement gain compensation if gain_factor_per_celsius is added
                 # if gain_factor_per_celsius != 0.0:
-                #     temp_induced_gain_factor_delta = gain_factor_per_celsius * temp_delta_c
-                #     current_gain_factor = 1.0 + temp_induced_gain_factor_delta
-                #     # Clamp current_gain_factor if necessary
-                #     for r in range(res_h):
-                #         for c in range(res_w):
-                #             imperfect_image[r][c] *= current_gain_factor
-                #             imperfect_image[r][c] = round(imperfect_image[r][c], 2)
+                #     current_gain_factor = 1.0 + gain_factor_per_celsius * temp_delta_c
+                #     imperfect_image = np.round(imperfect_image * current_gain_factor, 2)
 
             except Exception as e:
                 logger.warning(f"Could not apply thermal camera temperature compensation for {self.sensor_id}: {e}")
@@ -230,7 +253,7 @@ class ThermalCameraSensor(BaseSensor):
 
         
         output_reading = {
-            "thermal_image_celsius": imperfect_image,
+            "thermal_image_celsius": imperfect_image.tolist() if self.output_format == "list" else imperfect_image,
             "resolution": true_reading["resolution"] # Pass along resolution
         }
         return output_reading
@@ -283,6 +306,9 @@ class EMFSensor(BaseSensor):
                 - "overload_threshold_v_per_m" (float, optional): Threshold for overload anomaly. Default: 500.0.
                 - "overload_confidence" (float, optional): Confidence for overload anomaly label. Default: 0.95.
             **kwargs: Additional keyword arguments for BaseSensor.
+
+        The frequency response, harmonic ratios and orientation settings are compiled into
+        lookup tables here; call compile_response_tables() after changing them in self.config.
         """
         super().__init__(sensor_id, "emf_sensor", position_3d, sampling_volume, **kwargs)
         self.config = specific_params 
@@ -299,6 +325,11 @@ class EMFSensor(BaseSensor):
         if not isinstance(default_gain, (int, float)):
             raise ValueError(f"default_frequency_gain for sensor {sensor_id} must be a number. Got: {default_gain}")
         self.default_frequency_gain: float = float(default_gain)
+        self.compile_response_tables()
+
+    def compile_response_tables(self) -> None:
+        """(Re)compiles the frequency-response and directional-sensitivity tables from self.config."""
+        self.response_tables = EMFResponseTables.from_config(self.config, self.frequency_tolerance_hz, self.default_frequency_gain)
 
     def _calculate_drift(self, drift_type: str, base_rate: float, environment_state: Any) -> float:
         """
@@ -358,27 +389,26 @@ class EMFSensor(BaseSensor):
             logger.debug(f"Non-numeric dominant_frequency_hz ('{dominant_freq_hz}') for EMFSensor {self.sensor_id}. Using default gain: {self.default_frequency_gain}")
             return self.default_frequency_gain
         current_dominant_freq_float = float(dominant_freq_hz)
-        try: # Exact match for float string (e.g., "60.0") or int string (e.g., "60")
-            freq_str_exact = str(current_dominant_freq_float)
-            if freq_str_exact in self.frequency_response_gain:
-                return self.frequency_response_gain[freq_str_exact]
-            if current_dominant_freq_float == float(int(current_dominant_freq_float)): # Check if it's a whole number
-                freq_int_str_exact = str(int(current_dominant_freq_float))
-                if freq_int_str_exact in self.frequency_response_gain:
-                    return self.frequency_response_gain[freq_int_str_exact]
-        except ValueError: # Should not happen due to initial check, but safeguard
-            logger.warning(f"Could not convert dominant_freq_hz '{current_dominant_freq_float}' to string for exact match for EMFSensor {self.sensor_id}.")
-            pass # Proceed to tolerance matching
-        
-        for freq_key_str, gain_val in self.frequency_response_gain.items():
-            try:
-                config_freq_float = float(freq_key_str)
-                if abs(current_dominant_freq_float - config_freq_float) <= self.frequency_tolerance_hz:
-                    return gain_val
-            except ValueError:
-                logger.debug(f"Non-numeric key '{freq_key_str}' in frequency_response_gain for EMFSensor {self.sensor_id}. Skipping for tolerance match.")
-                pass
-        return self.default_frequency_gain
+        # Exact match for float string (e.g., "60.0") or int string (e.g., "60")
+        exact_gain = self.response_tables.exact_gains.get(current_dominant_freq_float)
+        if exact_gain is not None:
+            return exact_gain
+
+        for freq_key_str in self.response_tables.non_numeric_gain_keys:
+            logger.debug(f"Non-numeric key '{freq_key_str}' in frequency_response_gain for EMFSensor {self.sensor_id}. Skipping for tolerance match.")
+        return float(self.response_tables.frequency_gains(current_dominant_freq_float))
+
+    def get_frequency_gains(self, dominant_freqs_hz: Any) -> np.ndarray:
+        """
+        Batched get_frequency_gain for an array of numeric frequencies.
+
+        Args:
+            dominant_freqs_hz (Any): Frequencies to get gains for, any array shape.
+
+        Returns:
+            np.ndarray: Gain factors of the same shape.
+        """
+        return self.response_tables.frequency_gains(dominant_freqs_hz)
 
     def _analyze_frequency_spectrum(self, field_strength: float, environment_state: Any) -> Dict[str, Any]:
         """
@@ -393,14 +423,11 @@ class EMFSensor(BaseSensor):
             Dict[str, Any]: A dictionary representing the spectrum, e.g.,
                             {'fundamental': float, 'harmonics': {'3th': float, ...}, 'high_frequency_noise': float (optional)}.
         """
-        base_freq = self.config.get('base_frequency', 60.0)
         spectrum: Dict[str, Any] = {'fundamental': field_strength, 'harmonics': {}}
-        for n in [3, 5, 7, 9]: # 3rd, 5th, 7th, 9th harmonics
-            harmonic_strength = field_strength * (1.0 / n) * self.config.get(f'harmonic_{n}_ratio', 0.1)
-            if self.config.get('frequency_noise', True):
-                noise_factor = 1.0 + (np.random.normal(0, 0.02) * np.sqrt(n)) # Noise proportional to sqrt(harmonic_order)
-                harmonic_strength *= noise_factor
-            spectrum['harmonics'][f'{n}th'] = harmonic_strength
+        # 3rd, 5th, 7th, 9th harmonics, with noise proportional to sqrt(harmonic_order)
+        harmonic_strengths = self.response_tables.harmonic_strengths(np.array([field_strength]),
+                                                                     frequency_noise=self.config.get('frequency_noise', True))
+        spectrum['harmonics'] = dict(zip(self.response_tables.harmonic_keys, harmonic_strengths[0].tolist()))
         
         corona_discharge_value = 0.0
         if hasattr(environment_state, 'get_field_value'):
@@ -428,29 +455,37 @@ class EMFSensor(BaseSensor):
         Returns:
             float: The field magnitude after applying directional sensitivity.
         """
-        sensor_orientation = np.array(self.config.get('orientation', [0, 0, 1]), dtype=float)
-        
-        norm_field_vector = np.linalg.norm(field_vector)
-        norm_sensor_orientation = np.linalg.norm(sensor_orientation)
+        tables = self.response_tables
+        norm_field_vector = float(np.sqrt(field_vector @ field_vector))
 
         if norm_field_vector < 1e-9: return 0.0 # Handle zero field vector
-        if norm_sensor_orientation < 1e-9: # Handle zero sensor orientation
+        if tables.orientation_is_zero: # Handle zero sensor orientation
              logger.warning(f"EMFSensor {self.sensor_id} has zero vector orientation. Directional sensitivity will result in 0 field strength.")
              return 0.0
 
-        field_direction = field_vector / norm_field_vector
-        sensor_norm = sensor_orientation / norm_sensor_orientation
-        
-        alignment_factor = abs(np.dot(field_direction, sensor_norm)) # Cosine sensitivity pattern
-        
-        if self.config.get('orientation_uncertainty', True):
-            uncertainty_stddev = self.config.get('orientation_uncertainty_stddev', 0.05)
-            uncertainty = np.random.normal(0, uncertainty_stddev)
-            alignment_factor = np.clip(alignment_factor + uncertainty, 0, 1)
-        
+        # Cosine sensitivity pattern against the precompiled unit axis
+        alignment_factor = abs(float(tables.axis @ field_vector)) / norm_field_vector
+
+        if tables.orientation_uncertainty_stddev is not None:
+            uncertainty = np.random.normal(0, tables.orientation_uncertainty_stddev)
+            alignment_factor = min(max(alignment_factor + uncertainty, 0.0), 1.0)
+
         field_magnitude = field_magnitude_override if field_magnitude_override is not None else norm_field_vector
         return field_magnitude * alignment_factor
 
+    def _assumed_field_direction(self) -> np.ndarray:
+        """
+        Field direction assumed for scalar readings when 'apply_directional_sensitivity_to_scalar' is set.
+
+        Returns:
+            np.ndarray: The configured 'assumed_dominant_field_direction', or [0, 0, 1] if it is invalid.
+        """
+        dominant_dir_config = self.config.get('assumed_dominant_field_direction', [0,0,1])
+        if not (isinstance(dominant_dir_config, list) and len(dominant_dir_config) == 3 and all(isinstance(c, (int,float)) for c in dominant_dir_config)):
+            logger.warning(f"Invalid 'assumed_dominant_field_direction' for {self.sensor_id}. Using default [0,0,1].")
+            dominant_dir_config = [0,0,1] # Fallback
+        return np.array(dominant_dir_config, dtype=float)
+
     def _apply_frequency_response(self, spectrum: Dict[str, Any], environment_state: Any) -> Dict[str, Any]:
         """
         Applies frequency-dependent sensor response characteristics to a spectrum.
@@ -464,15 +499,9 @@ class EMFSensor(BaseSensor):
         Returns:
             Dict[str, Any]: The spectrum after applying the frequency response.
         """
-        response_curve = self.config.get('frequency_response_curve', {
-            'fundamental': 1.0, '3th': 0.95, '5th': 0.85, '7th': 0.70, '9th': 0.50, 'high_frequency_noise': 0.30
-        })
-        
         temp = self._get_ambient_temperature(environment_state) # Pass environment_state
-        temp_factor_per_10c = self.config.get('frequency_response_temp_coeff_per_10c', 0.001)
-        reference_temp_for_coeff = self.config.get('frequency_response_ref_temp_c', 25.0)
-        temp_factor = 1.0 - (abs(temp - reference_temp_for_coeff) / 10.0 * temp_factor_per_10c)
-        temp_factor = np.clip(temp_factor, 0.5, 1.5) # Cap the temperature effect
+        temp_factor = float(self.response_tables.temperature_factors(temp)) # Capped temperature effect
+        tables = self.response_tables
         
         filtered_spectrum: Dict[str, Any] = {}
         for freq_component, value in spectrum.items():
@@ -480,13 +509,11 @@ class EMFSensor(BaseSensor):
                 filtered_spectrum['harmonics'] = {}
                 for harmonic, h_value in value.items():
                     if isinstance(h_value, (int, float)): # Ensure harmonic value is numeric
-                        response = response_curve.get(harmonic, 0.5) # Default for unlisted harmonics
-                        filtered_spectrum['harmonics'][harmonic] = h_value * response * temp_factor
+                        filtered_spectrum['harmonics'][harmonic] = h_value * tables.response('harmonics', harmonic) * temp_factor
                     else:
                         filtered_spectrum['harmonics'][harmonic] = h_value # Preserve non-numeric if any
             elif isinstance(value, (int, float)): # Handle fundamental, high_frequency_noise etc.
-                response = response_curve.get(freq_component, 1.0) # Default for other components
-                filtered_spectrum[freq_component] = value * response * temp_factor
+                filtered_spectrum[freq_component] = value * tables.response(freq_component) * temp_factor
             else: # Preserve other types of values if any
                 filtered_spectrum[freq_component] = value
         return filtered_spectrum
@@ -610,6 +637,96 @@ class EMFSensor(BaseSensor):
             return true_readings
         return self.apply_imperfections(true_readings, environment_3d_state)
 
+    def sample_batch(self, environment_states: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Samples the sensor at several environment states, e.g., the steps of a recorded run.
+        Directional sensitivity, harmonic synthesis and the frequency response are evaluated
+        for the whole batch with the precompiled response tables; calibration, drift, EMI and
+        noise are then applied to each reading as in apply_imperfections.
+
+        The random draws follow the same distributions as sample() but in a different order,
+        so a batch matches sequential sample() calls only when the random imperfections are disabled.
+
+        Args:
+            environment_states (List[Any]): The environment states to sample.
+
+        Returns:
+            List[Dict[str, Any]]: One reading per state, in the same order. States whose ground
+                                  truth fails yield that ground truth's "error" dict.
+        """
+        tables = self.response_tables
+        readings: List[Dict[str, Any]] = []
+        batch_rows: List[int] = [] # Readings handled by the batched steps 1 and 2
+        for state in environment_states:
+            true_reading = self.get_ground_truth(state)
+            if "error" not in true_reading and isinstance(true_reading.get("ac_field_strength_v_per_m"), (int, float)):
+                batch_rows.append(len(readings))
+                readings.append(true_reading.copy())
+            elif "error" in true_reading:
+                readings.append(true_reading)
+            else:
+                readings.append(self.apply_imperfections(true_reading, state))
+        if not batch_rows:
+            return readings
+        states = [environment_states[row] for row in batch_rows]
+        strengths = np.array([readings[row]["ac_field_strength_v_per_m"] for row in batch_rows], dtype=float)
+
+        # 1. Directional Sensitivity
+        field_vectors = np.zeros((len(batch_rows), 3))
+        magnitudes = strengths.copy()
+        directional = np.zeros(len(batch_rows), dtype=bool)
+        scalar_direction = (self._assumed_field_direction()
+                            if self.config.get('apply_directional_sensitivity_to_scalar', False) else None)
+        for index, row in enumerate(batch_rows):
+            true_field_vector = readings[row].get('ac_field_vector_v_per_m')
+            if true_field_vector is not None and isinstance(true_field_vector, (list, np.ndarray)) and len(true_field_vector) == 3:
+                try:
+                    field_vectors[index] = np.array(true_field_vector, dtype=float)
+                except Exception as e_dir_sens:
+                    logger.warning(f"Error applying directional sensitivity with vector for {self.sensor_id}: {e_dir_sens}")
+                    continue
+                magnitudes[index] = np.linalg.norm(field_vectors[index])
+                directional[index] = True
+            elif scalar_direction is not None:
+                field_vectors[index] = scalar_direction * strengths[index]
+                directional[index] = True
+        if directional.any():
+            if tables.orientation_is_zero:
+                logger.warning(f"EMFSensor {self.sensor_id} has zero vector orientation. Directional sensitivity will result in 0 field strength.")
+            perceived = tables.apply_directional_sensitivity(field_vectors[directional], magnitudes[directional])
+            strengths[directional] = perceived
+
+        # 2. Spectrum Generation & Frequency Response
+        spectra = None
+        if self.enable_spectrum_output:
+            truth_spectra = [readings[row].get('spectrum_truth') if isinstance(readings[row].get('spectrum_truth'), dict) else {}
+                             for row in batch_rows]
+            harmonics = tables.harmonic_strengths(strengths, frequency_noise=self.config.get('frequency_noise', True))
+            if not self.config.get('recalculate_harmonics_post_directionality', True):
+                for index, truth in enumerate(truth_spectra):
+                    if truth:
+                        harmonics[index] = [truth.get('harmonics', {}).get(key, 0.0) for key in tables.harmonic_keys]
+            has_hf_noise = [isinstance(truth.get('high_frequency_noise'), (int, float)) for truth in truth_spectra]
+            hf_noise = [truth['high_frequency_noise'] if has_noise else 0.0 for truth, has_noise in zip(truth_spectra, has_hf_noise)]
+            temperatures = np.array([self._get_ambient_temperature(state) for state in states], dtype=float)
+            spectra = tables.apply_frequency_response(np.column_stack([strengths, harmonics, hf_noise]), temperatures)
+            # The reported field strength is the attenuated fundamental
+            strengths = spectra[:, 0]
+
+        for index, (row, state) in enumerate(zip(batch_rows, states)):
+            imperfect_reading = readings[row]
+            imperfect_reading["ac_field_strength_v_per_m"] = float(strengths[index])
+            if spectra is not None:
+                values = spectra[index].tolist()
+                spectrum: Dict[str, Any] = {'fundamental': values[0], 'harmonics': dict(zip(tables.harmonic_keys, values[1:-1]))}
+                if has_hf_noise[index]:
+                    spectrum['high_frequency_noise'] = values[-1]
+                imperfect_reading['spectrum'] = spectrum
+            else:
+                imperfect_reading.pop('spectrum', None)
+            readings[row] = self._apply_post_spectrum_imperfections(imperfect_reading, state)
+        return readings
+
     def get_ground_truth(self, environment_state: Any) -> Dict[str, Any]:
         """
         Retrieves the ground truth EMF characteristics from the environment.
@@ -743,12 +860,8 @@ class EMFSensor(BaseSensor):
                 logger.warning(f"Error applying directional sensitivity with vector for {self.sensor_id}: {e_dir_sens}")
                 # Keep current_field_strength as is from scalar ground truth
         elif self.config.get('apply_directional_sensitivity_to_scalar', False):
-            dominant_dir_config = self.config.get('assumed_dominant_field_direction', [0,0,1])
-            if not (isinstance(dominant_dir_config, list) and len(dominant_dir_config) == 3 and all(isinstance(c, (int,float)) for c in dominant_dir_config)):
-                logger.warning(f"Invalid 'assumed_dominant_field_direction' for {self.sensor_id}. Using default [0,0,1].")
-                dominant_dir_config = [0,0,1] # Fallback
             try:
-                assumed_field_vector = np.array(dominant_dir_config, dtype=float) * current_field_strength
+                assumed_field_vector = self._assumed_field_direction() * current_field_strength
                 current_field_strength = self._apply_directional_sensitivity(assumed_field_vector, field_magnitude_override=current_field_strength)
             except Exception as e_dir_sens_scalar:
                  logger.warning(f"Error applying directional sensitivity with scalar for {self.sensor_id}: {e_dir_sens_scalar}")
@@ -777,7 +890,20 @@ class EMFSensor(BaseSensor):
         else: # If spectrum output is disabled
             imperfect_reading.pop('spectrum', None)
 
+        return self._apply_post_spectrum_imperfections(imperfect_reading, environment_3d_state)
 
+    def _apply_post_spectrum_imperfections(self, imperfect_reading: Dict[str, Any], environment_3d_state: Any) -> Dict[str, Any]:
+        """
+        Applies steps 3-6 of apply_imperfections (calibration errors, drift, EMI and noise)
+        to a reading whose directional sensitivity and spectrum have already been applied.
+
+        Args:
+            imperfect_reading (Dict[str, Any]): The reading after steps 1 and 2.
+            environment_3d_state (Any): The current simulation environment state.
+
+        Returns:
+            Dict[str, Any]: The final sensor reading.
+        """
         # 3. Calibration Errors (Gain, Offset, Non-linearity, Axis Misalignment on spectrum if enabled)
         imperfect_reading = self._apply_calibration_errors(imperfect_reading, environment_3d_state)
 
@@ -20,6 +20,8 @@ from .system import (
     InternalTemperatureSensor
 )
 
+from .bank import VOCSensorBank
+
 # Define a SENSOR_CLASS_REGISTRY for the factory pattern
 # This will be used by VirtualGridGuardian to instantiate sensors
 SENSOR_CLASS_REGISTRY = {
@@ -37,4 +39,9 @@ SENSOR_CLASS_REGISTRY = {
     "solar_power": SolarPowerSensor,
     "internal_temperature": InternalTemperatureSensor,
     # Add other sensor type strings and their corresponding classes here
-}
\ No newline at end of file
+}
+
+# Sensor types that can be simulated as struct-of-arrays banks (see bank.py)
+SENSOR_BANK_REGISTRY = {
+    "voc_array": VOCSensorBank,
+}
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from envirosense.simulation_engine.sensors.bank import VOCSensorBank
+from envirosense.simulation_engine.sensors.environmental import VOCArraySensor
+from envirosense.simulation_engine.environment.mock_utils import create_mock_environment_state
+
+
+class TestVOCSensorBank(unittest.TestCase):
+
+    def _create_sensors(self):
+        """VOC arrays with noise-free imperfection chains that differ per sensor."""
+        sensors = []
+        for i in range(3):
+            sensors.append(VOCArraySensor(
+                sensor_id=f"bank_voc_{i}",
+                position_3d=(float(i), 0.0, 0.0),
+                sampling_volume={"shape": "cube", "size_m": 0.1},
+                specific_params={
+                    "channels": ["CO", "NO2", "SO2"],
+                    "response_time_alpha": 0.3 + 0.2 * i,
+                    "cross_sensitivity_matrix": {"CO": {"NO2": 0.05 * (i + 1)}, "SO2": {"CO": 0.01}}
+                },
+                drift_parameters={
+                    "baseline_drift_ppb_per_hour": {"CO": 0.1 * i},
+                    "sensitivity_drift_percent_per_hour": {"NO2": -0.5}
+                } if i > 0 else {},
+                calibration_artifacts={"offset_ppb": {"SO2": 0.3}, "gain_factor": {"CO": 1.02}},
+                environmental_compensation_params={
+                    "temperature": {"reference_temp_c": 20.0, "offset_ppb_per_celsius": {"NO2": 0.04}}
+                } if i != 1 else {}
+            ))
+        return sensors
+
+    def test_bank_matches_individual_sensors(self):
+        """Stacked simulation reproduces the per-object imperfection chain step by step."""
+        sensors = self._create_sensors()
+        bank = VOCSensorBank.from_sensors(self._create_sensors())
+        self.assertEqual(bank.cross_sensitivity.shape, (3, 3, 3))
+
+        for step, (co, no2) in enumerate([(10.0, 5.0), (14.0, 2.0), (9.0, 7.5)]):
+            env_state = create_mock_environment_state(
+                simulation_time_seconds=3600.0 * step,
+                chemical_concentrations={"CO": co, "NO2": no2, "SO2": 1.0},
+                default_temp_c=27.0
+            )
+            bank_readings = bank.to_readings(bank.sample(env_state))
+            for sensor in sensors:
+                expected = sensor.sample(env_state)["concentrations_ppb"]
+                actual = bank_readings[sensor.sensor_id]["concentrations_ppb"]
+                for channel in sensor.channels:
+                    # Both paths round to 3 decimals; numpy and Python rounding may differ by one unit there
+                    self.assertAlmostEqual(actual[channel], expected[channel], delta=1.5e-3)
+
+    def test_noise_uses_per_channel_stddev(self):
+        bank = VOCSensorBank(
+            sensor_ids=[f"n{i}" for i in range(2000)],
+            positions=np.zeros((2000, 3)),
+            channels=["CO", "NO2"],
+            response_time_alpha=1.0,
+            noise_stddev=[0.5, 0.0],
+            rng=np.random.default_rng(1)
+        )
+        env_state = create_mock_environment_state(chemical_concentrations={"CO": 100.0, "NO2": 50.0})
+        values, truth = bank.sample_with_ground_truth(env_state)
+        np.testing.assert_allclose(truth, np.tile([100.0, 50.0], (2000, 1)))
+        self.assertAlmostEqual(values[:, 0].std(), 0.5, delta=0.05)
+        np.testing.assert_allclose(values[:, 1], 50.0)
+
+    def test_mismatched_channels_rejected(self):
+        sensors = self._create_sensors()
+        sensors[1].channels = ["CO"]
+        with self.assertRaises(ValueError):
+            VOCSensorBank.from_sensors(sensors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+
+import numpy as np
+
+from envirosense.simulation_engine.sensors.emf_response import EMFResponseTables
+from envirosense.simulation_engine.sensors.infrastructure import EMFSensor
+from envirosense.simulation_engine.environment.mock_utils import create_mock_environment_state
+
+
+class TestEMFResponseTables(unittest.TestCase):
+
+    def test_frequency_gain_table_matches_key_matching(self):
+        """Overlapping tolerance windows resolve in config order; exact keys take precedence."""
+        sensor = EMFSensor("emf_table_gain", (0, 0, 0), {}, {
+            "frequency_response_gain": {"50.0": 0.9, "50.6": 1.3, "60": 1.1, "bad_key": 2.0, "60.4": 0.7},
+            "frequency_tolerance_hz": 0.5,
+            "default_frequency_gain": 0.1
+        })
+        frequencies = np.concatenate([np.round(np.arange(48.0, 62.0, 0.05), 2), [49.5, 50.5, 50.1, 51.1, 60.4, 59.5]])
+        gains = sensor.frequency_response_gain
+        expected = []
+        for frequency in frequencies.tolist():
+            exact_keys = [key for key in (str(frequency), str(int(frequency)) if frequency == int(frequency) else None) if key in gains]
+            window_keys = [key for key in ("50.0", "50.6", "60", "60.4") if abs(frequency - float(key)) <= 0.5]
+            matched = (exact_keys or window_keys)
+            expected.append(gains[matched[0]] if matched else sensor.default_frequency_gain)
+
+        np.testing.assert_allclose(sensor.get_frequency_gains(frequencies), expected)
+        self.assertEqual([sensor.get_frequency_gain(f) for f in frequencies.tolist()], expected)
+
+    def test_batched_frequency_response_matches_spectrum_dicts(self):
+        sensor = EMFSensor("emf_table_response", (0, 0, 0), {}, {"frequency_noise": False,
+                                                                 "frequency_response_temp_coeff_per_10c": 0.05})
+        tables = sensor.response_tables
+        fields = np.array([10.0, 250.0, 3.5])
+        temperatures = np.array([25.0, 40.0, -5.0])
+        spectra = np.column_stack([fields, tables.harmonic_strengths(fields, frequency_noise=False), 0.15 * fields])
+        batched = tables.apply_frequency_response(spectra, temperatures)
+
+        for row, (field, temperature) in enumerate(zip(fields, temperatures)):
+            spectrum = sensor._analyze_frequency_spectrum(field, None)
+            spectrum['high_frequency_noise'] = 0.15 * field
+            filtered = sensor._apply_frequency_response(spectrum, create_mock_environment_state(default_temp_c=temperature))
+            self.assertAlmostEqual(batched[row, 0], filtered['fundamental'])
+            for column, key in enumerate(tables.harmonic_keys, start=1):
+                self.assertAlmostEqual(batched[row, column], filtered['harmonics'][key])
+            self.assertAlmostEqual(batched[row, -1], filtered['high_frequency_noise'])
+
+    def test_directional_gain_matrix(self):
+        tables = EMFResponseTables({}, 1.0, 1.0, orientation=(0.0, 3.0, 4.0), orientation_uncertainty_stddev=None)
+        self.assertEqual(tables.directional_gain_matrix.shape, (3, 3))
+        vectors = np.array([[0.0, 3.0, 4.0], [1.0, 0.0, 0.0], [0.0, 0.0, -2.0], [0.0, 0.0, 0.0]])
+        np.testing.assert_allclose(tables.alignments(vectors), [1.0, 0.0, 0.8, 0.0])
+        np.testing.assert_allclose(tables.apply_directional_sensitivity(vectors), [5.0, 0.0, 1.6, 0.0])
+        np.testing.assert_allclose(tables.apply_directional_sensitivity(vectors, magnitudes=np.full(4, 10.0)), [10.0, 0.0, 8.0, 0.0])
+
+    def test_scalar_directional_fast_path_matches_batch(self):
+        sensor = EMFSensor("emf_table_fast_path", (0, 0, 0), {}, {"orientation": [0, 3, 4]})
+        tables = sensor.response_tables
+        for vector in ([0.0, 3.0, 4.0], [1.0, 0.0, 0.0], [0.2, -1.0, 2.5], [0.0, 0.0, 0.0]):
+            vector = np.array(vector)
+            np.random.seed(5)
+            fast = sensor._apply_directional_sensitivity(vector)
+            np.random.seed(5)
+            self.assertAlmostEqual(fast, tables.apply_directional_sensitivity(vector)[0])
+        np.random.seed(5)
+        fast = sensor._apply_directional_sensitivity(np.array([1.0, 1.0, 1.0]), field_magnitude_override=7.0)
+        np.random.seed(5)
+        self.assertAlmostEqual(fast, tables.apply_directional_sensitivity(np.ones(3), magnitudes=np.array([7.0]))[0])
+
+    def test_sample_batch_matches_sequential_samples(self):
+        class EMFEnvState:
+            def __init__(self, emf_data, temperature_c, simulation_time_seconds):
+                self.emf_data = emf_data
+                self.temperature_c = temperature_c
+                self.simulation_time_seconds = simulation_time_seconds
+
+            def get_emf_characteristics_at_point(self, position, frequency_range_hz):
+                return dict(self.emf_data)
+
+            def get_temperature_celsius(self, position, sampling_volume):
+                return self.temperature_c
+
+            def get_field_value(self, field_name, position):
+                return 30.0 if field_name == 'corona_discharge' and self.emf_data["ac_field_strength_v_per_m"] > 100 else 0.0
+
+        class BadEnvState: pass
+
+        sensor = EMFSensor("emf_table_batch", (0, 0, 0), {}, {"orientation": [0, 1, 1], "orientation_uncertainty": False,
+                                                              "frequency_noise": False,
+                                                              "frequency_response_temp_coeff_per_10c": 0.05})
+        states = [EMFEnvState({"ac_field_strength_v_per_m": 12.0, "ac_field_vector_v_per_m": [0.0, 6.0, 8.0]}, 30.0, 3600.0),
+                  BadEnvState(),
+                  EMFEnvState({"ac_field_strength_v_per_m": 150.0}, -10.0, 0.0),
+                  EMFEnvState({"ac_field_strength_v_per_m": 4.0, "ac_field_vector_v_per_m": [0.0, 0.0, 0.0]}, 25.0, 60.0)]
+
+        batch = sensor.sample_batch(states)
+        self.assertEqual(len(batch), len(states))
+        self.assertIn("error", batch[1])
+        for reading, state in zip(batch, states):
+            expected = sensor.sample(state)
+            self.assertEqual(reading.keys(), expected.keys())
+            if "error" in expected:
+                continue
+            self.assertAlmostEqual(reading["ac_field_strength_v_per_m"], expected["ac_field_strength_v_per_m"])
+            self.assertEqual(reading["spectrum"].keys(), expected["spectrum"].keys())
+            for key, value in expected["spectrum"].items():
+                if key == 'harmonics':
+                    for harmonic, h_value in value.items():
+                        self.assertAlmostEqual(reading["spectrum"]['harmonics'][harmonic], h_value)
+                else:
+                    self.assertAlmostEqual(reading["spectrum"][key], value)
+        self.assertIn('high_frequency_noise', batch[2]["spectrum"])
+
+    def test_recompile_after_config_change(self):
+        sensor = EMFSensor("emf_table_recompile", (0, 0, 0), {}, {"orientation": [0, 0, 1], "orientation_uncertainty": False})
+        sensor.config["orientation"] = [1, 0, 0]
+        sensor.compile_response_tables()
+        self.assertAlmostEqual(sensor._apply_directional_sensitivity(np.array([5.0, 0.0, 0.0])), 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
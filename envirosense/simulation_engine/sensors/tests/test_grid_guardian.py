@@ -1,15 +1,21 @@
 import unittest
+from typing import Any, Dict
 from unittest.mock import MagicMock, patch
 
 from envirosense.simulation_engine.sensors.config import SensorConfiguration, IndividualSensorConfig
 from envirosense.simulation_engine.sensors.grid_guardian import VirtualGridGuardian
 from envirosense.simulation_engine.sensors.base import BaseSensor # For type hinting
+from envirosense.simulation_engine.sensors.environmental import VOCArraySensor
+from envirosense.simulation_engine.environment.mock_utils import create_mock_environment_state
 # Assuming DummySensor is accessible for testing, or we create one here
 # For simplicity, let's redefine a minimal DummySensor or import if path is stable
 # from ..base import BaseSensor # If tests are run as a package
 
 # Minimal DummySensor for testing VirtualGridGuardian
 class DummyGuardianSensor(BaseSensor):
+    # sample() returns a canned reading rather than imperfections applied to the ground truth
+    SAMPLES_FROM_GROUND_TRUTH = False
+
     def __init__(self, sensor_id: str, sensor_type: str, position_3d, sampling_volume, **kwargs):
         super().__init__(sensor_id, sensor_type, position_3d, sampling_volume, **kwargs)
         self.sample_called_with = None
@@ -32,6 +38,18 @@ class DummyGuardianSensor(BaseSensor):
         # Minimal implementation for testing
         return true_reading.copy()
 
+class CountingGuardianSensor(DummyGuardianSensor):
+    """Dummy sensor following the standard pipeline, counting ground truth queries."""
+    SAMPLES_FROM_GROUND_TRUTH = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ground_truth_calls = 0
+
+    def get_ground_truth(self, environment_3d_state: Any) -> Dict[str, Any]:
+        self.ground_truth_calls += 1
+        return super().get_ground_truth(environment_3d_state)
+
 class TestVirtualGridGuardian(unittest.TestCase):
 
     def _create_mock_sensor_config(self, num_sensors=2, custom_guardian_id="GG-Test-001"):
@@ -198,6 +216,41 @@ class TestVirtualGridGuardian(unittest.TestCase):
         }
         self.assertEqual(labels, expected_labels)
 
+    def test_generate_training_sample_queries_ground_truth_once(self):
+        """Test that the reading and the labels share a single ground truth query."""
+        mock_config = self._create_mock_sensor_config(num_sensors=1)
+        guardian = VirtualGridGuardian(guardian_id="GG-SinglePass", config=mock_config)
+
+        mock_sensor = CountingGuardianSensor("sp_s1", "dummy_sp", (0,0,0), {})
+        guardian.sensors = {"sp_s1": mock_sensor}
+
+        readings, labels = guardian.generate_training_sample({"field_data": "some_value"})
+
+        self.assertEqual(mock_sensor.ground_truth_calls, 1)
+        self.assertEqual(readings, {"sp_s1": {"sp_s1_true_value": 0.9, "type": "dummy_sp"}})
+        self.assertEqual(labels, {"gt_sp_s1_sp_s1_true_value": 0.9, "gt_sp_s1_type": "dummy_sp"})
+
+    def test_voc_sensors_share_batched_chemical_query(self):
+        """Test that all VOC arrays are served by one batched environment query."""
+        voc_configs = [
+            IndividualSensorConfig(sensor_type="voc_array", sensor_id=f"batch_voc_{i}",
+                                   specific_params={"channels": ["CO", "NO2"]})
+            for i in range(3)
+        ]
+        config = SensorConfiguration(guardian_id="GG-BatchVOC", sensors=voc_configs)
+        guardian = VirtualGridGuardian(guardian_id="GG-BatchVOC", config=config)
+
+        env_state = create_mock_environment_state(chemical_concentrations={"CO": 10.0, "NO2": 5.0})
+        env_state.get_chemical_concentrations = MagicMock(wraps=env_state.get_chemical_concentrations)
+
+        readings, ground_truths = guardian.sample_environment_with_ground_truth(env_state)
+
+        env_state.get_chemical_concentrations.assert_called_once()
+        self.assertEqual(set(readings), {"batch_voc_0", "batch_voc_1", "batch_voc_2"})
+        for sensor_id, sensor in guardian.sensors.items():
+            self.assertEqual(ground_truths[sensor_id], sensor.get_ground_truth(env_state))
+            self.assertIn("concentrations_ppb", readings[sensor_id])
+
     def test_get_sensor(self):
         """Test retrieving a sensor by ID."""
         mock_config = self._create_mock_sensor_config(num_sensors=1)
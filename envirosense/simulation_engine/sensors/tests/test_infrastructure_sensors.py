@@ -452,6 +452,64 @@ class TestThermalCameraSensor(unittest.TestCase):
             self.assertAlmostEqual(sample3["thermal_image_celsius"][0][0], value_before)
             mock_logger_warning.assert_any_call(f"Thermal camera temp comp config exists for {sensor_valid_params_bad_env.sensor_id} but env_state lacks 'get_temperature_celsius'. Skipping.")
 
+    def test_thermal_camera_array_ground_truth_and_output(self):
+        """Array views from rendering environments are accepted and can be returned as arrays."""
+        resolution = [4, 3]
+        sensor = ThermalCameraSensor("thermal_array", (0,0,0), {}, {"resolution": resolution, "response_time_alpha": 1.0,
+                                                                   "orientation": {"yaw": 90.0, "pitch": -10.0, "roll": 0.0},
+                                                                   "output_format": "array"})
+        mock_env = MagicMock()
+        mock_env.get_thermal_field_view.return_value = np.full((3, 4), 31.5)
+        sample_data = sensor.sample(mock_env)
+        self.assertEqual(mock_env.get_thermal_field_view.call_args.kwargs["camera_orientation"],
+                         {"yaw": 90.0, "pitch": -10.0, "roll": 0.0})
+        self.assertIsInstance(sample_data["thermal_image_celsius"], np.ndarray)
+        np.testing.assert_allclose(sample_data["thermal_image_celsius"], 31.5)
+
+        mock_env.get_thermal_field_view.return_value = np.zeros((4, 3))
+        self.assertIn("error", sensor.get_ground_truth(mock_env))
+
+    def test_thermal_camera_netd_noise(self):
+        resolution = [40, 30]
+        sensor = ThermalCameraSensor("thermal_netd", (0,0,0), {}, {"resolution": resolution, "response_time_alpha": 1.0, "output_format": "array"},
+                                     noise_characteristics={"type": "netd", "netd_mk": 50.0})
+        sensor.get_ground_truth = lambda env: {"thermal_image_celsius": np.full((30, 40), 25.0), "resolution": resolution}
+        image = sensor.sample(None)["thermal_image_celsius"]
+        self.assertAlmostEqual(image.mean(), 25.0, delta=0.02)
+        self.assertAlmostEqual(image.std(), 0.05, delta=0.02)
+
+        # Frames are reproducible from a seeded generator
+        sensor.rng = np.random.default_rng(11)
+        image = sensor.sample(None)["thermal_image_celsius"]
+        expected = np.round(25.0 + np.random.default_rng(11).normal(0.0, 0.05, (30, 40)), 2)
+        np.testing.assert_allclose(image, expected)
+
+        seeded = ThermalCameraSensor("thermal_netd_seeded", (0,0,0), {}, {"resolution": resolution, "response_time_alpha": 1.0,
+                                                                          "output_format": "array", "noise_seed": 11},
+                                     noise_characteristics={"type": "netd", "netd_mk": 50.0})
+        seeded.get_ground_truth = sensor.get_ground_truth
+        np.testing.assert_allclose(seeded.sample(None)["thermal_image_celsius"], expected)
+
+    def test_thermal_camera_emissivity_and_vignetting(self):
+        resolution = [5, 3]
+        true_image = [[60.0] * resolution[0] for _ in range(resolution[1])]
+        sensor = ThermalCameraSensor("thermal_emissivity", (0,0,0), {}, {"resolution": resolution, "response_time_alpha": 1.0,
+                                                                         "emissivity": {"value": 0.9, "reflected_temp_c": 20.0}})
+        sensor.get_ground_truth = lambda env: {"thermal_image_celsius": true_image, "resolution": resolution}
+        expected = (0.9 * 333.15 ** 4 + 0.1 * 293.15 ** 4) ** 0.25 - 273.15
+        self.assertAlmostEqual(sensor.sample(None)["thermal_image_celsius"][1][2], expected, places=6)
+        self.assertEqual(true_image[1][2], 60.0)
+
+        sensor = ThermalCameraSensor("thermal_vignetting", (0,0,0), {}, {"resolution": resolution, "response_time_alpha": 1.0,
+                                                                         "fov_degrees": [90.0, 60.0],
+                                                                         "vignetting": {"strength": 1.0, "reference_temp_c": 20.0}})
+        sensor.get_ground_truth = lambda env: {"thermal_image_celsius": true_image, "resolution": resolution}
+        image = sensor.sample(None)["thermal_image_celsius"]
+        self.assertLess(image[1][0], image[1][1])
+        self.assertLess(image[1][1], image[1][2])
+        self.assertGreater(image[0][0], 20.0)
+        self.assertAlmostEqual(image[1][0], image[1][4], places=9)
+
 
 class TestEMFSensor(unittest.TestCase):
     """Test suite for the EMFSensor class, covering its initialization,
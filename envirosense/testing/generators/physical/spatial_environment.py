@@ -16,6 +16,7 @@ from mpl_toolkits.mplot3d import Axes3D
 from scipy.ndimage import gaussian_filter
 
 from envirosense.testing.framework import DataGenerator, TestScenario
+from envirosense.simulation_engine.physics.implicit_diffusion import ImplicitDiffusionSolver
 from envirosense.testing.generators.environmental.parameter_generator import (
     PARAMETER_DEFINITIONS, EnvironmentalParameterGenerator
 )
@@ -47,6 +48,7 @@ class SpatialEnvironmentGenerator(DataGenerator):
             'initial_conditions': None,         # Initial conditions (uniform or spatially varying)
             'boundary_conditions': 'dirichlet', # Type of boundary conditions
             'diffusion_coefficient': None,      # Diffusion coefficient (parameter-specific if None)
+            'diffusion_solver': 'explicit',     # Diffusion scheme (explicit, crank_nicolson, backward_euler)
             'advection_field': None,            # Vector field for advection/airflow
             'decay_rate': 0.0,                  # Decay rate for the parameter
             'random_seed': None,                # Seed for reproducibility
@@ -55,6 +57,9 @@ class SpatialEnvironmentGenerator(DataGenerator):
             'visualization_slice_index': None,  # Index of the slice (middle if None)
             'output_full_grid': False           # Whether to output the full grid data
         })
+
+        # Implicit diffusion solver, reused across steps while the grid shape is unchanged
+        self._diffusion_solver = None
         
         # Parameter-specific defaults
         self.parameter_defaults = {
@@ -678,6 +683,11 @@ class SpatialEnvironmentGenerator(DataGenerator):
         resolution = self.parameters['grid_resolution']
         D_grid = diffusion_coefficient * dt / (resolution * resolution)
         
+        # Implicit schemes are unconditionally stable, so no clamping is needed
+        scheme = self.parameters.get('diffusion_solver', 'explicit')
+        if scheme != 'explicit':
+            return self._apply_implicit_diffusion(grid, barrier_mask, D_grid, scheme)
+        
         # Check stability condition (dt <= dx^2 / (2 * D * ndim))
         max_stable_dt = resolution * resolution / (6 * diffusion_coefficient)
         if dt > max_stable_dt:
@@ -706,6 +716,34 @@ class SpatialEnvironmentGenerator(DataGenerator):
         
         return new_grid
     
+    def _apply_implicit_diffusion(self, grid: np.ndarray, barrier_mask: np.ndarray,
+                                  D_grid: float, scheme: str) -> np.ndarray:
+        """
+        Apply diffusion to the grid with an implicit sparse solver.
+        
+        Args:
+            grid: The current grid values
+            barrier_mask: Mask indicating barrier locations
+            D_grid: Diffusion coefficient in grid units for this time step
+            scheme: Implicit scheme ('crank_nicolson' or 'backward_euler')
+            
+        Returns:
+            Grid with diffusion applied
+        """
+        solver = self._diffusion_solver
+        if solver is None or solver.shape != grid.shape or solver.scheme != scheme:
+            solver = ImplicitDiffusionSolver(grid.shape, scheme)
+            self._diffusion_solver = solver
+        
+        # As in the explicit scheme, grid faces and barriers keep their values
+        fixed_mask = barrier_mask.copy()
+        fixed_mask[[0, -1], :, :] = True
+        fixed_mask[:, [0, -1], :] = True
+        fixed_mask[:, :, [0, -1]] = True
+        
+        # Interior cells have six neighbors, so the neighbor-averaged rate is 6 * D_grid
+        return solver.step(grid, 6.0 * D_grid, fixed_mask=fixed_mask)
+    
     def _apply_decay(self, grid: np.ndarray, dt: float) -> np.ndarray:
         """
         Apply decay to the parameter values.